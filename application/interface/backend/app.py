@@ -10,6 +10,17 @@ from .handlers.user_handler import user_bp
 from .handlers.patient_handler import patient_bp
 from .handlers.auth_handler import auth_bp
 from .handlers.analytics_handler import analytics_bp
+from .handlers.appointment_handler import appointment_bp
+from .utils.analytics_rollups import rollups_cli
+from .utils.vitals_timeseries import vitals_cli
+from .utils import response_cache
+from .utils.audit_logger import audit_logger
+from .utils.audit_writer import create_writer
+from .utils import revocation_cache
+from .utils import password_hasher
+from .utils import report_jobs
+from .utils import query_profiler
+from .utils import clinician_cache
 from . import database
 
 # Get configuration
@@ -45,18 +56,40 @@ if not app.config['DEBUG']:
 # Initialize database
 database.init_app(app)
 
+# Initialize analytics response cache
+response_cache.init_app(app)
+
+# Initialize JWT revocation cache
+revocation_cache.init_app(app)
+
+# Initialize password hashing worker pool
+password_hasher.init_app(app)
+
+# Initialize background report export jobs
+report_jobs.init_app(app)
+
+# Profile database queries on a sample of requests
+query_profiler.init_app(app)
+
+# Initialize clinician identity/assignment cache
+clinician_cache.init_app(app)
+
+# Write access_log rows in background batches
+if app.config.get('AUDIT_ASYNC_ENABLED', True):
+    audit_logger.attach_writer(create_writer(database.get_pool(app), app.config))
+
+# flask rollups refresh|backfill
+app.cli.add_command(rollups_cli)
+
+# flask vitals refresh|backfill|partitions
+app.cli.add_command(vitals_cli)
+
 @jwt.token_in_blocklist_loader
 def check_if_token_revoked(jwt_header, jwt_payload):
-    jti = jwt_payload['jti']
-    db = database.get_db()
-    cur = db.cursor()
     try:
-        cur.execute("SELECT 1 FROM token_blacklist WHERE jti = %s", (jti,))
-        return cur.fetchone() is not None
+        return revocation_cache.get_revocation_cache().is_revoked(jwt_payload['jti'])
     except Exception:
         return False
-    finally:
-        cur.close()
 
 # Create logs directory if it doesn't exist
 os.makedirs('logs', exist_ok=True)
@@ -66,6 +99,7 @@ app.register_blueprint(auth_bp, url_prefix='/api')
 app.register_blueprint(user_bp, url_prefix='/api')
 app.register_blueprint(patient_bp, url_prefix='/api')
 app.register_blueprint(analytics_bp, url_prefix='/api')
+app.register_blueprint(appointment_bp, url_prefix='/api')
 
 # Error handlers
 @app.errorhandler(404)
@@ -99,7 +133,15 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'service': 'MediTrack Patient Portal API',
-        'version': '1.0.0'
+        'version': '1.0.0',
+        'database_pool': database.get_pool(app).stats(),
+        'analytics_cache': response_cache.get_cache(app).stats(),
+        'audit_writer': audit_logger.writer.stats() if audit_logger.writer else None,
+        'jwt_revocation': revocation_cache.get_revocation_cache(app).stats(),
+        'password_hasher': password_hasher.get_password_hasher(app).stats(),
+        'report_jobs': report_jobs.get_report_jobs(app).stats(),
+        'query_profiler': query_profiler.get_profiler(app).stats(),
+        'clinician_cache': clinician_cache.get_clinician_cache(app).stats()
     }), 200
 
 @app.route('/')
@@ -111,7 +153,8 @@ def index():
             'health': '/health',
             'auth': '/api/auth/*',
             'users': '/api/users/*',
-            'patients': '/api/patients/*'
+            'patients': '/api/patients/*',
+            'appointments': '/api/appointments/*'
         }
     }), 200
 
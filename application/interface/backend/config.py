@@ -29,6 +29,32 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_POOL_SIZE = int(os.environ.get('DATABASE_POOL_SIZE', 20))
     SQLALCHEMY_MAX_OVERFLOW = int(os.environ.get('DATABASE_MAX_OVERFLOW', 10))
+
+    # Connection Pool (see database.ConnectionPool)
+    DB_POOL_MIN_SIZE = int(os.environ.get('DATABASE_POOL_MIN_SIZE', 2))
+    DB_POOL_MAX_SIZE = SQLALCHEMY_POOL_SIZE + SQLALCHEMY_MAX_OVERFLOW
+    DB_POOL_IDLE_TIMEOUT = int(os.environ.get('DATABASE_POOL_IDLE_TIMEOUT', 300))
+    DB_POOL_CHECKOUT_TIMEOUT = int(os.environ.get('DATABASE_POOL_CHECKOUT_TIMEOUT', 10))
+    DB_POOL_HEALTH_CHECK_INTERVAL = int(os.environ.get('DATABASE_POOL_HEALTH_CHECK_INTERVAL', 30))
+    
+    # Analytics response cache (see utils/response_cache.py)
+    ANALYTICS_CACHE_BACKEND = os.environ.get('ANALYTICS_CACHE_BACKEND', 'memory')  # memory, redis or none
+    ANALYTICS_CACHE_TTL = int(os.environ.get('ANALYTICS_CACHE_TTL', 60))
+    ANALYTICS_CACHE_MAX_BYTES = int(os.environ.get('ANALYTICS_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+    ANALYTICS_CACHE_MAX_ENTRIES = int(os.environ.get('ANALYTICS_CACHE_MAX_ENTRIES', 10000))
+    ANALYTICS_CACHE_REDIS_URL = os.environ.get('ANALYTICS_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+
+    # Background report exports
+    REPORT_JOBS_DIR = os.environ.get('REPORT_JOBS_DIR', 'reports')
+    REPORT_JOBS_WORKERS = int(os.environ.get('REPORT_JOBS_WORKERS', 2))
+    REPORT_JOBS_CHUNK_SIZE = int(os.environ.get('REPORT_JOBS_CHUNK_SIZE', 1000))
+    REPORT_JOBS_RETENTION = int(os.environ.get('REPORT_JOBS_RETENTION', 86400))
+
+    # Model bulk_create / bulk_upsert (see utils/bulk_write.py)
+    BULK_WRITE_BATCH_SIZE = int(os.environ.get('BULK_WRITE_BATCH_SIZE', 1000))
+
+    # Vitals chart series (see utils/vitals_timeseries.py)
+    VITALS_SERIES_MAX_POINTS = int(os.environ.get('VITALS_SERIES_MAX_POINTS', 1000))
     
     # JWT Configuration
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY')
@@ -38,6 +64,16 @@ class Config:
     JWT_HEADER_NAME = 'Authorization'
     JWT_HEADER_TYPE = 'Bearer'
     
+    # JWT revocation cache (see utils/revocation_cache.py)
+    JWT_REVOCATION_CACHE_MODE = os.environ.get('JWT_REVOCATION_CACHE_MODE', 'bloom')  # bloom or db
+    JWT_REVOCATION_MAX_STALENESS = float(os.environ.get('JWT_REVOCATION_MAX_STALENESS', 5))
+    JWT_REVOCATION_REBUILD_INTERVAL = float(os.environ.get('JWT_REVOCATION_REBUILD_INTERVAL', 3600))
+    JWT_REVOCATION_CAPACITY = int(os.environ.get('JWT_REVOCATION_CAPACITY', 100000))
+    
+    # Clinician identity / patient assignment cache
+    CLINICIAN_CACHE_TTL = float(os.environ.get('CLINICIAN_CACHE_TTL', 60))
+    CLINICIAN_CACHE_MAX_ENTRIES = int(os.environ.get('CLINICIAN_CACHE_MAX_ENTRIES', 10000))
+    
     # Session Configuration
     SESSION_COOKIE_SECURE = os.environ.get('SESSION_COOKIE_SECURE', 'True') == 'True'
     SESSION_COOKIE_HTTPONLY = os.environ.get('SESSION_COOKIE_HTTPONLY', 'True') == 'True'
@@ -70,6 +106,11 @@ class Config:
     # Audit Logging
     AUDIT_LOG_ENABLED = os.environ.get('AUDIT_LOG_ENABLED', 'True') == 'True'
     AUDIT_LOG_LEVEL = os.environ.get('AUDIT_LOG_LEVEL', 'INFO')
+    AUDIT_ASYNC_ENABLED = os.environ.get('AUDIT_ASYNC_ENABLED', 'True') == 'True'
+    AUDIT_QUEUE_SIZE = int(os.environ.get('AUDIT_QUEUE_SIZE', 10000))
+    AUDIT_BATCH_SIZE = int(os.environ.get('AUDIT_BATCH_SIZE', 500))
+    AUDIT_FLUSH_INTERVAL = float(os.environ.get('AUDIT_FLUSH_INTERVAL', 1.0))
+    AUDIT_SPOOL_PATH = os.environ.get('AUDIT_SPOOL_PATH', 'logs/audit_spool.jsonl')
     
     # File Upload Configuration
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16777216))  # 16MB
@@ -99,8 +140,18 @@ class Config:
     PASSWORD_REQUIRE_NUMBER = os.environ.get('PASSWORD_REQUIRE_NUMBER', 'True') == 'True'
     PASSWORD_REQUIRE_UPPERCASE = os.environ.get('PASSWORD_REQUIRE_UPPERCASE', 'True') == 'True'
     
+    # Password Hashing Pool
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))  # 0 hashes inline
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 32))
+    PASSWORD_HASH_RETRY_AFTER = int(os.environ.get('PASSWORD_HASH_RETRY_AFTER', 2))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 30))
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    
     # Performance Settings
     QUERY_TIMEOUT_SECONDS = int(os.environ.get('QUERY_TIMEOUT_SECONDS', 30))
+    QUERY_PROFILE_SAMPLE_RATE = float(os.environ.get('QUERY_PROFILE_SAMPLE_RATE', 0.05))
+    QUERY_PROFILE_SERVER_TIMING = os.environ.get('QUERY_PROFILE_SERVER_TIMING', 'False') == 'True'
+    QUERY_PROFILE_REPEAT_THRESHOLD = int(os.environ.get('QUERY_PROFILE_REPEAT_THRESHOLD', 5))
 
 
 class DevelopmentConfig(Config):
@@ -119,6 +170,13 @@ class TestingConfig(Config):
     # Use in-memory database for testing
     DB_NAME = 'wellness_test'
     SQLALCHEMY_DATABASE_URI = f"postgresql://{Config.DB_USER}:{Config.DB_PASSWORD}@{Config.DB_HOST}:{Config.DB_PORT}/{DB_NAME}"
+    
+    # Write audit rows inline so tests can assert on them
+    AUDIT_ASYNC_ENABLED = False
+
+    # Hash passwords inline and cheaply
+    PASSWORD_HASH_WORKERS = 0
+    BCRYPT_LOG_ROUNDS = 4
 
 
 class ProductionConfig(Config):
@@ -1,22 +1,342 @@
+"""
+Database connection management
+Provides a bounded, health-checked PostgreSQL connection pool shared by
+request handlers, models and the audit logger
+"""
 import psycopg2
+import psycopg2.extensions
 import os
-from flask import g
+import threading
+import time
+from flask import g, current_app
+from .utils.query_profiler import ProfilingCursor
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time"""
+    pass
+
+
+class ConnectionPool:
+    """
+    Thread-safe PostgreSQL connection pool
+
+    Connections are opened lazily up to max_size. Idle connections are
+    health-checked on checkout and connections idle for longer than
+    idle_timeout are closed, keeping at least min_size open. Connecting,
+    health pings and rollbacks run outside the pool lock, on a slot reserved
+    under it, so one stalled socket never blocks other checkouts.
+    """
+
+    def __init__(self, connect_kwargs, min_size=2, max_size=30, idle_timeout=300,
+                 checkout_timeout=10, health_check_interval=30):
+        """
+        Initialize the pool
+
+        Args:
+            connect_kwargs: Keyword arguments passed to psycopg2.connect
+            min_size: Number of idle connections kept open by the reaper
+            max_size: Maximum number of open connections
+            idle_timeout: Seconds an idle connection may live above min_size
+            checkout_timeout: Seconds to wait for a free connection
+            health_check_interval: Idle seconds after which a connection is
+                pinged before being handed out
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Invalid pool bounds: require 0 <= min_size <= max_size and max_size >= 1")
+
+        self.connect_kwargs = connect_kwargs
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+
+        self._lock = threading.Condition(threading.Lock())
+        self._reset()
+
+    def _reset(self):
+        # Idle connections as (connection, last_used) pairs, most recent last
+        self._idle = []
+        self._in_use = set()
+        self._opening = 0
+        self._pid = os.getpid()
+        self._stats = {
+            'checkouts': 0,
+            'connections_created': 0,
+            'connections_discarded': 0,
+            'connections_reaped': 0,
+            'health_check_failures': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'total_wait_ms': 0.0,
+        }
+
+    def _check_fork(self):
+        # Connections must never be shared across processes (gunicorn preload)
+        if self._pid != os.getpid():
+            self._reset()
+
+    def _close_quietly(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _needs_ping(self, conn, last_used):
+        return not conn.closed and time.monotonic() - last_used >= self.health_check_interval
+
+    def _ping(self, conn):
+        # Network round trip: never called with the lock held
+        if conn.closed:
+            return False
+        try:
+            cur = conn.cursor()
+            cur.execute('SELECT 1')
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _reap_idle_locked(self):
+        now = time.monotonic()
+        open_count = len(self._in_use) + len(self._idle)
+        keep = []
+        # Oldest entries first; stop reaping once only min_size would remain open
+        for conn, last_used in self._idle:
+            if now - last_used > self.idle_timeout and open_count > self.min_size:
+                open_count -= 1
+                self._stats['connections_reaped'] += 1
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            else:
+                keep.append((conn, last_used))
+        self._idle = keep
+
+    def getconn(self):
+        """
+        Check a connection out of the pool
+
+        Returns:
+            An open psycopg2 connection
+
+        Raises:
+            PoolTimeoutError: If max_size connections stay busy for checkout_timeout
+        """
+        started = time.monotonic()
+        with self._lock:
+            self._check_fork()
+            self._reap_idle_locked()
+            waited = False
+            candidate = None
+            while True:
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    if conn.closed:
+                        self._stats['connections_discarded'] += 1
+                        continue
+                    if not self._needs_ping(conn, last_used):
+                        return self._checkout_locked(conn, started, waited)
+                    # Reserve the connection's slot and ping it outside the lock
+                    candidate = conn
+                    self._opening += 1
+                    break
+
+                if len(self._in_use) + self._opening < self.max_size:
+                    # Reserve a slot and connect outside the lock
+                    self._opening += 1
+                    break
+
+                remaining = self.checkout_timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f"No database connection available within {self.checkout_timeout}s "
+                        f"(max_size={self.max_size})"
+                    )
+                if not waited:
+                    self._stats['waits'] += 1
+                    waited = True
+                self._lock.wait(remaining)
+
+        if candidate is not None:
+            if self._ping(candidate):
+                with self._lock:
+                    self._opening -= 1
+                    return self._checkout_locked(candidate, started, waited)
+            # Replace the broken connection, keeping the reserved slot
+            self._close_quietly(candidate)
+            with self._lock:
+                self._stats['health_check_failures'] += 1
+                self._stats['connections_discarded'] += 1
+
+        try:
+            conn = psycopg2.connect(**self.connect_kwargs)
+        except Exception:
+            with self._lock:
+                self._opening -= 1
+                self._lock.notify()
+            raise
+
+        with self._lock:
+            self._opening -= 1
+            self._stats['connections_created'] += 1
+            return self._checkout_locked(conn, started, waited)
+
+    def _checkout_locked(self, conn, started, waited):
+        self._in_use.add(conn)
+        self._stats['checkouts'] += 1
+        if waited:
+            self._stats['total_wait_ms'] += (time.monotonic() - started) * 1000
+        return conn
+
+    def putconn(self, conn):
+        """
+        Return a connection to the pool
+
+        Any open transaction is rolled back so the next borrower starts clean.
+        Broken connections are discarded.
+
+        Args:
+            conn: Connection previously obtained from getconn
+        """
+        with self._lock:
+            if self._pid != os.getpid() or conn not in self._in_use:
+                return
+            # The slot stays reserved while the connection is reset outside the lock
+            self._in_use.discard(conn)
+            self._opening += 1
+
+        reusable = not conn.closed
+        if reusable:
+            try:
+                status = conn.get_transaction_status()
+                if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                    reusable = False
+                elif status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                reusable = False
+        if not reusable:
+            self._close_quietly(conn)
+
+        with self._lock:
+            self._opening -= 1
+            if reusable:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self._stats['connections_discarded'] += 1
+            self._reap_idle_locked()
+            self._lock.notify()
+
+    def warm(self):
+        """Open connections until at least min_size are idle or in use"""
+        while True:
+            with self._lock:
+                self._check_fork()
+                if len(self._idle) + len(self._in_use) + self._opening >= self.min_size:
+                    return
+                self._opening += 1
+            try:
+                conn = psycopg2.connect(**self.connect_kwargs)
+            except Exception:
+                with self._lock:
+                    self._opening -= 1
+                    self._lock.notify()
+                raise
+            with self._lock:
+                self._opening -= 1
+                self._stats['connections_created'] += 1
+                self._idle.append((conn, time.monotonic()))
+                self._lock.notify()
+
+    def closeall(self):
+        """Close every idle connection and forget checked-out ones"""
+        with self._lock:
+            for conn, _ in self._idle:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._idle = []
+            self._in_use = set()
+            self._lock.notify_all()
+
+    def stats(self):
+        """
+        Snapshot of pool usage
+
+        Returns:
+            Dictionary with sizing, utilization and lifetime counters
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                'size': len(self._in_use) + len(self._idle),
+            })
+        stats['avg_wait_ms'] = round(stats['total_wait_ms'] / stats['waits'], 3) if stats['waits'] else 0.0
+        stats['total_wait_ms'] = round(stats['total_wait_ms'], 3)
+        return stats
+
+
+def connect_kwargs_from_env():
+    return {
+        'host': os.environ.get("DB_HOST", "localhost"),
+        'database': os.environ.get("DB_NAME", "wellness"),
+        'user': os.environ.get("DB_USER", "postgres"),
+        'password': os.environ.get("DB_PASSWORD"),
+    }
+
+
+def create_pool(config):
+    """
+    Build a connection pool from a Flask config mapping
+
+    Args:
+        config: Mapping with optional DB_POOL_* settings
+
+    Returns:
+        ConnectionPool instance
+    """
+    return ConnectionPool(
+        connect_kwargs_from_env(),
+        min_size=int(config.get('DB_POOL_MIN_SIZE', 2)),
+        max_size=int(config.get('DB_POOL_MAX_SIZE', 30)),
+        idle_timeout=float(config.get('DB_POOL_IDLE_TIMEOUT', 300)),
+        checkout_timeout=float(config.get('DB_POOL_CHECKOUT_TIMEOUT', 10)),
+        health_check_interval=float(config.get('DB_POOL_HEALTH_CHECK_INTERVAL', 30)),
+    )
+
+
+def get_pool(app=None):
+    """Return the connection pool registered on the (current) Flask app"""
+    app = app or current_app
+    pool = app.extensions.get('db_pool')
+    if pool is None:
+        pool = app.extensions['db_pool'] = create_pool(app.config)
+    return pool
+
 
 def get_db():
     if 'db' not in g:
-        g.db = psycopg2.connect(
-            host=os.environ.get("DB_HOST", "localhost"),
-            database=os.environ.get("DB_NAME", "wellness"),
-            user=os.environ.get("DB_USER", "postgres"),
-            password=os.environ.get("DB_PASSWORD")
-        )
+        g.db = get_pool().getconn()
+        # Sampled requests get cursors that report to the query profiler
+        g.db.cursor_factory = ProfilingCursor if 'query_profile' in g else psycopg2.extensions.cursor
     return g.db
 
 def close_db(e=None):
     db = g.pop('db', None)
 
     if db is not None:
-        db.close()
+        get_pool().putconn(db)
 
 def init_app(app):
+    app.extensions['db_pool'] = create_pool(app.config)
     app.teardown_appcontext(close_db)
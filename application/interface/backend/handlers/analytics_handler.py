@@ -1,13 +1,25 @@
 """
 Analytics handler for comprehensive dashboard metrics and reporting
 """
-from flask import Blueprint, request, jsonify, g
+import os
+import re
+from flask import Blueprint, request, jsonify, g, send_file
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from datetime import datetime, timedelta
 from ..database import get_db
 from ..utils.audit_logger import audit_log, audit_logger
 from .auth_handler import mfa_required
 from ..utils.auth_utils import get_clinician_id
+from ..utils.dashboard_metrics import fetch_dashboard_metrics
+from ..utils.response_cache import cached_response
+from ..utils.analytics_rollups import (
+    fetch_rollup_rows, rollup_status, APPOINTMENT_TREND_QUERY, ASSESSMENT_TREND_QUERY,
+    PATIENT_SUMMARY_QUERY, CLINICIAN_WORKLOAD_QUERY
+)
+from ..utils.query_profiler import get_profiler
+from ..utils.report_jobs import (
+    get_report_jobs, format_report_rows, REPORT_TYPES, EXPORT_FORMATS, COMPLETED
+)
 
 analytics_bp = Blueprint('analytics_bp', __name__)
 
@@ -16,6 +28,7 @@ analytics_bp = Blueprint('analytics_bp', __name__)
 @jwt_required()
 @mfa_required
 @audit_log('VIEW', 'analytics_dashboard')
+@cached_response('analytics_dashboard', params=('time_range',))
 def get_dashboard_metrics():
     """
     Get comprehensive dashboard metrics
@@ -50,389 +63,7 @@ def get_dashboard_metrics():
     cur = db.cursor()
     
     try:
-        metrics = {}
-        
-        # Patient Overview Metrics
-        if role in ['admin', 'clinician']:
-            # Total patients
-            if role == 'admin':
-                cur.execute('SELECT COUNT(*) FROM patients')
-            else:
-                cur.execute('SELECT COUNT(*) FROM patient_clinician WHERE clinician_id = %s', (clinician_id,))
-            metrics['total_patients'] = cur.fetchone()[0]
-            
-            # New patients in time range
-            if role == 'admin':
-                cur.execute(
-                    'SELECT COUNT(*) FROM patients WHERE created_at >= %s',
-                    (start_date,)
-                )
-            else:
-                cur.execute(
-                    '''
-                    SELECT COUNT(*) FROM patients p
-                    JOIN patient_clinician pc ON pc.patient_id = p.id
-                    WHERE pc.clinician_id = %s AND p.created_at >= %s
-                    ''',
-                    (clinician_id, start_date)
-                )
-            metrics['new_patients'] = cur.fetchone()[0]
-            
-            # Active patients (with recent activity)
-            if role == 'admin':
-                cur.execute(
-                    """
-                    SELECT COUNT(DISTINCT patient_id)
-                    FROM appointments
-                    WHERE appointment_time >= %s
-                    """,
-                    (start_date,)
-                )
-            else:
-                cur.execute(
-                    """
-                    SELECT COUNT(DISTINCT patient_id)
-                    FROM appointments
-                    WHERE appointment_time >= %s AND clinician_id = %s
-                    """,
-                    (start_date, clinician_id)
-                )
-            metrics['active_patients'] = cur.fetchone()[0]
-        
-        # Appointment Metrics
-        if role in ['admin', 'clinician']:
-            # Total appointments
-            if role == 'admin':
-                cur.execute(
-                    """
-                    SELECT COUNT(*), status
-                    FROM appointments
-                    WHERE appointment_time >= %s
-                    GROUP BY status
-                    """,
-                    (start_date,)
-                )
-            else:
-                cur.execute(
-                    """
-                    SELECT COUNT(*), status
-                    FROM appointments
-                    WHERE appointment_time >= %s AND clinician_id = %s
-                    GROUP BY status
-                    """,
-                    (start_date, clinician_id)
-                )
-            appointment_stats = cur.fetchall()
-            metrics['appointments'] = {
-                'total': sum(row[0] for row in appointment_stats),
-                'by_status': {row[1]: row[0] for row in appointment_stats}
-            }
-            
-            # Upcoming appointments
-            if role == 'admin':
-                cur.execute(
-                    """
-                    SELECT COUNT(*)
-                    FROM appointments
-                    WHERE appointment_time > %s AND status = 'scheduled'
-                    """,
-                    (datetime.now(),)
-                )
-            else:
-                cur.execute(
-                    """
-                    SELECT COUNT(*)
-                    FROM appointments
-                    WHERE appointment_time > %s AND status = 'scheduled' AND clinician_id = %s
-                    """,
-                    (datetime.now(), clinician_id)
-                )
-            metrics['upcoming_appointments'] = cur.fetchone()[0]
-        
-        # Assessment Metrics
-        if role in ['admin', 'clinician']:
-            # Assessment completion rate
-            if role == 'admin':
-                cur.execute(
-                    """
-                    SELECT
-                        si.instrument_code,
-                        si.name,
-                        COUNT(p.id) as total_assessments,
-                        AVG(CASE WHEN p.id IS NOT NULL THEN 1 ELSE 0 END) as completion_rate
-                    FROM scale_instruments si
-                    LEFT JOIN psyconnect p ON p.assessment_type = si.instrument_code
-                        AND p.assessed_at >= %s
-                    WHERE si.active = true
-                    GROUP BY si.instrument_code, si.name
-                    """,
-                    (start_date,)
-                )
-            else:
-                cur.execute(
-                    """
-                    SELECT
-                        si.instrument_code,
-                        si.name,
-                        COUNT(p.id) as total_assessments,
-                        AVG(CASE WHEN p.id IS NOT NULL THEN 1 ELSE 0 END) as completion_rate
-                    FROM scale_instruments si
-                    LEFT JOIN psyconnect p ON p.assessment_type = si.instrument_code
-                        AND p.assessed_at >= %s
-                        AND p.patient_id IN (SELECT patient_id FROM patient_clinician WHERE clinician_id = %s)
-                    WHERE si.active = true
-                    GROUP BY si.instrument_code, si.name
-                    """,
-                    (start_date, clinician_id)
-                )
-            assessment_stats = cur.fetchall()
-            metrics['assessments'] = [
-                {
-                    'instrument_code': row[0],
-                    'name': row[1],
-                    'total': row[2],
-                    'completion_rate': float(row[3]) if row[3] else 0
-                }
-                for row in assessment_stats
-            ]
-        
-        # Therapy Session Metrics
-        if role in ['admin', 'clinician']:
-            # Total sessions
-            if role == 'admin':
-                cur.execute(
-                    """
-                    SELECT COUNT(*), AVG(duration_minutes)
-                    FROM therapy_sessions ts
-                    JOIN appointments a ON a.id = ts.appointment_id
-                    WHERE a.appointment_time >= %s
-                    """,
-                    (start_date,)
-                )
-            else:
-                cur.execute(
-                    """
-                    SELECT COUNT(*), AVG(duration_minutes)
-                    FROM therapy_sessions ts
-                    JOIN appointments a ON a.id = ts.appointment_id
-                    WHERE a.appointment_time >= %s AND a.clinician_id = %s
-                    """,
-                    (start_date, clinician_id)
-                )
-            session_data = cur.fetchone()
-            metrics['therapy_sessions'] = {
-                'total': session_data[0],
-                'avg_duration': float(session_data[1]) if session_data[1] else 0
-            }
-            
-            # Homework completion rate
-            if role == 'admin':
-                cur.execute(
-                    """
-                    SELECT
-                        COUNT(*) as total,
-                        SUM(CASE WHEN completed = true THEN 1 ELSE 0 END) as completed
-                    FROM therapy_homework
-                    WHERE assigned_at >= %s
-                    """,
-                    (start_date,)
-                )
-            else:
-                cur.execute(
-                    """
-                    SELECT
-                        COUNT(*) as total,
-                        SUM(CASE WHEN completed = true THEN 1 ELSE 0 END) as completed
-                    FROM therapy_homework
-                    WHERE assigned_at >= %s
-                    AND patient_id IN (SELECT patient_id FROM patient_clinician WHERE clinician_id = %s)
-                    """,
-                    (start_date, clinician_id)
-                )
-            homework_data = cur.fetchone()
-            total_hw = homework_data[0] or 0
-            completed_hw = homework_data[1] or 0
-            metrics['homework_completion_rate'] = (completed_hw / total_hw * 100) if total_hw > 0 else 0
-        
-        # Vitals Metrics
-        if role in ['admin', 'clinician']:
-            # Average vitals
-            if role == 'admin':
-                cur.execute(
-                    """
-                    SELECT
-                        AVG(heart_rate) as avg_hr,
-                        COUNT(*) as total_readings
-                    FROM vitals
-                    WHERE recorded_at >= %s AND heart_rate IS NOT NULL
-                    """,
-                    (start_date,)
-                )
-            else:
-                cur.execute(
-                    """
-                    SELECT
-                        AVG(heart_rate) as avg_hr,
-                        COUNT(*) as total_readings
-                    FROM vitals
-                    WHERE recorded_at >= %s AND heart_rate IS NOT NULL
-                    AND patient_id IN (SELECT patient_id FROM patient_clinician WHERE clinician_id = %s)
-                    """,
-                    (start_date, clinician_id)
-                )
-            vitals_data = cur.fetchone()
-            metrics['vitals'] = {
-                'avg_heart_rate': float(vitals_data[0]) if vitals_data[0] else 0,
-                'total_readings': vitals_data[1]
-            }
-        
-        # Messaging Metrics
-        if role in ['admin', 'clinician']:
-            # Message volume
-            if role == 'admin':
-                cur.execute(
-                    """
-                    SELECT COUNT(*)
-                    FROM messages
-                    WHERE sent_at >= %s
-                    """,
-                    (start_date,)
-                )
-            else:
-                cur.execute(
-                    """
-                    SELECT COUNT(*)
-                    FROM messages
-                    WHERE sent_at >= %s
-                    AND (sender_id = %s OR recipient_id = %s)
-                    """,
-                    (start_date, user_id, user_id)
-                )
-            metrics['messages_sent'] = cur.fetchone()[0]
-        
-        # Clinician Metrics
-        if role in ['admin']:
-            # Active clinicians
-            cur.execute('SELECT COUNT(*) FROM clinicians WHERE active = true')
-            metrics['active_clinicians'] = cur.fetchone()[0]
-            
-            # Clinician workload
-            cur.execute(
-                """
-                SELECT 
-                    c.id,
-                    u.full_name,
-                    COUNT(DISTINCT pc.patient_id) as patient_count,
-                    COUNT(a.id) as appointment_count
-                FROM clinicians c
-                JOIN users u ON u.id = c.user_id
-                LEFT JOIN patient_clinician pc ON pc.clinician_id = c.id
-                LEFT JOIN appointments a ON a.clinician_id = c.id 
-                    AND a.appointment_time >= %s
-                WHERE c.active = true
-                GROUP BY c.id, u.full_name
-                ORDER BY patient_count DESC
-                LIMIT 10
-                """,
-                (start_date,)
-            )
-            clinician_workload = cur.fetchall()
-            metrics['clinician_workload'] = [
-                {
-                    'clinician_id': row[0],
-                    'name': row[1],
-                    'patient_count': row[2],
-                    'appointment_count': row[3]
-                }
-                for row in clinician_workload
-            ]
-        
-        # Access Log Metrics (Security)
-        if role == 'admin':
-            # Recent access activity
-            cur.execute(
-                """
-                SELECT 
-                    action,
-                    COUNT(*) as count
-                FROM access_log
-                WHERE accessed_at >= %s
-                GROUP BY action
-                ORDER BY count DESC
-                LIMIT 10
-                """,
-                (start_date,)
-            )
-            access_stats = cur.fetchall()
-            metrics['access_activity'] = [
-                {'action': row[0], 'count': row[1]}
-                for row in access_stats
-            ]
-            
-            # Unique users active
-            cur.execute(
-                """
-                SELECT COUNT(DISTINCT user_id)
-                FROM access_log
-                WHERE accessed_at >= %s
-                """,
-                (start_date,)
-            )
-            metrics['active_users'] = cur.fetchone()[0]
-        
-        # Patient-specific metrics
-        if role == 'patient':
-            # Get patient ID
-            cur.execute('SELECT id FROM patients WHERE user_id = %s', (user_id,))
-            patient_result = cur.fetchone()
-            
-            if patient_result:
-                patient_id = patient_result[0]
-                
-                # My appointments
-                cur.execute(
-                    """
-                    SELECT COUNT(*), status
-                    FROM appointments
-                    WHERE patient_id = %s AND appointment_time >= %s
-                    GROUP BY status
-                    """,
-                    (patient_id, start_date)
-                )
-                my_appointments = cur.fetchall()
-                metrics['my_appointments'] = {
-                    'total': sum(row[0] for row in my_appointments),
-                    'by_status': {row[1]: row[0] for row in my_appointments}
-                }
-                
-                # My assessments
-                cur.execute(
-                    """
-                    SELECT COUNT(*)
-                    FROM psyconnect
-                    WHERE patient_id = %s AND assessed_at >= %s
-                    """,
-                    (patient_id, start_date)
-                )
-                metrics['my_assessments'] = cur.fetchone()[0]
-                
-                # My homework
-                cur.execute(
-                    """
-                    SELECT 
-                        COUNT(*) as total,
-                        SUM(CASE WHEN completed = true THEN 1 ELSE 0 END) as completed
-                    FROM therapy_homework
-                    WHERE patient_id = %s AND assigned_at >= %s
-                    """,
-                    (patient_id, start_date)
-                )
-                homework = cur.fetchone()
-                metrics['my_homework'] = {
-                    'total': homework[0],
-                    'completed': homework[1] or 0,
-                    'completion_rate': (homework[1] / homework[0] * 100) if homework[0] > 0 else 0
-                }
+        metrics = fetch_dashboard_metrics(cur, role, user_id, clinician_id, start_date, end_date)
         
         return jsonify({
             'time_range': time_range,
@@ -452,6 +83,7 @@ def get_dashboard_metrics():
 @jwt_required()
 @mfa_required
 @audit_log('VIEW', 'analytics_trends')
+@cached_response('analytics_trends', params=('metric', 'period', 'days'))
 def get_trends():
     """
     Get trend data over time
@@ -491,7 +123,8 @@ def get_trends():
     except ValueError:
         return jsonify({'error': 'days must be an integer'}), 400
     
-    start_date = datetime.now() - timedelta(days=days)
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days)
     
     db = get_db()
     cur = db.cursor()
@@ -499,40 +132,23 @@ def get_trends():
     try:
         # Determine date truncation based on period
         if period == 'weekly':
-            date_trunc = "DATE_TRUNC('week', %s)"
+            trunc_unit = 'week'
         elif period == 'monthly':
-            date_trunc = "DATE_TRUNC('month', %s)"
+            trunc_unit = 'month'
         else:  # daily
-            date_trunc = "DATE_TRUNC('day', %s)"
+            trunc_unit = 'day'
+        date_trunc = f"DATE_TRUNC('{trunc_unit}', %s)"
         
         trend_data = []
+        # Set for metrics served from the daily rollups
+        freshness = None
         
         if metric == 'appointments' and role in ['admin', 'clinician']:
-            if role == 'admin':
-                query = f"""
-                    SELECT
-                        {date_trunc.replace('%s', 'appointment_time')} as period,
-                        COUNT(*) as count,
-                        status
-                    FROM appointments
-                    WHERE appointment_time >= %s
-                    GROUP BY period, status
-                    ORDER BY period
-                """
-                cur.execute(query, (start_date,))
-            else:
-                query = f"""
-                    SELECT
-                        {date_trunc.replace('%s', 'appointment_time')} as period,
-                        COUNT(*) as count,
-                        status
-                    FROM appointments
-                    WHERE appointment_time >= %s AND clinician_id = %s
-                    GROUP BY period, status
-                    ORDER BY period
-                """
-                cur.execute(query, (start_date, clinician_id))
-            results = cur.fetchall()
+            results = fetch_rollup_rows(
+                cur, APPOINTMENT_TREND_QUERY, start_date.date(), end_date.date(),
+                clinician_id=clinician_id, scoped=role == 'clinician', unit=trunc_unit
+            )
+            freshness = rollup_status(cur, start_date.date(), end_date.date())
             
             # Group by period
             period_data = {}
@@ -546,32 +162,11 @@ def get_trends():
             trend_data = list(period_data.values())
         
         elif metric == 'assessments' and role in ['admin', 'clinician']:
-            if role == 'admin':
-                query = f"""
-                    SELECT
-                        {date_trunc.replace('%s', 'assessed_at')} as period,
-                        COUNT(*) as count,
-                        assessment_type
-                    FROM psyconnect
-                    WHERE assessed_at >= %s
-                    GROUP BY period, assessment_type
-                    ORDER BY period
-                """
-                cur.execute(query, (start_date,))
-            else:
-                query = f"""
-                    SELECT
-                        {date_trunc.replace('%s', 'assessed_at')} as period,
-                        COUNT(*) as count,
-                        assessment_type
-                    FROM psyconnect
-                    WHERE assessed_at >= %s
-                    AND patient_id IN (SELECT patient_id FROM patient_clinician WHERE clinician_id = %s)
-                    GROUP BY period, assessment_type
-                    ORDER BY period
-                """
-                cur.execute(query, (start_date, clinician_id))
-            results = cur.fetchall()
+            results = fetch_rollup_rows(
+                cur, ASSESSMENT_TREND_QUERY, start_date.date(), end_date.date(),
+                clinician_id=clinician_id, scoped=role == 'clinician', unit=trunc_unit
+            )
+            freshness = rollup_status(cur, start_date.date(), end_date.date())
             
             period_data = {}
             for row in results:
@@ -650,13 +245,16 @@ def get_trends():
                 for row in results
             ]
         
-        return jsonify({
+        response = {
             'metric': metric,
             'period': period,
             'days': days,
             'start_date': start_date.isoformat(),
             'data': trend_data
-        }), 200
+        }
+        if freshness is not None:
+            response['rollup_status'] = freshness
+        return jsonify(response), 200
     
     except Exception as e:
         audit_logger.log_security_event('ANALYTICS_TRENDS_ERROR', user_id, request.remote_addr, 'An unexpected error occurred while fetching analytics trends')
@@ -751,9 +349,8 @@ def get_performance_metrics():
         cache_stats = cur.fetchone()
         metrics['cache_hit_ratio'] = float(cache_stats[2]) if cache_stats[2] else 0
         
-        # Recent slow queries (would need pg_stat_statements extension)
-        # For now, return placeholder
-        metrics['slow_queries'] = []
+        # Slowest statements seen by the in-app query profiler
+        metrics['slow_queries'] = get_profiler().snapshot(limit=10)['slowest_statements']
         
         return jsonify(metrics), 200
     
@@ -764,6 +361,68 @@ def get_performance_metrics():
         cur.close()
 
 
+@analytics_bp.route('/analytics/performance/queries', methods=['GET'])
+@jwt_required()
+@mfa_required
+@audit_log('VIEW', 'analytics_query_profile')
+def get_query_profile():
+    """
+    Get sampled per-route query statistics (admin only)
+
+    Query params:
+        - limit: slowest statements listed per route (default: 10, max: 100)
+        - reset: 'true' clears the collected statistics after reading them
+
+    Returns:
+        Per-route query counts, DB time, rows, slowest normalized statements
+        and N+1 / duplicate query patterns
+    """
+    claims = get_jwt()
+    if claims.get('role', 'patient') != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    try:
+        limit = max(1, min(int(request.args.get('limit', 10)), 100))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+
+    profiler = get_profiler()
+    report = profiler.snapshot(limit=limit)
+    if request.args.get('reset', 'false').lower() == 'true':
+        profiler.reset()
+    return jsonify(report), 200
+
+
+def _parse_report_request(data, allowed_types):
+    """
+    Validate report_type and the date range of a report request
+
+    Returns:
+        Tuple of (report_type, start_date, end_date, error_response); the
+        error response is None when the request is valid
+    """
+    report_type = data.get('report_type')
+    start_date_str = data.get('start_date', (datetime.now() - timedelta(days=30)).isoformat())
+    end_date_str = data.get('end_date', datetime.now().isoformat())
+
+    if report_type not in allowed_types:
+        return None, None, None, (jsonify({'error': f'Invalid report type. Allowed: {", ".join(allowed_types)}'}), 400)
+
+    try:
+        start_date = datetime.fromisoformat(start_date_str)
+        end_date = datetime.fromisoformat(end_date_str)
+    except ValueError:
+        return None, None, None, (jsonify({'error': 'Invalid date format. Use ISO format.'}), 400)
+
+    # Enforce maximum date range (e.g., 1 year)
+    if (end_date - start_date).days > 366:
+        return None, None, None, (jsonify({'error': 'Report date range cannot exceed 1 year'}), 400)
+    if start_date > end_date:
+        return None, None, None, (jsonify({'error': 'start_date must be before end_date'}), 400)
+
+    return report_type, start_date, end_date, None
+
+
 @analytics_bp.route('/analytics/reports/generate', methods=['POST'])
 @jwt_required()
 @mfa_required
@@ -796,27 +455,11 @@ def generate_report():
     if not data:
         return jsonify({'error': 'Request body is required'}), 400
 
-    report_type = data.get('report_type')
-    start_date_str = data.get('start_date', (datetime.now() - timedelta(days=30)).isoformat())
-    end_date_str = data.get('end_date', datetime.now().isoformat())
-    filters = data.get('filters', {})
-
-    # Validation
     allowed_types = ['patient_summary', 'clinician_workload', 'assessment_outcomes', 'system_usage']
-    if report_type not in allowed_types:
-        return jsonify({'error': f'Invalid report type. Allowed: {", ".join(allowed_types)}'}), 400
-
-    try:
-        start_date = datetime.fromisoformat(start_date_str)
-        end_date = datetime.fromisoformat(end_date_str)
-    except ValueError:
-        return jsonify({'error': 'Invalid date format. Use ISO format.'}), 400
-
-    # Enforce maximum date range (e.g., 1 year)
-    if (end_date - start_date).days > 366:
-        return jsonify({'error': 'Report date range cannot exceed 1 year'}), 400
-    if start_date > end_date:
-        return jsonify({'error': 'start_date must be before end_date'}), 400
+    report_type, start_date, end_date, error = _parse_report_request(data, allowed_types)
+    if error:
+        return error
+    filters = data.get('filters', {})
     
     db = get_db()
     cur = db.cursor()
@@ -835,123 +478,24 @@ def generate_report():
         
         if report_type == 'patient_summary':
             # Patient summary report
-            if role == 'admin':
-                query = """
-                    SELECT
-                        p.id,
-                        u.full_name,
-                        p.date_of_birth,
-                        p.gender,
-                        COUNT(DISTINCT a.id) as appointment_count,
-                        COUNT(DISTINCT ts.id) as session_count,
-                        COUNT(DISTINCT pc.id) as assessment_count
-                    FROM patients p
-                    JOIN users u ON u.id = p.user_id
-                    LEFT JOIN appointments a ON a.patient_id = p.id
-                        AND a.appointment_time BETWEEN %s AND %s
-                    LEFT JOIN therapy_sessions ts ON ts.appointment_id = a.id
-                    LEFT JOIN psyconnect pc ON pc.patient_id = p.id
-                        AND pc.assessed_at BETWEEN %s AND %s
-                    GROUP BY p.id, u.full_name, p.date_of_birth, p.gender
-                    ORDER BY appointment_count DESC
-                """
-                cur.execute(query, (start_date, end_date, start_date, end_date))
-            else:
-                query = """
-                    SELECT
-                        p.id,
-                        u.full_name,
-                        p.date_of_birth,
-                        p.gender,
-                        COUNT(DISTINCT a.id) as appointment_count,
-                        COUNT(DISTINCT ts.id) as session_count,
-                        COUNT(DISTINCT pc.id) as assessment_count
-                    FROM patients p
-                    JOIN users u ON u.id = p.user_id
-                    JOIN patient_clinician pcl ON pcl.patient_id = p.id
-                    LEFT JOIN appointments a ON a.patient_id = p.id
-                        AND a.appointment_time BETWEEN %s AND %s
-                    LEFT JOIN therapy_sessions ts ON ts.appointment_id = a.id
-                    LEFT JOIN psyconnect pc ON pc.patient_id = p.id
-                        AND pc.assessed_at BETWEEN %s AND %s
-                    WHERE pcl.clinician_id = %s
-                    GROUP BY p.id, u.full_name, p.date_of_birth, p.gender
-                    ORDER BY appointment_count DESC
-                """
-                cur.execute(query, (start_date, end_date, start_date, end_date, clinician_id))
-            results = cur.fetchall()
+            results = fetch_rollup_rows(
+                cur, PATIENT_SUMMARY_QUERY, start_date.date(), end_date.date(),
+                clinician_id=clinician_id, scoped=role == 'clinician'
+            )
             
-            report_data['data'] = [
-                {
-                    'patient_id': row[0],
-                    'name': row[1],
-                    'date_of_birth': row[2].isoformat() if row[2] else None,
-                    'gender': row[3],
-                    'appointments': row[4],
-                    'sessions': row[5],
-                    'assessments': row[6]
-                }
-                for row in results
-            ]
+            report_data['data'] = format_report_rows(report_type, results)
         
         elif report_type == 'clinician_workload':
             # Clinician workload report
-            if role == 'admin':
-                query = """
-                    SELECT
-                        c.id,
-                        u.full_name,
-                        c.specialty,
-                        COUNT(DISTINCT pc.patient_id) as patient_count,
-                        COUNT(DISTINCT a.id) as appointment_count,
-                        COUNT(DISTINCT ts.id) as session_count,
-                        AVG(ts.duration_minutes) as avg_session_duration
-                    FROM clinicians c
-                    JOIN users u ON u.id = c.user_id
-                    LEFT JOIN patient_clinician pc ON pc.clinician_id = c.id
-                    LEFT JOIN appointments a ON a.clinician_id = c.id
-                        AND a.appointment_time BETWEEN %s AND %s
-                    LEFT JOIN therapy_sessions ts ON ts.appointment_id = a.id
-                    WHERE c.active = true
-                    GROUP BY c.id, u.full_name, c.specialty
-                    ORDER BY appointment_count DESC
-                """
-                cur.execute(query, (start_date, end_date))
-            else:
-                query = """
-                    SELECT
-                        c.id,
-                        u.full_name,
-                        c.specialty,
-                        COUNT(DISTINCT pc.patient_id) as patient_count,
-                        COUNT(DISTINCT a.id) as appointment_count,
-                        COUNT(DISTINCT ts.id) as session_count,
-                        AVG(ts.duration_minutes) as avg_session_duration
-                    FROM clinicians c
-                    JOIN users u ON u.id = c.user_id
-                    LEFT JOIN patient_clinician pc ON pc.clinician_id = c.id
-                    LEFT JOIN appointments a ON a.clinician_id = c.id
-                        AND a.appointment_time BETWEEN %s AND %s
-                    LEFT JOIN therapy_sessions ts ON ts.appointment_id = a.id
-                    WHERE c.active = true AND c.id = %s
-                    GROUP BY c.id, u.full_name, c.specialty
-                    ORDER BY appointment_count DESC
-                """
-                cur.execute(query, (start_date, end_date, clinician_id))
-            results = cur.fetchall()
+            results = fetch_rollup_rows(
+                cur, CLINICIAN_WORKLOAD_QUERY, start_date.date(), end_date.date(),
+                clinician_id=clinician_id, scoped=role == 'clinician'
+            )
             
-            report_data['data'] = [
-                {
-                    'clinician_id': row[0],
-                    'name': row[1],
-                    'specialty': row[2],
-                    'patient_count': row[3],
-                    'appointments': row[4],
-                    'sessions': row[5],
-                    'avg_session_duration': float(row[6]) if row[6] else 0
-                }
-                for row in results
-            ]
+            report_data['data'] = format_report_rows(report_type, results)
+        
+        if report_type in ['patient_summary', 'clinician_workload']:
+            report_data['rollup_status'] = rollup_status(cur, start_date.date(), end_date.date())
         
         return jsonify(report_data), 200
     
@@ -960,3 +504,124 @@ def generate_report():
         return jsonify({'error': 'An error occurred while generating report'}), 500
     finally:
         cur.close()
+
+
+JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+
+def _report_job_for_request(job_id):
+    """
+    Look up a report job the current user may read
+
+    Returns:
+        ReportJob, or None if it does not exist or belongs to another scope
+    """
+    claims = get_jwt()
+    role = claims.get('role', 'patient')
+    if role not in ['admin', 'clinician'] or not JOB_ID_PATTERN.match(job_id):
+        return None
+    job = get_report_jobs().get(job_id)
+    if job is None:
+        return None
+    if role == 'clinician':
+        scope = f'clinician:{get_clinician_id(get_jwt_identity())}'
+    else:
+        scope = 'all'
+    return job if job.scope == scope else None
+
+
+@analytics_bp.route('/analytics/reports/jobs', methods=['POST'])
+@jwt_required()
+@mfa_required
+@audit_log('CREATE', 'analytics_report_job')
+def create_report_job():
+    """
+    Queue a report export
+
+    Request body:
+        - report_type: 'patient_summary' or 'clinician_workload'
+        - start_date: ISO format date
+        - end_date: ISO format date
+        - format: 'csv' or 'ndjson' (default: 'csv')
+
+    Returns:
+        202 with the job status; Location points at the status endpoint. An
+        identical request already in flight returns that job.
+    """
+    user_id = get_jwt_identity()
+    claims = get_jwt()
+    role = claims.get('role', 'patient')
+
+    if role not in ['admin', 'clinician']:
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    clinician_id = None
+    if role == 'clinician':
+        clinician_id = get_clinician_id(user_id)
+
+    data = request.get_json()
+    if not data:
+        return jsonify({'error': 'Request body is required'}), 400
+
+    report_type, start_date, end_date, error = _parse_report_request(data, list(REPORT_TYPES))
+    if error:
+        return error
+    export_format = data.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f'Invalid format. Allowed: {", ".join(EXPORT_FORMATS)}'}), 400
+
+    job, created = get_report_jobs().submit(
+        report_type, start_date.date(), end_date.date(),
+        clinician_id=clinician_id, scoped=role == 'clinician',
+        export_format=export_format, user_id=user_id, ip_address=request.remote_addr
+    )
+    body = job.to_dict()
+    body['deduplicated'] = not created
+    response = jsonify(body)
+    response.status_code = 202
+    response.headers['Location'] = f'{request.base_url}/{job.id}'
+    return response
+
+
+@analytics_bp.route('/analytics/reports/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+@mfa_required
+@audit_log('VIEW', 'analytics_report_job')
+def get_report_job(job_id):
+    """
+    Get the status and progress of a report job
+
+    Returns:
+        Job status; rows_written grows while the job runs
+    """
+    job = _report_job_for_request(job_id)
+    if job is None:
+        return jsonify({'error': 'Report job not found'}), 404
+    return jsonify(job.to_dict()), 200
+
+
+@analytics_bp.route('/analytics/reports/jobs/<job_id>/download', methods=['GET'])
+@jwt_required()
+@mfa_required
+@audit_log('EXPORT', 'analytics_report_job')
+def download_report_job(job_id):
+    """
+    Download the export file of a completed report job
+
+    Returns:
+        CSV or NDJSON file, sent in chunks; 409 while the job is not complete
+    """
+    job = _report_job_for_request(job_id)
+    if job is None:
+        return jsonify({'error': 'Report job not found'}), 404
+    if job.status != COMPLETED:
+        return jsonify({'error': 'Report job is not complete', 'status': job.status}), 409
+
+    jobs = get_report_jobs()
+    mimetype, extension = EXPORT_FORMATS[job.format]
+    return send_file(
+        os.path.abspath(jobs.path_for(job)),
+        mimetype=mimetype,
+        as_attachment=True,
+        download_name=f'{job.report_type}_{job.start_day.isoformat()}_{job.end_day.isoformat()}{extension}'
+    )
@@ -0,0 +1,114 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from .auth_handler import mfa_required
+from ..models.appointment import Appointment
+from ..utils.audit_logger import audit_log
+from ..utils.auth_utils import get_clinician_id, get_assigned_patient_ids
+from ..utils.validators import parse_naive_utc
+
+appointment_bp = Blueprint('appointment_bp', __name__)
+
+MAX_BATCH_SIZE = 5000
+BATCH_STATUSES = ('scheduled', 'completed')
+
+
+def _parse_proposal(item, assigned_patients):
+    """
+    Validate one proposed appointment
+
+    Returns:
+        Tuple of (proposal, error); proposal is None when error is set
+    """
+    if not isinstance(item, dict):
+        return None, 'Appointment must be an object'
+    try:
+        patient_id = int(item['patient_id'])
+        # Offsets (e.g. a trailing Z) are normalized to naive UTC, like stored times
+        appointment_time = parse_naive_utc(item['appointment_time'])
+    except (KeyError, TypeError, ValueError):
+        return None, 'patient_id and an ISO format appointment_time are required'
+    status = item.get('status', 'scheduled')
+    if status not in BATCH_STATUSES:
+        return None, f'Invalid status. Allowed: {", ".join(BATCH_STATUSES)}'
+    if assigned_patients is not None and patient_id not in assigned_patients:
+        return None, 'Clinician is not assigned to this patient'
+    return {'patient_id': patient_id, 'appointment_time': appointment_time, 'status': status}, None
+
+
+@appointment_bp.route('/appointments/batch', methods=['POST'])
+@jwt_required()
+@mfa_required
+@audit_log('CREATE', 'appointment_batch')
+def schedule_appointments():
+    """
+    Schedule many appointments for one clinician
+
+    Request body:
+        - clinician_id: Clinician to schedule for (admins only; clinicians
+          always schedule for themselves)
+        - appointments: List of {patient_id, appointment_time, status}
+
+    Returns:
+        Created appointments, and rejected entries with their index in the
+        request and the reason (invalid, unassigned or unknown patient, or
+        conflict)
+    """
+    claims = get_jwt()
+    role = claims.get('role')
+    if role not in ['clinician', 'admin']:
+        return jsonify({'error': 'Clinician or Admin privileges required'}), 403
+
+    data = request.get_json()
+    if not data or not isinstance(data.get('appointments'), list):
+        return jsonify({'error': 'appointments list is required'}), 400
+    if len(data['appointments']) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'At most {MAX_BATCH_SIZE} appointments per batch'}), 400
+
+    assigned_patients = None
+    if role == 'clinician':
+        clinician_id = get_clinician_id(get_jwt_identity())
+        if clinician_id is None:
+            return jsonify({'error': 'Clinician profile not found'}), 403
+        assigned_patients = get_assigned_patient_ids(clinician_id)
+    else:
+        try:
+            clinician_id = int(data['clinician_id'])
+        except (KeyError, TypeError, ValueError):
+            return jsonify({'error': 'clinician_id is required'}), 400
+
+    proposals = []
+    positions = []
+    rejected = []
+    for index, item in enumerate(data['appointments']):
+        proposal, error = _parse_proposal(item, assigned_patients)
+        if error:
+            rejected.append({'index': index, 'error': error})
+        else:
+            proposals.append(proposal)
+            positions.append(index)
+
+    if role == 'admin':
+        # Unknown IDs would fail the INSERT's foreign keys and the whole batch
+        clinician_exists, known_patients = Appointment.find_references(
+            clinician_id, [proposal['patient_id'] for proposal in proposals])
+        if not clinician_exists:
+            return jsonify({'error': 'Clinician not found'}), 404
+        kept = []
+        for proposal, index in zip(proposals, positions):
+            if proposal['patient_id'] in known_patients:
+                kept.append((proposal, index))
+            else:
+                rejected.append({'index': index, 'error': 'Patient not found'})
+        proposals = [proposal for proposal, _ in kept]
+        positions = [index for _, index in kept]
+
+    created, conflicts = Appointment.schedule_batch(clinician_id, proposals)
+    rejected.extend(
+        {'index': positions[i], 'error': reason} for i, _, reason in conflicts
+    )
+    rejected.sort(key=lambda entry: entry['index'])
+
+    return jsonify({
+        'created': [appointment.to_dict() for appointment in created],
+        'rejected': rejected
+    }), 201 if created else 200
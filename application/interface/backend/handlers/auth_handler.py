@@ -7,20 +7,21 @@ from flask_jwt_extended import (
     jwt_required, get_jwt_identity, get_jwt
 )
 from functools import wraps
-from flask_bcrypt import Bcrypt
 import pyotp
 import qrcode
 import io
 import base64
 from datetime import datetime, timedelta
 from ..database import get_db
-from ..utils.validators import Validators, ValidationError, validate_request
+from ..utils.validators import Validators, ValidationError, validate_request, password_validator
 from ..utils.audit_logger import audit_logger
 from ..config import get_config
 from ..utils.encryption import FieldEncryption
+from ..utils.revocation_cache import get_revocation_cache
+from ..utils.auth_utils import get_clinician_id
+from ..utils.password_hasher import get_password_hasher, HasherBusyError, busy_response
 
 auth_bp = Blueprint('auth_bp', __name__)
-bcrypt = Bcrypt()
 config = get_config()
 field_encryption = FieldEncryption()
 
@@ -39,7 +40,7 @@ def mfa_required(f):
 @auth_bp.route('/auth/register', methods=['POST'])
 @validate_request({
     'email': {'required': True, 'validator': Validators.validate_email},
-    'password': {'required': True, 'validator': lambda p: Validators.validate_password(p, config)},
+    'password': {'required': True, 'validator': password_validator(config)},
     'full_name': {'required': True},
     'role_id': {'required': True, 'validator': Validators.validate_role_id}
 })
@@ -73,8 +74,8 @@ def register():
         if cur.fetchone():
             return jsonify({'error': 'User already exists'}), 409
         
-        # Hash password
-        password_hash = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+        # Hash password (on the hashing pool)
+        password_hash = get_password_hasher().generate_password_hash(data['password'])
         
         # Create user
         cur.execute(
@@ -154,6 +155,10 @@ def register():
             'mfa_required': True
         }), 201
     
+    except HasherBusyError as e:
+        if db:
+            db.rollback()
+        return busy_response(e)
     except Exception as e:
         if db:
             db.rollback()
@@ -223,7 +228,7 @@ def login():
         )
         password_row = cur.fetchone()
 
-        if not password_row or not bcrypt.check_password_hash(password_row[0], data['password']):
+        if not password_row or not get_password_hasher().check_password_hash(password_row[0], data['password']):
             audit_logger.log_authentication(
                 user_id=user[0],
                 email=user[1],
@@ -256,6 +261,8 @@ def login():
             'mfa_required': True
         }), 200
     
+    except HasherBusyError as e:
+        return busy_response(e)
     except Exception as e:
         audit_logger.log_security_event('LOGIN_ERROR', None, request.remote_addr, 'An unexpected error occurred during login')
         return jsonify({'error': 'An error occurred during login'}), 500
@@ -339,13 +346,17 @@ def verify_mfa():
             return jsonify({'error': 'Invalid MFA code'}), 401
         
         # Create access and refresh tokens
+        claims = {
+            'mfa_verified': True,
+            'role': user[4],
+            'email': user[1]
+        }
+        if user[4] == 'clinician':
+            # Resolved once per token instead of on every scoped request
+            claims['clinician_id'] = get_clinician_id(user[0])
         access_token = create_access_token(
             identity=str(user[0]),
-            additional_claims={
-                'mfa_verified': True,
-                'role': user[4],
-                'email': user[1]
-            },
+            additional_claims=claims,
             expires_delta=timedelta(minutes=15)
         )
         
@@ -496,13 +507,16 @@ def refresh():
             return jsonify({'error': 'User not found'}), 404
 
         # Create new access token with preserved claims
+        claims = {
+            'mfa_verified': True,
+            'role': user[1],
+            'email': user[0]
+        }
+        if user[1] == 'clinician':
+            claims['clinician_id'] = get_clinician_id(user_id)
         access_token = create_access_token(
             identity=str(user_id),
-            additional_claims={
-                'mfa_verified': True,
-                'role': user[1],
-                'email': user[0]
-            },
+            additional_claims=claims,
             expires_delta=timedelta(minutes=15)
         )
 
@@ -541,6 +555,7 @@ def logout():
             (jti, user_id, datetime.utcnow(), datetime.fromtimestamp(claims['exp']))
         )
         db.commit()
+        get_revocation_cache().add(jti)
 
         # Log logout
         audit_logger.log_authentication(
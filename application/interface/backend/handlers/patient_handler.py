@@ -1,18 +1,40 @@
-from flask import Blueprint, request, jsonify
+import json
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from flask import Blueprint, request, jsonify, Response, stream_with_context, current_app
 from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 from .auth_handler import mfa_required
 from ..models.patient import Patient
+from ..models.vital import Vital
 from ..utils.audit_logger import audit_log
-from ..database import get_db
-from ..utils.auth_utils import get_clinician_id
+from ..utils.auth_utils import get_clinician_id, is_patient_assigned
+from ..utils.validators import parse_naive_utc
 
 patient_bp = Blueprint('patient_bp', __name__)
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 1000
+DEFAULT_SERIES_DAYS = 30
+MAX_SERIES_POINTS = 5000
+
 @patient_bp.route('/patients', methods=['GET'])
 @jwt_required()
 @mfa_required
 @audit_log('VIEW', 'patient_list')
 def get_patients():
+    """
+    List patients in id order
+
+    Query params:
+        - after: id cursor; return patients with a greater id
+        - limit: page size (default: 100, max: 1000)
+        - stream: 'true' streams every patient as one JSON array instead of a page
+
+    Returns:
+        JSON array of patients. When more pages exist the X-Next-Cursor and
+        Link (rel="next") headers point at the next page.
+    """
     user_id = get_jwt_identity()
     claims = get_jwt()
     role = claims.get('role')
@@ -24,11 +46,52 @@ def get_patients():
     if role == 'clinician':
         clinician_id = get_clinician_id(user_id)
 
-    patients = Patient.get_all(clinician_id=clinician_id)
     # Administrative view (admin or clinician assigned to these patients)
     # see full data for patients they manage.
     mask = (role not in ['admin', 'clinician'])
-    return jsonify([patient.to_dict(mask=mask) for patient in patients])
+
+    if request.args.get('stream', 'false').lower() == 'true':
+        def generate():
+            patients = Patient.iter_all(clinician_id=clinician_id, batch_size=STREAM_BATCH_SIZE)
+            separator = ''
+            yield '['
+            while True:
+                batch = list(islice(patients, STREAM_BATCH_SIZE))
+                if not batch:
+                    break
+                yield separator + ','.join(json.dumps(record) for record in Patient.to_dicts(batch, mask=mask))
+                separator = ','
+            yield ']'
+        return Response(stream_with_context(generate()), mimetype='application/json')
+
+    after = request.args.get('after')
+    try:
+        after = int(after) if after is not None else None
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({'error': 'after and limit must be integers'}), 400
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    # One extra row tells whether another page exists
+    patients = Patient.get_page(clinician_id=clinician_id, after=after, limit=limit + 1)
+    has_more = len(patients) > limit
+    patients = patients[:limit]
+
+    response = jsonify(Patient.to_dicts(patients, mask=mask))
+    if has_more:
+        next_cursor = patients[-1].id
+        response.headers['X-Next-Cursor'] = str(next_cursor)
+        response.headers['Link'] = f'<{request.base_url}?after={next_cursor}&limit={limit}>; rel="next"'
+    return response
+
+def _can_view_patient(patient, role, current_user_id):
+    # Authorization and Scoping Check
+    if role == 'admin':
+        return True
+    if role == 'clinician':
+        # Check assignment link
+        return is_patient_assigned(get_clinician_id(current_user_id), patient.id)
+    return str(current_user_id) == str(patient.user_id)
 
 @patient_bp.route('/patients/<int:patient_id>', methods=['GET'])
 @jwt_required()
@@ -43,34 +106,59 @@ def get_patient(patient_id):
     if not patient:
         return jsonify({'message': 'Patient not found'}), 404
 
-    # Authorization and Scoping Check
     is_own_record = str(current_user_id) == str(patient.user_id)
-
-    if role == 'admin':
-        authorized = True
-    elif role == 'clinician':
-        clinician_id = get_clinician_id(current_user_id)
-        # Check assignment link
-        db = get_db()
-        cur = db.cursor()
-        cur.execute(
-            'SELECT 1 FROM patient_clinician WHERE patient_id = %s AND clinician_id = %s',
-            (patient.id, clinician_id)
-        )
-        authorized = cur.fetchone() is not None
-        cur.close()
-    elif is_own_record:
-        authorized = True
-    else:
-        authorized = False
-
-    if not authorized:
+    if not _can_view_patient(patient, role, current_user_id):
         return jsonify({'error': 'Unauthorized access'}), 403
 
     # Masking Logic: Patient sees own data, Clinician/Admin sees data for patients they manage
     mask = (role not in ['admin', 'clinician']) and not is_own_record
     return jsonify(patient.to_dict(mask=mask))
 
+@patient_bp.route('/patients/<int:patient_id>/vitals/series', methods=['GET'])
+@jwt_required()
+@mfa_required
+@audit_log('VIEW', 'vitals')
+def get_vitals_series(patient_id):
+    """
+    Chart series of a patient's heart rate and blood pressure
+
+    Query params:
+        - start: ISO datetime (default: end minus 30 days)
+        - end: ISO datetime (default: now, UTC); offsets are converted to UTC
+        - max_points: points per series (default: VITALS_SERIES_MAX_POINTS, max: 5000)
+
+    Returns:
+        JSON with the tier served (raw, minute, hour or day), bucket_seconds,
+        stale and heart_rate / systolic / diastolic series
+    """
+    patient = Patient.get_by_id(patient_id)
+    if not patient:
+        return jsonify({'message': 'Patient not found'}), 404
+    if not _can_view_patient(patient, get_jwt().get('role'), get_jwt_identity()):
+        return jsonify({'error': 'Unauthorized access'}), 403
+
+    try:
+        # Bounds with an offset are compared in naive UTC, like recorded_at
+        end = (parse_naive_utc(request.args['end']) if 'end' in request.args
+               else datetime.now(timezone.utc).replace(tzinfo=None))
+        start = (parse_naive_utc(request.args['start']) if 'start' in request.args
+                 else end - timedelta(days=DEFAULT_SERIES_DAYS))
+        max_points = int(request.args.get('max_points', current_app.config.get('VITALS_SERIES_MAX_POINTS', 1000)))
+    except ValueError:
+        return jsonify({'error': 'start and end must be ISO datetimes and max_points an integer'}), 400
+    if start >= end:
+        return jsonify({'error': 'start must be before end'}), 400
+    max_points = max(3, min(max_points, MAX_SERIES_POINTS))
+
+    result = Vital.get_series(patient_id, start, end, max_points)
+    result.update({
+        'patient_id': patient_id,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'max_points': max_points,
+    })
+    return jsonify(result)
+
 @patient_bp.route('/patients', methods=['POST'])
 @jwt_required()
 @mfa_required
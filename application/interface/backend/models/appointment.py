@@ -1,6 +1,35 @@
+from psycopg2.extras import execute_values
 from ..database import get_db
+from ..utils.response_cache import invalidate_analytics
+from ..utils.scheduling import CONFLICT_SLOT, conflict_window, plan_appointment_batch
+from ..utils.bulk_write import bulk_insert, bulk_upsert
+
+WINDOW_TIMES_QUERY = '''
+    SELECT appointment_time, status = 'cancelled' FROM appointments
+    WHERE clinician_id = %s
+    AND appointment_time BETWEEN %s AND %s
+'''
+
+INSERT_APPOINTMENTS = '''
+    INSERT INTO appointments (patient_id, clinician_id, appointment_time, status) VALUES %s
+    ON CONFLICT (clinician_id, appointment_time) DO NOTHING
+    RETURNING *
+'''
+
+REFERENCES_QUERY = '''
+    SELECT EXISTS (SELECT 1 FROM clinicians WHERE id = %s),
+           ARRAY(SELECT id FROM patients WHERE id = ANY(%s))
+'''
 
 class Appointment:
+    # Columns accepted by bulk_create / bulk_upsert, and the checks run on every row
+    BULK_COLUMNS = ('patient_id', 'clinician_id', 'appointment_time', 'status')
+    BULK_SCHEMA = {
+        'patient_id': {'required': True},
+        'clinician_id': {'required': True},
+        'appointment_time': {'required': True},
+    }
+
     def __init__(self, id, patient_id, clinician_id, appointment_time, status):
         self.id = id
         self.patient_id = patient_id
@@ -37,4 +66,130 @@ class Appointment:
         appointment = cur.fetchone()
         db.commit()
         cur.close()
+        invalidate_analytics(clinician_id)
         return Appointment(*appointment)
+
+    @staticmethod
+    def bulk_create(rows, batch_size=None):
+        """
+        Insert many appointments, one multi-row INSERT and transaction per batch
+
+        For imports: unlike schedule_batch, rows are not checked for
+        overlapping appointments (BR8).
+
+        Args:
+            rows: Iterable of dictionaries keyed by BULK_COLUMNS
+            batch_size: Rows per batch (default: BULK_WRITE_BATCH_SIZE)
+
+        Returns:
+            List of new appointment IDs in row order
+        """
+        ids = bulk_insert('appointments', Appointment.BULK_COLUMNS, rows, 'appointment',
+                          Appointment.BULK_SCHEMA, batch_size=batch_size)
+        if ids:
+            invalidate_analytics()
+        return ids
+
+    @staticmethod
+    def bulk_upsert(rows, batch_size=None):
+        """
+        Insert many appointments, updating the ones already booked for the
+        same clinician_id and appointment_time
+
+        Args:
+            rows: Iterable of dictionaries keyed by BULK_COLUMNS
+            batch_size: Rows per batch (default: BULK_WRITE_BATCH_SIZE)
+
+        Returns:
+            List of inserted or updated appointment IDs
+        """
+        ids = bulk_upsert('appointments', Appointment.BULK_COLUMNS, rows, 'appointment',
+                          ('clinician_id', 'appointment_time'), Appointment.BULK_SCHEMA, batch_size=batch_size)
+        if ids:
+            invalidate_analytics()
+        return ids
+
+    @staticmethod
+    def schedule_batch(clinician_id, proposals):
+        """
+        Create a batch of appointments for one clinician, skipping conflicts
+
+        The clinician's appointments around the batch are loaded once and
+        every proposal is checked in memory (BR8), including against earlier
+        proposals of the same batch; cancelled appointments block only their
+        exact time, which the unique (clinician_id, appointment_time)
+        constraint still holds. Accepted appointments are inserted with one
+        multi-row INSERT ... ON CONFLICT DO NOTHING, and a slot taken by a
+        write outside this lock is reported as rejected instead of failing the
+        batch. A transaction-scoped advisory lock serializes concurrent
+        batches for the same clinician.
+
+        Args:
+            clinician_id: ID of the clinician
+            proposals: List of dictionaries with patient_id, appointment_time
+                (datetime) and optional status (default: 'scheduled')
+
+        Returns:
+            Tuple of (created Appointments, rejected (index, proposal, reason)
+            tuples)
+        """
+        if not proposals:
+            return [], []
+        db = get_db()
+        cur = db.cursor()
+        try:
+            cur.execute("SELECT pg_advisory_xact_lock(hashtext('appointments'), %s)", (clinician_id,))
+            start, end = conflict_window(proposals)
+            cur.execute(WINDOW_TIMES_QUERY, (clinician_id, start, end))
+            existing, taken = [], []
+            for appointment_time, cancelled in cur.fetchall():
+                (taken if cancelled else existing).append(appointment_time)
+            accepted, rejected = plan_appointment_batch(existing, proposals, taken_times=taken)
+
+            created = []
+            if accepted:
+                rows = [
+                    (p['patient_id'], clinician_id, p['appointment_time'], p.get('status', 'scheduled'))
+                    for p in accepted
+                ]
+                created = [
+                    Appointment(*row)
+                    for row in execute_values(cur, INSERT_APPOINTMENTS, rows, page_size=len(rows), fetch=True)
+                ]
+                # Accepted proposals have distinct times, so a missing time is a skipped row
+                inserted = {appointment.appointment_time for appointment in created}
+                index = {id(proposal): i for i, proposal in enumerate(proposals)}
+                rejected.extend(
+                    (index[id(p)], p, CONFLICT_SLOT) for p in accepted if p['appointment_time'] not in inserted
+                )
+                rejected.sort(key=lambda entry: entry[0])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cur.close()
+        if created:
+            invalidate_analytics(clinician_id)
+        return created, rejected
+
+    @staticmethod
+    def find_references(clinician_id, patient_ids):
+        """
+        Check that a clinician and patients exist, in one round trip
+
+        Args:
+            clinician_id: ID of the clinician
+            patient_ids: Iterable of patient IDs
+
+        Returns:
+            Tuple of (clinician exists, frozenset of the patient IDs that exist)
+        """
+        db = get_db()
+        cur = db.cursor()
+        try:
+            cur.execute(REFERENCES_QUERY, (clinician_id, list(set(patient_ids))))
+            clinician_exists, found = cur.fetchone()
+        finally:
+            cur.close()
+        return bool(clinician_exists), frozenset(found or ())
@@ -1,6 +1,15 @@
 from ..database import get_db
+from ..utils.bulk_write import bulk_insert, bulk_upsert
 
 class Message:
+    # Columns accepted by bulk_create / bulk_upsert, and the checks run on every row
+    BULK_COLUMNS = ('sender_id', 'receiver_id', 'message', 'sent_at')
+    BULK_SCHEMA = {
+        'sender_id': {'required': True},
+        'receiver_id': {'required': True},
+        'message': {'required': True},
+    }
+
     def __init__(self, id, sender_id, receiver_id, message, sent_at):
         self.id = id
         self.sender_id = sender_id
@@ -38,3 +47,33 @@ class Message:
         db.commit()
         cur.close()
         return Message(*message)
+
+    @staticmethod
+    def bulk_create(rows, batch_size=None):
+        """
+        Insert many messages, one multi-row INSERT and transaction per batch
+
+        Args:
+            rows: Iterable of dictionaries keyed by BULK_COLUMNS
+            batch_size: Rows per batch (default: BULK_WRITE_BATCH_SIZE)
+
+        Returns:
+            List of new message IDs in row order
+        """
+        return bulk_insert('messages', Message.BULK_COLUMNS, rows, 'message',
+                           Message.BULK_SCHEMA, batch_size=batch_size)
+
+    @staticmethod
+    def bulk_upsert(rows, batch_size=None):
+        """
+        Insert many messages, updating existing ones matched by id
+
+        Args:
+            rows: Iterable of dictionaries keyed by id and BULK_COLUMNS
+            batch_size: Rows per batch (default: BULK_WRITE_BATCH_SIZE)
+
+        Returns:
+            List of inserted or updated message IDs
+        """
+        return bulk_upsert('messages', Message.BULK_COLUMNS, rows, 'message',
+                           ('id',), Message.BULK_SCHEMA, batch_size=batch_size)
@@ -1,6 +1,29 @@
 from ..database import get_db
+from ..utils.response_cache import invalidate_analytics
+from ..utils.encryption import DataMasking
+from ..utils.phi_codec import compile_mask_rules, mask_records
+from ..utils.bulk_write import bulk_insert, bulk_upsert
+from ..utils.validators import Validators
 
 class Patient:
+    # Explicit projection in constructor order, for the listing/export paths
+    COLUMNS = ('id', 'user_id', 'date_of_birth', 'gender', 'created_at', 'ethnicity',
+               'address_line_1', 'address_line_2', 'state', 'zip', 'city')
+
+    # Demographic fields masked in addition to what DataMasking.is_phi_field flags
+    MASK_RULES = compile_mask_rules(COLUMNS, overrides={
+        field: DataMasking.mask_generic for field in ('gender', 'ethnicity', 'state', 'zip', 'city')
+    })
+
+    # Columns accepted by bulk_create / bulk_upsert, and the checks run on every row
+    BULK_COLUMNS = ('user_id', 'date_of_birth', 'gender', 'ethnicity', 'address_line_1', 'address_line_2',
+                    'state', 'zip', 'city')
+    BULK_SCHEMA = {
+        'user_id': {'required': True},
+        'date_of_birth': {'validator': Validators.validate_date_of_birth},
+        'gender': {'validator': Validators.validate_gender},
+    }
+
     def __init__(self, id, user_id, date_of_birth, gender, created_at, ethnicity, address_line_1, address_line_2, state, zip, city):
         self.id = id
         self.user_id = user_id
@@ -15,8 +38,6 @@ class Patient:
         self.city = city
 
     def to_dict(self, mask=False):
-        from ..utils.encryption import DataMasking
-
         data = {
             "id": self.id,
             "user_id": self.user_id,
@@ -32,17 +53,27 @@ class Patient:
         }
 
         if mask:
-            data['date_of_birth'] = DataMasking.mask_dob(data['date_of_birth'])
-            data['gender'] = DataMasking.mask_generic(data['gender'])
-            data['ethnicity'] = DataMasking.mask_generic(data['ethnicity'])
-            data['address_line_1'] = DataMasking.mask_address(data['address_line_1'])
-            data['address_line_2'] = DataMasking.mask_address(data['address_line_2'])
-            data['state'] = DataMasking.mask_generic(data['state'])
-            data['zip'] = DataMasking.mask_generic(data['zip'])
-            data['city'] = DataMasking.mask_generic(data['city'])
+            mask_records([data], Patient.MASK_RULES)
 
         return data
 
+    @staticmethod
+    def to_dicts(patients, mask=False):
+        """
+        Serialize many patients, masking column by column
+
+        Args:
+            patients: Iterable of Patient objects
+            mask: Apply PHI masking
+
+        Returns:
+            List of dictionaries in the to_dict shape
+        """
+        records = [patient.to_dict() for patient in patients]
+        if mask:
+            mask_records(records, Patient.MASK_RULES)
+        return records
+
     @staticmethod
     def get_all(clinician_id=None):
         db = get_db()
@@ -59,6 +90,71 @@ class Patient:
         cur.close()
         return [Patient(*patient) for patient in patients]
 
+    @staticmethod
+    def _scoped_select(clinician_id, after):
+        columns = ', '.join(f'p.{column}' for column in Patient.COLUMNS)
+        query = f'SELECT {columns} FROM patients p'
+        conditions = []
+        params = []
+        if clinician_id:
+            query += ' JOIN patient_clinician pc ON pc.patient_id = p.id'
+            conditions.append('pc.clinician_id = %s')
+            params.append(clinician_id)
+        if after is not None:
+            conditions.append('p.id > %s')
+            params.append(after)
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        return query + ' ORDER BY p.id', params
+
+    @staticmethod
+    def get_page(clinician_id=None, after=None, limit=100):
+        """
+        Keyset-paginated patient listing ordered by id
+
+        Args:
+            clinician_id: Restrict to patients assigned to this clinician
+            after: Return patients with id greater than this cursor
+            limit: Maximum number of patients returned
+
+        Returns:
+            List of Patient objects
+        """
+        query, params = Patient._scoped_select(clinician_id, after)
+        db = get_db()
+        cur = db.cursor()
+        cur.execute(query + ' LIMIT %s;', (*params, limit))
+        patients = cur.fetchall()
+        cur.close()
+        return [Patient(*patient) for patient in patients]
+
+    @staticmethod
+    def iter_all(clinician_id=None, batch_size=1000):
+        """
+        Stream every patient through a server-side (named) cursor
+
+        Only batch_size rows are held in memory at a time. The cursor lives in
+        the request's transaction, so the generator must be consumed within
+        the request (stream_with_context).
+
+        Args:
+            clinician_id: Restrict to patients assigned to this clinician
+            batch_size: Rows fetched per round trip
+
+        Yields:
+            Patient objects in id order
+        """
+        query, params = Patient._scoped_select(clinician_id, None)
+        db = get_db()
+        cur = db.cursor(name='patient_export')
+        cur.itersize = batch_size
+        try:
+            cur.execute(query + ';', params)
+            for patient in cur:
+                yield Patient(*patient)
+        finally:
+            cur.close()
+
     @staticmethod
     def get_by_id(patient_id):
         db = get_db()
@@ -79,8 +175,44 @@ class Patient:
         patient = cur.fetchone()
         db.commit()
         cur.close()
+        invalidate_analytics()
         return Patient(*patient)
 
+    @staticmethod
+    def bulk_create(rows, batch_size=None):
+        """
+        Insert many patients, one multi-row INSERT and transaction per batch
+
+        Args:
+            rows: Iterable of dictionaries keyed by BULK_COLUMNS
+            batch_size: Rows per batch (default: BULK_WRITE_BATCH_SIZE)
+
+        Returns:
+            List of new patient IDs in row order
+        """
+        ids = bulk_insert('patients', Patient.BULK_COLUMNS, rows, 'patient', Patient.BULK_SCHEMA, batch_size=batch_size)
+        if ids:
+            invalidate_analytics()
+        return ids
+
+    @staticmethod
+    def bulk_upsert(rows, batch_size=None):
+        """
+        Insert many patients, updating existing ones matched by id
+
+        Args:
+            rows: Iterable of dictionaries keyed by id and BULK_COLUMNS
+            batch_size: Rows per batch (default: BULK_WRITE_BATCH_SIZE)
+
+        Returns:
+            List of inserted or updated patient IDs
+        """
+        ids = bulk_upsert('patients', Patient.BULK_COLUMNS, rows, 'patient',
+                          ('id',), Patient.BULK_SCHEMA, batch_size=batch_size)
+        if ids:
+            invalidate_analytics()
+        return ids
+
     def update(self):
         db = get_db()
         cur = db.cursor()
@@ -90,6 +222,7 @@ class Patient:
         )
         db.commit()
         cur.close()
+        invalidate_analytics()
 
     def delete(self):
         db = get_db()
@@ -97,3 +230,4 @@ class Patient:
         cur.execute('DELETE FROM patients WHERE id = %s;', (self.id,))
         db.commit()
         cur.close()
+        invalidate_analytics()
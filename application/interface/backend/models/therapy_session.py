@@ -1,6 +1,16 @@
 from ..database import get_db
+from ..utils.response_cache import invalidate_analytics
+from ..utils.bulk_write import bulk_insert, bulk_upsert
+from ..utils.validators import Validators
 
 class TherapySession:
+    # Columns accepted by bulk_create / bulk_upsert, and the checks run on every row
+    BULK_COLUMNS = ('appointment_id', 'clinic_id', 'notes', 'duration_minutes')
+    BULK_SCHEMA = {
+        'appointment_id': {'required': True},
+        'duration_minutes': {'validator': Validators.validate_duration},
+    }
+
     def __init__(self, id, appointment_id, clinic_id, notes, duration_minutes):
         self.id = id
         self.appointment_id = appointment_id
@@ -37,4 +47,41 @@ class TherapySession:
         session = cur.fetchone()
         db.commit()
         cur.close()
+        invalidate_analytics()
         return TherapySession(*session)
+
+    @staticmethod
+    def bulk_create(rows, batch_size=None):
+        """
+        Insert many therapy sessions, one multi-row INSERT and transaction per batch
+
+        Args:
+            rows: Iterable of dictionaries keyed by BULK_COLUMNS
+            batch_size: Rows per batch (default: BULK_WRITE_BATCH_SIZE)
+
+        Returns:
+            List of new therapy session IDs in row order
+        """
+        ids = bulk_insert('therapy_sessions', TherapySession.BULK_COLUMNS, rows, 'therapy_session',
+                          TherapySession.BULK_SCHEMA, batch_size=batch_size)
+        if ids:
+            invalidate_analytics()
+        return ids
+
+    @staticmethod
+    def bulk_upsert(rows, batch_size=None):
+        """
+        Insert many therapy sessions, updating existing ones matched by id
+
+        Args:
+            rows: Iterable of dictionaries keyed by id and BULK_COLUMNS
+            batch_size: Rows per batch (default: BULK_WRITE_BATCH_SIZE)
+
+        Returns:
+            List of inserted or updated therapy session IDs
+        """
+        ids = bulk_upsert('therapy_sessions', TherapySession.BULK_COLUMNS, rows, 'therapy_session',
+                          ('id',), TherapySession.BULK_SCHEMA, batch_size=batch_size)
+        if ids:
+            invalidate_analytics()
+        return ids
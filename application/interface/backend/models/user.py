@@ -1,6 +1,16 @@
 from ..database import get_db
+from ..utils.bulk_write import bulk_insert, bulk_upsert
+from ..utils.validators import Validators
 
 class User:
+    # Columns accepted by bulk_create / bulk_upsert, and the checks run on every row
+    BULK_COLUMNS = ('email', 'full_name', 'role_id', 'manager_id')
+    BULK_SCHEMA = {
+        'email': {'required': True, 'validator': Validators.validate_email},
+        'full_name': {'required': True},
+        'role_id': {'required': True, 'validator': Validators.validate_role_id},
+    }
+
     def __init__(self, id, email, full_name, role_id, manager_id, created_at):
         self.id = id
         self.email = email
@@ -50,6 +60,35 @@ class User:
         cur.close()
         return User(*user)
 
+    @staticmethod
+    def bulk_create(rows, batch_size=None):
+        """
+        Insert many users, one multi-row INSERT and transaction per batch
+
+        Args:
+            rows: Iterable of dictionaries keyed by BULK_COLUMNS
+            batch_size: Rows per batch (default: BULK_WRITE_BATCH_SIZE)
+
+        Returns:
+            List of new user IDs in row order
+        """
+        return bulk_insert('users', User.BULK_COLUMNS, rows, 'user', User.BULK_SCHEMA, batch_size=batch_size)
+
+    @staticmethod
+    def bulk_upsert(rows, batch_size=None):
+        """
+        Insert many users, updating existing ones matched by email
+
+        Args:
+            rows: Iterable of dictionaries keyed by BULK_COLUMNS
+            batch_size: Rows per batch (default: BULK_WRITE_BATCH_SIZE)
+
+        Returns:
+            List of inserted or updated user IDs
+        """
+        return bulk_upsert('users', User.BULK_COLUMNS, rows, 'user',
+                           ('email',), User.BULK_SCHEMA, batch_size=batch_size)
+
     def update(self):
         db = get_db()
         cur = db.cursor()
@@ -1,6 +1,18 @@
 from ..database import get_db
+from ..utils.bulk_write import bulk_insert, bulk_upsert
+from ..utils.validators import Validators
+from ..utils.vitals_timeseries import fetch_vitals_series
 
 class Vital:
+    # Columns accepted by bulk_create / bulk_upsert, and the checks run on every row
+    BULK_COLUMNS = ('patient_id', 'heart_rate', 'blood_pressure', 'recorded_at')
+    BULK_SCHEMA = {
+        'patient_id': {'required': True},
+        'heart_rate': {'validator': Validators.validate_heart_rate},
+        'blood_pressure': {'validator': Validators.validate_blood_pressure},
+        'recorded_at': {'required': True},
+    }
+
     def __init__(self, id, patient_id, heart_rate, blood_pressure, recorded_at):
         self.id = id
         self.patient_id = patient_id
@@ -26,6 +38,31 @@ class Vital:
         cur.close()
         return [Vital(*vital) for vital in vitals]
 
+    @staticmethod
+    def get_series(patient_id, start, end, max_points):
+        """
+        Chart series of a patient's vitals, downsampled to max_points
+
+        Args:
+            patient_id: ID of the patient
+            start: Range start (datetime, inclusive)
+            end: Range end (datetime, exclusive)
+            max_points: Maximum points per series
+
+        Returns:
+            Dictionary from fetch_vitals_series with ISO formatted times
+        """
+        db = get_db()
+        cur = db.cursor()
+        try:
+            result = fetch_vitals_series(cur, patient_id, start, end, max_points)
+        finally:
+            cur.close()
+        for points in result['series'].values():
+            for point in points:
+                point[0] = point[0].isoformat()
+        return result
+
     @staticmethod
     def create(patient_id, heart_rate, blood_pressure, recorded_at):
         db = get_db()
@@ -38,3 +75,35 @@ class Vital:
         db.commit()
         cur.close()
         return Vital(*vital)
+
+    @staticmethod
+    def bulk_create(rows, batch_size=None):
+        """
+        Insert many vitals, one multi-row INSERT and transaction per batch
+
+        Args:
+            rows: Iterable of dictionaries keyed by BULK_COLUMNS
+            batch_size: Rows per batch (default: BULK_WRITE_BATCH_SIZE)
+
+        Returns:
+            List of new vital IDs in row order
+        """
+        return bulk_insert('vitals', Vital.BULK_COLUMNS, rows, 'vital', Vital.BULK_SCHEMA, batch_size=batch_size)
+
+    @staticmethod
+    def bulk_upsert(rows, batch_size=None):
+        """
+        Insert many vitals, updating existing ones matched by id and recorded_at
+
+        vitals is partitioned by recorded_at, so its key includes it; a
+        reading cannot be moved to another time by upsert.
+
+        Args:
+            rows: Iterable of dictionaries keyed by id and BULK_COLUMNS
+            batch_size: Rows per batch (default: BULK_WRITE_BATCH_SIZE)
+
+        Returns:
+            List of inserted or updated vital IDs
+        """
+        return bulk_upsert('vitals', Vital.BULK_COLUMNS, rows, 'vital',
+                           ('id', 'recorded_at'), Vital.BULK_SCHEMA, batch_size=batch_size)
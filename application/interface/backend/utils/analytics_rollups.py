@@ -0,0 +1,330 @@
+"""
+Daily analytics rollups
+Maintains the pre-aggregated tables from scripts/postgresql/analytics_rollups.sql
+and reports how current they are
+"""
+import click
+from datetime import date, datetime, timedelta
+from flask.cli import AppGroup
+from ..database import get_db
+
+# Days are recomputed in whole: delete the day's rows, then re-aggregate the
+# source rows falling inside [day, day + 1). Joining against unnest() keeps
+# the source scans on the timestamp indexes.
+DELETE_DAYS_QUERIES = [
+    'DELETE FROM analytics_daily_clinician_rollup WHERE day = ANY(%(days)s::date[])',
+    'DELETE FROM analytics_daily_patient_rollup WHERE day = ANY(%(days)s::date[])',
+    'DELETE FROM analytics_daily_assessment_rollup WHERE day = ANY(%(days)s::date[])',
+]
+
+INSERT_CLINICIAN_ROLLUP = """
+    INSERT INTO analytics_daily_clinician_rollup
+        (day, clinician_id, status, appointments, sessions, session_minutes, sessions_with_duration)
+    SELECT
+        d.day,
+        a.clinician_id,
+        a.status,
+        COUNT(DISTINCT a.id),
+        COUNT(ts.id),
+        COALESCE(SUM(ts.duration_minutes), 0),
+        COUNT(ts.duration_minutes)
+    FROM unnest(%(days)s::date[]) AS d(day)
+    JOIN appointments a ON a.appointment_time >= d.day AND a.appointment_time < d.day + 1
+    LEFT JOIN therapy_sessions ts ON ts.appointment_id = a.id
+    GROUP BY d.day, a.clinician_id, a.status
+"""
+
+INSERT_PATIENT_ROLLUP = """
+    INSERT INTO analytics_daily_patient_rollup (day, patient_id, appointments, sessions, assessments)
+    SELECT day, patient_id, SUM(appointments), SUM(sessions), SUM(assessments)
+    FROM (
+        SELECT d.day, a.patient_id, COUNT(DISTINCT a.id) AS appointments, COUNT(ts.id) AS sessions, 0 AS assessments
+        FROM unnest(%(days)s::date[]) AS d(day)
+        JOIN appointments a ON a.appointment_time >= d.day AND a.appointment_time < d.day + 1
+        LEFT JOIN therapy_sessions ts ON ts.appointment_id = a.id
+        GROUP BY d.day, a.patient_id
+        UNION ALL
+        SELECT d.day, p.patient_id, 0, 0, COUNT(*)
+        FROM unnest(%(days)s::date[]) AS d(day)
+        JOIN psyconnect p ON p.assessed_at >= d.day AND p.assessed_at < d.day + 1
+        GROUP BY d.day, p.patient_id
+    ) per_source
+    GROUP BY day, patient_id
+"""
+
+INSERT_ASSESSMENT_ROLLUP = """
+    INSERT INTO analytics_daily_assessment_rollup (day, patient_id, assessment_type, assessments)
+    SELECT d.day, p.patient_id, p.assessment_type, COUNT(*)
+    FROM unnest(%(days)s::date[]) AS d(day)
+    JOIN psyconnect p ON p.assessed_at >= d.day AND p.assessed_at < d.day + 1
+    GROUP BY d.day, p.patient_id, p.assessment_type
+"""
+
+
+def recompute_days(cur, days):
+    """
+    Rebuild every rollup row for the given calendar days
+
+    Args:
+        cur: Database cursor (caller owns the transaction)
+        days: Iterable of datetime.date
+    """
+    params = {'days': list(days)}
+    if not params['days']:
+        return
+    for query in DELETE_DAYS_QUERIES:
+        cur.execute(query, params)
+    cur.execute(INSERT_CLINICIAN_ROLLUP, params)
+    cur.execute(INSERT_PATIENT_ROLLUP, params)
+    cur.execute(INSERT_ASSESSMENT_ROLLUP, params)
+
+
+def refresh_rollups(db, max_days=366):
+    """
+    Recompute the days marked dirty by the source-table triggers
+
+    Claiming the dirty days and rewriting their rollups happen in one
+    transaction, so a write that lands mid-refresh re-marks its day for the
+    next run instead of being lost.
+
+    Args:
+        db: Database connection
+        max_days: Upper bound on days processed per call
+
+    Returns:
+        Number of days recomputed
+    """
+    cur = db.cursor()
+    try:
+        cur.execute(
+            """
+            DELETE FROM analytics_rollup_dirty_days
+            WHERE day IN (
+                SELECT day FROM analytics_rollup_dirty_days
+                ORDER BY day
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING day
+            """,
+            (max_days,)
+        )
+        days = [row[0] for row in cur.fetchall()]
+        recompute_days(cur, days)
+        cur.execute('UPDATE analytics_rollup_state SET refreshed_at = %s', (datetime.now(),))
+        db.commit()
+        return len(days)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def backfill_rollups(db, start_day, end_day, chunk_days=31):
+    """
+    Rebuild rollups for a historical date range
+
+    Each chunk commits separately so a long backfill does not hold one
+    transaction open over the whole history.
+
+    Args:
+        db: Database connection
+        start_day: First day (inclusive)
+        end_day: Last day (inclusive)
+        chunk_days: Days recomputed per transaction
+
+    Returns:
+        Number of days recomputed
+    """
+    total = (end_day - start_day).days + 1
+    cur = db.cursor()
+    try:
+        for offset in range(0, total, chunk_days):
+            days = [start_day + timedelta(days=i) for i in range(offset, min(offset + chunk_days, total))]
+            recompute_days(cur, days)
+            cur.execute(
+                """
+                UPDATE analytics_rollup_state SET
+                    backfilled_from = LEAST(COALESCE(backfilled_from, %(start)s), %(start)s),
+                    backfilled_to = GREATEST(COALESCE(backfilled_to, %(end)s), %(end)s),
+                    refreshed_at = COALESCE(refreshed_at, %(now)s)
+                """,
+                {'start': days[0], 'end': days[-1], 'now': datetime.now()}
+            )
+            db.commit()
+        return max(total, 0)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def rollup_status(cur, start_day, end_day):
+    """
+    Staleness indicator for responses served from rollups
+
+    Args:
+        cur: Database cursor
+        start_day: First day covered by the response
+        end_day: Last day covered by the response
+
+    Returns:
+        Dictionary with refreshed_at, pending_days and stale flag
+    """
+    cur.execute(
+        """
+        SELECT
+            s.refreshed_at,
+            s.backfilled_from,
+            (SELECT COUNT(*) FROM analytics_rollup_dirty_days
+             WHERE day BETWEEN %(start)s AND %(end)s)
+        FROM analytics_rollup_state s
+        """,
+        {'start': start_day, 'end': end_day}
+    )
+    row = cur.fetchone()
+    if not row:
+        return {'refreshed_at': None, 'pending_days': None, 'stale': True}
+
+    refreshed_at, backfilled_from, pending_days = row
+    not_backfilled = backfilled_from is None or backfilled_from > start_day
+    return {
+        'refreshed_at': refreshed_at.isoformat() if refreshed_at else None,
+        'pending_days': pending_days,
+        'stale': refreshed_at is None or pending_days > 0 or not_backfilled
+    }
+
+
+# Readers. Clinician scoping follows utils/dashboard_metrics.py: %(scoped)s
+# restricts rows to %(clinician_id)s (or its assigned patients) instead of
+# branching into separate admin and clinician queries.
+APPOINTMENT_TREND_QUERY = """
+    SELECT
+        DATE_TRUNC(%(unit)s, day::timestamp) AS period,
+        SUM(appointments)::integer AS count,
+        status
+    FROM analytics_daily_clinician_rollup
+    WHERE day BETWEEN %(start_day)s AND %(end_day)s
+    AND (NOT %(scoped)s OR clinician_id = %(clinician_id)s)
+    GROUP BY period, status
+    ORDER BY period
+"""
+
+ASSESSMENT_TREND_QUERY = """
+    SELECT
+        DATE_TRUNC(%(unit)s, day::timestamp) AS period,
+        SUM(assessments)::integer AS count,
+        assessment_type
+    FROM analytics_daily_assessment_rollup
+    WHERE day BETWEEN %(start_day)s AND %(end_day)s
+    AND (NOT %(scoped)s OR patient_id IN (
+        SELECT patient_id FROM patient_clinician WHERE clinician_id = %(clinician_id)s))
+    GROUP BY period, assessment_type
+    ORDER BY period
+"""
+
+PATIENT_SUMMARY_QUERY = """
+    SELECT
+        p.id,
+        u.full_name,
+        p.date_of_birth,
+        p.gender,
+        COALESCE(r.appointments, 0) AS appointment_count,
+        COALESCE(r.sessions, 0) AS session_count,
+        COALESCE(r.assessments, 0) AS assessment_count
+    FROM patients p
+    JOIN users u ON u.id = p.user_id
+    LEFT JOIN (
+        SELECT
+            patient_id,
+            SUM(appointments)::integer AS appointments,
+            SUM(sessions)::integer AS sessions,
+            SUM(assessments)::integer AS assessments
+        FROM analytics_daily_patient_rollup
+        WHERE day BETWEEN %(start_day)s AND %(end_day)s
+        GROUP BY patient_id
+    ) r ON r.patient_id = p.id
+    WHERE NOT %(scoped)s OR p.id IN (
+        SELECT patient_id FROM patient_clinician WHERE clinician_id = %(clinician_id)s)
+    ORDER BY appointment_count DESC
+"""
+
+CLINICIAN_WORKLOAD_QUERY = """
+    SELECT
+        c.id,
+        u.full_name,
+        c.specialty,
+        (SELECT COUNT(DISTINCT pc.patient_id) FROM patient_clinician pc WHERE pc.clinician_id = c.id) AS patient_count,
+        COALESCE(r.appointments, 0) AS appointment_count,
+        COALESCE(r.sessions, 0) AS session_count,
+        r.session_minutes::numeric / NULLIF(r.sessions_with_duration, 0) AS avg_session_duration
+    FROM clinicians c
+    JOIN users u ON u.id = c.user_id
+    LEFT JOIN (
+        SELECT
+            clinician_id,
+            SUM(appointments)::integer AS appointments,
+            SUM(sessions)::integer AS sessions,
+            SUM(session_minutes) AS session_minutes,
+            SUM(sessions_with_duration) AS sessions_with_duration
+        FROM analytics_daily_clinician_rollup
+        WHERE day BETWEEN %(start_day)s AND %(end_day)s
+        GROUP BY clinician_id
+    ) r ON r.clinician_id = c.id
+    WHERE c.active = true
+    AND (NOT %(scoped)s OR c.id = %(clinician_id)s)
+    ORDER BY appointment_count DESC
+"""
+
+
+def fetch_rollup_rows(cur, query, start_day, end_day, clinician_id=None, scoped=False, unit='day'):
+    """
+    Run one of the rollup reader queries
+
+    Args:
+        cur: Database cursor
+        query: One of the *_QUERY reader constants
+        start_day: First day (inclusive)
+        end_day: Last day (inclusive)
+        clinician_id: Clinician ID used when scoped
+        scoped: Restrict rows to the clinician and its assigned patients
+        unit: DATE_TRUNC unit for trend queries ('day', 'week', 'month')
+
+    Returns:
+        List of result rows
+    """
+    cur.execute(query, {
+        'start_day': start_day,
+        'end_day': end_day,
+        'clinician_id': clinician_id,
+        'scoped': scoped,
+        'unit': unit,
+    })
+    return cur.fetchall()
+
+
+rollups_cli = AppGroup('rollups', help='Maintain the analytics daily rollup tables.')
+
+
+@rollups_cli.command('refresh')
+@click.option('--max-days', default=366, show_default=True, help='Maximum dirty days to recompute.')
+def refresh_command(max_days):
+    """Recompute days marked dirty since the last refresh."""
+    count = refresh_rollups(get_db(), max_days=max_days)
+    click.echo(f'Recomputed {count} day(s).')
+
+
+@rollups_cli.command('backfill')
+@click.option('--start', 'start_str', required=True, help='First day, YYYY-MM-DD.')
+@click.option('--end', 'end_str', default=None, help='Last day, YYYY-MM-DD (default: today).')
+@click.option('--chunk-days', default=31, show_default=True, help='Days per transaction.')
+def backfill_command(start_str, end_str, chunk_days):
+    """Rebuild rollups for a historical date range."""
+    start_day = date.fromisoformat(start_str)
+    end_day = date.fromisoformat(end_str) if end_str else date.today()
+    if start_day > end_day:
+        raise click.BadParameter('start must not be after end')
+    count = backfill_rollups(get_db(), start_day, end_day, chunk_days=chunk_days)
+    click.echo(f'Backfilled {count} day(s) from {start_day} to {end_day}.')
@@ -28,6 +28,18 @@ class AuditLogger:
         handler.setFormatter(formatter)
         
         self.logger.addHandler(handler)
+        
+        # Background access_log writer (see audit_writer.py); None writes inline
+        self.writer = None
+    
+    def attach_writer(self, writer):
+        """
+        Route access_log inserts through a background writer
+        
+        Args:
+            writer: AuditWriter instance, or None to write synchronously
+        """
+        self.writer = writer
     
     def log_access(self, user_id, action, resource_type, resource_id, ip_address, user_agent, status='success', details=None):
         """
@@ -58,6 +70,11 @@ class AuditLogger:
         self.logger.info(f"AUDIT: {log_entry}")
         
         # Also write to database access_log table
+        action_name = f"{action}_{resource_type}_{resource_id}"
+        if self.writer is not None:
+            self.writer.enqueue(user_id, action_name, ip_address, user_agent, datetime.now(UTC))
+            return
+        
         try:
             db = get_db()
             cur = db.cursor()
@@ -66,13 +83,36 @@ class AuditLogger:
                 INSERT INTO access_log (user_id, action, ip_address, user_agent, accessed_at)
                 VALUES (%s, %s, %s, %s, %s)
                 """,
-                (user_id, f"{action}_{resource_type}_{resource_id}", ip_address, user_agent, datetime.now(UTC))
+                (user_id, action_name, ip_address, user_agent, datetime.now(UTC))
             )
             db.commit()
             cur.close()
         except Exception as e:
             self.logger.error(f"Failed to write audit log to database: {e}")
     
+    def log_bulk_write(self, user_id, action, resource_type, record_ids, ip_address, user_agent=None):
+        """
+        Log one batch of a bulk write as a single audit event
+        
+        Args:
+            user_id: ID of user performing the write (None for scripts)
+            action: Action performed (BULK_CREATE, BULK_UPSERT)
+            resource_type: Type of resource written
+            record_ids: IDs of the rows written in the batch
+            ip_address: IP address of request
+            user_agent: User agent string
+        """
+        resource_id = f"{min(record_ids)}-{max(record_ids)}" if record_ids else 'none'
+        self.log_access(
+            user_id=user_id,
+            action=action,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            ip_address=ip_address,
+            user_agent=user_agent or 'unknown',
+            details={'record_count': len(record_ids)}
+        )
+    
     def log_authentication(self, user_id, email, action, ip_address, status='success', details=None):
         """
         Log authentication events
@@ -0,0 +1,334 @@
+"""
+Asynchronous audit log writer
+Moves access_log inserts off the request path: rows are queued in memory and
+written by a background thread in multi-row batches. Batches that cannot be
+written are appended to a local spool file and replayed once the database is
+reachable again, so no audit record is lost. Spool lines that cannot be
+replayed are set aside in a quarantine file for manual inspection. The spool
+is shared by every worker process, so all access to it holds an flock on a
+sidecar lock file.
+"""
+import atexit
+import fcntl
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from psycopg2.extras import execute_values
+
+INSERT_ACCESS_LOG = 'INSERT INTO access_log (user_id, action, ip_address, user_agent, accessed_at) VALUES %s'
+
+_STOP = object()
+
+
+class AuditWriter:
+    """
+    Bounded queue plus a single writer thread flushing access_log batches
+
+    A batch is flushed when batch_size rows are waiting or flush_interval
+    seconds have passed since its first row. When the queue is full the row
+    is spooled to disk synchronously instead of being dropped.
+    """
+
+    def __init__(self, pool, spool_path='logs/audit_spool.jsonl', max_queue=10000,
+                 batch_size=500, flush_interval=1.0, max_replay_attempts=3):
+        """
+        Initialize the writer
+
+        Args:
+            pool: Connection pool with getconn/putconn (database.ConnectionPool)
+            spool_path: JSON-lines file holding rows not yet written to the database
+            max_queue: Rows buffered in memory before new rows go to the spool
+            batch_size: Maximum rows per INSERT
+            flush_interval: Maximum seconds a queued row waits for its batch
+            max_replay_attempts: Consecutive failed replays of a spool chunk
+                before it is moved to the quarantine file (spool_path + '.bad')
+        """
+        self.pool = pool
+        self.spool_path = spool_path
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_replay_attempts = max_replay_attempts
+        self.logger = logging.getLogger('audit')
+
+        self._spool_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._replay_failures = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stats = {
+            'enqueued': 0,
+            'written': 0,
+            'batches': 0,
+            'spooled': 0,
+            'overflow_spooled': 0,
+            'replayed': 0,
+            'quarantined': 0,
+            'write_failures': 0,
+            'max_queue_depth': 0,
+        }
+        atexit.register(self.shutdown)
+
+    def _ensure_started(self):
+        # The thread does not survive a fork (gunicorn preload); restart it
+        # in the child with a fresh queue.
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            if self._pid is not None and self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self.max_queue)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+            self._thread.start()
+
+    def enqueue(self, user_id, action, ip_address, user_agent, accessed_at):
+        """
+        Queue one access_log row
+
+        Never blocks on the database. If the queue is full the row is
+        appended to the spool file before returning.
+        """
+        row = (user_id, action, ip_address, user_agent, accessed_at)
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._stats['overflow_spooled'] += 1
+            self._spool([row])
+            return
+        self._stats['enqueued'] += 1
+        depth = self._queue.qsize()
+        if depth > self._stats['max_queue_depth']:
+            self._stats['max_queue_depth'] = depth
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                # Keep the thread alive; flush() waits on task_done below
+                self.logger.error(f"Audit writer error: {e}")
+            finally:
+                for _ in range(len(batch) + (1 if stop else 0)):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _insert(self, rows):
+        conn = self.pool.getconn()
+        try:
+            cur = conn.cursor()
+            execute_values(cur, INSERT_ACCESS_LOG, rows, page_size=self.batch_size)
+            conn.commit()
+            cur.close()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.pool.putconn(conn)
+
+    def _write_batch(self, batch):
+        try:
+            self._insert(batch)
+        except Exception as e:
+            self._stats['write_failures'] += 1
+            self.logger.error(f"Failed to write {len(batch)} audit rows to database, spooling: {e}")
+            self._spool(batch)
+            return
+        self._stats['written'] += len(batch)
+        self._stats['batches'] += 1
+        self._replay_spool()
+
+    @contextmanager
+    def _spool_locked(self):
+        """
+        Exclusive access to the spool across threads and worker processes
+
+        Appends, replays and rewrites all run under it, so one worker never
+        replays lines another is replaying or replaces a file another has
+        just appended to.
+        """
+        with self._spool_lock:
+            os.makedirs(os.path.dirname(self.spool_path) or '.', exist_ok=True)
+            with open(self.spool_path + '.lock', 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _spool(self, rows):
+        with self._spool_locked():
+            with open(self.spool_path, 'a') as f:
+                for user_id, action, ip_address, user_agent, accessed_at in rows:
+                    f.write(json.dumps([user_id, action, ip_address, user_agent, accessed_at.isoformat()]) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self._stats['spooled'] += len(rows)
+
+    def _replay_spool(self):
+        """
+        Write spooled rows to the database, chunk by chunk
+
+        The spool is rewritten after every committed chunk, so rows are
+        inserted at most once. Lines that cannot be parsed, and a chunk that
+        fails max_replay_attempts replays in a row while new batches are being
+        written, are moved to the quarantine file instead of blocking the
+        spool forever.
+        """
+        with self._spool_locked():
+            if not os.path.exists(self.spool_path):
+                return
+            entries = []
+            bad = []
+            with open(self.spool_path) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        user_id, action, ip_address, user_agent, accessed_at = json.loads(line)
+                        row = (user_id, action, ip_address, user_agent, datetime.fromisoformat(accessed_at))
+                    except (ValueError, TypeError) as e:
+                        self.logger.error(f"Unreadable audit spool line, quarantining: {e}")
+                        bad.append(line)
+                        continue
+                    entries.append((line, row))
+            if bad:
+                self._quarantine(bad)
+                self._rewrite_spool([line for line, _ in entries])
+
+            while entries:
+                chunk = entries[:self.batch_size]
+                try:
+                    self._insert([row for _, row in chunk])
+                except Exception as e:
+                    self._replay_failures += 1
+                    if self._replay_failures < self.max_replay_attempts:
+                        self.logger.error(f"Failed to replay audit spool: {e}")
+                        break
+                    self.logger.error(f"Audit spool chunk failed {self._replay_failures} replays, "
+                                      f"quarantining {len(chunk)} rows: {e}")
+                    self._quarantine([line for line, _ in chunk])
+                else:
+                    self._stats['replayed'] += len(chunk)
+                self._replay_failures = 0
+                entries = entries[len(chunk):]
+                self._rewrite_spool([line for line, _ in entries])
+
+    def _rewrite_spool(self, lines):
+        """Replace the spool with the lines still to be written (caller holds _spool_locked)"""
+        if not lines:
+            if os.path.exists(self.spool_path):
+                os.remove(self.spool_path)
+            return
+        tmp_path = f'{self.spool_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.spool_path)
+
+    def _quarantine(self, lines):
+        """Append spool lines that will not be replayed to the .bad file (caller holds _spool_locked)"""
+        with open(self.spool_path + '.bad', 'a') as f:
+            f.writelines(line if line.endswith('\n') else line + '\n' for line in lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self._stats['quarantined'] += len(lines)
+
+    def flush(self, timeout=None):
+        """
+        Wait until every queued row has been written or spooled
+
+        Returns:
+            True if the queue drained within timeout
+        """
+        if self._thread is None or self._pid != os.getpid():
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def shutdown(self, timeout=10):
+        """Flush outstanding rows and stop the writer thread"""
+        if self._thread is None or self._pid != os.getpid():
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            # Could not drain in time: persist whatever is still queued
+            leftover = []
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    leftover.append(item)
+            if leftover:
+                self._spool(leftover)
+        self._thread = None
+
+    def stats(self):
+        """
+        Snapshot of writer throughput and backpressure
+
+        Returns:
+            Dictionary with lifetime counters and current queue depth
+        """
+        stats = dict(self._stats)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['max_queue'] = self.max_queue
+        stats['spool_pending'] = os.path.exists(self.spool_path)
+        return stats
+
+
+def create_writer(pool, config):
+    """
+    Build an audit writer from a Flask config mapping
+
+    Args:
+        pool: Connection pool used by the writer thread
+        config: Mapping with optional AUDIT_* settings
+
+    Returns:
+        AuditWriter instance
+    """
+    return AuditWriter(
+        pool,
+        spool_path=config.get('AUDIT_SPOOL_PATH', 'logs/audit_spool.jsonl'),
+        max_queue=int(config.get('AUDIT_QUEUE_SIZE', 10000)),
+        batch_size=int(config.get('AUDIT_BATCH_SIZE', 500)),
+        flush_interval=float(config.get('AUDIT_FLUSH_INTERVAL', 1.0)),
+    )
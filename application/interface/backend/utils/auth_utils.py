@@ -1,16 +1,34 @@
+from flask import has_app_context, has_request_context
+from flask_jwt_extended import get_jwt
 from ..database import get_db
+from .clinician_cache import get_clinician_cache
 
-def get_clinician_id(user_id):
+
+def _token_clinician_id(user_id):
+    # Tokens issued at MFA verification carry the clinician_id claim
+    if not has_request_context():
+        return None
+    try:
+        claims = get_jwt()
+    except RuntimeError:
+        return None
+    if str(claims.get('sub')) != str(user_id):
+        return None
+    return claims.get('clinician_id')
+
+
+def load_clinician_id(user_id, db=None):
     """
-    Get clinician ID from user ID
+    Look up the clinician ID of a user in the database
 
     Args:
         user_id: ID of the user
+        db: Database connection (default: the request's connection)
 
     Returns:
         clinician_id or None
     """
-    db = get_db()
+    db = db or get_db()
     cur = db.cursor()
     try:
         cur.execute('SELECT id FROM clinicians WHERE user_id = %s', (user_id,))
@@ -18,3 +36,76 @@ def get_clinician_id(user_id):
         return row[0] if row else None
     finally:
         cur.close()
+
+
+def get_clinician_id(user_id):
+    """
+    Get clinician ID from user ID
+
+    Resolved from the token's clinician_id claim when present, otherwise from
+    the clinician cache, querying the database only on a miss.
+
+    Args:
+        user_id: ID of the user
+
+    Returns:
+        clinician_id or None
+    """
+    clinician_id = _token_clinician_id(user_id)
+    if clinician_id is not None:
+        return clinician_id
+    if not has_app_context():
+        return load_clinician_id(user_id)
+    return get_clinician_cache().clinician_id(user_id, lambda: load_clinician_id(user_id))
+
+
+def get_assigned_patient_ids(clinician_id, db=None):
+    """
+    Get the IDs of the patients assigned to a clinician
+
+    Args:
+        clinician_id: ID of the clinician
+        db: Database connection (default: the request's connection)
+
+    Returns:
+        frozenset of patient IDs
+    """
+    def load():
+        cur = (db or get_db()).cursor()
+        try:
+            cur.execute('SELECT patient_id FROM patient_clinician WHERE clinician_id = %s', (clinician_id,))
+            return [row[0] for row in cur.fetchall()]
+        finally:
+            cur.close()
+
+    if not has_app_context():
+        return frozenset(load())
+    return get_clinician_cache().assigned_patients(clinician_id, load)
+
+
+def is_patient_assigned(clinician_id, patient_id, db=None):
+    """
+    Check whether a patient is assigned to a clinician
+
+    Args:
+        clinician_id: ID of the clinician
+        patient_id: ID of the patient
+        db: Database connection (default: the request's connection)
+
+    Returns:
+        Boolean
+    """
+    if clinician_id is None:
+        return False
+    return patient_id in get_assigned_patient_ids(clinician_id, db=db)
+
+
+def invalidate_clinician_cache(clinician_id=None):
+    """
+    Drop cached assignments after patient_clinician changes
+
+    Args:
+        clinician_id: Clinician whose patients changed (default: everything)
+    """
+    if has_app_context():
+        get_clinician_cache().invalidate(clinician_id)
@@ -0,0 +1,170 @@
+"""
+Bulk writes
+Multi-row INSERT and upsert paths behind the models' bulk_create /
+bulk_upsert: rows are validated up front, then written batch_size at a time
+with execute_values, one transaction and one audit event per batch. Rows
+carrying different sets of columns are written by separate statements within
+the batch's transaction.
+"""
+from flask import current_app, has_app_context, has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+from psycopg2.extras import execute_values
+from ..database import get_db
+from .audit_logger import audit_logger
+from .validators import BulkValidationError, validate_rows
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def resolve_batch_size(batch_size=None):
+    """Rows per statement and transaction: the argument, else BULK_WRITE_BATCH_SIZE"""
+    if batch_size:
+        return int(batch_size)
+    if has_app_context():
+        return int(current_app.config.get('BULK_WRITE_BATCH_SIZE', DEFAULT_BATCH_SIZE))
+    return DEFAULT_BATCH_SIZE
+
+
+def _requester():
+    if not has_request_context():
+        return None, None, None
+    try:
+        user_id = get_jwt_identity()
+    except RuntimeError:
+        user_id = None
+    return user_id, request.remote_addr, request.headers.get('User-Agent', 'unknown')
+
+
+def _group_by_columns(columns, rows):
+    # Rows are written with exactly the columns they carry: a column a row
+    # leaves out keeps its database default on insert and its stored value on
+    # upsert, instead of being sent as NULL. One statement per column set.
+    groups = {}
+    for index, row in enumerate(rows):
+        present = tuple(column for column in columns if column in row)
+        groups.setdefault(present, []).append(index)
+    return groups
+
+
+def _statement(table, columns, conflict_columns):
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+    if conflict_columns:
+        updates = [column for column in columns if column not in conflict_columns]
+        query += f" ON CONFLICT ({', '.join(conflict_columns)}) DO "
+        query += ('UPDATE SET ' + ', '.join(f'{column} = EXCLUDED.{column}' for column in updates)
+                  if updates else 'NOTHING')
+    return query + ' RETURNING id'
+
+
+def _last_per_key(rows, key_columns):
+    # One INSERT ... ON CONFLICT cannot update the same row twice
+    latest = {}
+    for row in rows:
+        latest[tuple(row[column] for column in key_columns)] = row
+    return list(latest.values()) if len(latest) < len(rows) else rows
+
+
+def _write(table, columns, rows, resource_type, schema, conflict_columns, batch_size, db):
+    rows = list(rows)
+    if schema:
+        errors = validate_rows(rows, schema)
+        if errors:
+            raise BulkValidationError(errors)
+    if not rows:
+        return []
+    action = 'BULK_UPSERT' if conflict_columns else 'BULK_CREATE'
+
+    size = resolve_batch_size(batch_size)
+    user_id, ip_address, user_agent = _requester()
+    db = db or get_db()
+    ids = []
+    for start in range(0, len(rows), size):
+        batch = rows[start:start + size]
+        if conflict_columns:
+            batch = _last_per_key(batch, conflict_columns)
+        groups = [(present, indexes) for present, indexes in _group_by_columns(columns, batch).items() if present]
+        if not groups:
+            continue
+
+        # Inserts report IDs in row order; upserts in statement order
+        batch_ids = [] if conflict_columns else [None] * len(batch)
+        cur = db.cursor()
+        try:
+            for present, indexes in groups:
+                values = [tuple(batch[index][column] for column in present) for index in indexes]
+                returned = execute_values(cur, _statement(table, present, conflict_columns), values,
+                                          page_size=len(values), fetch=True)
+                if conflict_columns:
+                    # DO NOTHING returns no row for keys that already exist
+                    batch_ids.extend(row[0] for row in returned)
+                else:
+                    for index, row in zip(indexes, returned):
+                        batch_ids[index] = row[0]
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            cur.close()
+
+        batch_ids = [row_id for row_id in batch_ids if row_id is not None]
+        ids.extend(batch_ids)
+        audit_logger.log_bulk_write(user_id, action, resource_type, batch_ids, ip_address, user_agent)
+    return ids
+
+
+def bulk_insert(table, columns, rows, resource_type, schema=None, batch_size=None, db=None):
+    """
+    Insert many rows, one multi-row INSERT and transaction per batch
+
+    Every row is validated before anything is written. Batches committed
+    before a failing batch stay committed.
+
+    Args:
+        table: Table name
+        columns: Columns that may be written; a column a row leaves out
+            keeps its database default
+        rows: Iterable of dictionaries keyed by column
+        resource_type: Resource name used in the audit log
+        schema: validate_request style schema checked against every row
+        batch_size: Rows per batch (default: BULK_WRITE_BATCH_SIZE)
+        db: Database connection (default: the request's connection)
+
+    Returns:
+        List of new row IDs in row order
+
+    Raises:
+        BulkValidationError: Some rows are invalid; nothing was written
+    """
+    return _write(table, columns, rows, resource_type, schema, None, batch_size, db)
+
+
+def bulk_upsert(table, columns, rows, resource_type, conflict_columns, schema=None, batch_size=None, db=None):
+    """
+    Insert many rows, updating the ones whose conflict key already exists
+
+    Like bulk_insert, with INSERT ... ON CONFLICT (conflict_columns) DO
+    UPDATE. Only the columns a row carries are updated. When a batch holds
+    the same key more than once the last row wins.
+
+    Args:
+        table: Table name
+        columns: Columns that may be written
+        rows: Iterable of dictionaries keyed by column
+        resource_type: Resource name used in the audit log
+        conflict_columns: Columns of a unique constraint; required in every row
+        schema: validate_request style schema checked against every row
+        batch_size: Rows per batch (default: BULK_WRITE_BATCH_SIZE)
+        db: Database connection (default: the request's connection)
+
+    Returns:
+        List of inserted or updated row IDs
+
+    Raises:
+        BulkValidationError: Some rows are invalid; nothing was written
+    """
+    schema = dict(schema or {})
+    for column in conflict_columns:
+        schema[column] = dict(schema.get(column, {}), required=True)
+    columns = tuple(conflict_columns) + tuple(column for column in columns if column not in conflict_columns)
+    return _write(table, columns, rows, resource_type, schema, tuple(conflict_columns), batch_size, db)
@@ -0,0 +1,131 @@
+"""
+Clinician identity cache
+Bounded, TTL-limited LRU caches for the user -> clinician mapping and each
+clinician's assigned patient set, so role-scoped endpoints stop querying
+clinicians / patient_clinician on every request
+"""
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+
+class ClinicianCache:
+    """
+    In-process cache of clinician identities and patient assignments
+
+    Assignments are held as frozensets, so the assignment check is a set
+    membership test. Entries expire after ttl seconds, which bounds how long
+    an assignment change made outside the application stays invisible;
+    invalidate() drops entries immediately for changes made in-process.
+    """
+
+    def __init__(self, max_entries=10000, ttl=60.0):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Upper bound on cached users plus cached clinicians
+            ttl: Seconds an entry may be served before it is reloaded
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (expires_at, value), least recently used first
+        self._entries = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def _get(self, key, loader):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return entry[1]
+            self._stats['misses'] += 1
+
+        value = loader()
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+        return value
+
+    def clinician_id(self, user_id, loader):
+        """
+        Clinician ID of a user
+
+        Args:
+            user_id: ID of the user
+            loader: Callable returning the clinician ID (or None) on a miss
+
+        Returns:
+            clinician_id or None
+        """
+        return self._get(('user', str(user_id)), loader)
+
+    def assigned_patients(self, clinician_id, loader):
+        """
+        Patients assigned to a clinician
+
+        Args:
+            clinician_id: ID of the clinician
+            loader: Callable returning the assigned patient IDs on a miss
+
+        Returns:
+            frozenset of patient IDs
+        """
+        return self._get(('assigned', clinician_id), lambda: frozenset(loader()))
+
+    def invalidate(self, clinician_id=None):
+        """
+        Drop cached assignments
+
+        Args:
+            clinician_id: Clinician whose patient set changed (default: all
+                cached identities and assignments)
+        """
+        with self._lock:
+            self._stats['invalidations'] += 1
+            if clinician_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(('assigned', clinician_id), None)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        return stats
+
+
+def create_clinician_cache(config):
+    """
+    Build a clinician cache from a Flask config mapping
+
+    Args:
+        config: Mapping with optional CLINICIAN_CACHE_* settings
+
+    Returns:
+        ClinicianCache instance
+    """
+    return ClinicianCache(
+        max_entries=int(config.get('CLINICIAN_CACHE_MAX_ENTRIES', 10000)),
+        ttl=float(config.get('CLINICIAN_CACHE_TTL', 60)),
+    )
+
+
+def get_clinician_cache(app=None):
+    """Return the clinician cache registered on the (current) Flask app"""
+    app = app or current_app
+    cache = app.extensions.get('clinician_cache')
+    if cache is None:
+        cache = app.extensions['clinician_cache'] = create_clinician_cache(app.config)
+    return cache
+
+
+def init_app(app):
+    app.extensions['clinician_cache'] = create_clinician_cache(app.config)
@@ -0,0 +1,252 @@
+"""
+Dashboard aggregation engine
+Computes the full /analytics/dashboard payload in a single database round trip
+"""
+
+# Staff (admin/clinician) dashboard. Scoping is parameterized rather than
+# branched: %(scoped)s is true for clinicians, which restricts every section to
+# %(clinician_id)s and its assigned patients. psycopg2 interpolates parameters
+# client-side, so the planner sees constants and folds the unused branch away.
+# Admin-only sections are gated by %(is_admin)s the same way.
+STAFF_DASHBOARD_QUERY = """
+    WITH
+    scope AS (
+        SELECT patient_id FROM patient_clinician WHERE clinician_id = %(clinician_id)s
+    ),
+    appt AS (
+        SELECT id, patient_id, status
+        FROM appointments
+        WHERE appointment_time >= %(start_date)s
+        AND (NOT %(scoped)s OR clinician_id = %(clinician_id)s)
+    ),
+    appt_status AS (
+        SELECT status, COUNT(*) AS count FROM appt GROUP BY status
+    ),
+    assessment_stats AS (
+        SELECT
+            si.instrument_code,
+            si.name,
+            COUNT(p.id) AS total,
+            AVG(CASE WHEN p.id IS NOT NULL THEN 1 ELSE 0 END) AS completion_rate
+        FROM scale_instruments si
+        LEFT JOIN psyconnect p ON p.assessment_type = si.instrument_code
+            AND p.assessed_at >= %(start_date)s
+            AND (NOT %(scoped)s OR p.patient_id IN (SELECT patient_id FROM scope))
+        WHERE si.active = true
+        GROUP BY si.instrument_code, si.name
+    ),
+    workload AS (
+        SELECT
+            c.id AS clinician_id,
+            u.full_name AS name,
+            COUNT(DISTINCT pc.patient_id) AS patient_count,
+            COUNT(a.id) AS appointment_count
+        FROM clinicians c
+        JOIN users u ON u.id = c.user_id
+        LEFT JOIN patient_clinician pc ON pc.clinician_id = c.id
+        LEFT JOIN appointments a ON a.clinician_id = c.id
+            AND a.appointment_time >= %(start_date)s
+        WHERE c.active = true AND %(is_admin)s
+        GROUP BY c.id, u.full_name
+        ORDER BY patient_count DESC
+        LIMIT 10
+    ),
+    access_stats AS (
+        SELECT action, COUNT(*) AS count
+        FROM access_log
+        WHERE accessed_at >= %(start_date)s AND %(is_admin)s
+        GROUP BY action
+        ORDER BY count DESC
+        LIMIT 10
+    )
+    SELECT json_build_object(
+        'total_patients', CASE WHEN %(scoped)s
+            THEN (SELECT COUNT(*) FROM scope)
+            ELSE (SELECT COUNT(*) FROM patients) END,
+        'new_patients', (
+            SELECT COUNT(*) FROM patients p
+            WHERE p.created_at >= %(start_date)s
+            AND (NOT %(scoped)s OR p.id IN (SELECT patient_id FROM scope))
+        ),
+        'active_patients', (SELECT COUNT(DISTINCT patient_id) FROM appt),
+        'appointment_status', (
+            SELECT COALESCE(json_agg(json_build_array(status, count)), '[]'::json) FROM appt_status
+        ),
+        'upcoming_appointments', (
+            SELECT COUNT(*) FROM appointments
+            WHERE appointment_time > %(now)s AND status = 'scheduled'
+            AND (NOT %(scoped)s OR clinician_id = %(clinician_id)s)
+        ),
+        'assessments', (
+            SELECT COALESCE(json_agg(row_to_json(s)), '[]'::json) FROM assessment_stats s
+        ),
+        'therapy_sessions', (
+            SELECT json_build_object('total', COUNT(*), 'avg_duration', AVG(ts.duration_minutes))
+            FROM therapy_sessions ts
+            JOIN appt a ON a.id = ts.appointment_id
+        ),
+        'homework', (
+            SELECT json_build_object(
+                'total', COUNT(*),
+                'completed', SUM(CASE WHEN completed = true THEN 1 ELSE 0 END)
+            )
+            FROM therapy_homework
+            WHERE assigned_at >= %(start_date)s
+            AND (NOT %(scoped)s OR patient_id IN (SELECT patient_id FROM scope))
+        ),
+        'vitals', (
+            SELECT json_build_object('avg_heart_rate', AVG(heart_rate), 'total_readings', COUNT(*))
+            FROM vitals
+            WHERE recorded_at >= %(start_date)s AND heart_rate IS NOT NULL
+            AND (NOT %(scoped)s OR patient_id IN (SELECT patient_id FROM scope))
+        ),
+        'messages_sent', (
+            SELECT COUNT(*) FROM messages
+            WHERE sent_at >= %(start_date)s
+            AND (NOT %(scoped)s OR sender_id = %(user_id)s OR receiver_id = %(user_id)s)
+        ),
+        'active_clinicians', CASE WHEN %(is_admin)s
+            THEN (SELECT COUNT(*) FROM clinicians WHERE active = true) END,
+        'clinician_workload', (
+            SELECT COALESCE(json_agg(row_to_json(w) ORDER BY w.patient_count DESC), '[]'::json)
+            FROM workload w
+        ),
+        'access_activity', (
+            SELECT COALESCE(json_agg(row_to_json(x) ORDER BY x.count DESC), '[]'::json)
+            FROM access_stats x
+        ),
+        'active_users', CASE WHEN %(is_admin)s
+            THEN (SELECT COUNT(DISTINCT user_id) FROM access_log WHERE accessed_at >= %(start_date)s) END
+    )
+"""
+
+PATIENT_DASHBOARD_QUERY = """
+    WITH me AS (
+        SELECT id FROM patients WHERE user_id = %(user_id)s LIMIT 1
+    )
+    SELECT json_build_object(
+        'patient_id', (SELECT id FROM me),
+        'appointment_status', (
+            SELECT COALESCE(json_agg(json_build_array(status, count)), '[]'::json)
+            FROM (
+                SELECT status, COUNT(*) AS count
+                FROM appointments
+                WHERE patient_id = (SELECT id FROM me) AND appointment_time >= %(start_date)s
+                GROUP BY status
+            ) s
+        ),
+        'assessments', (
+            SELECT COUNT(*) FROM psyconnect
+            WHERE patient_id = (SELECT id FROM me) AND assessed_at >= %(start_date)s
+        ),
+        'homework', (
+            SELECT json_build_object(
+                'total', COUNT(*),
+                'completed', SUM(CASE WHEN completed = true THEN 1 ELSE 0 END)
+            )
+            FROM therapy_homework
+            WHERE patient_id = (SELECT id FROM me) AND assigned_at >= %(start_date)s
+        )
+    )
+"""
+
+
+def _status_breakdown(pairs):
+    return {
+        'total': sum(count for _, count in pairs),
+        'by_status': {status: count for status, count in pairs}
+    }
+
+
+def _staff_metrics(payload, is_admin):
+    homework = payload['homework']
+    total_hw = homework['total'] or 0
+    completed_hw = homework['completed'] or 0
+    sessions = payload['therapy_sessions']
+    vitals = payload['vitals']
+
+    metrics = {
+        'total_patients': payload['total_patients'],
+        'new_patients': payload['new_patients'],
+        'active_patients': payload['active_patients'],
+        'appointments': _status_breakdown(payload['appointment_status']),
+        'upcoming_appointments': payload['upcoming_appointments'],
+        'assessments': [
+            {
+                'instrument_code': row['instrument_code'],
+                'name': row['name'],
+                'total': row['total'],
+                'completion_rate': float(row['completion_rate']) if row['completion_rate'] else 0
+            }
+            for row in payload['assessments']
+        ],
+        'therapy_sessions': {
+            'total': sessions['total'],
+            'avg_duration': float(sessions['avg_duration']) if sessions['avg_duration'] else 0
+        },
+        'homework_completion_rate': (completed_hw / total_hw * 100) if total_hw > 0 else 0,
+        'vitals': {
+            'avg_heart_rate': float(vitals['avg_heart_rate']) if vitals['avg_heart_rate'] else 0,
+            'total_readings': vitals['total_readings']
+        },
+        'messages_sent': payload['messages_sent'],
+    }
+
+    if is_admin:
+        metrics['active_clinicians'] = payload['active_clinicians']
+        metrics['clinician_workload'] = payload['clinician_workload']
+        metrics['access_activity'] = payload['access_activity']
+        metrics['active_users'] = payload['active_users']
+
+    return metrics
+
+
+def _patient_metrics(payload):
+    if payload['patient_id'] is None:
+        return {}
+
+    homework = payload['homework']
+    total = homework['total']
+    completed = homework['completed'] or 0
+    return {
+        'my_appointments': _status_breakdown(payload['appointment_status']),
+        'my_assessments': payload['assessments'],
+        'my_homework': {
+            'total': total,
+            'completed': completed,
+            'completion_rate': (completed / total * 100) if total > 0 else 0
+        }
+    }
+
+
+def fetch_dashboard_metrics(cur, role, user_id, clinician_id, start_date, now):
+    """
+    Compute dashboard metrics with one query
+
+    Args:
+        cur: Database cursor
+        role: Role of the requesting user (admin, clinician, patient)
+        user_id: ID of the requesting user
+        clinician_id: Clinician ID when role is clinician
+        start_date: Start of the reporting window
+        now: Current time, used for upcoming appointments
+
+    Returns:
+        Metrics dictionary in the /analytics/dashboard response shape
+    """
+    if role in ['admin', 'clinician']:
+        cur.execute(STAFF_DASHBOARD_QUERY, {
+            'start_date': start_date,
+            'now': now,
+            'user_id': user_id,
+            'clinician_id': clinician_id,
+            'scoped': role == 'clinician',
+            'is_admin': role == 'admin',
+        })
+        return _staff_metrics(cur.fetchone()[0], role == 'admin')
+
+    if role == 'patient':
+        cur.execute(PATIENT_DASHBOARD_QUERY, {'user_id': user_id, 'start_date': start_date})
+        return _patient_metrics(cur.fetchone()[0])
+
+    return {}
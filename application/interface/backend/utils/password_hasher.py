@@ -0,0 +1,265 @@
+"""
+Password hashing worker pool
+Runs bcrypt and PBKDF2 work on a dedicated process pool so that a burst of
+logins does not tie up request workers, and sheds load with a retryable error
+once too many hashes are waiting
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import bcrypt
+from flask import current_app, jsonify
+from .encryption import hash_password, verify_password
+
+
+class HasherBusyError(Exception):
+    """Raised when the hashing queue is full; the caller should retry later"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Password hashing queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _bcrypt_hash(password, rounds):
+    salt = bcrypt.gensalt(rounds=rounds)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def _bcrypt_check(pw_hash, password):
+    return bcrypt.checkpw(password.encode('utf-8'), pw_hash.encode('utf-8'))
+
+
+OPERATIONS = {
+    'bcrypt_hash': _bcrypt_hash,
+    'bcrypt_check': _bcrypt_check,
+    'pbkdf2_hash': hash_password,
+    'pbkdf2_verify': verify_password,
+}
+
+
+def _run(operation, args):
+    # Executed in the worker process; wall-clock start time lets the parent
+    # split queue wait from hash time
+    started = time.time()
+    result = OPERATIONS[operation](*args)
+    return result, started, time.time() - started
+
+
+class PasswordHasher:
+    """
+    Bounded executor for password hashing
+
+    At most max_pending hashes may be queued or running at once; further
+    requests raise HasherBusyError immediately instead of waiting, so the
+    endpoint can answer 503 with Retry-After. With workers=0 hashing runs inline
+    in the calling thread (tests, single-process tools), still bounded.
+    """
+
+    def __init__(self, workers=2, max_pending=32, retry_after=2, bcrypt_rounds=12, timeout=30.0):
+        """
+        Initialize the hasher
+
+        Args:
+            workers: Worker processes (0 hashes inline)
+            max_pending: Hashes allowed to be queued or running at once
+            retry_after: Seconds suggested to clients turned away when full
+            bcrypt_rounds: bcrypt log rounds for new hashes
+            timeout: Seconds to wait for a queued hash before giving up
+        """
+        self.workers = workers
+        self.max_pending = max(1, max_pending)
+        self.retry_after = retry_after
+        self.bcrypt_rounds = bcrypt_rounds
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._pending = 0
+        self._stats = {
+            'submitted': 0,
+            'completed': 0,
+            'rejected': 0,
+            'failed': 0,
+            'queue_wait_ms_total': 0.0,
+            'queue_wait_ms_max': 0.0,
+            'hash_ms_total': 0.0,
+            'hash_ms_max': 0.0,
+        }
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                # A forked child cannot use the parent's pool
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def _acquire(self):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats['rejected'] += 1
+                raise HasherBusyError(self.retry_after)
+            self._pending += 1
+            self._stats['submitted'] += 1
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+
+    def _record(self, queue_wait, hash_time):
+        queue_wait_ms = max(0.0, queue_wait) * 1000
+        hash_ms = hash_time * 1000
+        with self._lock:
+            self._stats['completed'] += 1
+            self._stats['queue_wait_ms_total'] += queue_wait_ms
+            self._stats['queue_wait_ms_max'] = max(self._stats['queue_wait_ms_max'], queue_wait_ms)
+            self._stats['hash_ms_total'] += hash_ms
+            self._stats['hash_ms_max'] = max(self._stats['hash_ms_max'], hash_ms)
+
+    def _call(self, operation, *args):
+        self._acquire()
+        future = None
+        try:
+            submitted = time.time()
+            if self.workers <= 0:
+                result, started, hash_time = _run(operation, args)
+            else:
+                future = self._get_executor().submit(_run, operation, args)
+                result, started, hash_time = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._stats['failed'] += 1
+            if future is None:
+                self._release()
+                raise
+            # Keep the slot taken until the abandoned hash actually finishes
+            future.add_done_callback(lambda _: self._release())
+            raise HasherBusyError(self.retry_after)
+        except Exception:
+            with self._lock:
+                self._stats['failed'] += 1
+            self._release()
+            raise
+        self._release()
+        self._record(started - submitted, hash_time)
+        return result
+
+    def generate_password_hash(self, password):
+        """
+        Hash a password with bcrypt
+
+        Args:
+            password: Plaintext password
+
+        Returns:
+            bcrypt hash as a string
+
+        Raises:
+            HasherBusyError: If max_pending hashes are already in flight
+        """
+        if not password:
+            raise ValueError('Password must be non-empty.')
+        return self._call('bcrypt_hash', password, self.bcrypt_rounds)
+
+    def check_password_hash(self, pw_hash, password):
+        """
+        Check a password against a bcrypt hash
+
+        Args:
+            pw_hash: Stored bcrypt hash
+            password: Candidate password
+
+        Returns:
+            True if the password matches
+
+        Raises:
+            HasherBusyError: If max_pending hashes are already in flight
+        """
+        return self._call('bcrypt_check', pw_hash, password)
+
+    def hash_password(self, password, salt=None):
+        """PBKDF2 hash_password from utils.encryption, run on the pool"""
+        return self._call('pbkdf2_hash', password, salt)
+
+    def verify_password(self, password, hashed_password, salt):
+        """PBKDF2 verify_password from utils.encryption, run on the pool"""
+        return self._call('pbkdf2_verify', password, hashed_password, salt)
+
+    def stats(self):
+        """
+        Snapshot of hashing load
+
+        Returns:
+            Dictionary with lifetime counters, current pending count and
+            average/maximum queue wait and hash time in milliseconds
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            pending = self._pending
+        completed = stats['completed']
+        return {
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            'pending': pending,
+            'submitted': stats['submitted'],
+            'completed': completed,
+            'rejected': stats['rejected'],
+            'failed': stats['failed'],
+            'queue_wait_ms_avg': round(stats['queue_wait_ms_total'] / completed, 2) if completed else 0.0,
+            'queue_wait_ms_max': round(stats['queue_wait_ms_max'], 2),
+            'hash_ms_avg': round(stats['hash_ms_total'] / completed, 2) if completed else 0.0,
+            'hash_ms_max': round(stats['hash_ms_max'], 2),
+        }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+def busy_response(error):
+    """503 response telling the client when to retry a turned-away request"""
+    response = jsonify({'error': 'Server busy, please retry shortly'})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+def create_password_hasher(config):
+    """
+    Build a password hasher from a Flask config mapping
+
+    Args:
+        config: Mapping with optional PASSWORD_HASH_* settings
+
+    Returns:
+        PasswordHasher instance
+    """
+    return PasswordHasher(
+        workers=int(config.get('PASSWORD_HASH_WORKERS', 2)),
+        max_pending=int(config.get('PASSWORD_HASH_MAX_PENDING', 32)),
+        retry_after=int(config.get('PASSWORD_HASH_RETRY_AFTER', 2)),
+        bcrypt_rounds=int(config.get('BCRYPT_LOG_ROUNDS', 12)),
+        timeout=float(config.get('PASSWORD_HASH_TIMEOUT', 30)),
+    )
+
+
+def get_password_hasher(app=None):
+    """Return the password hasher registered on the (current) Flask app"""
+    app = app or current_app
+    hasher = app.extensions.get('password_hasher')
+    if hasher is None:
+        hasher = app.extensions['password_hasher'] = create_password_hasher(app.config)
+    return hasher
+
+
+def init_app(app):
+    app.extensions['password_hasher'] = create_password_hasher(app.config)
@@ -0,0 +1,335 @@
+"""
+Query profiler
+Instruments the cursors handed out by get_db on a sample of requests and
+aggregates, per route, query counts, database time, rows fetched, the slowest
+normalized statements and repeated-statement (N+1) patterns
+"""
+import random
+import re
+import threading
+import time
+from functools import lru_cache
+import psycopg2.extensions
+from flask import current_app, g, has_request_context, request
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=1024)
+def normalize_statement(query):
+    """
+    Reduce a SQL statement to its shape
+
+    Literals become '?', IN lists collapse to IN (...) and whitespace is
+    collapsed, so the same statement with different values aggregates together.
+
+    Args:
+        query: SQL text (str or bytes)
+
+    Returns:
+        Normalized SQL string
+    """
+    if isinstance(query, bytes):
+        query = query.decode('utf-8', 'replace')
+    query = _STRING_LITERAL.sub('?', query)
+    query = _NUMBER_LITERAL.sub('?', query)
+    query = _IN_LIST.sub('IN (...)', query)
+    return _WHITESPACE.sub(' ', query).strip()
+
+
+class RequestProfile:
+    """Queries executed while serving one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        # normalized statement -> [count, total seconds, max seconds, rows]
+        self.statements = {}
+        # (normalized statement, params) -> executions
+        self._calls = {}
+
+    def record_query(self, query, params, seconds):
+        statement = normalize_statement(query)
+        self.query_count += 1
+        self.db_seconds += seconds
+        entry = self.statements.get(statement)
+        if entry is None:
+            entry = self.statements[statement] = [0, 0.0, 0.0, 0]
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+        try:
+            key = (statement, repr(params))
+        except Exception:
+            return statement
+        self._calls[key] = self._calls.get(key, 0) + 1
+        return statement
+
+    def record_rows(self, statement, count):
+        self.rows += count
+        entry = self.statements.get(statement)
+        if entry is not None:
+            entry[3] += count
+
+    def repeated_statements(self, threshold):
+        """Statements executed at least threshold times (N+1 candidates)"""
+        return {statement: entry[0] for statement, entry in self.statements.items() if entry[0] >= threshold}
+
+    def duplicate_statements(self):
+        """Statements executed more than once with identical parameters"""
+        duplicates = {}
+        for (statement, _), count in self._calls.items():
+            if count > 1:
+                duplicates[statement] = duplicates.get(statement, 0) + count - 1
+        return duplicates
+
+
+class ProfilingCursor(psycopg2.extensions.cursor):
+    """
+    psycopg2 cursor that reports to the request's RequestProfile
+
+    Installed as the connection's cursor_factory for sampled requests; a
+    cursor created outside a sampled request records nothing.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._profile = g.get('query_profile') if has_request_context() else None
+        self._statement = None
+
+    def _timed(self, method, query, params):
+        if self._profile is None:
+            return method(query, params)
+        started = time.perf_counter()
+        try:
+            return method(query, params)
+        finally:
+            self._statement = self._profile.record_query(query, params, time.perf_counter() - started)
+
+    def execute(self, query, vars=None):
+        return self._timed(super().execute, query, vars)
+
+    def executemany(self, query, vars_list):
+        return self._timed(super().executemany, query, vars_list)
+
+    def _count(self, count):
+        if self._profile is not None:
+            self._profile.record_rows(self._statement, count)
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            self._count(1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(size) if size is not None else super().fetchmany()
+        self._count(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        self._count(len(rows))
+        return rows
+
+    def __next__(self):
+        row = super().__next__()
+        self._count(1)
+        return row
+
+
+class QueryProfiler:
+    """
+    Per-route aggregation of sampled request profiles
+
+    Keeps, for every route, request and query totals plus the max_statements
+    statements with the most database time. A statement run repeat_threshold
+    or more times in one request, or more than once with identical
+    parameters, is counted as an N+1 / redundant-lookup pattern.
+    """
+
+    def __init__(self, sample_rate=0.05, server_timing=False, repeat_threshold=5, max_statements=20):
+        """
+        Initialize the profiler
+
+        Args:
+            sample_rate: Fraction of requests profiled (0 disables, 1 profiles all)
+            server_timing: Add a Server-Timing header to profiled responses
+            repeat_threshold: Executions of one statement per request flagged as N+1
+            max_statements: Statements retained per route
+        """
+        self.sample_rate = sample_rate
+        self.server_timing = server_timing
+        self.repeat_threshold = repeat_threshold
+        self.max_statements = max_statements
+        self._lock = threading.Lock()
+        self._routes = {}
+        self._sampled = 0
+
+    def should_sample(self):
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _route_locked(self, route, blueprint):
+        stats = self._routes.get(route)
+        if stats is None:
+            stats = self._routes[route] = {
+                'blueprint': blueprint,
+                'requests': 0,
+                'queries': 0,
+                'max_queries': 0,
+                'db_ms': 0.0,
+                'request_ms': 0.0,
+                'rows': 0,
+                'statements': {},
+                'n_plus_one': {},
+                'duplicates': {},
+            }
+        return stats
+
+    def record(self, route, blueprint, profile):
+        """
+        Fold a finished request into the route aggregates
+
+        Args:
+            route: Route key, e.g. 'GET /api/patients/<int:patient_id>'
+            blueprint: Blueprint name or None
+            profile: RequestProfile of the request
+        """
+        request_ms = (time.perf_counter() - profile.started) * 1000
+        repeated = profile.repeated_statements(self.repeat_threshold)
+        duplicates = profile.duplicate_statements()
+        with self._lock:
+            self._sampled += 1
+            stats = self._route_locked(route, blueprint)
+            stats['requests'] += 1
+            stats['queries'] += profile.query_count
+            stats['max_queries'] = max(stats['max_queries'], profile.query_count)
+            stats['db_ms'] += profile.db_seconds * 1000
+            stats['request_ms'] += request_ms
+            stats['rows'] += profile.rows
+
+            statements = stats['statements']
+            for statement, (count, seconds, max_seconds, rows) in profile.statements.items():
+                entry = statements.get(statement)
+                if entry is None:
+                    entry = statements[statement] = {'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0}
+                entry['calls'] += count
+                entry['total_ms'] += seconds * 1000
+                entry['max_ms'] = max(entry['max_ms'], max_seconds * 1000)
+                entry['rows'] += rows
+            if len(statements) > self.max_statements:
+                keep = sorted(statements, key=lambda s: statements[s]['total_ms'], reverse=True)[:self.max_statements]
+                stats['statements'] = {statement: statements[statement] for statement in keep}
+
+            for statement in repeated:
+                stats['n_plus_one'][statement] = stats['n_plus_one'].get(statement, 0) + 1
+            for statement, extra in duplicates.items():
+                stats['duplicates'][statement] = stats['duplicates'].get(statement, 0) + extra
+
+    def snapshot(self, limit=10):
+        """
+        Report of the sampled requests
+
+        Args:
+            limit: Slowest statements listed per route and overall
+
+        Returns:
+            Dictionary with per-route averages, their slowest statements and
+            flagged patterns, plus the slowest statements across all routes
+        """
+        with self._lock:
+            routes = {}
+            slowest = []
+            for route, stats in self._routes.items():
+                requests_seen = stats['requests']
+                statements = sorted(
+                    ({'statement': statement, **{k: round(v, 3) if isinstance(v, float) else v
+                                                 for k, v in entry.items()}}
+                     for statement, entry in stats['statements'].items()),
+                    key=lambda entry: entry['total_ms'], reverse=True
+                )
+                slowest.extend(dict(entry, route=route) for entry in statements)
+                routes[route] = {
+                    'blueprint': stats['blueprint'],
+                    'requests': requests_seen,
+                    'avg_queries': round(stats['queries'] / requests_seen, 2),
+                    'max_queries': stats['max_queries'],
+                    'avg_db_ms': round(stats['db_ms'] / requests_seen, 3),
+                    'avg_request_ms': round(stats['request_ms'] / requests_seen, 3),
+                    'avg_rows': round(stats['rows'] / requests_seen, 2),
+                    'slowest_statements': statements[:limit],
+                    'n_plus_one': dict(stats['n_plus_one']),
+                    'duplicate_queries': dict(stats['duplicates']),
+                }
+            sampled = self._sampled
+        slowest.sort(key=lambda entry: entry['max_ms'], reverse=True)
+        return {
+            'sample_rate': self.sample_rate,
+            'sampled_requests': sampled,
+            'routes': routes,
+            'slowest_statements': slowest[:limit],
+        }
+
+    def reset(self):
+        with self._lock:
+            self._routes = {}
+            self._sampled = 0
+
+    def stats(self):
+        with self._lock:
+            return {'sample_rate': self.sample_rate, 'sampled_requests': self._sampled, 'routes': len(self._routes)}
+
+    def before_request(self):
+        if self.should_sample():
+            g.query_profile = RequestProfile()
+
+    def after_request(self, response):
+        profile = g.pop('query_profile', None)
+        if profile is None:
+            return response
+        rule = request.url_rule.rule if request.url_rule is not None else request.path
+        self.record(f'{request.method} {rule}', request.blueprint, profile)
+        if self.server_timing:
+            response.headers.add(
+                'Server-Timing',
+                f'db;dur={profile.db_seconds * 1000:.2f};desc="{profile.query_count} queries"'
+            )
+        return response
+
+
+def create_profiler(config):
+    """
+    Build a query profiler from a Flask config mapping
+
+    Args:
+        config: Mapping with optional QUERY_PROFILE_* settings
+
+    Returns:
+        QueryProfiler instance
+    """
+    return QueryProfiler(
+        sample_rate=float(config.get('QUERY_PROFILE_SAMPLE_RATE', 0.05)),
+        server_timing=bool(config.get('QUERY_PROFILE_SERVER_TIMING', False)),
+        repeat_threshold=int(config.get('QUERY_PROFILE_REPEAT_THRESHOLD', 5)),
+        max_statements=int(config.get('QUERY_PROFILE_MAX_STATEMENTS', 20)),
+    )
+
+
+def get_profiler(app=None):
+    """Return the query profiler registered on the (current) Flask app"""
+    app = app or current_app
+    profiler = app.extensions.get('query_profiler')
+    if profiler is None:
+        profiler = app.extensions['query_profiler'] = create_profiler(app.config)
+    return profiler
+
+
+def init_app(app):
+    profiler = app.extensions['query_profiler'] = create_profiler(app.config)
+    app.before_request(profiler.before_request)
+    app.after_request(profiler.after_request)
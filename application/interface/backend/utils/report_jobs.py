@@ -0,0 +1,361 @@
+"""
+Analytics report jobs
+Runs patient_summary / clinician_workload reports in the background and
+streams their rows into CSV or NDJSON export files, so large date ranges do
+not have to fit in one request
+"""
+import csv
+import hashlib
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from flask import current_app
+from ..database import get_db
+from .audit_logger import audit_logger
+from .analytics_rollups import PATIENT_SUMMARY_QUERY, CLINICIAN_WORKLOAD_QUERY
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', '.csv'),
+    'ndjson': ('application/x-ndjson', '.ndjson'),
+}
+
+
+def _patient_summary_row(row):
+    return {
+        'patient_id': row[0],
+        'name': row[1],
+        'date_of_birth': row[2].isoformat() if row[2] else None,
+        'gender': row[3],
+        'appointments': row[4],
+        'sessions': row[5],
+        'assessments': row[6]
+    }
+
+
+def _clinician_workload_row(row):
+    return {
+        'clinician_id': row[0],
+        'name': row[1],
+        'specialty': row[2],
+        'patient_count': row[3],
+        'appointments': row[4],
+        'sessions': row[5],
+        'avg_session_duration': float(row[6]) if row[6] else 0
+    }
+
+
+# Reader query, export columns and row formatter per report type
+REPORT_TYPES = {
+    'patient_summary': (
+        PATIENT_SUMMARY_QUERY,
+        ('patient_id', 'name', 'date_of_birth', 'gender', 'appointments', 'sessions', 'assessments'),
+        _patient_summary_row,
+    ),
+    'clinician_workload': (
+        CLINICIAN_WORKLOAD_QUERY,
+        ('clinician_id', 'name', 'specialty', 'patient_count', 'appointments', 'sessions', 'avg_session_duration'),
+        _clinician_workload_row,
+    ),
+}
+
+
+def format_report_rows(report_type, rows):
+    """
+    Convert rollup reader rows into report records
+
+    Args:
+        report_type: Key of REPORT_TYPES
+        rows: Rows returned by the report type's query
+
+    Returns:
+        List of dictionaries
+    """
+    formatter = REPORT_TYPES[report_type][2]
+    return [formatter(row) for row in rows]
+
+
+class ReportJob:
+    """State of one report export"""
+
+    def __init__(self, job_id, key, report_type, start_day, end_day, clinician_id, scoped,
+                 export_format, user_id, ip_address):
+        self.id = job_id
+        self.key = key
+        self.report_type = report_type
+        self.start_day = start_day
+        self.end_day = end_day
+        self.clinician_id = clinician_id
+        self.scoped = scoped
+        self.format = export_format
+        self.user_id = user_id
+        self.ip_address = ip_address
+        self.status = QUEUED
+        self.rows_written = 0
+        self.error = None
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def scope(self):
+        """Who may read this job: 'all' or 'clinician:<id>'"""
+        return f'clinician:{self.clinician_id}' if self.scoped else 'all'
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'report_type': self.report_type,
+            'format': self.format,
+            'status': self.status,
+            'rows_written': self.rows_written,
+            'date_range': {
+                'start': self.start_day.isoformat(),
+                'end': self.end_day.isoformat()
+            },
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class ReportJobQueue:
+    """
+    In-process report job queue
+
+    Jobs run on a thread pool inside an app context, reading the report query
+    through a server-side cursor chunk_size rows at a time and appending each
+    chunk to the export file. An identical request (same report, range, scope
+    and format) made while a job is queued or running returns that job instead
+    of starting another. Finished jobs and their files are kept for
+    retention seconds.
+    """
+
+    def __init__(self, app, directory='reports', max_workers=2, chunk_size=1000, retention=86400):
+        """
+        Initialize the queue
+
+        Args:
+            app: Flask app whose config and database pool the jobs use
+            directory: Where export files are written
+            max_workers: Reports generated concurrently
+            chunk_size: Rows fetched and written per chunk
+            retention: Seconds finished jobs remain downloadable
+        """
+        self.app = app
+        self.directory = directory
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.retention = retention
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self._jobs = {}
+        self._in_flight = {}
+        self._stats = {
+            'submitted': 0,
+            'deduplicated': 0,
+            'completed': 0,
+            'failed': 0,
+            'rows_exported': 0,
+        }
+
+    @staticmethod
+    def job_key(report_type, start_day, end_day, clinician_id, scoped, export_format):
+        raw = json.dumps([report_type, start_day.isoformat(), end_day.isoformat(),
+                          clinician_id if scoped else None, export_format])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def path_for(self, job):
+        return os.path.join(self.directory, job.id + EXPORT_FORMATS[job.format][1])
+
+    def submit(self, report_type, start_day, end_day, clinician_id=None, scoped=False,
+               export_format='csv', user_id=None, ip_address=None):
+        """
+        Enqueue a report, or join the identical one already in flight
+
+        Args:
+            report_type: Key of REPORT_TYPES
+            start_day: First day (inclusive)
+            end_day: Last day (inclusive)
+            clinician_id: Clinician ID used when scoped
+            scoped: Restrict rows to the clinician and its assigned patients
+            export_format: 'csv' or 'ndjson'
+            user_id: Requesting user, recorded in the export audit log
+            ip_address: Requesting address, recorded in the export audit log
+
+        Returns:
+            Tuple of (ReportJob, created) where created is False for a
+            deduplicated request
+        """
+        if report_type not in REPORT_TYPES:
+            raise ValueError(f"Unknown report type: {report_type}")
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format}")
+
+        key = self.job_key(report_type, start_day, end_day, clinician_id, scoped, export_format)
+        with self._lock:
+            self._prune_locked()
+            job_id = self._in_flight.get(key)
+            if job_id is not None:
+                self._stats['deduplicated'] += 1
+                return self._jobs[job_id], False
+
+            job = ReportJob(uuid.uuid4().hex, key, report_type, start_day, end_day,
+                            clinician_id if scoped else None, scoped, export_format, user_id, ip_address)
+            self._jobs[job.id] = job
+            self._in_flight[key] = job.id
+            self._stats['submitted'] += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='report-job')
+            executor = self._executor
+        executor.submit(self._run, job)
+        return job, True
+
+    def get(self, job_id):
+        """Return the job with this ID, or None"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune_locked(self):
+        cutoff = datetime.now().timestamp() - self.retention
+        expired = [job for job in self._jobs.values()
+                   if job.finished_at is not None and job.finished_at.timestamp() < cutoff]
+        for job in expired:
+            del self._jobs[job.id]
+            try:
+                os.remove(self.path_for(job))
+            except OSError:
+                pass
+
+    def _write_rows(self, job, handle):
+        query, columns, formatter = REPORT_TYPES[job.report_type]
+        writer = None
+        if job.format == 'csv':
+            writer = csv.DictWriter(handle, fieldnames=columns)
+            writer.writeheader()
+
+        db = get_db()
+        cur = db.cursor(name=f'report_job_{job.id}')
+        cur.itersize = self.chunk_size
+        try:
+            cur.execute(query, {
+                'start_day': job.start_day,
+                'end_day': job.end_day,
+                'clinician_id': job.clinician_id,
+                'scoped': job.scoped,
+                'unit': 'day',
+            })
+            while True:
+                rows = cur.fetchmany(self.chunk_size)
+                if not rows:
+                    break
+                records = [formatter(row) for row in rows]
+                if writer is not None:
+                    writer.writerows(records)
+                else:
+                    handle.write(''.join(json.dumps(record) + '\n' for record in records))
+                handle.flush()
+                job.rows_written += len(records)
+        finally:
+            cur.close()
+
+    def _run(self, job):
+        path = self.path_for(job)
+        partial = path + '.part'
+        job.status = RUNNING
+        job.started_at = datetime.now()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with self.app.app_context():
+                with open(partial, 'w', newline='', encoding='utf-8') as handle:
+                    self._write_rows(job, handle)
+            # Only complete files are ever visible under the download path
+            os.replace(partial, path)
+            job.status = COMPLETED
+        except Exception as e:
+            job.status = FAILED
+            job.error = 'Report generation failed'
+            self.app.logger.error(f"Report job {job.id} failed: {e}")
+            try:
+                os.remove(partial)
+            except OSError:
+                pass
+        finally:
+            job.finished_at = datetime.now()
+            with self._lock:
+                self._in_flight.pop(job.key, None)
+                if job.status == COMPLETED:
+                    self._stats['completed'] += 1
+                    self._stats['rows_exported'] += job.rows_written
+                else:
+                    self._stats['failed'] += 1
+
+        if job.status == COMPLETED:
+            audit_logger.log_data_export(
+                user_id=job.user_id,
+                export_type=f'report_{job.report_type}',
+                record_count=job.rows_written,
+                ip_address=job.ip_address,
+                purpose=f'{job.report_type} report {job.start_day.isoformat()} to {job.end_day.isoformat()}'
+            )
+
+    def stats(self):
+        """
+        Snapshot of queue activity
+
+        Returns:
+            Dictionary with lifetime counters and current job counts
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._in_flight)
+            stats['retained'] = len(self._jobs)
+        return stats
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+def create_report_jobs(app):
+    """
+    Build a report job queue from the app's config
+
+    Args:
+        app: Flask app with optional REPORT_JOBS_* settings
+
+    Returns:
+        ReportJobQueue instance
+    """
+    config = app.config
+    return ReportJobQueue(
+        app,
+        directory=config.get('REPORT_JOBS_DIR', 'reports'),
+        max_workers=int(config.get('REPORT_JOBS_WORKERS', 2)),
+        chunk_size=int(config.get('REPORT_JOBS_CHUNK_SIZE', 1000)),
+        retention=int(config.get('REPORT_JOBS_RETENTION', 86400)),
+    )
+
+
+def get_report_jobs(app=None):
+    """Return the report job queue registered on the (current) Flask app"""
+    app = app or current_app._get_current_object()
+    jobs = app.extensions.get('report_jobs')
+    if jobs is None:
+        jobs = app.extensions['report_jobs'] = create_report_jobs(app)
+    return jobs
+
+
+def init_app(app):
+    app.extensions['report_jobs'] = create_report_jobs(app)
@@ -0,0 +1,353 @@
+"""
+Role-scoped response cache
+Caches JSON bodies of read-heavy endpoints (analytics dashboard and trends)
+with TTLs, LRU eviction under a memory budget, and explicit invalidation
+from the model write paths
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, has_app_context, jsonify, request
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from .auth_utils import get_clinician_id
+
+# Invalidation scopes. Every cache key embeds the current version of the
+# 'all' scope and of the scope its data depends on; bumping a version makes
+# the older entries unreachable, and they age out through TTL/LRU. This works
+# the same way for the in-process and the shared backend.
+SCOPE_ALL = 'all'
+SCOPE_ADMIN = 'admin'
+SCOPE_PATIENTS = 'patients'
+
+
+def clinician_scope(clinician_id):
+    return f'clinician:{clinician_id}'
+
+
+class MemoryCacheBackend:
+    """
+    In-process LRU cache with per-entry TTL and a byte budget
+
+    Values are stored serialized, so the budget counts the actual payload
+    size and cached objects can never be mutated by callers.
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024, max_entries=10000):
+        """
+        Initialize the backend
+
+        Args:
+            max_bytes: Upper bound on the summed size of stored values
+            max_entries: Upper bound on the number of stored values
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # key -> (expires_at, payload), least recently used first
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._bytes = 0
+        self._stats = {'hits': 0, 'misses': 0, 'sets': 0, 'evictions': 0, 'expired': 0, 'rejected': 0}
+
+    def _drop_locked(self, key):
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            expires_at, payload = entry
+            if expires_at <= time.monotonic():
+                self._drop_locked(key)
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+        return json.loads(payload)
+
+    def set(self, key, value, ttl):
+        payload = json.dumps(value, separators=(',', ':'))
+        with self._lock:
+            if len(payload) > self.max_bytes:
+                self._stats['rejected'] += 1
+                return
+            if key in self._entries:
+                self._drop_locked(key)
+            self._entries[key] = (time.monotonic() + ttl, payload)
+            self._bytes += len(payload)
+            self._stats['sets'] += 1
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                self._drop_locked(next(iter(self._entries)))
+                self._stats['evictions'] += 1
+
+    def get_version(self, scope):
+        with self._lock:
+            return self._versions.get(scope, 0)
+
+    def bump_version(self, scope):
+        with self._lock:
+            self._versions[scope] = self._versions.get(scope, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._versions = {}
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'backend': 'memory',
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            })
+        return stats
+
+
+class RedisCacheBackend:
+    """
+    Shared cache for multi-worker deployments
+
+    Entries expire through Redis TTLs; the memory budget is left to the Redis
+    server's maxmemory/allkeys-lru policy. Scope versions are Redis counters,
+    so an invalidation in one worker is seen by all of them.
+    """
+
+    def __init__(self, client, prefix='meditrack:cache:'):
+        """
+        Initialize the backend
+
+        Args:
+            client: redis.Redis compatible client
+            prefix: Namespace for all keys written by this cache
+        """
+        self.client = client
+        self.prefix = prefix
+        self._stats = {'hits': 0, 'misses': 0, 'sets': 0, 'errors': 0}
+
+    @classmethod
+    def from_url(cls, url, prefix='meditrack:cache:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("ANALYTICS_CACHE_BACKEND=redis requires the 'redis' package")
+        return cls(redis.Redis.from_url(url), prefix=prefix)
+
+    def get(self, key):
+        try:
+            payload = self.client.get(self.prefix + key)
+        except Exception:
+            # A cache outage must not take the endpoint down
+            self._stats['errors'] += 1
+            return None
+        if payload is None:
+            self._stats['misses'] += 1
+            return None
+        self._stats['hits'] += 1
+        return json.loads(payload)
+
+    def set(self, key, value, ttl):
+        try:
+            self.client.set(self.prefix + key, json.dumps(value, separators=(',', ':')), ex=max(1, int(ttl)))
+            self._stats['sets'] += 1
+        except Exception:
+            self._stats['errors'] += 1
+
+    def get_version(self, scope):
+        try:
+            version = self.client.get(self.prefix + 'version:' + scope)
+        except Exception:
+            self._stats['errors'] += 1
+            return None
+        return int(version) if version is not None else 0
+
+    def bump_version(self, scope):
+        try:
+            self.client.incr(self.prefix + 'version:' + scope)
+        except Exception:
+            self._stats['errors'] += 1
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + '*'):
+            self.client.delete(key)
+
+    def stats(self):
+        stats = dict(self._stats)
+        stats['backend'] = 'redis'
+        return stats
+
+
+class ResponseCache:
+    """
+    Versioned, scope-aware cache in front of a backend
+    """
+
+    def __init__(self, backend, default_ttl=60):
+        self.backend = backend
+        self.default_ttl = default_ttl
+
+    def _versioned_key(self, scope, key):
+        all_version = self.backend.get_version(SCOPE_ALL)
+        scope_version = self.backend.get_version(scope)
+        if all_version is None or scope_version is None:
+            return None
+        return f'{all_version}.{scope_version}:{key}'
+
+    def get(self, scope, key):
+        versioned = self._versioned_key(scope, key)
+        return self.backend.get(versioned) if versioned else None
+
+    def set(self, scope, key, value, ttl=None):
+        versioned = self._versioned_key(scope, key)
+        if versioned:
+            self.backend.set(versioned, value, ttl or self.default_ttl)
+
+    def invalidate(self, clinician_id=None):
+        """
+        Drop cached responses affected by a write
+
+        Args:
+            clinician_id: Clinician whose data changed. Invalidates that
+                clinician, the admin-wide views and patient views. When None,
+                everything is invalidated.
+        """
+        if clinician_id is None:
+            self.backend.bump_version(SCOPE_ALL)
+            return
+        self.backend.bump_version(clinician_scope(clinician_id))
+        self.backend.bump_version(SCOPE_ADMIN)
+        self.backend.bump_version(SCOPE_PATIENTS)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        return self.backend.stats()
+
+
+class NullResponseCache:
+    """Cache used when ANALYTICS_CACHE_BACKEND=none"""
+
+    def get(self, scope, key):
+        return None
+
+    def set(self, scope, key, value, ttl=None):
+        pass
+
+    def invalidate(self, clinician_id=None):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {'backend': 'none'}
+
+
+def create_cache(config):
+    """
+    Build a response cache from a Flask config mapping
+
+    Args:
+        config: Mapping with optional ANALYTICS_CACHE_* settings
+
+    Returns:
+        ResponseCache or NullResponseCache instance
+    """
+    backend_name = config.get('ANALYTICS_CACHE_BACKEND', 'memory')
+    ttl = float(config.get('ANALYTICS_CACHE_TTL', 60))
+    if backend_name == 'none':
+        return NullResponseCache()
+    if backend_name == 'redis':
+        backend = RedisCacheBackend.from_url(config.get('ANALYTICS_CACHE_REDIS_URL', 'redis://localhost:6379/0'))
+    elif backend_name == 'memory':
+        backend = MemoryCacheBackend(
+            max_bytes=int(config.get('ANALYTICS_CACHE_MAX_BYTES', 16 * 1024 * 1024)),
+            max_entries=int(config.get('ANALYTICS_CACHE_MAX_ENTRIES', 10000)),
+        )
+    else:
+        raise ValueError(f"Unknown ANALYTICS_CACHE_BACKEND: {backend_name}")
+    return ResponseCache(backend, default_ttl=ttl)
+
+
+def get_cache(app=None):
+    """Return the response cache registered on the (current) Flask app"""
+    app = app or current_app
+    cache = app.extensions.get('response_cache')
+    if cache is None:
+        cache = app.extensions['response_cache'] = create_cache(app.config)
+    return cache
+
+
+def init_app(app):
+    app.extensions['response_cache'] = create_cache(app.config)
+
+
+def invalidate_analytics(clinician_id=None):
+    """
+    Invalidation hook for model write paths
+
+    A no-op outside an application context (scripts, CLI imports).
+
+    Args:
+        clinician_id: Clinician whose data changed, or None for everything
+    """
+    if has_app_context():
+        get_cache().invalidate(clinician_id)
+
+
+def cached_response(endpoint, params=(), ttl=None):
+    """
+    Decorator caching a view's 200 JSON response per caller scope
+
+    The key covers the endpoint, the caller's role and scope identity and the
+    listed query parameters. Admin responses are shared between admins;
+    clinician and patient responses are keyed by their own user and clinician
+    IDs, so scoped data is never served to another caller. Place it below
+    @audit_log so cache hits are still audited.
+
+    Args:
+        endpoint: Name used as the key prefix
+        params: Query parameter names that select the response
+        ttl: Seconds to keep the response (default ANALYTICS_CACHE_TTL)
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            role = get_jwt().get('role', 'patient')
+            user_id = get_jwt_identity()
+            clinician_id = None
+            if role == 'admin':
+                scope = SCOPE_ADMIN
+                identity = 'admin'
+            elif role == 'clinician':
+                clinician_id = get_clinician_id(user_id)
+                scope = clinician_scope(clinician_id)
+                identity = f'clinician:{clinician_id}:{user_id}'
+            else:
+                scope = SCOPE_PATIENTS
+                identity = f'{role}:{user_id}'
+
+            selectors = '&'.join(f'{name}={request.args.get(name, "")}' for name in params)
+            key = f'{endpoint}|{identity}|{selectors}'
+
+            cache = get_cache()
+            body = cache.get(scope, key)
+            if body is not None:
+                return jsonify(body), 200
+
+            response = f(*args, **kwargs)
+            rv, status = response if isinstance(response, tuple) else (response, 200)
+            if status == 200:
+                cache.set(scope, key, rv.get_json(), ttl)
+            return response
+        return decorated_function
+    return decorator
@@ -0,0 +1,252 @@
+"""
+JWT revocation cache
+Answers the token_in_blocklist check from an in-memory bloom filter of
+revoked JTIs so that the common case (token not revoked) does not touch the
+database. The filter is refreshed incrementally from token_blacklist and
+rebuilt periodically to drop expired entries.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+from flask import current_app
+from ..database import get_db
+
+# Rows newer than the watermark minus this overlap are re-read on every
+# refresh, so a row committed late with an older blacklisted_at is not missed.
+# Re-adding a JTI to the filter is harmless.
+WATERMARK_OVERLAP = timedelta(seconds=30)
+
+# Expired tokens are rejected by signature/exp validation before the blocklist
+# check runs, so rebuilds only load rows that can still matter. The margin
+# covers the naive timestamps in token_blacklist being written in mixed zones.
+LOAD_ACTIVE_QUERY = """
+    SELECT jti, blacklisted_at FROM token_blacklist
+    WHERE expires_at > CURRENT_TIMESTAMP - INTERVAL '1 day'
+"""
+
+LOAD_SINCE_QUERY = """
+    SELECT jti, blacklisted_at FROM token_blacklist
+    WHERE blacklisted_at > %s
+"""
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings (double hashing on blake2b)"""
+
+    def __init__(self, capacity, error_rate=0.001):
+        """
+        Size the filter for an expected number of items
+
+        Args:
+            capacity: Number of items at which error_rate is reached
+            error_rate: Target false positive probability
+        """
+        capacity = max(1, int(capacity))
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationCache:
+    """
+    Bloom-filter front for token_blacklist lookups
+
+    A negative filter answer means "not revoked" and skips the database; a
+    positive answer is confirmed with an exact query, so false positives cost
+    one lookup and never reject a valid token. Revocations made by other
+    workers become visible within max_staleness seconds. If the filter cannot
+    be refreshed, every check falls back to the database.
+    """
+
+    def __init__(self, mode='bloom', max_staleness=5.0, rebuild_interval=3600.0,
+                 capacity=100000, error_rate=0.001):
+        """
+        Initialize the cache
+
+        Args:
+            mode: 'bloom' to use the filter, 'db' to always query token_blacklist
+            max_staleness: Seconds before the filter must be refreshed
+            rebuild_interval: Seconds between full rebuilds that drop expired JTIs
+            capacity: Minimum number of JTIs the filter is sized for
+            error_rate: Target false positive probability
+        """
+        if mode not in ('bloom', 'db'):
+            raise ValueError(f"Unknown revocation cache mode: {mode}")
+        self.mode = mode
+        self.max_staleness = max_staleness
+        self.rebuild_interval = rebuild_interval
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        self._lock = threading.Lock()
+        self._filter = None
+        self._watermark = None
+        self._refreshed_at = 0.0
+        self._built_at = 0.0
+        self._stats = {
+            'checks': 0,
+            'filter_negatives': 0,
+            'db_lookups': 0,
+            'false_positives': 0,
+            'refreshes': 0,
+            'rebuilds': 0,
+            'refresh_failures': 0,
+        }
+
+    def _query_revoked(self, cur, jti):
+        self._stats['db_lookups'] += 1
+        cur.execute("SELECT 1 FROM token_blacklist WHERE jti = %s", (jti,))
+        return cur.fetchone() is not None
+
+    def _rebuild_locked(self, cur):
+        cur.execute(LOAD_ACTIVE_QUERY)
+        rows = cur.fetchall()
+        bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+        for jti, _ in rows:
+            bloom.add(jti)
+        self._filter = bloom
+        self._watermark = max((blacklisted_at for _, blacklisted_at in rows), default=None)
+        self._built_at = time.monotonic()
+        self._stats['rebuilds'] += 1
+
+    def _refresh_locked(self, cur):
+        now = time.monotonic()
+        if (self._filter is None or self._watermark is None
+                or now - self._built_at > self.rebuild_interval
+                or self._filter.count > self._filter.capacity):
+            self._rebuild_locked(cur)
+        else:
+            cur.execute(LOAD_SINCE_QUERY, (self._watermark - WATERMARK_OVERLAP,))
+            for jti, blacklisted_at in cur.fetchall():
+                self._filter.add(jti)
+                if blacklisted_at > self._watermark:
+                    self._watermark = blacklisted_at
+        self._refreshed_at = now
+        self._stats['refreshes'] += 1
+
+    def _fresh_filter(self):
+        if self._filter is not None and time.monotonic() - self._refreshed_at <= self.max_staleness:
+            return self._filter
+        return None
+
+    def _refreshed_filter(self, cur):
+        with self._lock:
+            bloom = self._fresh_filter()
+            if bloom is not None:
+                # Another thread refreshed while we waited for the lock
+                return bloom
+            try:
+                self._refresh_locked(cur)
+            except Exception:
+                self._stats['refresh_failures'] += 1
+                try:
+                    cur.connection.rollback()
+                except Exception:
+                    pass
+                return None
+            return self._filter
+
+    def is_revoked(self, jti):
+        """
+        Check whether a token has been revoked
+
+        Args:
+            jti: JWT ID claim
+
+        Returns:
+            True if the JTI is in token_blacklist
+        """
+        self._stats['checks'] += 1
+        bloom = self._fresh_filter() if self.mode == 'bloom' else None
+        if bloom is not None and jti not in bloom:
+            self._stats['filter_negatives'] += 1
+            return False
+
+        cur = get_db().cursor()
+        try:
+            if self.mode == 'bloom' and bloom is None:
+                bloom = self._refreshed_filter(cur)
+                if bloom is not None and jti not in bloom:
+                    self._stats['filter_negatives'] += 1
+                    return False
+            revoked = self._query_revoked(cur, jti)
+            if bloom is not None and not revoked:
+                self._stats['false_positives'] += 1
+            return revoked
+        finally:
+            cur.close()
+
+    def add(self, jti):
+        """
+        Record a revocation made by this worker immediately
+
+        Args:
+            jti: JWT ID claim just inserted into token_blacklist
+        """
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+
+    def stats(self):
+        """
+        Snapshot of cache effectiveness
+
+        Returns:
+            Dictionary with lifetime counters and filter sizing
+        """
+        stats = dict(self._stats)
+        stats['mode'] = self.mode
+        bloom = self._filter
+        stats['filter_items'] = bloom.count if bloom else 0
+        stats['filter_bytes'] = len(bloom.bits) if bloom else 0
+        return stats
+
+
+def create_revocation_cache(config):
+    """
+    Build a revocation cache from a Flask config mapping
+
+    Args:
+        config: Mapping with optional JWT_REVOCATION_* settings
+
+    Returns:
+        RevocationCache instance
+    """
+    return RevocationCache(
+        mode=config.get('JWT_REVOCATION_CACHE_MODE', 'bloom'),
+        max_staleness=float(config.get('JWT_REVOCATION_MAX_STALENESS', 5)),
+        rebuild_interval=float(config.get('JWT_REVOCATION_REBUILD_INTERVAL', 3600)),
+        capacity=int(config.get('JWT_REVOCATION_CAPACITY', 100000)),
+        error_rate=float(config.get('JWT_REVOCATION_ERROR_RATE', 0.001)),
+    )
+
+
+def get_revocation_cache(app=None):
+    """Return the revocation cache registered on the (current) Flask app"""
+    app = app or current_app
+    cache = app.extensions.get('revocation_cache')
+    if cache is None:
+        cache = app.extensions['revocation_cache'] = create_revocation_cache(app.config)
+    return cache
+
+
+def init_app(app):
+    app.extensions['revocation_cache'] = create_revocation_cache(app.config)
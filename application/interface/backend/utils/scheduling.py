@@ -0,0 +1,89 @@
+"""
+Batch appointment scheduling
+Checks a batch of proposed appointment times against a clinician's existing
+appointments and each other using sorted in-memory indexes, replacing one
+overlap query per proposed appointment
+"""
+from bisect import bisect_left, insort
+from datetime import timedelta
+
+# BR8: appointments of one clinician closer than this overlap (inclusive,
+# as in BusinessRules.check_appointment_overlap)
+CONFLICT_WINDOW = timedelta(hours=1)
+
+CONFLICT_EXISTING = 'Clinician has a conflicting appointment at this time'
+CONFLICT_BATCH = 'Conflicts with an earlier appointment in this batch'
+# appointments (clinician_id, appointment_time) is unique, cancelled rows included
+CONFLICT_SLOT = 'Clinician already has an appointment record at this exact time'
+
+
+class AppointmentSlotIndex:
+    """Sorted appointment start times supporting window conflict lookups"""
+
+    def __init__(self, times=(), window=CONFLICT_WINDOW):
+        self.window = window
+        self._times = sorted(times)
+
+    def conflicts(self, appointment_time):
+        """True if a stored time lies within window of appointment_time"""
+        i = bisect_left(self._times, appointment_time - self.window)
+        return i < len(self._times) and self._times[i] <= appointment_time + self.window
+
+    def add(self, appointment_time):
+        insort(self._times, appointment_time)
+
+    def __len__(self):
+        return len(self._times)
+
+
+def conflict_window(proposals, window=CONFLICT_WINDOW):
+    """
+    Time range of existing appointments that can conflict with a batch
+
+    Args:
+        proposals: Sequence of dictionaries with an appointment_time
+        window: Conflict window
+
+    Returns:
+        Tuple of (start, end) datetimes, inclusive
+    """
+    times = [proposal['appointment_time'] for proposal in proposals]
+    return min(times) - window, max(times) + window
+
+
+def plan_appointment_batch(existing_times, proposals, window=CONFLICT_WINDOW, taken_times=()):
+    """
+    Split proposed appointments into accepted and rejected
+
+    Proposals are taken in order; each is checked against the existing
+    appointments and against the proposals accepted before it.
+
+    Args:
+        existing_times: Start times of the clinician's non-cancelled
+            appointments within conflict_window(proposals)
+        proposals: Sequence of dictionaries with an appointment_time
+        window: Conflict window
+        taken_times: Start times that block only an exact match (the
+            clinician's cancelled appointments, which keep their unique slot)
+
+    Returns:
+        Tuple of (accepted, rejected). accepted is a list of proposals,
+        rejected a list of (index, proposal, reason) tuples.
+    """
+    existing = AppointmentSlotIndex(existing_times, window)
+    batch = AppointmentSlotIndex(window=window)
+    taken = set(taken_times)
+    accepted = []
+    rejected = []
+    for index, proposal in enumerate(proposals):
+        appointment_time = proposal['appointment_time']
+        if existing.conflicts(appointment_time):
+            rejected.append((index, proposal, CONFLICT_EXISTING))
+        elif appointment_time in taken:
+            rejected.append((index, proposal, CONFLICT_SLOT))
+        elif batch.conflicts(appointment_time):
+            rejected.append((index, proposal, CONFLICT_BATCH))
+        else:
+            batch.add(appointment_time)
+            accepted.append(proposal)
+    return accepted, rejected
@@ -2,9 +2,17 @@
 Validation utilities for input validation and business rules
 """
 import re
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from functools import wraps
 from flask import request, jsonify
+from .auth_utils import is_patient_assigned
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+BLOOD_PRESSURE_PATTERN = re.compile(r'^\d{2,3}/\d{2,3}$')
+NON_DIGIT_PATTERN = re.compile(r'[^\d]')
+UPPERCASE_PATTERN = re.compile(r'[A-Z]')
+NUMBER_PATTERN = re.compile(r'\d')
+SPECIAL_CHARACTER_PATTERN = re.compile(r'[!@#$%^&*(),.?":{}|<>]')
 
 
 class ValidationError(Exception):
@@ -15,6 +23,30 @@ class ValidationError(Exception):
         super().__init__(self.message)
 
 
+class BulkValidationError(ValidationError):
+    """Raised by bulk writes when rows fail validation; nothing is written"""
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(f"{len({index for index, _, _ in errors})} rows failed validation")
+
+
+def parse_naive_utc(value):
+    """
+    Parse an ISO format datetime for a timestamp without time zone column
+
+    Values with an offset (including a trailing Z) are converted to UTC and
+    returned naive, so they compare with the naive timestamps read from the
+    database; naive values are returned unchanged.
+
+    Raises:
+        ValueError, TypeError: value is not an ISO format datetime string
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
 class Validators:
     """Collection of validation functions"""
     
@@ -24,8 +56,7 @@ class Validators:
         if not email:
             raise ValidationError("Email is required", "email")
         
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(pattern, email):
+        if not EMAIL_PATTERN.match(email):
             raise ValidationError("Invalid email format", "email")
         
         return True
@@ -38,36 +69,10 @@ class Validators:
         Args:
             password: Password to validate
             config: Configuration object with password policy settings
-        """
-        if not password:
-            raise ValidationError("Password is required", "password")
-        
-        # Default policy
-        min_length = 12
-        require_special = True
-        require_number = True
-        require_uppercase = True
-        
-        # Override with config if provided
-        if config:
-            min_length = getattr(config, 'PASSWORD_MIN_LENGTH', 12)
-            require_special = getattr(config, 'PASSWORD_REQUIRE_SPECIAL', True)
-            require_number = getattr(config, 'PASSWORD_REQUIRE_NUMBER', True)
-            require_uppercase = getattr(config, 'PASSWORD_REQUIRE_UPPERCASE', True)
-        
-        if len(password) < min_length:
-            raise ValidationError(f"Password must be at least {min_length} characters", "password")
-        
-        if require_uppercase and not re.search(r'[A-Z]', password):
-            raise ValidationError("Password must contain at least one uppercase letter", "password")
-        
-        if require_number and not re.search(r'\d', password):
-            raise ValidationError("Password must contain at least one number", "password")
-        
-        if require_special and not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
-            raise ValidationError("Password must contain at least one special character", "password")
         
-        return True
+        Routes should bind the policy once with password_validator(config).
+        """
+        return password_validator(config)(password)
     
     @staticmethod
     def validate_date_of_birth(dob):
@@ -98,7 +103,7 @@ class Validators:
             return True  # Phone is optional in many cases
         
         # Remove common formatting characters
-        digits = re.sub(r'[^\d]', '', phone)
+        digits = NON_DIGIT_PATTERN.sub('', phone)
         
         if len(digits) < 10 or len(digits) > 15:
             raise ValidationError("Invalid phone number", "phone")
@@ -125,8 +130,7 @@ class Validators:
         if not bp:
             return True  # Optional field
         
-        pattern = r'^\d{2,3}/\d{2,3}$'
-        if not re.match(pattern, bp):
+        if not BLOOD_PRESSURE_PATTERN.match(bp):
             raise ValidationError("Invalid blood pressure format. Use format: 120/80", "blood_pressure")
         
         systolic, diastolic = map(int, bp.split('/'))
@@ -286,18 +290,7 @@ class BusinessRules:
         Returns:
             Boolean indicating if clinician is assigned to patient
         """
-        cur = db.cursor()
-        cur.execute(
-            """
-            SELECT 1 FROM patient_clinician
-            WHERE patient_id = %s AND clinician_id = %s
-            """,
-            (patient_id, clinician_id)
-        )
-        result = cur.fetchone()
-        cur.close()
-        
-        if not result:
+        if not is_patient_assigned(clinician_id, patient_id, db=db):
             raise ValidationError(
                 "Clinician is not assigned to this patient",
                 "authorization"
@@ -375,21 +368,172 @@ class BusinessRules:
         return True
 
 
-def validate_request(schema):
+def password_validator(config=None):
+    """
+    Build a password validator with the policy read from config once
+
+    Args:
+        config: Configuration object with PASSWORD_* policy settings
+            (default: min length 12, uppercase, number and special required)
+
+    Returns:
+        Function(password) raising ValidationError on a policy violation
+    """
+    min_length = getattr(config, 'PASSWORD_MIN_LENGTH', 12) if config else 12
+    checks = []
+    if not config or getattr(config, 'PASSWORD_REQUIRE_UPPERCASE', True):
+        checks.append((UPPERCASE_PATTERN, "Password must contain at least one uppercase letter"))
+    if not config or getattr(config, 'PASSWORD_REQUIRE_NUMBER', True):
+        checks.append((NUMBER_PATTERN, "Password must contain at least one number"))
+    if not config or getattr(config, 'PASSWORD_REQUIRE_SPECIAL', True):
+        checks.append((SPECIAL_CHARACTER_PATTERN, "Password must contain at least one special character"))
+    checks = tuple(checks)
+    too_short = f"Password must be at least {min_length} characters"
+
+    def validate_password(password):
+        if not password:
+            raise ValidationError("Password is required", "password")
+        if len(password) < min_length:
+            raise ValidationError(too_short, "password")
+        for pattern, message in checks:
+            if not pattern.search(password):
+                raise ValidationError(message, "password")
+        return True
+
+    return validate_password
+
+
+def _compile_fields(schema):
+    # (field, message when missing or None, validator or None) in schema order
+    return tuple(
+        (field, f"{field} is required" if rules.get('required', False) else None, rules.get('validator'))
+        for field, rules in schema.items()
+    )
+
+
+def compile_schema(schema):
+    """
+    Turn a validate_request schema into a record validator
+
+    The schema is walked once here; the returned function only loops over
+    the prepared (field, required message, validator) entries.
+
+    Args:
+        schema: Dictionary of field -> {'required': bool, 'validator': callable}
+
+    Returns:
+        Function(data) returning a dictionary of field -> error message,
+        empty when data is valid
+    """
+    fields = _compile_fields(schema)
+
+    def validate(data):
+        errors = {}
+        for field, missing, validator in fields:
+            if field not in data:
+                if missing is not None:
+                    errors[field] = missing
+            elif validator is not None:
+                try:
+                    validator(data[field])
+                except ValidationError as e:
+                    errors[field] = e.message
+        return errors
+
+    return validate
+
+
+def compile_rows_schema(schema):
+    """
+    Turn a validate_request schema into a validator for arrays of records
+
+    Works column by column and runs each validator once per distinct value
+    of its column, so repeated values (gender, role_id, ...) are checked once.
+
+    Args:
+        schema: Dictionary of field -> {'required': bool, 'validator': callable}
+
+    Returns:
+        Function(rows) returning a list of (index, field, message) tuples
+        ordered by row, empty when every row is valid
+    """
+    fields = _compile_fields(schema)
+
+    def validate(rows):
+        errors = []
+        for field, missing, validator in fields:
+            results = {}
+            for index, row in enumerate(rows):
+                if field not in row:
+                    if missing is not None:
+                        errors.append((index, field, missing))
+                    continue
+                if validator is None:
+                    continue
+
+                value = row[field]
+                # Keyed by type too: 72, 72.0 and True are equal dict keys
+                key = (type(value), value)
+                try:
+                    message = results[key]
+                except KeyError:
+                    message = results[key] = _run_validator(validator, value)
+                except TypeError:  # unhashable value
+                    message = _run_validator(validator, value)
+                if message is not None:
+                    errors.append((index, field, message))
+
+        errors.sort(key=lambda error: error[0])
+        return errors
+
+    return validate
+
+
+def validate_rows(rows, schema):
+    """
+    Validate many rows against a validate_request schema
+
+    Args:
+        rows: Sequence of dictionaries
+        schema: Dictionary of field -> {'required': bool, 'validator': callable}
+
+    Returns:
+        List of (index, field, message) tuples ordered by row, empty when
+        every row is valid
+    """
+    return compile_rows_schema(schema)(rows)
+
+
+def _run_validator(validator, value):
+    try:
+        validator(value)
+    except ValidationError as e:
+        return e.message
+    return None
+
+
+def validate_request(schema, many=False):
     """
     Decorator for validating request data against a schema
     
+    The schema is compiled once, when the route is decorated.
+    
     Args:
         schema: Dictionary defining required and optional fields with validators
+        many: True when the body is a JSON array of records, or the name of
+            the body field holding that array (bulk endpoints)
         
     Usage:
         @validate_request({
             'email': {'required': True, 'validator': Validators.validate_email},
-            'password': {'required': True, 'validator': Validators.validate_password}
+            'password': {'required': True, 'validator': password_validator(config)}
         })
         def create_user():
             ...
     """
+    validate = compile_schema(schema)
+    validate_many = compile_rows_schema(schema) if many else None
+
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
@@ -398,20 +542,19 @@ def validate_request(schema):
             if not data:
                 return jsonify({'error': 'Request body is required'}), 400
             
-            errors = {}
-            
-            # Check required fields
-            for field, rules in schema.items():
-                if rules.get('required', False) and field not in data:
-                    errors[field] = f"{field} is required"
-                
-                # Run validator if field is present
-                if field in data and 'validator' in rules:
-                    try:
-                        rules['validator'](data[field])
-                    except ValidationError as e:
-                        errors[field] = e.message
+            if validate_many is not None:
+                rows = data if many is True else data.get(many) if isinstance(data, dict) else None
+                if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+                    return jsonify({'error': 'Request body must contain an array of objects'}), 400
+                errors = validate_many(rows)
+                if errors:
+                    return jsonify({'errors': [
+                        {'index': index, 'field': field, 'error': message}
+                        for index, field, message in errors
+                    ]}), 400
+                return f(*args, **kwargs)
             
+            errors = validate(data)
             if errors:
                 return jsonify({'errors': errors}), 400
             
@@ -0,0 +1,387 @@
+"""
+Vitals time series
+Maintains the per-minute, hourly and daily vitals tiers from
+scripts/postgresql/vitals_timeseries.sql and serves chart series from the
+tier that fits the requested range and point budget, downsampled with
+largest-triangle-three-buckets (LTTB)
+"""
+import click
+from datetime import date, timedelta
+from flask.cli import AppGroup
+from ..database import get_db
+
+# Tier name, table, bucket length in seconds; finest first
+TIERS = (
+    ('minute', 'vitals_minute', 60),
+    ('hour', 'vitals_hourly', 3600),
+    ('day', 'vitals_daily', 86400),
+)
+
+TIER_COLUMNS = ('heart_rate', 'systolic', 'diastolic')
+
+# Blood pressure is stored as text ('120/80'); readings that do not parse
+# contribute their heart rate only
+_AGGREGATE = r"""
+    COUNT(*),
+    MIN(v.heart_rate), MAX(v.heart_rate), AVG(v.heart_rate),
+    MIN(bp.systolic), MAX(bp.systolic), AVG(bp.systolic),
+    MIN(bp.diastolic), MAX(bp.diastolic), AVG(bp.diastolic)
+FROM unnest(%(patient_ids)s::bigint[], %(days)s::date[]) AS d(patient_id, day)
+JOIN vitals v ON v.patient_id = d.patient_id AND v.recorded_at >= d.day AND v.recorded_at < d.day + 1
+LEFT JOIN LATERAL (
+    SELECT split_part(v.blood_pressure, '/', 1)::integer AS systolic,
+           split_part(v.blood_pressure, '/', 2)::integer AS diastolic
+    WHERE v.blood_pressure ~ '^\d{2,3}/\d{2,3}$'
+) bp ON true
+"""
+
+# Each (patient, day) is recomputed in whole for every tier: delete its
+# buckets, then re-aggregate the day's raw readings
+DELETE_TIER_QUERIES = [
+    f"""
+    DELETE FROM {table} t
+    USING unnest(%(patient_ids)s::bigint[], %(days)s::date[]) AS d(patient_id, day)
+    WHERE t.patient_id = d.patient_id AND t.bucket >= d.day AND t.bucket < d.day + 1
+    """
+    for _, table, _ in TIERS
+]
+
+INSERT_TIER_QUERIES = [
+    f"""
+    INSERT INTO {table} (patient_id, bucket, samples,
+        heart_rate_min, heart_rate_max, heart_rate_avg,
+        systolic_min, systolic_max, systolic_avg,
+        diastolic_min, diastolic_max, diastolic_avg)
+    SELECT v.patient_id, date_trunc('{name}', v.recorded_at), {_AGGREGATE}
+    GROUP BY v.patient_id, date_trunc('{name}', v.recorded_at)
+    """
+    for name, table, _ in TIERS
+]
+
+
+def recompute_patient_days(cur, patient_days):
+    """
+    Rebuild every tier row for the given (patient, day) pairs
+
+    Args:
+        cur: Database cursor (caller owns the transaction)
+        patient_days: Iterable of (patient_id, datetime.date)
+    """
+    pairs = list(patient_days)
+    if not pairs:
+        return
+    params = {'patient_ids': [pair[0] for pair in pairs], 'days': [pair[1] for pair in pairs]}
+    for query in DELETE_TIER_QUERIES:
+        cur.execute(query, params)
+    for query in INSERT_TIER_QUERIES:
+        cur.execute(query, params)
+
+
+def refresh_vitals_tiers(db, max_pairs=10000):
+    """
+    Recompute the (patient, day) pairs marked dirty by the vitals trigger
+
+    Claiming the pairs and rewriting their tiers happen in one transaction,
+    as in analytics_rollups.refresh_rollups.
+
+    Args:
+        db: Database connection
+        max_pairs: Upper bound on pairs processed per call
+
+    Returns:
+        Number of (patient, day) pairs recomputed
+    """
+    cur = db.cursor()
+    try:
+        cur.execute(
+            """
+            DELETE FROM vitals_rollup_dirty
+            WHERE (patient_id, day) IN (
+                SELECT patient_id, day FROM vitals_rollup_dirty
+                ORDER BY day, patient_id
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING patient_id, day
+            """,
+            (max_pairs,)
+        )
+        pairs = cur.fetchall()
+        recompute_patient_days(cur, pairs)
+        db.commit()
+        return len(pairs)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def backfill_vitals_tiers(db, start_day, end_day, chunk_days=7):
+    """
+    Rebuild the tiers of every patient with readings in a date range
+
+    Args:
+        db: Database connection
+        start_day: First day (inclusive)
+        end_day: Last day (inclusive)
+        chunk_days: Days recomputed per transaction
+
+    Returns:
+        Number of (patient, day) pairs recomputed
+    """
+    total = 0
+    cur = db.cursor()
+    try:
+        day = start_day
+        while day <= end_day:
+            chunk_end = min(day + timedelta(days=chunk_days - 1), end_day)
+            cur.execute(
+                """
+                SELECT DISTINCT patient_id, recorded_at::date FROM vitals
+                WHERE recorded_at >= %s AND recorded_at < %s
+                """,
+                (day, chunk_end + timedelta(days=1))
+            )
+            pairs = cur.fetchall()
+            recompute_patient_days(cur, pairs)
+            db.commit()
+            total += len(pairs)
+            day = chunk_end + timedelta(days=1)
+        return total
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def create_partitions(db, months_ahead=3):
+    """
+    Create the monthly vitals and vitals_minute partitions up to months_ahead
+
+    Args:
+        db: Database connection
+        months_ahead: Months past the current one to cover
+
+    Returns:
+        Number of partitions created
+    """
+    until = date.today() + timedelta(days=31 * months_ahead)
+    cur = db.cursor()
+    try:
+        created = 0
+        for parent in ('vitals', 'vitals_minute'):
+            cur.execute('SELECT vitals_create_partitions(%s, CURRENT_DATE, %s)', (parent, until))
+            created += cur.fetchone()[0]
+        db.commit()
+        return created
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def lttb_indices(xs, ys, threshold):
+    """
+    Largest-triangle-three-buckets point selection
+
+    Keeps the first and last point and, from each of threshold - 2 equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket, which
+    preserves peaks and troughs that plain averaging flattens.
+
+    Args:
+        xs: Increasing x values (numbers)
+        ys: y values (numbers)
+        threshold: Points to keep
+
+    Returns:
+        Sorted list of kept indices
+    """
+    n = len(xs)
+    if threshold >= n:
+        return list(range(n))
+    if threshold <= 2:
+        return [0, n - 1][:max(threshold, 0)]
+
+    every = (n - 2) / (threshold - 2)
+    kept = [0]
+    a = 0
+    for i in range(threshold - 2):
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        ax, ay = xs[a], ys[a]
+        best, best_area = next_start - 1, -1.0
+        for j in range(int(i * every) + 1, next_start):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+
+def downsample(points, threshold):
+    """
+    Reduce [time, value, ...] chart points to at most threshold with LTTB
+
+    Args:
+        points: List of sequences whose first element is a datetime and
+            second the plotted value
+        threshold: Maximum points returned
+
+    Returns:
+        List of the kept points, in order
+    """
+    if len(points) <= threshold:
+        return points
+    xs = [point[0].timestamp() for point in points]
+    ys = [point[1] for point in points]
+    return [points[i] for i in lttb_indices(xs, ys, threshold)]
+
+
+def _parse_blood_pressure(value):
+    try:
+        systolic, diastolic = value.split('/')
+        return int(systolic), int(diastolic)
+    except (AttributeError, ValueError):
+        return None, None
+
+
+def choose_tier(start, end, max_points):
+    """
+    Finest tier whose buckets over [start, end) fit in max_points
+
+    Args:
+        start: Range start (datetime)
+        end: Range end (datetime)
+        max_points: Point budget per series
+
+    Returns:
+        (name, table, bucket_seconds) from TIERS; the daily tier when none fits
+    """
+    span = (end - start).total_seconds()
+    for tier in TIERS:
+        if span / tier[2] <= max_points:
+            return tier
+    return TIERS[-1]
+
+
+def _series_points(rows, offset):
+    # [time, avg, min, max] for the tier columns at offset, skipping empty buckets
+    return [[row[0], row[offset + 2], row[offset], row[offset + 1]] for row in rows if row[offset + 2] is not None]
+
+
+def fetch_vitals_series(cur, patient_id, start, end, max_points):
+    """
+    Chart series of a patient's vitals over [start, end)
+
+    Raw readings are returned when there are no more than max_points of them;
+    otherwise the finest tier that fits is read. Either way each series is
+    cut to max_points with LTTB.
+
+    Args:
+        cur: Database cursor
+        patient_id: ID of the patient
+        start: Range start (datetime, inclusive)
+        end: Range end (datetime, exclusive)
+        max_points: Maximum points per series
+
+    Returns:
+        Dictionary with the tier used, its bucket_seconds, whether the tier
+        has pending refreshes in the range (stale) and series of heart_rate,
+        systolic and diastolic points. Raw points are [time, value]; tier
+        points are [bucket, avg, min, max].
+    """
+    cur.execute(
+        """
+        SELECT recorded_at, heart_rate, blood_pressure FROM vitals
+        WHERE patient_id = %s AND recorded_at >= %s AND recorded_at < %s
+        ORDER BY recorded_at
+        LIMIT %s
+        """,
+        (patient_id, start, end, max_points + 1)
+    )
+    rows = cur.fetchall()
+    if len(rows) <= max_points:
+        series = {column: [] for column in TIER_COLUMNS}
+        for recorded_at, heart_rate, blood_pressure in rows:
+            if heart_rate is not None:
+                series['heart_rate'].append([recorded_at, heart_rate])
+            systolic, diastolic = _parse_blood_pressure(blood_pressure)
+            if systolic is not None:
+                series['systolic'].append([recorded_at, systolic])
+                series['diastolic'].append([recorded_at, diastolic])
+        return {'tier': 'raw', 'bucket_seconds': None, 'stale': False, 'series': series}
+
+    name, table, bucket_seconds = choose_tier(start, end, max_points)
+    cur.execute(
+        f"""
+        SELECT bucket,
+            heart_rate_min, heart_rate_max, heart_rate_avg,
+            systolic_min, systolic_max, systolic_avg,
+            diastolic_min, diastolic_max, diastolic_avg
+        FROM {table}
+        WHERE patient_id = %(patient_id)s
+        AND bucket >= date_trunc(%(unit)s, %(start)s::timestamp) AND bucket < %(end)s
+        ORDER BY bucket
+        """,
+        {'patient_id': patient_id, 'unit': name, 'start': start, 'end': end}
+    )
+    rows = cur.fetchall()
+    series = {
+        column: downsample(_series_points(rows, 1 + 3 * i), max_points)
+        for i, column in enumerate(TIER_COLUMNS)
+    }
+
+    cur.execute(
+        """
+        SELECT EXISTS (
+            SELECT 1 FROM vitals_rollup_dirty
+            WHERE patient_id = %s AND day BETWEEN %s AND %s
+        )
+        """,
+        (patient_id, start.date(), end.date())
+    )
+    stale = bool(cur.fetchone()[0])
+    return {'tier': name, 'bucket_seconds': bucket_seconds, 'stale': stale, 'series': series}
+
+
+vitals_cli = AppGroup('vitals', help='Maintain the vitals time-series tiers and partitions.')
+
+
+@vitals_cli.command('refresh')
+@click.option('--max-pairs', default=10000, show_default=True, help='Maximum dirty (patient, day) pairs to recompute.')
+def refresh_command(max_pairs):
+    """Recompute patient-days changed since the last refresh."""
+    count = refresh_vitals_tiers(get_db(), max_pairs=max_pairs)
+    click.echo(f'Recomputed {count} patient-day(s).')
+
+
+@vitals_cli.command('backfill')
+@click.option('--start', 'start_str', required=True, help='First day, YYYY-MM-DD.')
+@click.option('--end', 'end_str', default=None, help='Last day, YYYY-MM-DD (default: today).')
+@click.option('--chunk-days', default=7, show_default=True, help='Days per transaction.')
+def backfill_command(start_str, end_str, chunk_days):
+    """Rebuild the tiers for a historical date range."""
+    start_day = date.fromisoformat(start_str)
+    end_day = date.fromisoformat(end_str) if end_str else date.today()
+    if start_day > end_day:
+        raise click.BadParameter('start must not be after end')
+    count = backfill_vitals_tiers(get_db(), start_day, end_day, chunk_days=chunk_days)
+    click.echo(f'Backfilled {count} patient-day(s) from {start_day} to {end_day}.')
+
+
+@vitals_cli.command('partitions')
+@click.option('--months-ahead', default=3, show_default=True, help='Months past the current one to cover.')
+def partitions_command(months_ahead):
+    """Create upcoming monthly partitions."""
+    count = create_partitions(get_db(), months_ahead=months_ahead)
+    click.echo(f'Created {count} partition(s).')
@@ -0,0 +1,92 @@
+"""
+Benchmark: connect-per-request vs pooled connections
+
+Simulates the database work of a cheap endpoint such as
+GET /api/patients/<id> against a local PostgreSQL instance and reports
+requests/sec and latency percentiles for both connection strategies.
+
+Usage (from application/interface, with DB_* environment variables set):
+    python -m benchmarks.bench_db_pool --threads 8 --duration 10
+"""
+import argparse
+import statistics
+import threading
+import time
+
+import psycopg2
+
+from backend.database import ConnectionPool, connect_kwargs_from_env
+
+QUERY = 'SELECT * FROM patients WHERE id = %s;'
+
+
+def run_workers(request_fn, threads, duration):
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        local = []
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            request_fn()
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return latencies
+
+
+def summarize(name, latencies, duration):
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0
+    print(
+        f"{name:<22} {len(latencies) / duration:>10.1f} req/s   "
+        f"p50 {statistics.median(latencies) * 1000:>7.2f} ms   p95 {p95 * 1000:>7.2f} ms"
+    )
+    return len(latencies) / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--patient-id', type=int, default=1)
+    args = parser.parse_args()
+
+    kwargs = connect_kwargs_from_env()
+
+    def connect_per_request():
+        conn = psycopg2.connect(**kwargs)
+        cur = conn.cursor()
+        cur.execute(QUERY, (args.patient_id,))
+        cur.fetchone()
+        cur.close()
+        conn.close()
+
+    pool = ConnectionPool(kwargs, min_size=args.threads, max_size=args.threads)
+    pool.warm()
+
+    def pooled():
+        conn = pool.getconn()
+        cur = conn.cursor()
+        cur.execute(QUERY, (args.patient_id,))
+        cur.fetchone()
+        cur.close()
+        pool.putconn(conn)
+
+    print(f"{args.threads} threads, {args.duration:.0f}s per run")
+    before = summarize('connect-per-request', run_workers(connect_per_request, args.threads, args.duration), args.duration)
+    after = summarize('pooled', run_workers(pooled, args.threads, args.duration), args.duration)
+    print(f"speedup: {after / before:.1f}x")
+    print(f"pool stats: {pool.stats()}")
+    pool.closeall()
+
+
+if __name__ == '__main__':
+    main()
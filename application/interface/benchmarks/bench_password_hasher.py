@@ -0,0 +1,79 @@
+"""
+Benchmark: login storm with inline vs pooled password hashing
+
+Fires --logins bcrypt checks from --threads request threads, hashing inline
+(as auth_handler did) and through PasswordHasher, while a probe thread times
+a cheap pure-Python "other endpoint" call. Reports login throughput, probe
+latency and, for the pool, queue wait and rejections. No database is needed.
+
+Usage (from application/interface):
+    python -m benchmarks.bench_password_hasher --logins 64 --threads 16 --workers 4
+"""
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.utils.password_hasher import PasswordHasher, HasherBusyError
+
+
+def probe(stop, latencies):
+    while not stop.is_set():
+        started = time.perf_counter()
+        sum(i * i for i in range(2000))
+        latencies.append((time.perf_counter() - started) * 1000)
+        time.sleep(0.005)
+
+
+def storm(name, hasher, pw_hash, logins, threads):
+    stop = threading.Event()
+    latencies = []
+    prober = threading.Thread(target=probe, args=(stop, latencies))
+    prober.start()
+
+    def login(_):
+        try:
+            return hasher.check_password_hash(pw_hash, 'Password123!')
+        except HasherBusyError:
+            return None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    prober.join()
+
+    rejected = results.count(None)
+    p99 = statistics.quantiles(latencies, n=100)[98] if len(latencies) >= 2 else float('nan')
+    print(f"{name:<10} {(logins - rejected) / elapsed:>8.1f} logins/s   "
+          f"probe p99 {p99:>7.2f} ms   rejected {rejected}")
+    return hasher.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--logins', type=int, default=64)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--max-pending', type=int, default=32)
+    parser.add_argument('--rounds', type=int, default=12)
+    args = parser.parse_args()
+
+    inline = PasswordHasher(workers=0, max_pending=args.logins, bcrypt_rounds=args.rounds)
+    pooled = PasswordHasher(workers=args.workers, max_pending=args.max_pending, bcrypt_rounds=args.rounds)
+    pw_hash = inline.generate_password_hash('Password123!')
+    # Start the worker processes before timing
+    pooled.check_password_hash(pw_hash, 'Password123!')
+
+    print(f"{args.logins} logins from {args.threads} threads, bcrypt rounds {args.rounds}")
+    storm('inline', inline, pw_hash, args.logins, args.threads)
+    stats = storm(f'pool x{args.workers}', pooled, pw_hash, args.logins, args.threads)
+    print(f"pool queue wait avg {stats['queue_wait_ms_avg']} ms, max {stats['queue_wait_ms_max']} ms; "
+          f"hash avg {stats['hash_ms_avg']} ms")
+    pooled.shutdown()
+
+
+if __name__ == '__main__':
+    main()
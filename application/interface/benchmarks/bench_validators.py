@@ -0,0 +1,154 @@
+"""
+Benchmark: per-request schema walk vs compiled schema validation
+
+Validates realistic register, login and vitals payloads the way
+validate_request did (walking the schema dict per request, re.match with
+pattern strings, password policy re-read from config per call) and with
+compile_schema / compile_rows_schema, plus a bulk vitals array row by row
+vs column by column. No database or Flask request is needed.
+
+Usage (from application/interface):
+    python -m benchmarks.bench_validators --requests 50000 --rows 20000
+"""
+import argparse
+import random
+import re
+import time
+from types import SimpleNamespace
+
+from backend.utils.validators import (
+    Validators, ValidationError, compile_schema, compile_rows_schema, password_validator
+)
+
+CONFIG = SimpleNamespace(PASSWORD_MIN_LENGTH=12, PASSWORD_REQUIRE_SPECIAL=True,
+                         PASSWORD_REQUIRE_NUMBER=True, PASSWORD_REQUIRE_UPPERCASE=True)
+
+
+def legacy_email(email):
+    if not email:
+        raise ValidationError("Email is required", "email")
+    if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+        raise ValidationError("Invalid email format", "email")
+    return True
+
+
+def legacy_password(password, config):
+    if not password:
+        raise ValidationError("Password is required", "password")
+    min_length = getattr(config, 'PASSWORD_MIN_LENGTH', 12)
+    require_special = getattr(config, 'PASSWORD_REQUIRE_SPECIAL', True)
+    require_number = getattr(config, 'PASSWORD_REQUIRE_NUMBER', True)
+    require_uppercase = getattr(config, 'PASSWORD_REQUIRE_UPPERCASE', True)
+    if len(password) < min_length:
+        raise ValidationError(f"Password must be at least {min_length} characters", "password")
+    if require_uppercase and not re.search(r'[A-Z]', password):
+        raise ValidationError("Password must contain at least one uppercase letter", "password")
+    if require_number and not re.search(r'\d', password):
+        raise ValidationError("Password must contain at least one number", "password")
+    if require_special and not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        raise ValidationError("Password must contain at least one special character", "password")
+    return True
+
+
+def legacy_blood_pressure(bp):
+    if not bp:
+        return True
+    if not re.match(r'^\d{2,3}/\d{2,3}$', bp):
+        raise ValidationError("Invalid blood pressure format. Use format: 120/80", "blood_pressure")
+    systolic, diastolic = map(int, bp.split('/'))
+    if systolic < 70 or systolic > 250 or diastolic < 40 or diastolic > 150 or systolic <= diastolic:
+        raise ValidationError("Invalid blood pressure", "blood_pressure")
+    return True
+
+
+def legacy_validate(schema, data):
+    # validate_request's loop before schemas were compiled
+    errors = {}
+    for field, rules in schema.items():
+        if rules.get('required', False) and field not in data:
+            errors[field] = f"{field} is required"
+        if field in data and 'validator' in rules:
+            try:
+                rules['validator'](data[field])
+            except ValidationError as e:
+                errors[field] = e.message
+    return errors
+
+
+def schemas(legacy):
+    register = {
+        'email': {'required': True, 'validator': legacy_email if legacy else Validators.validate_email},
+        'password': {'required': True, 'validator': (lambda p: legacy_password(p, CONFIG)) if legacy
+                     else password_validator(CONFIG)},
+        'full_name': {'required': True},
+        'role_id': {'required': True, 'validator': Validators.validate_role_id},
+    }
+    login = {
+        'email': {'required': True, 'validator': legacy_email if legacy else Validators.validate_email},
+        'password': {'required': True},
+    }
+    vital = {
+        'patient_id': {'required': True},
+        'heart_rate': {'validator': Validators.validate_heart_rate},
+        'blood_pressure': {'validator': legacy_blood_pressure if legacy else Validators.validate_blood_pressure},
+        'recorded_at': {'required': True},
+    }
+    return {'register': register, 'login': login, 'vital': vital}
+
+
+def payloads(count, rng):
+    result = []
+    for i in range(count):
+        kind = rng.choice(('register', 'login', 'login', 'vital'))
+        if kind == 'vital':
+            data = {'patient_id': rng.randint(1, 500), 'heart_rate': rng.randint(50, 120),
+                    'blood_pressure': f"{rng.randint(100, 140)}/{rng.randint(60, 90)}",
+                    'recorded_at': '2026-01-01T10:00:00'}
+        else:
+            data = {'email': f'user{i}@example.org', 'password': 'Correct-Horse-42'}
+            if kind == 'register':
+                data.update(full_name=f'User {i}', role_id=rng.choice((1, 2)))
+            if rng.random() < 0.05:
+                data['email'] = 'not-an-email'
+        result.append((kind, data))
+    return result
+
+
+def timed(label, fn):
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<34} {elapsed * 1000:>9.1f} ms")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=50000)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    data = payloads(args.requests, rng)
+    legacy = schemas(legacy=True)
+    compiled = {kind: compile_schema(schema) for kind, schema in schemas(legacy=False).items()}
+
+    print(f"{args.requests} request payloads")
+    old, old_time = timed('schema walk per request', lambda: [legacy_validate(legacy[k], d) for k, d in data])
+    new, new_time = timed('compiled schema', lambda: [compiled[k](d) for k, d in data])
+    assert old == new, 'compiled validation disagrees with the schema walk'
+    print(f"speedup {old_time / new_time:.2f}x")
+
+    rows = [d for k, d in payloads(args.rows * 4, rng) if k == 'vital'][:args.rows]
+    vital_schema = schemas(legacy=False)['vital']
+    validate_rows = compile_rows_schema(vital_schema)
+    print(f"\n{len(rows)} bulk vitals rows")
+    _, row_time = timed('row by row (compiled schema)',
+                        lambda: [compiled['vital'](row) for row in rows])
+    _, column_time = timed('column by column (rows schema)', lambda: validate_rows(rows))
+    print(f"speedup {row_time / column_time:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+--
+-- Analytics daily rollups
+--
+-- Pre-aggregated per-day tables read by /api/analytics/trends and
+-- /api/analytics/reports/generate instead of rescanning appointments,
+-- therapy_sessions and psyconnect on every request.
+--
+-- Triggers on the source tables mark the affected calendar days dirty; the
+-- refresh job (`flask rollups refresh`, run from cron) recomputes only those
+-- days. Populate history once with `flask rollups backfill --start YYYY-MM-DD`.
+--
+-- Apply with: psql -d wellness -f analytics_rollups.sql
+--
+
+-- Appointments and therapy sessions per clinician, day and appointment status
+CREATE TABLE IF NOT EXISTS public.analytics_daily_clinician_rollup (
+    day date NOT NULL,
+    clinician_id integer NOT NULL,
+    status character varying(20),
+    appointments integer NOT NULL,
+    sessions integer NOT NULL,
+    session_minutes bigint NOT NULL,
+    sessions_with_duration integer NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_adcr_day ON public.analytics_daily_clinician_rollup (day);
+CREATE INDEX IF NOT EXISTS idx_adcr_clinician_day ON public.analytics_daily_clinician_rollup (clinician_id, day);
+
+-- Appointments, therapy sessions and assessments per patient and day
+CREATE TABLE IF NOT EXISTS public.analytics_daily_patient_rollup (
+    day date NOT NULL,
+    patient_id bigint NOT NULL,
+    appointments integer NOT NULL,
+    sessions integer NOT NULL,
+    assessments integer NOT NULL,
+    PRIMARY KEY (day, patient_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_adpr_patient_day ON public.analytics_daily_patient_rollup (patient_id, day);
+
+-- Assessments per patient, day and instrument
+CREATE TABLE IF NOT EXISTS public.analytics_daily_assessment_rollup (
+    day date NOT NULL,
+    patient_id bigint NOT NULL,
+    assessment_type character varying(255) NOT NULL,
+    assessments integer NOT NULL,
+    PRIMARY KEY (day, patient_id, assessment_type)
+);
+
+CREATE INDEX IF NOT EXISTS idx_adar_patient_day ON public.analytics_daily_assessment_rollup (patient_id, day);
+
+-- Days whose rollups no longer match the source tables
+CREATE TABLE IF NOT EXISTS public.analytics_rollup_dirty_days (
+    day date PRIMARY KEY,
+    marked_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+
+-- Single-row refresh bookkeeping
+CREATE TABLE IF NOT EXISTS public.analytics_rollup_state (
+    id boolean PRIMARY KEY DEFAULT true CHECK (id),
+    refreshed_at timestamp without time zone,
+    backfilled_from date,
+    backfilled_to date
+);
+
+INSERT INTO public.analytics_rollup_state (id) VALUES (true) ON CONFLICT DO NOTHING;
+
+-- Indexes used by the per-day recompute
+CREATE INDEX IF NOT EXISTS idx_appointments_appointment_time ON public.appointments (appointment_time);
+CREATE INDEX IF NOT EXISTS idx_psyconnect_assessed_at ON public.psyconnect (assessed_at);
+CREATE INDEX IF NOT EXISTS idx_therapy_sessions_appointment_id ON public.therapy_sessions (appointment_id);
+
+
+CREATE OR REPLACE FUNCTION public.analytics_mark_dirty_day(ts timestamp without time zone)
+RETURNS void LANGUAGE sql AS $$
+    INSERT INTO public.analytics_rollup_dirty_days (day)
+    SELECT ts::date WHERE ts IS NOT NULL
+    ON CONFLICT (day) DO NOTHING;
+$$;
+
+CREATE OR REPLACE FUNCTION public.analytics_appointments_dirty()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM public.analytics_mark_dirty_day(OLD.appointment_time);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM public.analytics_mark_dirty_day(NEW.appointment_time);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.analytics_therapy_sessions_dirty()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM public.analytics_mark_dirty_day(
+            (SELECT appointment_time FROM public.appointments WHERE id = OLD.appointment_id));
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM public.analytics_mark_dirty_day(
+            (SELECT appointment_time FROM public.appointments WHERE id = NEW.appointment_id));
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.analytics_psyconnect_dirty()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM public.analytics_mark_dirty_day(OLD.assessed_at);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM public.analytics_mark_dirty_day(NEW.assessed_at);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_appointments_rollup_dirty ON public.appointments;
+CREATE TRIGGER trg_appointments_rollup_dirty
+    AFTER INSERT OR UPDATE OR DELETE ON public.appointments
+    FOR EACH ROW EXECUTE FUNCTION public.analytics_appointments_dirty();
+
+DROP TRIGGER IF EXISTS trg_therapy_sessions_rollup_dirty ON public.therapy_sessions;
+CREATE TRIGGER trg_therapy_sessions_rollup_dirty
+    AFTER INSERT OR UPDATE OR DELETE ON public.therapy_sessions
+    FOR EACH ROW EXECUTE FUNCTION public.analytics_therapy_sessions_dirty();
+
+DROP TRIGGER IF EXISTS trg_psyconnect_rollup_dirty ON public.psyconnect;
+CREATE TRIGGER trg_psyconnect_rollup_dirty
+    AFTER INSERT OR UPDATE OR DELETE ON public.psyconnect
+    FOR EACH ROW EXECUTE FUNCTION public.analytics_psyconnect_dirty();
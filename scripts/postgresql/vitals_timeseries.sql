@@ -0,0 +1,146 @@
+--
+-- Vitals time series
+--
+-- Converts public.vitals into a table range-partitioned by month on
+-- recorded_at and adds pre-aggregated per-minute, hourly and daily tiers
+-- (sample count plus min/max/avg heart rate, systolic and diastolic pressure)
+-- read by GET /api/patients/<id>/vitals/series.
+--
+-- A trigger on vitals marks each written (patient, day) dirty; the refresh
+-- job (`flask vitals refresh`, run from cron) recomputes only those. Populate
+-- history once with `flask vitals backfill --start YYYY-MM-DD`, and keep
+-- partitions ahead of incoming data with `flask vitals partitions`.
+--
+-- Apply with: psql -d wellness -f vitals_timeseries.sql
+--
+
+-- Creates the monthly partitions of a table partitioned by a timestamp.
+-- Rows outside every monthly partition land in <table>_default, which must
+-- hold no rows for a month before that month's partition can be created.
+CREATE OR REPLACE FUNCTION public.vitals_create_partitions(parent text, from_day date, to_day date)
+RETURNS integer LANGUAGE plpgsql AS $$
+DECLARE
+    month date := date_trunc('month', from_day)::date;
+    partition text;
+    created integer := 0;
+BEGIN
+    WHILE month <= to_day LOOP
+        partition := parent || '_' || to_char(month, 'YYYY_MM');
+        IF to_regclass('public.' || partition) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE public.%I PARTITION OF public.%I FOR VALUES FROM (%L) TO (%L)',
+                partition, parent, month, (month + interval '1 month')::date
+            );
+            created := created + 1;
+        END IF;
+        month := (month + interval '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$;
+
+-- Raw readings, partitioned by month. The existing table is swapped for a
+-- partitioned one once; its rows are copied and it is kept as
+-- vitals_unpartitioned until dropped by hand.
+DO $$
+DECLARE
+    first_day date;
+    last_day date;
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'public.vitals'::regclass) = 'r' THEN
+        ALTER TABLE public.vitals RENAME TO vitals_unpartitioned;
+        ALTER TABLE public.vitals_unpartitioned RENAME CONSTRAINT vitals_pkey TO vitals_unpartitioned_pkey;
+
+        CREATE SEQUENCE IF NOT EXISTS public.vitals_id_seq;
+        PERFORM setval('public.vitals_id_seq', COALESCE((SELECT MAX(id) FROM public.vitals_unpartitioned), 0) + 1, false);
+
+        CREATE TABLE public.vitals (
+            id bigint DEFAULT nextval('public.vitals_id_seq') NOT NULL,
+            patient_id bigint NOT NULL REFERENCES public.patients(id),
+            heart_rate integer,
+            blood_pressure character varying(20),
+            recorded_at timestamp without time zone NOT NULL,
+            CONSTRAINT vitals_heart_rate_check CHECK (((heart_rate >= 30) AND (heart_rate <= 220))),
+            PRIMARY KEY (id, recorded_at)
+        ) PARTITION BY RANGE (recorded_at);
+        ALTER SEQUENCE public.vitals_id_seq OWNED BY public.vitals.id;
+        CREATE TABLE public.vitals_default PARTITION OF public.vitals DEFAULT;
+
+        SELECT MIN(recorded_at)::date, MAX(recorded_at)::date INTO first_day, last_day
+        FROM public.vitals_unpartitioned;
+        PERFORM public.vitals_create_partitions(
+            'vitals', COALESCE(first_day, CURRENT_DATE), GREATEST(COALESCE(last_day, CURRENT_DATE), CURRENT_DATE + 90)
+        );
+        INSERT INTO public.vitals SELECT * FROM public.vitals_unpartitioned;
+
+        GRANT SELECT, INSERT, DELETE, UPDATE ON TABLE public.vitals TO wellness_app;
+        GRANT SELECT ON TABLE public.vitals TO wellness_readonly;
+        GRANT USAGE ON SEQUENCE public.vitals_id_seq TO wellness_app;
+    END IF;
+END;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_vitals_patient_recorded_at ON public.vitals (patient_id, recorded_at);
+
+-- Downsampled tiers, one row per patient and bucket
+CREATE TABLE IF NOT EXISTS public.vitals_minute (
+    patient_id bigint NOT NULL,
+    bucket timestamp without time zone NOT NULL,
+    samples integer NOT NULL,
+    heart_rate_min integer,
+    heart_rate_max integer,
+    heart_rate_avg real,
+    systolic_min integer,
+    systolic_max integer,
+    systolic_avg real,
+    diastolic_min integer,
+    diastolic_max integer,
+    diastolic_avg real,
+    PRIMARY KEY (patient_id, bucket)
+) PARTITION BY RANGE (bucket);
+
+CREATE TABLE IF NOT EXISTS public.vitals_minute_default PARTITION OF public.vitals_minute DEFAULT;
+
+SELECT public.vitals_create_partitions(
+    'vitals_minute',
+    COALESCE((SELECT MIN(recorded_at)::date FROM public.vitals), CURRENT_DATE),
+    CURRENT_DATE + 90
+);
+
+CREATE TABLE IF NOT EXISTS public.vitals_hourly (LIKE public.vitals_minute INCLUDING ALL);
+CREATE TABLE IF NOT EXISTS public.vitals_daily (LIKE public.vitals_minute INCLUDING ALL);
+
+-- (patient, day) pairs whose tiers no longer match the raw readings
+CREATE TABLE IF NOT EXISTS public.vitals_rollup_dirty (
+    patient_id bigint NOT NULL,
+    day date NOT NULL,
+    marked_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    PRIMARY KEY (patient_id, day)
+);
+
+GRANT SELECT ON TABLE public.vitals_minute, public.vitals_hourly, public.vitals_daily TO wellness_app, wellness_readonly;
+GRANT SELECT, INSERT, DELETE, UPDATE ON TABLE public.vitals_minute, public.vitals_hourly, public.vitals_daily,
+    public.vitals_rollup_dirty TO wellness_app;
+
+
+CREATE OR REPLACE FUNCTION public.vitals_mark_dirty()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO public.vitals_rollup_dirty (patient_id, day)
+        VALUES (OLD.patient_id, OLD.recorded_at::date)
+        ON CONFLICT (patient_id, day) DO NOTHING;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO public.vitals_rollup_dirty (patient_id, day)
+        VALUES (NEW.patient_id, NEW.recorded_at::date)
+        ON CONFLICT (patient_id, day) DO NOTHING;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_vitals_rollup_dirty ON public.vitals;
+CREATE TRIGGER trg_vitals_rollup_dirty
+    AFTER INSERT OR UPDATE OR DELETE ON public.vitals
+    FOR EACH ROW EXECUTE FUNCTION public.vitals_mark_dirty();
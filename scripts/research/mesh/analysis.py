@@ -1,6 +1,83 @@
 import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from scipy.optimize import curve_fit
+
+MIN_FIT_POINTS = 5
+FIT_CHUNK_SIZE = 200  # Terms per process pool task
+
+
+def logistic(x, L, k, x0):
+    return L / (1 + np.exp(-k * (x - x0)))
+
+
+def ols_slopes(x, y, mask):
+    """
+    Closed-form least-squares slopes of many series at once.
+    :param x: 1-D array of x values shared by all series
+    :param y: 2-D array, one series per row
+    :param mask: Boolean array like y; only True points are used
+    Returns: 1-D array of slopes (0.0 for series with fewer than 2 points)
+    """
+    w = mask.astype(float)
+    n = w.sum(axis=1)
+    sx = w @ x
+    sy = (w * y).sum(axis=1)
+    sxx = w @ (x * x)
+    sxy = (w * y) @ x
+    denom = n * sxx - sx * sx
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slopes = (n * sxy - sx * sy) / denom
+    return np.where((n >= 2) & (denom != 0), slopes, 0.0)
+
+
+def initial_guess(x, y_norm):
+    """
+    Warm-start logistic parameters (L, k, x0) for a normalized series: x0 is
+    where it first reaches half its maximum, k follows from the slope there.
+    """
+    half = int(np.argmax(y_norm >= 0.5))
+    x0 = float(x[half])
+    lo, hi = max(half - 2, 0), min(half + 2, len(x) - 1)
+    slope = (y_norm[hi] - y_norm[lo]) / (x[hi] - x[lo]) if x[hi] != x[lo] else 0.0
+    k = float(np.clip(4 * slope, 0.01, 2.0))
+    return [1.0, k, x0]
+
+
+def fit_series(x, y):
+    """
+    Fits a logistic curve to one time series, warm-started from the data and
+    retried from the default guess, falling back to a straight line.
+    Returns: dict {'model', 'params'} or None if there are too few points
+    """
+    if len(x) < MIN_FIT_POINTS:
+        return None
+    y_max = np.max(y)
+    if y_max == 0:
+        return None
+    y_norm = y / y_max
+
+    with np.errstate(over='ignore'):
+        for p0 in (initial_guess(x, y_norm), [1, 0.1, np.median(x)]):
+            try:
+                popt, _ = curve_fit(logistic, x, y_norm, p0=p0, maxfev=2000)
+            except (RuntimeError, ValueError):
+                continue
+            if np.all(np.isfinite(popt)):
+                return {
+                    'model': 'logistic',
+                    'params': {'L': float(popt[0] * y_max), 'k': float(popt[1]), 'x0': float(popt[2])}
+                }
+
+    slope, intercept = np.polyfit(x, y, 1)
+    return {'model': 'linear', 'params': {'slope': float(slope), 'intercept': float(intercept)}}
+
+
+def _fit_chunk(chunk):
+    """Process pool task: fits [(ui, x, y), ...]"""
+    return [(ui, fit_series(x, y)) for ui, x, y in chunk]
+
+
 class Analyzer:
     def __init__(self, df, candidate_map, logger):
         """
@@ -11,6 +88,26 @@ class Analyzer:
         self.df = df
         self.candidate_map = candidate_map
         self.logger = logger
+        self._matrix = None
+
+    def term_year_matrix(self):
+        """
+        Pivots the long DataFrame once into a dense term x year matrix.
+        Returns: (uis, years, counts, observed) where counts is a float array
+                 of shape (terms, years) and observed marks (ui, year) rows
+                 present in the DataFrame
+        """
+        if self._matrix is None:
+            uis, rows = np.unique(self.df['ui'].to_numpy(), return_inverse=True)
+            years = self.df['year'].to_numpy().astype(np.int64)
+            first_year = years.min() if len(years) else 0
+            span = (years.max() - first_year + 1) if len(years) else 0
+            counts = np.zeros((len(uis), span))
+            observed = np.zeros((len(uis), span), dtype=bool)
+            np.add.at(counts, (rows, years - first_year), self.df['count'].to_numpy())
+            observed[rows, years - first_year] = True
+            self._matrix = (uis, np.arange(first_year, first_year + span), counts, observed)
+        return self._matrix
 
     def calculate_tss(self):
         """
@@ -19,28 +116,17 @@ class Analyzer:
         """
         self.logger.info("Calculating Term Significance Scores...")
 
-        # Calculate base stats
-        grouped = self.df.groupby('ui')['count'].agg(['sum', 'count']).reset_index()
-        grouped.columns = ['ui', 'total_count', 'years_active']
-
-        # Calculate recent slope (heuristic: last 10 years)
-        max_year = self.df['year'].max()
-        recent_mask = self.df['year'] >= (max_year - 10)
-        recent_df = self.df[recent_mask].copy()
-
-        def calculate_slope(group):
-            if len(group) < 2:
-                return 0.0
-            x = group['year'].values
-            y = group['count'].values
-            slope, _ = np.polyfit(x, y, 1)
-            return float(slope)
-
-        slopes = recent_df.groupby('ui').apply(calculate_slope, include_groups=False).reset_index()
-        slopes.columns = ['ui', 'recent_slope']
+        uis, years, counts, observed = self.term_year_matrix()
 
-        # Merge results
-        stats = pd.merge(grouped, slopes, on='ui', how='left').fillna(0.0)
+        # Recent slope (heuristic: last 10 years), least squares over the
+        # observed years of every term in one pass
+        recent = years >= (years.max() - 10) if len(years) else years.astype(bool)
+        stats = pd.DataFrame({
+            'ui': uis,
+            'total_count': counts.sum(axis=1),
+            'years_active': observed.sum(axis=1),
+            'recent_slope': ols_slopes(years[recent].astype(float), counts[:, recent], observed[:, recent]),
+        })
 
         # Add metadata and final score
         stats['name'] = stats['ui'].map(lambda x: self.candidate_map.get(x, "Unknown"))
@@ -66,46 +152,46 @@ class Analyzer:
         return kept
 
     def logistic_model(self, x, L, k, x0):
-        return L / (1 + np.exp(-k * (x - x0)))
+        return logistic(x, L, k, x0)
+
+    def _series(self, ui_index):
+        uis, years, counts, observed = self.term_year_matrix()
+        mask = observed[ui_index]
+        return years[mask].astype(float), counts[ui_index, mask]
 
     def fit_growth_models(self, ui):
         """
         Fits growth models to a term's time series.
         """
-        term_df = self.df[self.df['ui'] == ui].sort_values('year')
-        if len(term_df) < 5:
+        uis = self.term_year_matrix()[0]
+        i = np.searchsorted(uis, ui)
+        if i == len(uis) or uis[i] != ui:
             return None
+        return fit_series(*self._series(i))
 
-        # Prepare data
-        x = term_df['year'].values
-        y = term_df['count'].values
-
-        # Normalize y for logistic fitting
-        y_max = np.max(y)
-        if y_max == 0: return None
-        y_norm = y / y_max
-
-        # Try Logistic
-        try:
-            # p0: L, k, x0
-            popt, _ = curve_fit(self.logistic_model, x, y_norm,
-                                p0=[1, 0.1, np.median(x)],
-                                maxfev=2000)
-            return {
-                'model': 'logistic',
-                'params': {
-                    'L': float(popt[0] * y_max),
-                    'k': float(popt[1]),
-                    'x0': float(popt[2])
-                }
-            }
-        except:
-            # Fallback to Linear
-            slope, intercept = np.polyfit(x, y, 1)
-            return {
-                'model': 'linear',
-                'params': {
-                    'slope': float(slope),
-                    'intercept': float(intercept)
-                }
-            }
+    def fit_growth_models_batch(self, uis=None, workers=1):
+        """
+        Fits growth models to many terms in a process pool.
+        :param uis: Terms to fit (default: every term in the DataFrame)
+        :param workers: Processes; 1 fits in this process
+        Returns: dict {ui: fit} for terms with enough data points
+        """
+        all_uis, years, counts, observed = self.term_year_matrix()
+        if uis is None:
+            indices = np.arange(len(all_uis))
+        else:
+            indices = np.searchsorted(all_uis, list(uis))
+            indices = [i for i, ui in zip(indices, uis) if i < len(all_uis) and all_uis[i] == ui]
+        points = observed.sum(axis=1)
+        tasks = [(all_uis[i],) + self._series(i) for i in indices if points[i] >= MIN_FIT_POINTS]
+        chunks = [tasks[i:i + FIT_CHUNK_SIZE] for i in range(0, len(tasks), FIT_CHUNK_SIZE)]
+        self.logger.info(f"Fitting growth models for {len(tasks)} terms with {workers} workers...")
+
+        if workers > 1 and len(chunks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(_fit_chunk, chunks)
+                fits = [fit for chunk in results for fit in chunk]
+        else:
+            fits = [fit for chunk in chunks for fit in _fit_chunk(chunk)]
+
+        return {ui: fit for ui, fit in fits if fit}
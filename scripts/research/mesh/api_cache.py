@@ -0,0 +1,238 @@
+"""
+Persistent API response cache shared by every versioned MeSH client.
+One long-lived WAL-mode SQLite connection per database, owned by a dedicated
+thread so async clients never block the event loop on disk I/O. Values are
+stored as zlib-compressed JSON, expire after a per-endpoint TTL, and the
+least recently used entries are evicted once the database outgrows its size
+budget.
+
+Keys are the canonical request (URL plus sorted query parameters, without
+credentials such as api_key, email or tool), so the same request made by v3,
+v9 or v10 is one cache entry.
+"""
+import asyncio
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from . import config
+
+DAY = 24 * 60 * 60
+
+# Seconds a cached response stays valid, by URL prefix (first match wins)
+ENDPOINT_TTLS = [
+    ("https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch", 7 * DAY),    # counts grow as PubMed indexes
+    ("https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch", 90 * DAY),    # article records rarely change
+    ("https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary", 90 * DAY),
+    ("https://clinicaltrials.gov", 1 * DAY),                               # recruitment status changes daily
+]
+DEFAULT_TTL = 30 * DAY
+
+# Request parameters that identify the caller rather than the request
+CREDENTIAL_PARAMS = {"api_key", "email", "tool"}
+
+# Access times are written back in batches rather than on every hit
+TOUCH_BATCH = 100
+
+
+def request_key(url, params=None, kind="json"):
+    """
+    Canonical cache key of a request.
+    :param url: Endpoint URL, optionally with a query string
+    :param params: Query parameters not already in the URL
+    :param kind: How the response is decoded ("json" or "text"); part of the key
+        so a client reading raw XML never receives another client's parsed JSON
+    Returns: str
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query += [(k, str(v)) for k, v in (params or {}).items()]
+    query = sorted((k, v) for k, v in query if k not in CREDENTIAL_PARAMS)
+    base = urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+    return f"{kind}:{base}?{urlencode(query)}"
+
+
+def endpoint_ttl(url):
+    for prefix, ttl in ENDPOINT_TTLS:
+        if url.startswith(prefix):
+            return ttl
+    return DEFAULT_TTL
+
+
+class ResponseCache:
+    def __init__(self, path, max_bytes=config.API_CACHE_MAX_MB << 20):
+        """
+        :param path: SQLite database file
+        :param max_bytes: Size budget for stored values; least recently used
+            entries are evicted beyond it
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "writes": 0, "evictions": 0}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-cache")
+        self._conn = None
+        self._size = 0
+        self._touched = {}   # key -> access time, not yet written back
+        self._executor.submit(self._connect).result()
+
+    # --- Cache thread ---
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            # Only the cache thread uses the connection, except close() at interpreter exit
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value BLOB, "
+                         "size INTEGER, expires REAL, accessed REAL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            conn.commit()
+            self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def _get(self, key):
+        conn = self._connect()
+        row = conn.execute("SELECT value, expires FROM responses WHERE key = ?", (key,)).fetchone()
+        now = time.time()
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+        if row[1] < now:
+            self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        self._touched[key] = now
+        if len(self._touched) >= TOUCH_BATCH:
+            self._flush_touched(conn)
+            conn.commit()
+        return json.loads(zlib.decompress(row[0]))
+
+    def _set(self, key, value, ttl):
+        conn = self._connect()
+        blob = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+        now = time.time()
+        old = conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        conn.execute("INSERT OR REPLACE INTO responses (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                     (key, blob, len(blob), now + ttl, now))
+        self._touched.pop(key, None)
+        self._size += len(blob) - (old[0] if old else 0)
+        self.stats["writes"] += 1
+        self._flush_touched(conn)
+        if self._size > self.max_bytes:
+            self._evict(conn)
+        conn.commit()
+
+    def _flush_touched(self, conn):
+        if self._touched:
+            conn.executemany("UPDATE responses SET accessed = ? WHERE key = ?",
+                             [(accessed, key) for key, accessed in self._touched.items()])
+            self._touched.clear()
+
+    def _evict(self, conn):
+        """Drops expired entries, then least recently used ones, down to 90% of the budget"""
+        conn.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+        self._size = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        target = self.max_bytes * 0.9
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if self._size <= target:
+                break
+            victims.append((key,))
+            self._size -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self.stats["evictions"] += len(victims)
+
+    def _summary(self):
+        conn = self._connect()
+        entries = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {**self.stats, "entries": entries, "bytes": self._size,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0}
+
+    def _close(self):
+        if self._conn is not None:
+            self._flush_touched(self._conn)
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    # --- Public API ---
+
+    def get(self, url, params=None, kind="json"):
+        """
+        Cached response of a request.
+        Returns: the stored value, or None on a miss or an expired entry
+        """
+        return self._executor.submit(self._get, request_key(url, params, kind)).result()
+
+    def set(self, url, params, value, kind="json"):
+        """Stores a JSON-serializable response, valid for its endpoint's TTL"""
+        self._executor.submit(self._set, request_key(url, params, kind), value, endpoint_ttl(url)).result()
+
+    async def aget(self, url, params=None, kind="json"):
+        """get() from a coroutine, without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._get, request_key(url, params, kind))
+
+    async def aset(self, url, params, value, kind="json"):
+        """set() from a coroutine, without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._set, request_key(url, params, kind), value,
+                                   endpoint_ttl(url))
+
+    def summary(self):
+        """
+        Hit/miss statistics of this process with the size of the cache.
+        Returns: dict
+        """
+        return self._executor.submit(self._summary).result()
+
+    def close(self):
+        """Writes back pending access times and closes the connection"""
+        try:
+            self._executor.submit(self._close).result()
+        except RuntimeError:
+            # At exit the executor is shut down before atexit hooks run; its thread is idle
+            self._close()
+        self._executor.shutdown()
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(path=None):
+    """
+    Process-wide cache for a database file, so every client shares one
+    connection and one cache thread.
+    :param path: SQLite database file (default: config.API_CACHE_DB)
+    Returns: ResponseCache
+    """
+    path = os.path.abspath(path or config.API_CACHE_DB)
+    with _caches_lock:
+        cache = _caches.get(path)
+        # Reopen if the database was deleted underneath the connection
+        if cache is not None and not os.path.exists(path):
+            cache.close()
+            cache = None
+        if cache is None:
+            cache = _caches[path] = ResponseCache(path)
+        return cache
+
+
+@atexit.register
+def close_all():
+    """Closes every open cache, checkpointing the WAL into the database file"""
+    with _caches_lock:
+        for cache in _caches.values():
+            cache.close()
+        _caches.clear()
@@ -0,0 +1,144 @@
+"""
+Benchmark: ElementTree iterparse + descendant searches vs PubMedExtractor
+
+Writes a synthetic PubMed baseline file (full MedlineCitation records with
+abstracts, authors, MeSH headings with qualifiers and PubmedData history)
+and parses it with the previous iterparse/.find(".//PubDate") article
+parser and with the path-targeted PubMedExtractor, reporting articles/sec.
+Both must produce identical (ui, year) counts.
+
+Usage (from the repository root):
+    python -m scripts.research.mesh.benchmarks.bench_pubmed_extractor --articles 30000
+"""
+import argparse
+import gzip
+import os
+import random
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+
+from scripts.research.mesh.pubmed_parser import PubMedExtractor, PubMedParser
+
+
+def synthetic_article(rng, pmid, vocabulary):
+    year = rng.randint(1965, 2024)
+    if rng.random() < 0.1:
+        pub_date = f"<PubDate><MedlineDate>{year} Jan-Feb</MedlineDate></PubDate>"
+    else:
+        pub_date = f"<PubDate><Year>{year}</Year><Month>Mar</Month></PubDate>"
+    headings = "".join(
+        f'<MeshHeading><DescriptorName UI="{ui}" MajorTopicYN="{rng.choice("NY")}">Term {ui}</DescriptorName>'
+        f'<QualifierName UI="Q000{rng.randint(100, 999)}" MajorTopicYN="N">qualifier</QualifierName></MeshHeading>'
+        for ui in rng.sample(vocabulary, rng.randint(5, 15))
+    )
+    authors = "".join(
+        f"<Author ValidYN=\"Y\"><LastName>Author{i}</LastName><ForeName>A</ForeName><Initials>A</Initials>"
+        f"<AffiliationInfo><Affiliation>Department {i}, University</Affiliation></AffiliationInfo></Author>"
+        for i in range(rng.randint(2, 8))
+    )
+    abstract = " ".join(f"word{rng.randint(0, 5000)}" for _ in range(rng.randint(80, 250)))
+    return (
+        f'<PubmedArticle><MedlineCitation Status="MEDLINE" Owner="NLM"><PMID Version="1">{pmid}</PMID>'
+        f"<DateCompleted><Year>{year + 1}</Year><Month>01</Month><Day>02</Day></DateCompleted>"
+        f'<Article PubModel="Print"><Journal><ISSN IssnType="Print">0000-0000</ISSN>'
+        f'<JournalIssue CitedMedium="Print"><Volume>1</Volume>{pub_date}</JournalIssue>'
+        f"<Title>Journal</Title></Journal><ArticleTitle>Title {pmid}</ArticleTitle>"
+        f"<Abstract><AbstractText>{abstract}</AbstractText></Abstract>"
+        f'<AuthorList CompleteYN="Y">{authors}</AuthorList><Language>eng</Language>'
+        f'<ArticleDate DateType="Electronic"><Year>{year}</Year><Month>02</Month><Day>03</Day></ArticleDate>'
+        f"</Article><MeshHeadingList>{headings}</MeshHeadingList></MedlineCitation>"
+        f'<PubmedData><History><PubMedPubDate PubStatus="pubmed"><Year>{year}</Year><Month>1</Month>'
+        f'<Day>1</Day></PubMedPubDate></History><PublicationStatus>ppublish</PublicationStatus>'
+        f'<ArticleIdList><ArticleId IdType="pubmed">{pmid}</ArticleId></ArticleIdList></PubmedData>'
+        f"</PubmedArticle>\n"
+    )
+
+
+def write_baseline(path, articles, seed=0):
+    rng = random.Random(seed)
+    vocabulary = [f"D{n:06d}" for n in rng.sample(range(1, 70000), 5000)]
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<PubmedArticleSet>\n')
+        for pmid in range(1, articles + 1):
+            f.write(synthetic_article(rng, pmid, vocabulary))
+        f.write("</PubmedArticleSet>\n")
+
+
+def legacy_process_article(article_elem, counter):
+    year = None
+    pub_date = article_elem.find(".//PubDate")
+    if pub_date is not None:
+        year_elem = pub_date.find("Year")
+        if year_elem is not None:
+            year = year_elem.text
+    if not year:
+        article_date = article_elem.find(".//ArticleDate")
+        if article_date is not None:
+            year_elem = article_date.find("Year")
+            if year_elem is not None:
+                year = year_elem.text
+    if not year:
+        date_completed = article_elem.find(".//DateCompleted")
+        if date_completed is not None:
+            year_elem = date_completed.find("Year")
+            if year_elem is not None:
+                year = year_elem.text
+    if not year or not str(year).isdigit():
+        return
+    year = int(year)
+    mesh_list = article_elem.find(".//MeshHeadingList")
+    if mesh_list is not None:
+        for heading in mesh_list.findall("MeshHeading"):
+            descriptor = heading.find("DescriptorName")
+            if descriptor is not None:
+                counter[(descriptor.get("UI"), year)] += 1
+
+
+def legacy_parse_file(path):
+    counts = Counter()
+    with gzip.open(path, 'rb') as f:
+        for event, elem in ET.iterparse(f, events=("end",)):
+            if elem.tag == "PubmedArticle":
+                legacy_process_article(elem, counts)
+                elem.clear()
+    return counts
+
+
+def timed(label, fn, articles, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<34} {best:8.3f}s  {articles / best:>10,.0f} articles/sec")
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument('--articles', type=int, default=30000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pubmed_synthetic.xml.gz")
+        write_baseline(path, args.articles)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"Synthetic baseline: {args.articles:,} articles, {size_mb:.1f} MB gzipped\n")
+
+        legacy, legacy_time = timed("iterparse + .find(.//PubDate)", lambda: legacy_parse_file(path),
+                                    args.articles, args.repeat)
+        _, extract_time = timed("PubMedExtractor.count_file", lambda: PubMedExtractor().count_file(path),
+                                args.articles, args.repeat)
+        current, _ = timed("PubMedParser.parse_file (UI keys)", lambda: PubMedParser().parse_file(path),
+                           args.articles, args.repeat)
+
+    assert current == legacy, "extractor counts differ from the iterparse parser"
+    print(f"\nSpeedup (count_file vs iterparse): {legacy_time / extract_time:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
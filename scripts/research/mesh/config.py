@@ -7,7 +7,12 @@ import os
 DATA_DIR = os.getenv("MESH_DATA_DIR", "./data")
 OUTPUT_DIR = os.path.join(DATA_DIR, "output")
 MESH_DESC_XML = os.path.join(DATA_DIR, "desc2024.xml")  # Update year as needed
+MESH_SNAPSHOT_PATH = os.path.join(DATA_DIR, "mesh_descriptors.json.gz")  # Rebuilt when MESH_DESC_XML changes
 PUBMED_DIR = os.path.join(DATA_DIR, "pubmed_baseline")
+INGEST_INDEX_DIR = os.path.join(DATA_DIR, "ingest_index")  # Per-file parsed shards
+# API response cache shared by every versioned client (v3-v10)
+API_CACHE_DB = os.getenv("MESH_API_CACHE_DB", os.path.join(DATA_DIR, "api_cache.db"))
+API_CACHE_MAX_MB = int(os.getenv("MESH_API_CACHE_MAX_MB", "512"))
 
 # --- Tree Number Prefixes for Mental Health ---
 # F03: Mental Disorders
@@ -10,9 +10,9 @@ from collections import deque
 
 # Improved import to handle both standalone and package execution
 try:
-    from .pubmed_client import get_term_publication_count, discover_related_terms
+    from .pubmed_client import get_client, discover_related_terms
 except ImportError:
-    from pubmed_client import get_term_publication_count, discover_related_terms
+    from pubmed_client import get_client, discover_related_terms
 
 # --- Configuration ---
 SEED_TERM = "Mental Health"
@@ -38,6 +38,10 @@ def run_discovery_pipeline():
     # A set to keep track of terms we've already processed to avoid cycles
     visited_terms = set()
 
+    client = get_client()
+    # Counts of frontier terms, fetched concurrently a batch at a time
+    frontier_counts = {}
+
     # --- Main Discovery Loop ---
     while terms_to_visit and len(results) < MAX_TERMS_TO_DISCOVER:
         
@@ -49,8 +53,12 @@ def run_discovery_pipeline():
         print(f"\nProcessing: '{current_term}'")
         visited_terms.add(current_term)
 
-        # 1. Get the publication count for the current term
-        count = get_term_publication_count(current_term)
+        # 1. Get the publication count for the current term, together with
+        #    the next terms waiting in the queue
+        if current_term not in frontier_counts:
+            batch = [current_term] + [t for t in terms_to_visit if t not in visited_terms][:client.max_workers - 1]
+            frontier_counts.update(client.counts(batch))
+        count = frontier_counts.pop(current_term)
         print(f"  -> Count: {count}")
 
         # 2. Apply the filter (our "competition" rule)
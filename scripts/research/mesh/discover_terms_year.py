@@ -8,9 +8,9 @@ from collections import deque
 
 # Improved import to handle both standalone and package execution
 try:
-    from .pubmed_client import get_term_publication_count, discover_related_terms
+    from .pubmed_client import get_client, get_term_publication_count, discover_related_terms
 except ImportError:
-    from pubmed_client import get_term_publication_count, discover_related_terms
+    from pubmed_client import get_client, get_term_publication_count, discover_related_terms
 
 # --- Configuration ---
 SEED_TERM = "Mental Health"
@@ -36,6 +36,10 @@ def run_year_discovery_pipeline():
     term_stats = {}
     visited_terms = set()
 
+    client = get_client()
+    # Target year counts of frontier terms, fetched concurrently a batch at a time
+    frontier_counts = {}
+
     # --- Main Discovery Loop ---
     while terms_to_visit and len(results) < MAX_TERMS_TO_DISCOVER:
         
@@ -47,8 +51,11 @@ def run_year_discovery_pipeline():
         print(f"\nProcessing: '{current_term}'")
         visited_terms.add(current_term)
 
-        # 1. Get count for target year
-        count_target = get_term_publication_count(current_term, year=TARGET_YEAR)
+        # 1. Get count for target year, together with the next terms waiting in the queue
+        if current_term not in frontier_counts:
+            batch = [current_term] + [t for t in terms_to_visit if t not in visited_terms][:client.max_workers - 1]
+            frontier_counts.update(client.counts(batch, year=TARGET_YEAR))
+        count_target = frontier_counts.pop(current_term)
         print(f"  -> {TARGET_YEAR} Count: {count_target}")
 
         # Basic filter: Minimum count in target year
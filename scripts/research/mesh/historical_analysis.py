@@ -6,49 +6,34 @@ import os
 import glob
 import argparse
 import pandas as pd
-from concurrent.futures import ProcessPoolExecutor
-from collections import Counter
 
 from . import config
 from . import utils
 from .mesh_loader import MeshLoader
-from .pubmed_parser import PubMedParser
+from .ingest_index import IngestIndex
 from .analysis import Analyzer
 
 logger = utils.setup_logger("MeSH_Pipeline")
 
-def parse_worker(args):
-    """Helper for multiprocessing"""
-    file_path, allowed_uis = args
-    parser = PubMedParser(allowed_mesh_uis=allowed_uis)
-    return parser.parse_file(file_path)
-
 @utils.timer
-def run_ingest(file_list, allowed_uis=None):
+def run_ingest(file_list, allowed_uis=None, rebuild=False):
     """
-    Runs parallel ingestion of PubMed files.
+    Runs ingestion of PubMed files through the on-disk ingest index.
+    Only files without an up-to-date shard are parsed (in parallel).
+    Returns: DataFrame with columns ['ui', 'year', 'count']
     """
-    logger.info(f"Starting ingest of {len(file_list)} files with {config.NUM_WORKERS} workers.")
-    
-    # Prepare arguments for workers
-    worker_args = [(f, allowed_uis) for f in file_list]
-    
-    global_counter = Counter()
-    
-    with ProcessPoolExecutor(max_workers=config.NUM_WORKERS) as executor:
-        results = executor.map(parse_worker, worker_args)
-        
-        for i, res in enumerate(results):
-            global_counter.update(res)
-            if i % 10 == 0 and i > 0:
-                logger.info(f"Processed {i}/{len(file_list)} files...")
-
-    return global_counter
+    index = IngestIndex(config.INGEST_INDEX_DIR, logger)
+    failed = index.update(file_list, num_workers=config.NUM_WORKERS, rebuild=rebuild)
+    if failed:
+        logger.warning(f"{len(failed)} files failed to parse and are excluded from this run.")
+    return index.load(file_list, allowed_uis=allowed_uis)
 
 def main():
     parser = argparse.ArgumentParser(description="MeSH Historical Analysis Pipeline")
     parser.add_argument("--mode", choices=["discovery", "full"], required=True, 
                         help="'discovery' runs on sample data to build term list. 'full' runs on all data.")
+    parser.add_argument("--rebuild-index", action="store_true",
+                        help="Reparse every baseline file instead of reusing cached ingest shards.")
     args = parser.parse_args()
 
     # --- Step 1: Load MeSH Tree Structure ---
@@ -79,14 +64,7 @@ def main():
             logger.warning("No curated list found. Running full ingest on ALL tree candidates.")
 
     # --- Step 3: Ingest PubMed Data ---
-    raw_counts = run_ingest(files_to_process, allowed_uis=candidate_uis)
-
-    # Convert Counter to DataFrame
-    data = []
-    for (ui, year), count in raw_counts.items():
-        data.append({'ui': ui, 'year': year, 'count': count})
-    
-    df = pd.DataFrame(data)
+    df = run_ingest(files_to_process, allowed_uis=candidate_uis, rebuild=args.rebuild_index)
     
     # --- Step 4: Analysis & Pruning ---
     analyzer = Analyzer(df, candidate_map, logger)
@@ -114,19 +92,17 @@ def main():
         # Save raw time series
         df.to_csv(os.path.join(config.OUTPUT_DIR, "full_time_series.csv"), index=False)
         
-        # Perform Modeling on top terms
-        top_terms = df.groupby('ui')['count'].sum().nlargest(50).index
+        # Perform Modeling on every term with enough data
+        fits = analyzer.fit_growth_models_batch(workers=config.NUM_WORKERS)
         results = []
-        for ui in top_terms:
-            fit = analyzer.fit_growth_models(ui)
-            if fit:
-                results.append({
-                    'ui': ui, 
-                    'name': candidate_map.get(ui, "Unknown"),
-                    'model_type': fit['model'],
-                    'params': str(fit['params'])
-                })
-        
+        for ui, fit in fits.items():
+            results.append({
+                'ui': ui,
+                'name': candidate_map.get(ui, "Unknown"),
+                'model_type': fit['model'],
+                'params': str(fit['params'])
+            })
+
         pd.DataFrame(results).to_csv(os.path.join(config.OUTPUT_DIR, "modeling_results.csv"), index=False)
         logger.info("Full analysis complete.")
 
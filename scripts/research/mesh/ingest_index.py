@@ -0,0 +1,257 @@
+"""
+Persistent columnar index of PubMed baseline ingest results.
+Each baseline file is parsed once into a shard of (term id, year, count)
+columns; re-runs parse only new or changed files and merge the shards with
+NumPy instead of reparsing the whole baseline.
+"""
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from .pubmed_parser import PubMedExtractor
+from .utils import file_digest
+
+# Bump when the parser output changes so existing shards are rebuilt
+INDEX_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+MAX_YEAR = np.iinfo(np.uint16).max
+
+
+def _columns(terms, term, years, values):
+    return {
+        'terms': np.array(terms, dtype=str) if len(terms) else np.array([], dtype='U1'),
+        'term': np.array(term, dtype=np.uint32),
+        'year': np.array(years, dtype=np.uint16),
+        'count': np.array(values, dtype=np.uint32),
+    }
+
+
+def counts_to_columns(counts):
+    """
+    Converts parser output into shard columns.
+    :param counts: dict { (mesh_ui, year): count }
+    Returns: dict of arrays 'terms' (unique UIs), 'term' (uint32 index
+             into terms), 'year' (uint16) and 'count' (uint32)
+    """
+    items = [(ui, year, n) for (ui, year), n in counts.items() if 0 <= year <= MAX_YEAR]
+    if not items:
+        return _columns([], [], [], [])
+    uis, years, values = zip(*items)
+    terms, term = np.unique(np.array(uis), return_inverse=True)
+    return _columns(terms, term, years, values)
+
+
+def interned_counts_to_columns(terms, counts):
+    """
+    Converts PubMedExtractor output into shard columns.
+    :param terms: list of MeSH UIs indexed by term id
+    :param counts: dict { (term_id, year): count }
+    """
+    items = [(term_id, year, n) for (term_id, year), n in counts.items() if 0 <= year <= MAX_YEAR]
+    if not items:
+        return _columns([], [], [], [])
+    term, years, values = zip(*items)
+    return _columns(terms, term, years, values)
+
+
+def shard_name(file_path):
+    """Shard file name of a baseline file"""
+    name = os.path.basename(file_path)
+    if name.endswith(".xml.gz"):
+        name = name[:-len(".xml.gz")]
+    return name + ".npz"
+
+
+def write_shard(path, columns):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **columns)
+    os.replace(tmp_path, path)
+
+
+def build_shard(file_path, index_dir):
+    """
+    Worker: parses one baseline file with no term filter and writes its shard,
+    so only the small manifest entry travels back to the parent process.
+    Returns: (file_path, sha256, shard name, rows, error)
+    """
+    try:
+        sha256 = file_digest(file_path)
+        extractor = PubMedExtractor()
+        columns = interned_counts_to_columns(extractor.terms, extractor.count_file(file_path))
+        shard = shard_name(file_path)
+        write_shard(os.path.join(index_dir, shard), columns)
+        return file_path, sha256, shard, len(columns['count']), None
+    except Exception as e:
+        return file_path, None, None, 0, str(e)
+
+
+class IngestIndex:
+    def __init__(self, index_dir, logger):
+        """
+        :param index_dir: Directory holding the manifest and one .npz shard per
+                          baseline file
+        :param logger: logging object
+        """
+        self.index_dir = index_dir
+        self.logger = logger
+        self.manifest_path = os.path.join(index_dir, MANIFEST_NAME)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == INDEX_VERSION:
+                return manifest
+            self.logger.info("Ingest index version changed; rebuilding all shards.")
+        return {'version': INDEX_VERSION, 'files': {}}
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def _key(file_path):
+        return os.path.basename(file_path)
+
+    def _shard_path(self, entry):
+        return os.path.join(self.index_dir, entry['shard'])
+
+    def is_fresh(self, file_path):
+        """
+        True if the file's shard matches its current contents. Size and mtime
+        are compared first; the file is only hashed when they differ, so a
+        touched but unchanged file keeps its shard.
+        """
+        entry = self.manifest['files'].get(self._key(file_path))
+        if entry is None or not os.path.exists(self._shard_path(entry)):
+            return False
+        stat = os.stat(file_path)
+        if entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return True
+        if entry['size'] != stat.st_size or entry['sha256'] != file_digest(file_path):
+            return False
+        entry['mtime_ns'] = stat.st_mtime_ns
+        return True
+
+    def _record_shard(self, file_path, sha256, shard, rows):
+        stat = os.stat(file_path)
+        self.manifest['files'][self._key(file_path)] = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': sha256,
+            'shard': shard,
+            'rows': int(rows),
+        }
+
+    def update(self, file_list, num_workers, rebuild=False):
+        """
+        Parses the files whose shards are missing or stale. Files are
+        scheduled largest first so one big file does not stall the tail of
+        the run, and progress is reported by bytes parsed.
+        :param file_list: Baseline .xml.gz paths
+        :param num_workers: Parser processes
+        :param rebuild: Reparse every file regardless of its fingerprint
+        Returns: list of files that could not be parsed
+        """
+        os.makedirs(self.index_dir, exist_ok=True)
+        stale = [f for f in file_list if rebuild or not self.is_fresh(f)]
+        sizes = {f: os.path.getsize(f) for f in stale}
+        total_bytes = sum(sizes.values())
+        self.logger.info(
+            f"Ingest index: {len(file_list) - len(stale)} files cached, {len(stale)} to parse "
+            f"({total_bytes / 1e9:.2f} GB) with {num_workers} workers."
+        )
+        failed = []
+        if stale:
+            started = time.monotonic()
+            done_bytes = 0
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                futures = [
+                    executor.submit(build_shard, f, self.index_dir)
+                    for f in sorted(stale, key=sizes.get, reverse=True)
+                ]
+                for i, future in enumerate(as_completed(futures), 1):
+                    file_path, sha256, shard, rows, error = future.result()
+                    done_bytes += sizes[file_path]
+                    if error is not None:
+                        self.logger.error(f"Error parsing {file_path}: {error}")
+                        failed.append(file_path)
+                        self.manifest['files'].pop(self._key(file_path), None)
+                    else:
+                        self._record_shard(file_path, sha256, shard, rows)
+                        # Persist progress so an interrupted run keeps finished shards
+                        self._save_manifest()
+                    if i % 10 == 0 or i == len(futures):
+                        self._log_progress(i, len(futures), done_bytes, total_bytes, started)
+        self._save_manifest()
+        return failed
+
+    def _log_progress(self, files_done, files_total, done_bytes, total_bytes, started):
+        elapsed = time.monotonic() - started
+        fraction = done_bytes / total_bytes if total_bytes else 1.0
+        eta = elapsed * (1 - fraction) / fraction if fraction else float('inf')
+        self.logger.info(
+            f"Processed {files_done}/{files_total} files, {done_bytes / 1e9:.2f}/{total_bytes / 1e9:.2f} GB "
+            f"({fraction:.0%}), {done_bytes / 1e6 / max(elapsed, 1e-9):.1f} MB/s, ETA {eta / 60:.1f} min"
+        )
+
+    def _shards(self, file_list):
+        for file_path in file_list:
+            entry = self.manifest['files'].get(self._key(file_path))
+            if entry is not None:
+                yield self._shard_path(entry)
+
+    def load(self, file_list, allowed_uis=None):
+        """
+        Merges the shards of the given files into a dense term x year count
+        matrix, summed in place one shard at a time.
+        :param file_list: Baseline .xml.gz paths (files without a shard are skipped)
+        :param allowed_uis: Set of MeSH UIs to keep. If None, keeps all.
+        Returns: DataFrame with columns ['ui', 'year', 'count']
+        """
+        shard_paths = list(self._shards(file_list))
+
+        # Pass 1: term vocabulary and year range, without reading the counts
+        terms, first_year, last_year = [], MAX_YEAR, 0
+        for path in shard_paths:
+            with np.load(path) as shard:
+                terms.append(shard['terms'])
+                years = shard['year']
+            if len(years):
+                first_year = min(first_year, int(years.min()))
+                last_year = max(last_year, int(years.max()))
+        if last_year < first_year:
+            return pd.DataFrame(columns=['ui', 'year', 'count'])
+
+        vocab = np.unique(np.concatenate(terms))
+        if allowed_uis:
+            vocab = vocab[np.isin(vocab, list(allowed_uis))]
+        span = last_year - first_year + 1
+        matrix = np.zeros((len(vocab), span), dtype=np.int64)
+        flat = matrix.reshape(-1)
+
+        # Pass 2: shard-local term ids -> matrix rows, counts added in place
+        for path in shard_paths:
+            with np.load(path) as shard:
+                shard_terms, term, year, count = shard['terms'], shard['term'], shard['year'], shard['count']
+            rows = np.searchsorted(vocab, shard_terms)
+            found = rows < len(vocab)
+            found[found] = vocab[rows[found]] == shard_terms[found]
+            rows = np.where(found, rows, -1)[term]
+            mask = rows >= 0
+            np.add.at(flat, rows[mask] * span + (year[mask].astype(np.int64) - first_year), count[mask])
+
+        row, col = np.nonzero(matrix)
+        return pd.DataFrame({
+            'ui': vocab[row].astype(object),
+            'year': col.astype(np.int64) + first_year,
+            'count': matrix[row, col],
+        })
@@ -1,60 +1,26 @@
 """
-Parses MeSH Descriptor XML to build the initial candidate universe based on Tree Numbers.
+Builds the initial candidate universe from the MeSH Descriptor XML based on Tree Numbers.
 """
-import xml.etree.cElementTree as ET
 from . import config
+from .mesh_store import MeshStore
 
 class MeshLoader:
-    def __init__(self, xml_path, logger):
+    def __init__(self, xml_path, logger, snapshot_path=None):
         self.xml_path = xml_path
         self.logger = logger
+        self.snapshot_path = snapshot_path or config.MESH_SNAPSHOT_PATH
         self.term_map = {} # UI -> Name
         self.tree_map = {} # UI -> [TreeNumbers]
 
     def load_descriptors(self):
         """
-        Stream parses the MeSH XML to find terms belonging to target tree branches.
+        Finds terms belonging to target tree branches via the cached descriptor
+        store, parsing the MeSH XML only when its snapshot is stale.
         """
-        self.logger.info(f"Parsing MeSH Descriptors from {self.xml_path}...")
-        
-        context = ET.iterparse(self.xml_path, events=("end",))
-        count = 0
-        candidates = 0
+        store = MeshStore(self.xml_path, self.snapshot_path, self.logger).load()
 
-        for event, elem in context:
-            if elem.tag == "DescriptorRecord":
-                ui_elem = elem.find("DescriptorUI")
-                name_elem = elem.find("DescriptorName/String")
+        self.term_map = store.descendants(config.TARGET_TREE_PREFIXES)
+        self.tree_map = {ui: store.tree_numbers[ui] for ui in self.term_map}
 
-                if ui_elem is None or name_elem is None:
-                    elem.clear()
-                    continue
-
-                ui = ui_elem.text
-                name = name_elem.text
-                
-                tree_numbers = []
-                tree_list = elem.find("TreeNumberList")
-                if tree_list is not None:
-                    tree_numbers = [t.text for t in tree_list.findall("TreeNumber")]
-
-                # Check if this term belongs to our target domains
-                is_candidate = False
-                for tn in tree_numbers:
-                    for prefix in config.TARGET_TREE_PREFIXES:
-                        if tn.startswith(prefix):
-                            is_candidate = True
-                            break
-                    if is_candidate:
-                        break
-                
-                if is_candidate:
-                    self.term_map[ui] = name
-                    self.tree_map[ui] = tree_numbers
-                    candidates += 1
-
-                count += 1
-                elem.clear()
-
-        self.logger.info(f"Scanned {count} descriptors. Found {candidates} mental health candidates.")
-        return self.term_map
\ No newline at end of file
+        self.logger.info(f"Scanned {len(store)} descriptors. Found {len(self.term_map)} mental health candidates.")
+        return self.term_map
@@ -0,0 +1,196 @@
+"""
+Indexed MeSH descriptor store.
+Parses the MeSH Descriptor XML once into a compact gzipped JSON snapshot
+(UI, name, tree numbers, entry terms), reused until the XML changes, and
+indexes tree numbers in a trie so subtree queries do not scan every
+descriptor.
+"""
+import gzip
+import json
+import os
+import xml.etree.cElementTree as ET
+
+from . import config
+from .utils import file_digest
+
+# Bump when the snapshot layout changes so existing snapshots are rebuilt
+SNAPSHOT_VERSION = 1
+
+
+class TreeNumberTrie:
+    """
+    Trie over dot-separated MeSH tree numbers (e.g. F03.600.300), one node
+    per segment. Each node holds the UIs of the descriptors filed exactly
+    at that tree number.
+    """
+
+    def __init__(self):
+        self.root = {}   # segment -> [children, uis]
+
+    def insert(self, tree_number, ui):
+        children = self.root
+        for segment in tree_number.split("."):
+            node = children.get(segment)
+            if node is None:
+                node = children[segment] = [{}, []]
+            children = node[0]
+        node[1].append(ui)
+
+    @staticmethod
+    def _collect(node, uis):
+        stack = [node]
+        while stack:
+            children, node_uis = stack.pop()
+            uis.update(node_uis)
+            stack.extend(children.values())
+
+    def subtree(self, prefix):
+        """
+        UIs of all descriptors with a tree number starting with prefix, as
+        str.startswith would match: 'F03' covers F03 and everything below it,
+        and a partial last segment such as 'F0' covers F01...F09.
+        Returns: set of UIs
+        """
+        *path, last = prefix.split(".")
+        children = self.root
+        for segment in path:
+            node = children.get(segment)
+            if node is None:
+                return set()
+            children = node[0]
+        uis = set()
+        for segment, node in children.items():
+            if segment.startswith(last):
+                self._collect(node, uis)
+        return uis
+
+
+def parse_descriptor_xml(xml_path):
+    """
+    Stream parses the MeSH Descriptor XML.
+    Returns: list of [ui, name, tree_numbers, entry_terms]
+    """
+    descriptors = []
+    context = ET.iterparse(xml_path, events=("start", "end"))
+    _, root = next(context)
+    for event, elem in context:
+        if event != "end" or elem.tag != "DescriptorRecord":
+            continue
+        ui = elem.findtext("DescriptorUI")
+        name = elem.findtext("DescriptorName/String")
+        if ui is not None and name is not None:
+            tree_numbers = [t.text for t in elem.findall("TreeNumberList/TreeNumber")]
+            entry_terms = sorted({t.text for t in elem.findall("ConceptList/Concept/TermList/Term/String")} - {name})
+            descriptors.append([ui, name, tree_numbers, entry_terms])
+        # Drop the finished record from the root so memory stays flat
+        root.clear()
+    return descriptors
+
+
+class MeshStore:
+    def __init__(self, xml_path, snapshot_path, logger=None):
+        """
+        :param xml_path: MeSH Descriptor XML (e.g. desc2024.xml)
+        :param snapshot_path: Cached snapshot (.json.gz), rebuilt when the XML changes
+        :param logger: logging object
+        """
+        self.xml_path = xml_path
+        self.snapshot_path = snapshot_path
+        self.logger = logger
+        self.names = {}          # UI -> name
+        self.tree_numbers = {}   # UI -> [TreeNumbers]
+        self.labels = {}         # lower-cased name or entry term -> UI
+        self.trie = TreeNumberTrie()
+
+    def _log(self, message):
+        if self.logger:
+            self.logger.info(message)
+
+    def _read_snapshot(self, stat):
+        if not os.path.exists(self.snapshot_path):
+            return None
+        with gzip.open(self.snapshot_path, 'rt', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        source = snapshot.get('source', {})
+        if snapshot.get('version') != SNAPSHOT_VERSION or source.get('size') != stat.st_size:
+            return None
+        if source.get('mtime_ns') != stat.st_mtime_ns and source.get('sha256') != file_digest(self.xml_path):
+            return None
+        return snapshot
+
+    def _write_snapshot(self, stat, descriptors):
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'source': {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_digest(self.xml_path)},
+            'descriptors': descriptors,
+        }
+        os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+        tmp_path = self.snapshot_path + ".tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+        os.replace(tmp_path, self.snapshot_path)
+
+    def load(self, rebuild=False):
+        """
+        Loads descriptors from the snapshot, parsing the XML only when the
+        snapshot is missing or was built from a different XML file.
+        Returns: self
+        """
+        stat = os.stat(self.xml_path)
+        snapshot = None if rebuild else self._read_snapshot(stat)
+        if snapshot is not None:
+            descriptors = snapshot['descriptors']
+            self._log(f"Loaded {len(descriptors)} MeSH descriptors from snapshot {self.snapshot_path}.")
+        else:
+            self._log(f"Parsing MeSH Descriptors from {self.xml_path}...")
+            descriptors = parse_descriptor_xml(self.xml_path)
+            self._write_snapshot(stat, descriptors)
+            self._log(f"Wrote snapshot of {len(descriptors)} descriptors to {self.snapshot_path}.")
+
+        for ui, name, tree_numbers, entry_terms in descriptors:
+            self.names[ui] = name
+            self.tree_numbers[ui] = tree_numbers
+            for tree_number in tree_numbers:
+                self.trie.insert(tree_number, ui)
+            for label in entry_terms:
+                self.labels.setdefault(label.lower(), ui)
+        # Preferred names win over another descriptor's entry term
+        for ui, name in self.names.items():
+            self.labels[name.lower()] = ui
+        return self
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, label):
+        """UI of the descriptor whose name or entry term is label (case-insensitive), or None"""
+        return self.labels.get(label.strip().lower())
+
+    def descendants(self, prefixes):
+        """
+        Descriptors filed under any of the tree number prefixes.
+        :param prefixes: Tree number prefix or list of prefixes (e.g. ["F03", "F01"])
+        Returns: dict {ui: name}
+        """
+        if isinstance(prefixes, str):
+            prefixes = [prefixes]
+        uis = set()
+        for prefix in prefixes:
+            uis |= self.trie.subtree(prefix)
+        return {ui: self.names[ui] for ui in sorted(uis)}
+
+
+_default_store = None
+
+
+def get_default_store(logger=None):
+    """
+    Store for the pipeline's configured MeSH XML, loaded once per process.
+    Returns: MeshStore, or None if the XML is not available locally
+    """
+    global _default_store
+    if _default_store is None:
+        if not os.path.exists(config.MESH_DESC_XML):
+            return None
+        _default_store = MeshStore(config.MESH_DESC_XML, config.MESH_SNAPSHOT_PATH, logger).load()
+    return _default_store
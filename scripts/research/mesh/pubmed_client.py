@@ -1,21 +1,239 @@
 """
 A client for interacting with the PubMed API using the requests library.
 This version is designed for a more robust, adaptive search strategy.
+
+All requests go through one PubMedClient per process: a pooled keep-alive
+session paced by a shared token bucket at NCBI's limit (3 requests/sec, or
+10 with an API key), so terms can be counted concurrently without tripping
+the limit.
 """
 import requests
+import threading
 import time
 import os
-from typing import List, Dict, Optional, Set
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Iterable, List, Dict, Optional
 from xml.etree import ElementTree
 
 # --- Constants ---
 PUBMED_API_BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 # It's good practice to have an API key, but not strictly required for low-volume use.
 PUBMED_API_KEY = os.getenv("PUBMED_API_KEY", None)
+# NCBI E-utilities limits (requests per second)
+RATE_LIMIT = 3
+RATE_LIMIT_WITH_KEY = 10
+MAX_RETRIES = 3
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. With the default capacity of one token,
+    request starts are spaced exactly 1/rate seconds apart, so no one-second
+    window ever holds more than `rate` requests.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Blocks until a token is available and takes it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class PubMedClient:
+    """
+    Rate-limited, concurrent E-utilities client.
+    """
+
+    def __init__(self, api_key: Optional[str] = PUBMED_API_KEY, max_workers: Optional[int] = None,
+                 session: Optional[requests.Session] = None):
+        """
+        Args:
+            api_key: NCBI API key; raises the rate limit from 3 to 10 requests/sec.
+            max_workers: Concurrent requests in flight (default: the rate limit).
+            session: requests session to reuse (default: a new pooled session).
+        """
+        self.api_key = api_key
+        self.rate = RATE_LIMIT_WITH_KEY if api_key else RATE_LIMIT
+        self.max_workers = max_workers or self.rate
+        self.limiter = TokenBucket(self.rate)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+            session.mount("https://", adapter)
+        self.session = session
+
+    def _request(self, method: str, endpoint: str, params: Dict) -> requests.Response:
+        """
+        Sends one paced request. HTTP 429 and 5xx responses are retried with
+        backoff; other errors raise requests.exceptions.RequestException.
+        """
+        params = dict(params)
+        if self.api_key:
+            params["api_key"] = self.api_key
+        url = f"{PUBMED_API_BASE_URL}/{endpoint}"
+        for attempt in range(MAX_RETRIES + 1):
+            self.limiter.acquire()
+            if method == "POST":
+                response = self.session.post(url, data=params, timeout=30)
+            else:
+                response = self.session.get(url, params=params, timeout=30)
+            retryable = response.status_code == 429 or response.status_code >= 500
+            if not retryable or attempt == MAX_RETRIES:
+                response.raise_for_status()
+                return response
+            time.sleep(2 ** attempt)
+
+    def esearch(self, term: str, **params) -> Dict:
+        """Runs esearch.fcgi and returns its esearchresult object."""
+        params = {"db": "pubmed", "term": term, "retmode": "json", **params}
+        return self._request("GET", "esearch.fcgi", params).json().get("esearchresult", {})
+
+    def count(self, term: str, year: Optional[int] = None) -> int:
+        """
+        Searches PubMed for a given term and returns the number of publications.
+        Supports filtering by year if provided.
+        """
+        optimized_query = _optimize_query_for_pubmed(term)
+
+        if year:
+            # PDAT: Publication Date
+            # Format: YYYY[PDAT]
+            optimized_query += f" AND ({year}[PDAT])"
+
+        try:
+            return int(self.esearch(optimized_query, retmax=0).get("count", 0))
+        except requests.exceptions.RequestException as e:
+            print(f"Error searching PubMed for '{term}': {e}")
+            return 0
+        except (KeyError, ValueError) as e:
+            print(f"Error parsing PubMed response for '{term}': {e}")
+            return 0
+
+    def counts(self, terms: Iterable[str], year: Optional[int] = None) -> Dict[str, int]:
+        """
+        Publication counts of many terms, requested concurrently up to the
+        rate limit.
+
+        Returns:
+            Dict of term -> count, in the order of terms.
+        """
+        terms = list(dict.fromkeys(terms))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(terms, executor.map(lambda t: self.count(t, year), terms)))
+
+    def yearly_counts(self, term: str, years: Iterable[int]) -> Dict[int, int]:
+        """
+        Publication counts of one term per year. The term is searched once
+        with usehistory=y and each year is counted against the stored result
+        set on the history server, so the MeSH query is not re-evaluated.
+
+        Returns:
+            Dict of year -> count (0 for years whose request failed).
+        """
+        years = list(years)
+        try:
+            base = self.esearch(_optimize_query_for_pubmed(term), retmax=0, usehistory="y")
+            webenv, query_key = base["webenv"], base["querykey"]
+        except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+            print(f"Error creating PubMed history for '{term}': {e}")
+            return {year: 0 for year in years}
+
+        def year_count(year):
+            try:
+                result = self.esearch(f"#{query_key} AND ({year}[PDAT])", retmax=0, WebEnv=webenv)
+                return int(result.get("count", 0))
+            except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+                print(f"Error counting '{term}' for {year}: {e}")
+                return 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(years, executor.map(year_count, years)))
+
+    def related_terms(self, term: str, max_papers: int = 100) -> List[str]:
+        """
+        Discovers related MeSH terms by analyzing a sample of recent papers.
+        This is the core discovery mechanism for the algorithm. It avoids fetching
+        full paper text, retrieving only the lightweight metadata.
+
+        Args:
+            term: The term to start the discovery from.
+            max_papers: The number of papers to sample. A smaller number is faster
+                        but gives less variety.
+
+        Returns:
+            A sorted list of related MeSH term names.
+        """
+        related_terms = set()
+        optimized_query = _optimize_query_for_pubmed(term)
+
+        try:
+            # 1. Find recent papers for the term
+            ids = self.esearch(optimized_query, retmax=max_papers, sort="pub_date").get("idlist", [])
+
+            if not ids:
+                print(f"Could not find any papers for '{term}' to discover related terms.")
+                return []
+
+            # 2. Fetch the metadata for those papers
+            fetch_params = {
+                "db": "pubmed",
+                "id": ",".join(ids),
+                "rettype": "medline",
+                "retmode": "xml",
+            }
+            fetch_response = self._request("POST", "efetch.fcgi", fetch_params)
+
+            # 3. Parse the XML to extract MeSH terms
+            root = ElementTree.fromstring(fetch_response.content)
+            for heading in root.findall(".//MeshHeading"):
+                descriptor = heading.find("DescriptorName")
+                if descriptor is not None and descriptor.text:
+                    related_terms.add(descriptor.text)
+
+            # Remove the original search term if it's present
+            related_terms.discard(term)
+
+            # Return as a sorted list for JSON consistency
+            return sorted(related_terms)
+
+        except requests.exceptions.RequestException as e:
+            print(f"API error discovering related terms for '{term}': {e}")
+            return []
+        except ElementTree.ParseError as e:
+            print(f"XML parse error discovering related terms for '{term}': {e}")
+            return []
 
 
 # --- Helper Functions ---
 
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_client() -> PubMedClient:
+    """Process-wide client, so every caller shares one rate limit and connection pool."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = PubMedClient()
+        return _default_client
+
+
 def _optimize_query_for_pubmed(term: str) -> str:
     """
     Formats a search query for PubMed MeSH Major Topic search.
@@ -27,124 +245,20 @@ def get_term_publication_count(term: str, year: Optional[int] = None) -> int:
     Searches PubMed for a given term and returns the number of publications.
     Supports filtering by year if provided.
     """
-    optimized_query = _optimize_query_for_pubmed(term)
-    
-    if year:
-        # PDAT: Publication Date
-        # Format: YYYY[PDAT]
-        optimized_query += f" AND ({year}[PDAT])"
-
-    params = {
-        "db": "pubmed",
-        "term": optimized_query,
-        "retmode": "json",
-        "retmax": 0,
-    }
-    if PUBMED_API_KEY:
-        params["api_key"] = PUBMED_API_KEY
-
-    try:
-        response = requests.get(f"{PUBMED_API_BASE_URL}/esearch.fcgi", params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        count = int(data.get("esearchresult", {}).get("count", 0))
-        
-        time.sleep(1.0)
-        return count
-        
-    except requests.exceptions.RequestException as e:
-        print(f"Error searching PubMed for '{term}': {e}")
-        return 0
-    except (KeyError, ValueError) as e:
-        print(f"Error parsing PubMed response for '{term}': {e}")
-        return 0
-
-def discover_related_terms(term: str, max_papers: int = 100) -> Set[str]:
-    """
-    Discovers related MeSH terms by analyzing a sample of recent papers.
-    This is the core discovery mechanism for the algorithm. It avoids fetching
-    full paper text, retrieving only the lightweight metadata.
+    return get_client().count(term, year)
 
-    Args:
-        term: The term to start the discovery from.
-        max_papers: The number of papers to sample. A smaller number is faster
-                    but gives less variety.
+def get_term_publication_counts(terms: Iterable[str], year: Optional[int] = None) -> Dict[str, int]:
+    """
+    Publication counts of many terms, requested concurrently within the rate limit.
+    """
+    return get_client().counts(terms, year)
 
-    Returns:
-        A set of related MeSH term names.
+def discover_related_terms(term: str, max_papers: int = 100) -> List[str]:
     """
-    related_terms = set()
-    optimized_query = _optimize_query_for_pubmed(term)
-    
-    # 1. Find recent papers for the term
-    search_params = {
-        "db": "pubmed",
-        "term": optimized_query,
-        "retmax": max_papers,
-        "sort": "pub_date",
-        "retmode": "json",
-    }
-    if PUBMED_API_KEY:
-        search_params["api_key"] = PUBMED_API_KEY
-
-    try:
-        search_response = requests.get(f"{PUBMED_API_BASE_URL}/esearch.fcgi", params=search_params)
-        search_response.raise_for_status()
-        search_data = search_response.json()
-        ids = search_data.get("esearchresult", {}).get("idlist", [])
-        
-        if not ids:
-            print(f"Could not find any papers for '{term}' to discover related terms.")
-            return related_terms
-        
-        time.sleep(1.0)
-
-        # 2. Fetch the metadata for those papers
-        fetch_params = {
-            "db": "pubmed",
-            "id": ",".join(ids),
-            "rettype": "medline",
-            "retmode": "xml",
-        }
-        if PUBMED_API_KEY:
-            fetch_params["api_key"] = PUBMED_API_KEY
-            
-        fetch_response = requests.post(f"{PUBMED_API_BASE_URL}/efetch.fcgi", data=fetch_params)
-        fetch_response.raise_for_status()
-
-        # 3. Parse the XML to extract MeSH terms
-        root = ElementTree.fromstring(fetch_response.content)
-        for heading in root.findall(".//MeshHeading"):
-            descriptor = heading.find("DescriptorName")
-            if descriptor is not None and descriptor.text:
-                # Check if this is a Major Topic
-                is_major = descriptor.get("MajorTopicYN") == "Y"
-
-                # Also check qualifiers for Major Topic status
-                qualifiers = heading.findall("QualifierName")
-                for qual in qualifiers:
-                    if qual.get("MajorTopicYN") == "Y":
-                        is_major = True
-
-                # For v1, we still add all terms, but we ensure we handle the structure correctly
-                # and prioritize major topics in future weighted versions.
-                related_terms.add(descriptor.text)
-        
-        # Remove the original search term if it's present
-        if term in related_terms:
-            related_terms.remove(term)
-
-        time.sleep(1.0)
-        # Return as a sorted list for JSON consistency
-        return sorted(list(related_terms))
-
-    except requests.exceptions.RequestException as e:
-        print(f"API error discovering related terms for '{term}': {e}")
-        return []
-    except ElementTree.ParseError as e:
-        print(f"XML parse error discovering related terms for '{term}': {e}")
-        return []
+    Discovers related MeSH terms by analyzing a sample of recent papers.
+    See PubMedClient.related_terms.
+    """
+    return get_client().related_terms(term, max_papers)
 
 
 # --- Example Usage ---
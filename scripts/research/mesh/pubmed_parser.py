@@ -1,82 +1,154 @@
 """
-Streaming parser for PubMed XML (.gz) files. 
+Streaming parser for PubMed XML (.gz) files.
 Designed to be run in parallel processes.
 """
 import gzip
-import xml.etree.cElementTree as ET
 import os
+import re
 from collections import Counter
 
+CHUNK_SIZE = 1 << 20
+
+# Element paths read by PubMedExtractor. PubMed XML is machine generated:
+# markup characters inside text are always escaped and no CDATA is used, so
+# these byte markers only ever match real tags.
+ARTICLE_START = b'<PubmedArticle>'
+ARTICLE_END = b'</PubmedArticle>'
+# Year sources in order of preference: <Source>/Year of the first element of
+# each; the first one with a Year wins
+DATE_ELEMENTS = (b'PubDate', b'ArticleDate', b'DateCompleted')
+YEAR_PATTERN = re.compile(rb'<Year>([^<]*)</Year>')
+# MeshHeading/DescriptorName -> (UI, attributes)
+DESCRIPTOR_PATTERN = re.compile(rb'<MeshHeading>\s*<DescriptorName\b(?=[^>]*\bUI="([^"]*)")([^>]*)>')
+MAJOR_TOPIC = b'MajorTopicYN="Y"'
+
+
+def _element(article, name):
+    """Content of the first <name> element of an article, or None"""
+    open_tag = b'<' + name
+    start = article.find(open_tag)
+    # Skip longer tag names sharing the prefix
+    while start >= 0 and article[start + len(open_tag):start + len(open_tag) + 1] not in b'> \t\r\n':
+        start = article.find(open_tag, start + 1)
+    if start < 0:
+        return None
+    start = article.find(b'>', start) + 1
+    end = article.find(b'</' + name + b'>', start)
+    return article[start:end] if end >= 0 else None
+
+
+def _article_year(article):
+    for name in DATE_ELEMENTS:
+        date = _element(article, name)
+        if date is not None:
+            year = YEAR_PATTERN.search(date)
+            if year is not None and year.group(1):
+                year = year.group(1).strip()
+                return int(year) if year.isdigit() else None
+    return None
+
+
+class PubMedExtractor:
+    """
+    Fast streaming extractor for PubMed baseline files. Instead of building
+    an element tree it scans the decompressed bytes article by article and
+    reads only the year (PubDate, then ArticleDate, then DateCompleted) and
+    the MeshHeadingList/MeshHeading/DescriptorName headings, interning
+    descriptor UIs to integer ids.
+    """
+
+    def __init__(self):
+        self.terms = []      # term id -> MeSH UI
+        self.term_ids = {}   # MeSH UI (bytes) -> term id
+
+    def intern(self, ui):
+        term_id = self.term_ids.get(ui)
+        if term_id is None:
+            term_id = self.term_ids[ui] = len(self.terms)
+            self.terms.append(ui.decode('ascii'))
+        return term_id
+
+    def _articles(self, block):
+        intern = self.intern
+        for article in block.split(ARTICLE_END):
+            # Drop whatever precedes the article (e.g. a PubmedBookArticle and its PubDate)
+            start = article.rfind(ARTICLE_START)
+            if start < 0:
+                continue
+            article = article[start:]
+            year = _article_year(article)
+            if year is None:
+                continue
+            mesh_list = _element(article, b'MeshHeadingList')
+            if mesh_list is None:
+                yield year, []
+            else:
+                yield year, [(intern(ui), MAJOR_TOPIC in attrs) for ui, attrs in DESCRIPTOR_PATTERN.findall(mesh_list)]
+
+    def iter_articles(self, filepath, chunk_size=CHUNK_SIZE):
+        """
+        Streams the articles of a .xml.gz file. Articles without a numeric
+        year are skipped.
+        Yields: (year, [(term_id, major_topic), ...])
+        """
+        tail = b''
+        with gzip.open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                buffer = tail + chunk
+                # Only complete articles are scanned; the rest waits for the next chunk
+                cut = buffer.rfind(ARTICLE_END)
+                if cut < 0:
+                    tail = buffer
+                    continue
+                cut += len(ARTICLE_END)
+                yield from self._articles(buffer[:cut])
+                tail = buffer[cut:]
+        if ARTICLE_START in tail:
+            raise ValueError(f"{filepath} ends inside a PubmedArticle")
+
+    def count_file(self, filepath, counts=None):
+        """
+        Counts descriptor mentions per year. counts is updated in place, so
+        it keeps the articles read before an error.
+        Returns: Counter { (term_id, year): count }
+        """
+        counts = Counter() if counts is None else counts
+        for year, headings in self.iter_articles(filepath):
+            counts.update([(term_id, year) for term_id, _ in headings])
+        return counts
+
+
 class PubMedParser:
     def __init__(self, allowed_mesh_uis=None):
         """
-        :param allowed_mesh_uis: Set of MeSH UIs (strings) to filter for. 
+        :param allowed_mesh_uis: Set of MeSH UIs (strings) to filter for.
                                  If None, parses all.
         """
         self.allowed_mesh_uis = set(allowed_mesh_uis) if allowed_mesh_uis else None
 
-    def parse_file(self, filepath):
+    def parse_file(self, filepath, raise_errors=False):
         """
         Parses a single .xml.gz file and returns aggregated counts.
+        :param raise_errors: Re-raise read/parse errors instead of returning
+                             the counts gathered before the error.
         Returns: dict { (mesh_ui, year): count }
         """
-        local_counts = Counter()
-        
+        extractor = PubMedExtractor()
+        id_counts = Counter()
+
         try:
-            with gzip.open(filepath, 'rb') as f:
-                context = ET.iterparse(f, events=("end",))
-                
-                for event, elem in context:
-                    if elem.tag == "PubmedArticle":
-                        self._process_article(elem, local_counts)
-                        elem.clear()
+            extractor.count_file(filepath, id_counts)
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Error parsing {filepath}: {e}")
-            
-        return local_counts
 
-    def _process_article(self, article_elem, counter):
-        # 1. Extract Year
-        year = None
-        
-        # Try PubDate first
-        pub_date = article_elem.find(".//PubDate")
-        if pub_date is not None:
-            year_elem = pub_date.find("Year")
-            if year_elem is not None:
-                year = year_elem.text
-        
-        # Fallback to ArticleDate
-        if not year:
-            article_date = article_elem.find(".//ArticleDate")
-            if article_date is not None:
-                year_elem = article_date.find("Year")
-                if year_elem is not None:
-                    year = year_elem.text
-
-        # Fallback to DateCompleted
-        if not year:
-            date_completed = article_elem.find(".//DateCompleted")
-            if date_completed is not None:
-                year_elem = date_completed.find("Year")
-                if year_elem is not None:
-                    year = year_elem.text
-
-        if not year or not str(year).isdigit():
-            return
-
-        year = int(year)
-
-        # 2. Extract MeSH Terms
-        mesh_list = article_elem.find(".//MeshHeadingList")
-        if mesh_list is not None:
-            for heading in mesh_list.findall("MeshHeading"):
-                descriptor = heading.find("DescriptorName")
-                if descriptor is not None:
-                    ui = descriptor.get("UI")
-                    
-                    # Filter: Only count if it's in our candidate list
-                    if self.allowed_mesh_uis and ui not in self.allowed_mesh_uis:
-                        continue
-                    
-                    counter[(ui, year)] += 1
\ No newline at end of file
+        local_counts = Counter()
+        for (term_id, year), count in id_counts.items():
+            ui = extractor.terms[term_id]
+            # Filter: Only count if it's in our candidate list
+            if self.allowed_mesh_uis and ui not in self.allowed_mesh_uis:
+                continue
+            local_counts[(ui, year)] = count
+
+        return local_counts
@@ -0,0 +1,154 @@
+"""
+Adaptive year-range publication counting.
+A time series of N intervals naively costs N esearch calls per term. The
+counter asks for the whole span first and splits it only where it has to:
+a range with no publications settles every interval inside it with one call,
+sparse ranges are bisected, and dense ranges skip their leading empty years
+(before a term came into use) with a few prefix-range calls before counting
+the rest interval by interval. Every (term, start, end) result is cached, so
+repeated and overlapping series cost nothing extra.
+
+PubMed matches [PDAT] against both the print and the electronic date, so an
+article can fall in two adjacent years and a range count is not the sum of
+its parts. Counts are therefore never derived by subtraction; zero is the
+only value propagated from a range to the intervals inside it, and only when
+PubMed actually answered zero. A range whose count could not be fetched is
+not cached and is split like a sparse one, so a failed request costs at most
+the one interval it could not be retried around, which is reported in
+`failed` and left at 0.
+"""
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Mean publications per interval at which a range is counted interval by
+# interval instead of bisected (empty intervals past the first are unlikely)
+DENSE_COUNT_PER_INTERVAL = 20
+
+
+class CountUnavailable(Exception):
+    """Raised by count_range when PubMed returned no count for a range"""
+
+
+class RangeCounter:
+    def __init__(self, count_range, dense_count=DENSE_COUNT_PER_INTERVAL):
+        """
+        :param count_range: coroutine function (term, start_year, end_year) -> publication count,
+            raising CountUnavailable when the request failed
+        :param dense_count: Mean count per interval at which a range is no longer bisected
+        """
+        self.count_range = count_range
+        self.dense_count = dense_count
+        self.cache = {}      # (term, start_year, end_year) -> count
+        self.calls = 0       # count_range calls made
+        self.failed = []     # (term, start_year, end_year) intervals left at 0 because their count failed
+        self._pending = {}   # (term, start_year, end_year) -> in-flight task
+
+    async def count(self, term, start, end):
+        """
+        Publication count of term between start and end (inclusive), from the
+        cache when known. Concurrent requests for the same range share one call.
+        Returns: int
+        Raises: CountUnavailable if the count could not be fetched (not cached)
+        """
+        key = (term, start, end)
+        if key in self.cache:
+            return self.cache[key]
+        task = self._pending.get(key)
+        if task is None:
+            task = self._pending[key] = asyncio.ensure_future(self._fetch(key))
+        return await task
+
+    async def _fetch(self, key):
+        try:
+            self.calls += 1
+            count = await self.count_range(*key)
+            self.cache[key] = count
+            return count
+        finally:
+            del self._pending[key]
+
+    async def _try_count(self, term, start, end):
+        """count(), or None when it could not be fetched"""
+        try:
+            return await self.count(term, start, end)
+        except CountUnavailable as e:
+            logger.warning(f"No count for '{term}' in {start}-{end}: {e}")
+            return None
+
+    async def _interval_count(self, term, intervals, index):
+        count = await self._try_count(term, *intervals[index])
+        if count is None:
+            self.failed.append((term, *intervals[index]))
+            return 0
+        return count
+
+    async def counts(self, term, intervals):
+        """
+        Publication counts of term for each interval.
+        :param intervals: (start_year, end_year) tuples in increasing order
+        Returns: list of counts, one per interval
+        """
+        intervals = list(intervals)
+        counts = [0] * len(intervals)
+        if intervals:
+            total = await self._try_count(term, intervals[0][0], intervals[-1][1])
+            await self._resolve(term, intervals, 0, len(intervals), total, counts)
+        return counts
+
+    async def _resolve(self, term, intervals, lo, hi, total, counts):
+        """
+        Fills counts[lo:hi] given the count over intervals[lo:hi]
+        (None when that count failed)
+        """
+        if total == 0:
+            return
+        if hi - lo == 1:
+            counts[lo] = total if total is not None else await self._interval_count(term, intervals, lo)
+            return
+        if total is not None and total >= self.dense_count * (hi - lo):
+            first = await self._first_nonempty(term, intervals, lo, hi)
+            counts[first:hi] = await asyncio.gather(
+                *(self._interval_count(term, intervals, i) for i in range(first, hi)))
+            return
+        mid = (lo + hi) // 2
+        left, right = await asyncio.gather(
+            self._try_count(term, intervals[lo][0], intervals[mid - 1][1]),
+            self._try_count(term, intervals[mid][0], intervals[hi - 1][1]))
+        await asyncio.gather(
+            self._resolve(term, intervals, lo, mid, left, counts),
+            self._resolve(term, intervals, mid, hi, right, counts))
+
+    async def _first_nonempty(self, term, intervals, lo, hi):
+        """
+        Index of the first interval in intervals[lo:hi] with publications, given
+        that the range as a whole has some. Leading empty intervals (years before
+        a term came into use) are skipped with prefix-range queries that double in
+        length, then bisected, so they cost O(log n) calls instead of one each.
+        A failed probe ends the search early, counting from the last interval
+        known to be empty rather than guessing.
+        """
+        start = intervals[lo][0]
+        first = await self._try_count(term, start, intervals[lo][1])
+        if first is None or first > 0:
+            return lo
+        empty, step = lo, 1   # intervals[lo:empty + 1] have no publications
+        while True:
+            probe = min(empty + step, hi - 1)
+            count = await self._try_count(term, start, intervals[probe][1])
+            if count is None:
+                return empty + 1
+            if count > 0:
+                break
+            empty, step = probe, step * 2
+        while probe - empty > 1:
+            mid = (empty + probe) // 2
+            count = await self._try_count(term, start, intervals[mid][1])
+            if count is None:
+                return empty + 1
+            if count > 0:
+                probe = mid
+            else:
+                empty = mid
+        return probe
@@ -1,6 +1,7 @@
 """
 Utility functions for logging and file handling.
 """
+import hashlib
 import logging
 import os
 import json
@@ -53,4 +54,12 @@ def save_json(data, filepath):
 
 def load_json(filepath):
     with open(filepath, 'r') as f:
-        return json.load(f)
\ No newline at end of file
+        return json.load(f)
+
+def file_digest(filepath, chunk_size=1 << 20):
+    """SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
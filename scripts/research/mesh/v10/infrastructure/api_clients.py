@@ -10,6 +10,8 @@ import json
 import logging
 import time
 from typing import List, Dict, Any, Optional
+from scripts.research.mesh.api_cache import get_cache
+from scripts.research.mesh.mesh_store import get_default_store
 
 logger = logging.getLogger("ExternalAPIFetcher")
 
@@ -22,7 +24,12 @@ class ExternalAPIFetcher:
     def query_api_safely(url: str) -> Optional[Dict[str, Any]]:
         """
         Executes HTTP GET request safely, returning parsed JSON or None if offline/error.
+        Responses come from the suite-wide cache when another version already fetched them.
         """
+        cache = get_cache()
+        cached = cache.get(url)
+        if cached is not None:
+            return cached
         try:
             req = urllib.request.Request(
                 url, 
@@ -30,7 +37,9 @@ class ExternalAPIFetcher:
             )
             with urllib.request.urlopen(req, timeout=8) as response:
                 if response.status == 200:
-                    return json.loads(response.read().decode("utf-8"))
+                    data = json.loads(response.read().decode("utf-8"))
+                    cache.set(url, None, data)
+                    return data
         except Exception as e:
             if hasattr(e, "code") and e.code == 404:
                 logger.debug(f"API {url} returned 404 Not Found (expected for non-pharmacological entries).")
@@ -220,9 +229,14 @@ class ExternalAPIFetcher:
     @classmethod
     def fetch_mesh_tree_numbers(cls, mesh_id: str) -> List[str]:
         """
-        Fetches the tree numbers for a specific MeSH ID dynamically from the MeSH RDF Details API.
-        Enforces a strict 333ms delay.
+        Fetches the tree numbers for a specific MeSH ID, from the local descriptor store when the
+        MeSH XML is available, otherwise from the MeSH RDF Details API.
+        Enforces a strict 333ms delay on API calls.
         """
+        store = get_default_store(logger)
+        if store is not None and mesh_id in store.tree_numbers:
+            return list(store.tree_numbers[mesh_id])
+
         time.sleep(0.35)
         url = f"https://id.nlm.nih.gov/mesh/{mesh_id}.json"
         data = cls.query_api_safely(url)
@@ -17,6 +17,11 @@ except ImportError:
 
 from Bio import Entrez
 
+try:
+    from scripts.research.mesh.mesh_store import get_default_store
+except ImportError:  # run as a plain script: no local descriptor store
+    get_default_store = None
+
 # Configure Entrez
 # Replace with your actual email address
 Entrez.email = "cito@greenhousemd.org"  
@@ -60,7 +65,17 @@ class Node:
 # ---------- MeSH Data Fetching and Classification ----------
 
 def get_mesh_details(term):
-    """Fetches MeSH details for a given term using Entrez."""
+    """
+    Fetches MeSH details for a given term, from the local descriptor store when the MeSH XML is
+    available (mesh_id is then the descriptor UI), otherwise using Entrez.
+    """
+    store = get_default_store(logger) if get_default_store else None
+    if store is not None:
+        ui = store.lookup(term)
+        if ui:
+            logger.debug(f"Found MeSH UI {ui} for term '{term}' in the local descriptor store")
+            return {"mesh_id": ui, "tree_numbers": list(store.tree_numbers[ui])}
+
     logger.info(f"Fetching MeSH details for term: '{term}'")
     try:
         logger.debug(f"Calling Entrez.esearch for term: '{term}'")
@@ -2,15 +2,13 @@
 MeSH Discovery Suite V3 - Core PubMed Client
 Enhanced with async support, SQLite caching, and robust error handling.
 """
-import sqlite3
 import aiohttp
 import asyncio
-import time
 import os
-import json
 import logging
 import random
 from typing import List, Dict, Optional, Set
+from scripts.research.mesh.api_cache import get_cache
 from xml.etree import ElementTree
 
 logger = logging.getLogger(__name__)
@@ -21,22 +19,15 @@ class PubMedClientV3:
     """
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 
-    def __init__(self, api_keys: List[str] = None, cache_db: str = "scripts/research/mesh/v3/cache.db"):
+    def __init__(self, api_keys: List[str] = None, cache_db: Optional[str] = None):
         # Enhancement 4: API key rotation
         self.api_keys = api_keys or ([os.getenv("PUBMED_API_KEY")] if os.getenv("PUBMED_API_KEY") else [])
-        self.cache_db = cache_db
-        self._init_cache()
+        # Enhancement 1: Persistent SQLite caching, shared across suite versions
+        self.cache = get_cache(cache_db)
         self.key_index = 0
         # Enhancement 12: Telemetry
         self.telemetry = {"requests": 0, "cache_hits": 0, "errors": 0}
 
-    def _init_cache(self):
-        # Enhancement 1: Persistent SQLite caching
-        os.makedirs(os.path.dirname(self.cache_db), exist_ok=True)
-        conn = sqlite3.connect(self.cache_db)
-        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, timestamp REAL)")
-        conn.close()
-
     def _get_api_key(self):
         if not self.api_keys:
             return None
@@ -48,14 +39,14 @@ class PubMedClientV3:
         """
         Fetches data from NCBI E-utilities asynchronously.
         """
-        cache_key = f"{tool}_{json.dumps(params, sort_keys=True)}"
+        url = f"{self.BASE_URL}/{tool}.fcgi"
+        # Non-JSON responses are cached as raw text and wrapped on the way out
+        kind = "json" if params.get("retmode") == "json" else "text"
         if use_cache:
-            conn = sqlite3.connect(self.cache_db)
-            row = conn.execute("SELECT value FROM cache WHERE key = ?", (cache_key,)).fetchone()
-            conn.close()
-            if row:
+            cached = await self.cache.aget(url, params, kind)
+            if cached is not None:
                 self.telemetry["cache_hits"] += 1
-                return json.loads(row[0])
+                return cached if kind == "json" else {"content": cached}
 
         api_key = self._get_api_key()
         if api_key:
@@ -65,7 +56,6 @@ class PubMedClientV3:
         params["tool"] = "GreenhouseMeshV3"
 
         self.telemetry["requests"] += 1
-        url = f"{self.BASE_URL}/{tool}.fcgi"
 
         # Enhancement 3: Async HTTP requests
         # Enhancement 5: Jittered exponential backoff
@@ -87,17 +77,13 @@ class PubMedClientV3:
 
                         response.raise_for_status()
 
-                        if params.get("retmode") == "json":
+                        if kind == "json":
                             data = await response.json()
                         else:
                             data = {"content": await response.text()}
 
                         if use_cache:
-                            conn = sqlite3.connect(self.cache_db)
-                            conn.execute("INSERT OR REPLACE INTO cache (key, value, timestamp) VALUES (?, ?, ?)",
-                                         (cache_key, json.dumps(data), time.time()))
-                            conn.commit()
-                            conn.close()
+                            await self.cache.aset(url, params, data if kind == "json" else data["content"], kind)
 
                         return data
                 except Exception as e:
@@ -12,6 +12,8 @@ from xml.etree import ElementTree
 
 # Add the current directory to sys.path to allow relative-like imports if run as a script
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# and the repository root for the shared mesh modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../..")))
 
 from core.client import PubMedClientV3
 from core.engine import DiscoveryEngineV3
@@ -29,7 +31,7 @@ class MeSHPipelineV3:
         self._setup_logging()
 
         self.cli = CLIV3()
-        self.client = PubMedClientV3(api_keys=self.config.get('api_keys'))
+        self.client = PubMedClientV3(api_keys=self.config.get('api_keys'), cache_db=self.config.get('cache_db'))
         self.engine = DiscoveryEngineV3(
             self.client,
             min_count=self.config.get('min_count', 100),
@@ -2,15 +2,13 @@
 MeSH Discovery Suite V4 - Core PubMed Client
 Enhanced with async support, SQLite caching, and robust error handling.
 """
-import sqlite3
 import aiohttp
 import asyncio
-import time
 import os
-import json
 import logging
 import random
 from typing import List, Dict, Optional, Set
+from scripts.research.mesh.api_cache import get_cache
 
 logger = logging.getLogger(__name__)
 
@@ -20,19 +18,12 @@ class PubMedClientV4:
     """
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 
-    def __init__(self, api_keys: List[str] = None, cache_db: str = "scripts/research/mesh/v4/cache.db"):
+    def __init__(self, api_keys: List[str] = None, cache_db: Optional[str] = None):
         self.api_keys = api_keys or ([os.getenv("PUBMED_API_KEY")] if os.getenv("PUBMED_API_KEY") else [])
-        self.cache_db = cache_db
-        self._init_cache()
+        self.cache = get_cache(cache_db)
         self.key_index = 0
         self.telemetry = {"requests": 0, "cache_hits": 0, "errors": 0}
 
-    def _init_cache(self):
-        os.makedirs(os.path.dirname(self.cache_db), exist_ok=True)
-        conn = sqlite3.connect(self.cache_db)
-        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, timestamp REAL)")
-        conn.close()
-
     def _get_api_key(self):
         if not self.api_keys:
             return None
@@ -44,14 +35,14 @@ class PubMedClientV4:
         """
         Fetches data from NCBI E-utilities asynchronously.
         """
-        cache_key = f"{tool}_{json.dumps(params, sort_keys=True)}"
+        url = f"{self.BASE_URL}/{tool}.fcgi"
+        # Non-JSON responses are cached as raw text and wrapped on the way out
+        kind = "json" if params.get("retmode") == "json" else "text"
         if use_cache:
-            conn = sqlite3.connect(self.cache_db)
-            row = conn.execute("SELECT value FROM cache WHERE key = ?", (cache_key,)).fetchone()
-            conn.close()
-            if row:
+            cached = await self.cache.aget(url, params, kind)
+            if cached is not None:
                 self.telemetry["cache_hits"] += 1
-                return json.loads(row[0])
+                return cached if kind == "json" else {"content": cached}
 
         api_key = self._get_api_key()
         if api_key:
@@ -61,7 +52,6 @@ class PubMedClientV4:
         params["tool"] = "GreenhouseMeshV4"
 
         self.telemetry["requests"] += 1
-        url = f"{self.BASE_URL}/{tool}.fcgi"
 
         async with aiohttp.ClientSession() as session:
             for attempt in range(5):
@@ -83,17 +73,13 @@ class PubMedClientV4:
 
                         response.raise_for_status()
 
-                        if params.get("retmode") == "json":
+                        if kind == "json":
                             data = await response.json()
                         else:
                             data = {"content": await response.text()}
 
                         if use_cache:
-                            conn = sqlite3.connect(self.cache_db)
-                            conn.execute("INSERT OR REPLACE INTO cache (key, value, timestamp) VALUES (?, ?, ?)",
-                                         (cache_key, json.dumps(data), time.time()))
-                            conn.commit()
-                            conn.close()
+                            await self.cache.aset(url, params, data if kind == "json" else data["content"], kind)
 
                         return data
                 except Exception as e:
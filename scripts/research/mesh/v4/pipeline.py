@@ -11,6 +11,8 @@ import sys
 
 # Add the current directory to sys.path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# and the repository root for the shared mesh modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../..")))
 
 from core.client import PubMedClientV4
 from core.engine import DiscoveryEngineV4
@@ -27,7 +29,7 @@ class MeSHPipelineV4:
         self.cli = CLIV4()
         self.client = PubMedClientV4(
             api_keys=self.config.get('api_keys'),
-            cache_db=self.config.get('cache_db', "scripts/research/mesh/v4/cache.db")
+            cache_db=self.config.get('cache_db')
         )
         self.engine = DiscoveryEngineV4(self.client, self.config)
 
@@ -2,15 +2,13 @@
 MeSH Discovery Suite V5 - Core PubMed Client (Temporal Optimized)
 Inherits from V4 foundation with focus on time-bucketed performance.
 """
-import sqlite3
 import aiohttp
 import asyncio
-import time
 import os
-import json
 import logging
 import random
 from typing import List, Dict, Optional, Tuple
+from scripts.research.mesh.api_cache import get_cache
 
 logger = logging.getLogger(__name__)
 
@@ -20,19 +18,12 @@ class PubMedClientV5:
     """
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 
-    def __init__(self, api_keys: List[str] = None, cache_db: str = "scripts/research/mesh/v5/cache.db"):
+    def __init__(self, api_keys: List[str] = None, cache_db: Optional[str] = None):
         self.api_keys = api_keys or ([os.getenv("PUBMED_API_KEY")] if os.getenv("PUBMED_API_KEY") else [])
-        self.cache_db = cache_db
-        self._init_cache()
+        self.cache = get_cache(cache_db)
         self.key_index = 0
         self.telemetry = {"requests": 0, "cache_hits": 0, "errors": 0}
 
-    def _init_cache(self):
-        os.makedirs(os.path.dirname(self.cache_db), exist_ok=True)
-        conn = sqlite3.connect(self.cache_db)
-        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, timestamp REAL)")
-        conn.close()
-
     def _get_api_key(self):
         if not self.api_keys:
             return None
@@ -41,14 +32,14 @@ class PubMedClientV5:
         return key
 
     async def fetch(self, tool: str, params: Dict, use_cache: bool = True) -> Dict:
-        cache_key = f"{tool}_{json.dumps(params, sort_keys=True)}"
+        url = f"{self.BASE_URL}/{tool}.fcgi"
+        # Non-JSON responses are cached as raw text and wrapped on the way out
+        kind = "json" if params.get("retmode") == "json" else "text"
         if use_cache:
-            conn = sqlite3.connect(self.cache_db)
-            row = conn.execute("SELECT value FROM cache WHERE key = ?", (cache_key,)).fetchone()
-            conn.close()
-            if row:
+            cached = await self.cache.aget(url, params, kind)
+            if cached is not None:
                 self.telemetry["cache_hits"] += 1
-                return json.loads(row[0])
+                return cached if kind == "json" else {"content": cached}
 
         api_key = self._get_api_key()
         if api_key:
@@ -58,7 +49,6 @@ class PubMedClientV5:
         params["tool"] = "GreenhouseMeshV5"
 
         self.telemetry["requests"] += 1
-        url = f"{self.BASE_URL}/{tool}.fcgi"
 
         async with aiohttp.ClientSession() as session:
             for attempt in range(5):
@@ -76,17 +66,13 @@ class PubMedClientV5:
 
                         response.raise_for_status()
 
-                        if params.get("retmode") == "json":
+                        if kind == "json":
                             data = await response.json()
                         else:
                             data = {"content": await response.text()}
 
                         if use_cache:
-                            conn = sqlite3.connect(self.cache_db)
-                            conn.execute("INSERT OR REPLACE INTO cache (key, value, timestamp) VALUES (?, ?, ?)",
-                                         (cache_key, json.dumps(data), time.time()))
-                            conn.commit()
-                            conn.close()
+                            await self.cache.aset(url, params, data if kind == "json" else data["content"], kind)
 
                         return data
                 except Exception as e:
@@ -96,9 +82,11 @@ class PubMedClientV5:
                     await asyncio.sleep(1 + random.random())
         return {}
 
-    async def get_publication_count_in_range(self, term: str, start_year: int, end_year: int) -> int:
+    async def get_publication_count_in_range(self, term: str, start_year: int, end_year: int,
+                                             default: Optional[int] = 0) -> Optional[int]:
         """
         Fetches the number of publications for a term within a specific date range.
+        :param default: Returned when PubMed gave no count (retries exhausted)
         """
         # Using [MeSH Terms] and [DP] (Date - Publication) for broad longitudinal coverage
         query = f'("{term}"[MeSH Terms]) AND ("{start_year}/01/01"[Date - Publication] : "{end_year}/12/31"[Date - Publication])'
@@ -111,8 +99,8 @@ class PubMedClientV5:
         }
         
         data = await self.fetch("esearch", params)
-        count_str = data.get("esearchresult", {}).get("count", "0")
-        return int(count_str)
+        count_str = data.get("esearchresult", {}).get("count")
+        return int(count_str) if count_str is not None else default
 
     def get_telemetry(self):
         return self.telemetry
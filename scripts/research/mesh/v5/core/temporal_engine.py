@@ -2,12 +2,15 @@
 MeSH Discovery Suite V5 - Temporal Engine
 Orchestrates longitudinal publication count collection.
 """
+import aiohttp
 import asyncio
 import yaml
 import logging
 import json
+import os
 from datetime import datetime
 from typing import List, Dict, Any
+from scripts.research.mesh.range_counter import CountUnavailable, RangeCounter
 from .client import PubMedClientV5
 
 logger = logging.getLogger(__name__)
@@ -29,6 +32,23 @@ class TemporalEngineV5:
             "intervals": [],
             "datasets": []
         }
+        # Limit concurrency to respect NCBI rate limits
+        self.semaphore = asyncio.Semaphore(5)
+        self.range_counter = RangeCounter(self.count_range)
+
+    async def count_range(self, term: str, start: int, end: int) -> int:
+        async with self.semaphore:
+            logger.info(f"Fetching counts for '{term}' during {start}-{end}...")
+            try:
+                count = await self.client.get_publication_count_in_range(term, start, end, default=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise CountUnavailable(str(e)) from e
+            # Small delay to be polite to NCBI
+            await asyncio.sleep(0.1)
+        if count is None:
+            # A failed request must not read as "no publications in this range"
+            raise CountUnavailable(f"PubMed request failed for {start}-{end}")
+        return count
 
     def generate_intervals(self) -> List[tuple]:
         """
@@ -48,14 +68,7 @@ class TemporalEngineV5:
         """
         Collects counts for a single condition across all intervals.
         """
-        counts = []
-        for start, end in intervals:
-            logger.info(f"Fetching counts for '{term}' during {start}-{end}...")
-            count = await self.client.get_publication_count_in_range(term, start, end)
-            counts.append(count)
-            # Small delay to be polite to NCBI
-            await asyncio.sleep(0.1)
-            
+        counts = await self.range_counter.counts(term, intervals)
         return {
             "label": term,
             "counts": counts,
@@ -85,18 +98,13 @@ class TemporalEngineV5:
                 except Exception as e:
                     logger.warning(f"Failed to load dynamic conditions from {v8_output}: {e}")
 
-        # Limit concurrency to respect NCBI rate limits
-        sem = asyncio.Semaphore(5)
-        
-        async def sem_process(condition):
-            async with sem:
-                return await self.process_condition(condition, intervals)
-        
-        tasks = []
-        for condition in conditions:
-            tasks.append(sem_process(condition))
-            
+        tasks = [self.process_condition(condition, intervals) for condition in conditions]
         self.results["datasets"] = await asyncio.gather(*tasks)
+        logger.info(f"Counted {len(conditions)} series of {len(intervals)} intervals "
+                    f"with {self.range_counter.calls} range queries.")
+        if self.range_counter.failed:
+            logger.warning(f"{len(self.range_counter.failed)} intervals could not be counted and were left at 0: "
+                           f"{self.range_counter.failed}")
         
         # Save output
         output_path = "scripts/research/mesh/v5/timeline_v5.json"
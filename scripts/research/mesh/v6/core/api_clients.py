@@ -1,12 +1,10 @@
 import asyncio
 import aiohttp
-import sqlite3
-import json
 import os
-import time
 import random
 import logging
 from typing import Dict, List, Any, Optional
+from scripts.research.mesh.api_cache import get_cache
 
 logger = logging.getLogger(__name__)
 
@@ -19,31 +17,16 @@ class DiscoveryClientV6:
     CLINICAL_TRIALS_BASE_URL = "https://clinicaltrials.gov/api/v2/studies"
     OPENFDA_BASE_URL = "https://api.fda.gov/drug/label.json"
 
-    def __init__(self, cache_db: str = "scripts/research/mesh/v6/cache.db"):
-        self.cache_db = cache_db
-        self._init_cache()
+    def __init__(self, cache_db: Optional[str] = None):
+        self.cache = get_cache(cache_db)
         self.api_key = os.getenv("PUBMED_API_KEY")
 
-    def _init_cache(self):
-        cache_dir = os.path.dirname(self.cache_db)
-        if cache_dir:
-            os.makedirs(cache_dir, exist_ok=True)
-        try:
-            conn = sqlite3.connect(self.cache_db)
-            conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, timestamp REAL)")
-            conn.close()
-        except Exception as e:
-            logger.error(f"Failed to initialize cache: {e}")
-
     async def _fetch(self, session: aiohttp.ClientSession, url: str, params: Dict, use_cache: bool = True) -> Dict:
-        cache_key = f"{url}_{json.dumps(params, sort_keys=True)}"
         if use_cache:
             try:
-                conn = sqlite3.connect(self.cache_db)
-                row = conn.execute("SELECT value FROM cache WHERE key = ?", (cache_key,)).fetchone()
-                conn.close()
-                if row:
-                    return json.loads(row[0])
+                cached = await self.cache.aget(url, params)
+                if cached is not None:
+                    return cached
             except Exception as e:
                 logger.warning(f"Cache read error: {e}")
 
@@ -64,11 +47,7 @@ class DiscoveryClientV6:
 
                     if use_cache:
                         try:
-                            conn = sqlite3.connect(self.cache_db)
-                            conn.execute("INSERT OR REPLACE INTO cache (key, value, timestamp) VALUES (?, ?, ?)",
-                                         (cache_key, json.dumps(data), time.time()))
-                            conn.commit()
-                            conn.close()
+                            await self.cache.aset(url, params, data)
                         except Exception as e:
                             logger.warning(f"Cache write error: {e}")
 
@@ -15,7 +15,7 @@ class DiscoveryEngineV6:
     """
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self.client = DiscoveryClientV6(cache_db=config.get("cache_db", "scripts/research/mesh/v6/cache.db"))
+        self.client = DiscoveryClientV6(cache_db=config.get("cache_db"))
         self.semaphore = asyncio.Semaphore(config.get("max_concurrency", 5))
 
     def parse_graph_csv(self, csv_path: str) -> List[Dict[str, Any]]:
@@ -1,10 +1,7 @@
 import aiohttp
-import asyncio
-import sqlite3
-import json
-import os
 import logging
 from typing import Dict, List, Any, Optional
+from scripts.research.mesh.api_cache import get_cache
 
 logger = logging.getLogger(__name__)
 
@@ -14,36 +11,19 @@ class ClinicalTrialsClient:
     """
     BASE_URL = "https://clinicaltrials.gov/api/v2/studies"
 
-    def __init__(self, cache_db: str = "scripts/research/mesh/v8/cache.db"):
-        self.cache_db = cache_db
-        self._init_cache()
-
-    def _init_cache(self):
-        cache_dir = os.path.dirname(self.cache_db)
-        if cache_dir:
-            os.makedirs(cache_dir, exist_ok=True)
-        conn = sqlite3.connect(self.cache_db)
-        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, timestamp REAL)")
-        conn.close()
+    def __init__(self, cache_db: Optional[str] = None):
+        self.cache = get_cache(cache_db)
 
     async def _fetch(self, session: aiohttp.ClientSession, params: Dict) -> Dict:
-        cache_key = f"clinicaltrials_{json.dumps(params, sort_keys=True)}"
-
-        conn = sqlite3.connect(self.cache_db)
-        row = conn.execute("SELECT value FROM cache WHERE key = ?", (cache_key,)).fetchone()
-        conn.close()
-        if row:
-            return json.loads(row[0])
+        cached = await self.cache.aget(self.BASE_URL, params)
+        if cached is not None:
+            return cached
 
         try:
             async with session.get(self.BASE_URL, params=params) as response:
                 if response.status == 200:
                     data = await response.json()
-                    conn = sqlite3.connect(self.cache_db)
-                    conn.execute("INSERT OR REPLACE INTO cache (key, value, timestamp) VALUES (?, ?, ?)",
-                                 (cache_key, json.dumps(data), asyncio.get_event_loop().time()))
-                    conn.commit()
-                    conn.close()
+                    await self.cache.aset(self.BASE_URL, params, data)
                     return data
                 else:
                     logger.error(f"ClinicalTrials API error: {response.status}")
@@ -1,10 +1,8 @@
 import aiohttp
-import asyncio
-import sqlite3
-import json
 import os
 import logging
 from typing import Dict, List, Any, Optional
+from scripts.research.mesh.api_cache import get_cache
 
 logger = logging.getLogger(__name__)
 
@@ -14,27 +12,15 @@ class DisGeNETClient:
     """
     BASE_URL = "https://www.disgenet.org/api/v1"
 
-    def __init__(self, api_key: Optional[str] = None, cache_db: str = "scripts/research/mesh/v8/cache.db"):
+    def __init__(self, api_key: Optional[str] = None, cache_db: Optional[str] = None):
         self.api_key = api_key or os.getenv("DISGENET_API_KEY")
-        self.cache_db = cache_db
-        self._init_cache()
-
-    def _init_cache(self):
-        cache_dir = os.path.dirname(self.cache_db)
-        if cache_dir:
-            os.makedirs(cache_dir, exist_ok=True)
-        conn = sqlite3.connect(self.cache_db)
-        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, timestamp REAL)")
-        conn.close()
+        self.cache = get_cache(cache_db)
 
     async def _fetch(self, session: aiohttp.ClientSession, endpoint: str, params: Dict) -> Any:
-        cache_key = f"disgenet_{endpoint}_{json.dumps(params, sort_keys=True)}"
-
-        conn = sqlite3.connect(self.cache_db)
-        row = conn.execute("SELECT value FROM cache WHERE key = ?", (cache_key,)).fetchone()
-        conn.close()
-        if row:
-            return json.loads(row[0])
+        url = f"{self.BASE_URL}/{endpoint}"
+        cached = await self.cache.aget(url, params)
+        if cached is not None:
+            return cached
 
         if not self.api_key:
             logger.error("DisGeNET API key missing! This source requires an API key for curated data.")
@@ -43,17 +29,12 @@ class DisGeNETClient:
             return {"error": "No API key"}
 
         headers = {"Authorization": f"Bearer {self.api_key}"}
-        url = f"{self.BASE_URL}/{endpoint}"
 
         try:
             async with session.get(url, params=params, headers=headers) as response:
                 if response.status == 200:
                     data = await response.json()
-                    conn = sqlite3.connect(self.cache_db)
-                    conn.execute("INSERT OR REPLACE INTO cache (key, value, timestamp) VALUES (?, ?, ?)",
-                                 (cache_key, json.dumps(data), asyncio.get_event_loop().time()))
-                    conn.commit()
-                    conn.close()
+                    await self.cache.aset(url, params, data)
                     return data
                 else:
                     logger.error(f"DisGeNET API error: {response.status}")
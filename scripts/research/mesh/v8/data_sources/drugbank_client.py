@@ -1,10 +1,8 @@
 import aiohttp
-import asyncio
-import sqlite3
-import json
 import os
 import logging
 from typing import Dict, List, Any, Optional
+from scripts.research.mesh.api_cache import get_cache
 
 logger = logging.getLogger(__name__)
 
@@ -14,27 +12,15 @@ class DrugBankClient:
     """
     BASE_URL = "https://api.drugbank.com/v1"
 
-    def __init__(self, api_key: Optional[str] = None, cache_db: str = "scripts/research/mesh/v8/cache.db"):
+    def __init__(self, api_key: Optional[str] = None, cache_db: Optional[str] = None):
         self.api_key = api_key or os.getenv("DRUGBANK_API_KEY")
-        self.cache_db = cache_db
-        self._init_cache()
-
-    def _init_cache(self):
-        cache_dir = os.path.dirname(self.cache_db)
-        if cache_dir:
-            os.makedirs(cache_dir, exist_ok=True)
-        conn = sqlite3.connect(self.cache_db)
-        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, timestamp REAL)")
-        conn.close()
+        self.cache = get_cache(cache_db)
 
     async def _fetch(self, session: aiohttp.ClientSession, endpoint: str, params: Dict) -> Dict:
-        cache_key = f"drugbank_{endpoint}_{json.dumps(params, sort_keys=True)}"
-
-        conn = sqlite3.connect(self.cache_db)
-        row = conn.execute("SELECT value FROM cache WHERE key = ?", (cache_key,)).fetchone()
-        conn.close()
-        if row:
-            return json.loads(row[0])
+        url = f"{self.BASE_URL}/{endpoint}"
+        cached = await self.cache.aget(url, params)
+        if cached is not None:
+            return cached
 
         if not self.api_key:
             logger.error("DrugBank API key missing! This source requires an API key for discovery data.")
@@ -43,17 +29,12 @@ class DrugBankClient:
             return {"error": "No API key"}
 
         headers = {"Authorization": self.api_key}
-        url = f"{self.BASE_URL}/{endpoint}"
 
         try:
             async with session.get(url, params=params, headers=headers) as response:
                 if response.status == 200:
                     data = await response.json()
-                    conn = sqlite3.connect(self.cache_db)
-                    conn.execute("INSERT OR REPLACE INTO cache (key, value, timestamp) VALUES (?, ?, ?)",
-                                 (cache_key, json.dumps(data), asyncio.get_event_loop().time()))
-                    conn.commit()
-                    conn.close()
+                    await self.cache.aset(url, params, data)
                     return data
                 else:
                     logger.error(f"DrugBank API error: {response.status}")
@@ -1,10 +1,8 @@
 import aiohttp
-import asyncio
-import sqlite3
 import json
-import os
 import logging
 from typing import Dict, List, Any, Optional
+from scripts.research.mesh.api_cache import get_cache
 
 logger = logging.getLogger(__name__)
 
@@ -14,36 +12,21 @@ class OpenTargetsClient:
     """
     URL = "https://api.platform.opentargets.org/api/v4/graphql"
 
-    def __init__(self, cache_db: str = "scripts/research/mesh/v8/cache.db"):
-        self.cache_db = cache_db
-        self._init_cache()
-
-    def _init_cache(self):
-        cache_dir = os.path.dirname(self.cache_db)
-        if cache_dir:
-            os.makedirs(cache_dir, exist_ok=True)
-        conn = sqlite3.connect(self.cache_db)
-        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, timestamp REAL)")
-        conn.close()
+    def __init__(self, cache_db: Optional[str] = None):
+        self.cache = get_cache(cache_db)
 
     async def _query(self, session: aiohttp.ClientSession, query: str, variables: Dict) -> Dict:
-        cache_key = f"opentargets_{query}_{json.dumps(variables, sort_keys=True)}"
-
-        conn = sqlite3.connect(self.cache_db)
-        row = conn.execute("SELECT value FROM cache WHERE key = ?", (cache_key,)).fetchone()
-        conn.close()
-        if row:
-            return json.loads(row[0])
+        # GraphQL goes over POST; the query and its variables identify the request
+        request = {"query": query, "variables": json.dumps(variables, sort_keys=True)}
+        cached = await self.cache.aget(self.URL, request)
+        if cached is not None:
+            return cached
 
         try:
             async with session.post(self.URL, json={"query": query, "variables": variables}) as response:
                 if response.status == 200:
                     data = await response.json()
-                    conn = sqlite3.connect(self.cache_db)
-                    conn.execute("INSERT OR REPLACE INTO cache (key, value, timestamp) VALUES (?, ?, ?)",
-                                 (cache_key, json.dumps(data), asyncio.get_event_loop().time()))
-                    conn.commit()
-                    conn.close()
+                    await self.cache.aset(self.URL, request, data)
                     return data
                 else:
                     logger.error(f"OpenTargets API error: {response.status}")
@@ -1,11 +1,9 @@
 import aiohttp
-import asyncio
-import sqlite3
-import json
 import os
 import logging
 import xml.etree.ElementTree as ET
 from typing import Dict, List, Any, Optional
+from scripts.research.mesh.api_cache import get_cache
 
 logger = logging.getLogger(__name__)
 
@@ -15,32 +13,20 @@ class PubMedClient:
     """
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 
-    def __init__(self, api_key: Optional[str] = None, cache_db: str = "scripts/research/mesh/v8/cache.db"):
+    def __init__(self, api_key: Optional[str] = None, cache_db: Optional[str] = None):
         self.api_key = api_key or os.getenv("PUBMED_API_KEY")
-        self.cache_db = cache_db
-        self._init_cache()
-
-    def _init_cache(self):
-        cache_dir = os.path.dirname(self.cache_db)
-        if cache_dir:
-            os.makedirs(cache_dir, exist_ok=True)
-        conn = sqlite3.connect(self.cache_db)
-        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, timestamp REAL)")
-        conn.close()
+        self.cache = get_cache(cache_db)
 
     async def _fetch(self, session: aiohttp.ClientSession, endpoint: str, params: Dict, use_xml: bool = False) -> Any:
-        cache_key = f"pubmed_{endpoint}_{json.dumps(params, sort_keys=True)}"
-
-        conn = sqlite3.connect(self.cache_db)
-        row = conn.execute("SELECT value FROM cache WHERE key = ?", (cache_key,)).fetchone()
-        conn.close()
-        if row:
-            return json.loads(row[0]) if not use_xml else row[0]
+        url = f"{self.BASE_URL}/{endpoint}"
+        kind = "text" if use_xml else "json"
+        cached = await self.cache.aget(url, params, kind)
+        if cached is not None:
+            return cached
 
         if self.api_key:
             params["api_key"] = self.api_key
 
-        url = f"{self.BASE_URL}/{endpoint}"
         try:
             async with session.get(url, params=params) as response:
                 if response.status == 200:
@@ -49,11 +35,7 @@ class PubMedClient:
                     else:
                         data = await response.json()
 
-                    conn = sqlite3.connect(self.cache_db)
-                    conn.execute("INSERT OR REPLACE INTO cache (key, value, timestamp) VALUES (?, ?, ?)",
-                                 (cache_key, json.dumps(data) if not use_xml else data, asyncio.get_event_loop().time()))
-                    conn.commit()
-                    conn.close()
+                    await self.cache.aset(url, params, data, kind)
                     return data
                 else:
                     logger.error(f"PubMed API error: {response.status}")
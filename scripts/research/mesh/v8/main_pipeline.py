@@ -28,7 +28,7 @@ async def run_pipeline(config_path: str):
 
     disorder = config['pipeline']['disorder']
     output_csv = config['pipeline']['output_csv']
-    cache_db = config['pipeline']['cache_db']
+    cache_db = config['pipeline'].get('cache_db')
 
     logger.info(f"Starting discovery pipeline for: {disorder}")
 
@@ -2,16 +2,14 @@
 MeSH Discovery Suite V9 - Core PubMed Client
 Consolidated async client with SQLite caching, session pooling, and rate limiting.
 """
-import sqlite3
 import aiohttp
 import asyncio
-import time
 import os
-import json
 import logging
 import random
 import xml.etree.ElementTree as ET
 from typing import List, Dict, Optional, Set, Any, Union
+from scripts.research.mesh.api_cache import get_cache
 
 logger = logging.getLogger(__name__)
 
@@ -24,24 +22,17 @@ class PubMedClientV9:
     def __init__(
         self,
         api_key: Optional[str] = None,
-        cache_db: str = "scripts/research/mesh/v9/cache.db",
+        cache_db: Optional[str] = None,
         email: str = "cito@greenhousemd.org",
         tool: str = "GreenhouseMeshV9"
     ):
         self.api_key = api_key or os.getenv("PUBMED_API_KEY")
-        self.cache_db = cache_db
+        self.cache = get_cache(cache_db)
         self.email = email
         self.tool = tool
-        self._init_cache()
         self.telemetry = {"requests": 0, "cache_hits": 0, "errors": 0}
         self._session: Optional[aiohttp.ClientSession] = None
 
-    def _init_cache(self):
-        os.makedirs(os.path.dirname(self.cache_db), exist_ok=True)
-        conn = sqlite3.connect(self.cache_db)
-        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, timestamp REAL)")
-        conn.close()
-
     async def get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
             self._session = aiohttp.ClientSession()
@@ -52,15 +43,14 @@ class PubMedClientV9:
             await self._session.close()
 
     async def _fetch(self, endpoint: str, params: Dict, use_cache: bool = True, use_xml: bool = False) -> Any:
-        cache_key = f"pubmed_{endpoint}_{json.dumps(params, sort_keys=True)}"
+        url = f"{self.BASE_URL}/{endpoint}.fcgi"
+        kind = "text" if use_xml else "json"
 
         if use_cache:
-            conn = sqlite3.connect(self.cache_db)
-            row = conn.execute("SELECT value FROM cache WHERE key = ?", (cache_key,)).fetchone()
-            conn.close()
-            if row:
+            cached = await self.cache.aget(url, params, kind)
+            if cached is not None:
                 self.telemetry["cache_hits"] += 1
-                return json.loads(row[0]) if not use_xml else row[0]
+                return cached
 
         if self.api_key:
             params["api_key"] = self.api_key
@@ -68,7 +58,6 @@ class PubMedClientV9:
         params["email"] = self.email
         params["tool"] = self.tool
 
-        url = f"{self.BASE_URL}/{endpoint}.fcgi"
         session = await self.get_session()
 
         for attempt in range(5):
@@ -93,11 +82,7 @@ class PubMedClientV9:
                         data = await response.json()
 
                     if use_cache:
-                        conn = sqlite3.connect(self.cache_db)
-                        conn.execute("INSERT OR REPLACE INTO cache (key, value, timestamp) VALUES (?, ?, ?)",
-                                     (cache_key, json.dumps(data) if not use_xml else data, time.time()))
-                        conn.commit()
-                        conn.close()
+                        await self.cache.aset(url, params, data, kind)
 
                     return data
             except Exception as e:
@@ -129,7 +114,11 @@ class PubMedClientV9:
         params.update(kwargs)
         return await self._fetch("efetch", params, use_xml=True)
 
-    async def get_publication_count(self, term: str, year: Optional[int] = None, year_range: Optional[tuple] = None) -> int:
+    async def get_publication_count(self, term: str, year: Optional[int] = None, year_range: Optional[tuple] = None,
+                                    default: Optional[int] = 0) -> Optional[int]:
+        """
+        :param default: Returned when the request failed and PubMed gave no count
+        """
         query = f"({term}[MeSH Major Topic])"
         if year:
             query += f" AND ({year}[PDAT])"
@@ -137,7 +126,8 @@ class PubMedClientV9:
             query += f" AND ({year_range[0]}:{year_range[1]}[PDAT])"
 
         data = await self.esearch(query, retmax=0)
-        return int(data.get("esearchresult", {}).get("count", 0))
+        count = data.get("esearchresult", {}).get("count")
+        return int(count) if count is not None else default
 
     async def discover_related_terms(self, term: str, max_papers: int = 50, noexp: bool = True) -> Set[str]:
         # Enhancement: use 'noexp' if requested for precision
@@ -4,13 +4,10 @@ Async client for ClinicalTrials.gov API v2 with pagination and caching.
 """
 import aiohttp
 import asyncio
-import sqlite3
-import json
-import os
-import time
 import random
 import logging
 from typing import Dict, List, Any, Optional
+from scripts.research.mesh.api_cache import get_cache
 
 logger = logging.getLogger(__name__)
 
@@ -20,18 +17,11 @@ class ClinicalTrialsClientV9:
     """
     BASE_URL = "https://clinicaltrials.gov/api/v2/studies"
 
-    def __init__(self, cache_db: str = "scripts/research/mesh/v9/cache.db"):
-        self.cache_db = cache_db
-        self._init_cache()
+    def __init__(self, cache_db: Optional[str] = None):
+        self.cache = get_cache(cache_db)
         self._session: Optional[aiohttp.ClientSession] = None
         self.telemetry = {"requests": 0, "cache_hits": 0, "errors": 0}
 
-    def _init_cache(self):
-        os.makedirs(os.path.dirname(self.cache_db), exist_ok=True)
-        conn = sqlite3.connect(self.cache_db)
-        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, timestamp REAL)")
-        conn.close()
-
     async def get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
             self._session = aiohttp.ClientSession()
@@ -42,15 +32,11 @@ class ClinicalTrialsClientV9:
             await self._session.close()
 
     async def _fetch(self, params: Dict, use_cache: bool = True) -> Dict:
-        cache_key = f"clinicaltrials_{json.dumps(params, sort_keys=True)}"
-
         if use_cache:
-            conn = sqlite3.connect(self.cache_db)
-            row = conn.execute("SELECT value FROM cache WHERE key = ?", (cache_key,)).fetchone()
-            conn.close()
-            if row:
+            cached = await self.cache.aget(self.BASE_URL, params)
+            if cached is not None:
                 self.telemetry["cache_hits"] += 1
-                return json.loads(row[0])
+                return cached
 
         session = await self.get_session()
         for attempt in range(5):
@@ -67,11 +53,7 @@ class ClinicalTrialsClientV9:
                     data = await response.json()
 
                     if use_cache:
-                        conn = sqlite3.connect(self.cache_db)
-                        conn.execute("INSERT OR REPLACE INTO cache (key, value, timestamp) VALUES (?, ?, ?)",
-                                     (cache_key, json.dumps(data), time.time()))
-                        conn.commit()
-                        conn.close()
+                        await self.cache.aset(self.BASE_URL, params, data)
                     return data
             except Exception as e:
                 self.telemetry["errors"] += 1
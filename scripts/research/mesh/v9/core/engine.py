@@ -62,54 +62,78 @@ class DiscoveryEngineV9:
         """
         Runs the discovery process starting from a seed term.
         Yields results incrementally.
+
+        Requests are pipelined: a level's counts run concurrently, each accepted
+        term is expanded as soon as its count is in, and the next level's counts
+        start as each expansion returns. Terms are decided level by level, in the
+        order their counts arrive, so shallower terms claim total_max_terms first.
         """
         logger.info(f"Starting V9 Discovery for: {seed_term}")
         self.visited = set()
+        self.frontier = {seed_term}  # every term ever queued, so none is counted twice
         self.total_terms = 0
 
-        # Level 1 queue
-        queue = [(seed_term, 1, None, 1.0)] # term, level, parent_count, parent_significance
-
-        for level in range(1, self.max_levels + 1):
-            next_queue = []
-            level_results = []
-
-            # Process current level
-            tasks = []
-            for term, lvl, p_count, p_sig in queue:
-                tasks.append(self._process_term(term, lvl, p_count))
-
-            results = await asyncio.gather(*tasks)
-
-            for res in results:
-                if not res: continue
-
-                yield res
-                level_results.append(res)
-
-                if res.get("status") == "accepted" and level < self.max_levels:
-                    # Get related terms for next level
-                    related = await self._fetch_related(res["term"])
-                    for r_term in list(related)[:self.max_children]:
-                        if r_term not in self.visited:
-                            next_queue.append((r_term, level + 1, res["count"], 1.0))
-
-            self.checkpoint(level, level_results)
-            queue = next_queue
-            if not queue or self.total_terms >= self.total_max_terms:
-                break
-
-    async def _process_term(self, term: str, level: int, parent_count: Optional[int]) -> Optional[Dict]:
-        if term in self.visited:
-            self.telemetry["levels"][level]["skipped"] += 1
-            return None
+        # Level 1 queue: count tasks resolving to (term, level, parent_count, count)
+        queue = [asyncio.ensure_future(self._count(seed_term, 1, None))]
+        next_queue, expansions = [], []
+        try:
+            for level in range(1, self.max_levels + 1):
+                next_queue, expansions = [], []
+                level_results = []
+                budget_spent = False
+
+                for next_count in asyncio.as_completed(queue):
+                    res = self._evaluate(*await next_count)
+                    if res is None:
+                        budget_spent = True
+                        break
+
+                    yield res
+                    level_results.append(res)
+
+                    if res["status"] == "accepted" and level < self.max_levels:
+                        # Get related terms for next level without waiting for the rest of this one
+                        expansions.append(asyncio.ensure_future(self._expand(res, next_queue)))
+
+                if not budget_spent:
+                    await asyncio.gather(*expansions)
+                self.checkpoint(level, level_results)
+                queue = next_queue
+                if budget_spent or not queue or self.total_terms >= self.total_max_terms:
+                    break
+        finally:
+            for task in queue + next_queue + expansions:
+                task.cancel()
+
+    async def _count(self, term: str, level: int, parent_count: Optional[int]) -> tuple:
+        async with self.semaphore:
+            count = await self.client.get_publication_count(term)
+        return term, level, parent_count, count
 
+    async def _expand(self, res: Dict, next_queue: List[asyncio.Future]):
+        """
+        Queues count requests for the related terms of an accepted term.
+        """
+        related = await self._fetch_related(res["term"])
+        level = res["level"] + 1
+        for r_term in list(related)[:self.max_children]:
+            if self.total_terms >= self.total_max_terms:
+                return
+            if r_term in self.frontier:
+                self.telemetry["levels"][level]["skipped"] += 1
+                continue
+            self.frontier.add(r_term)
+            next_queue.append(asyncio.ensure_future(self._count(r_term, level, res["count"])))
+
+    def _evaluate(self, term: str, level: int, parent_count: Optional[int], count: int) -> Optional[Dict]:
+        """
+        Accepts or prunes a counted term. Runs without awaiting, so the check
+        against total_max_terms and the increment cannot interleave.
+        Returns: result dict, or None once total_max_terms terms are accepted
+        """
         if self.total_terms >= self.total_max_terms:
             return None
 
-        async with self.semaphore:
-            count = await self.client.get_publication_count(term)
-
         threshold = self.level_thresholds.get(level, 0)
         significance = (count / parent_count) if parent_count else 1.0
 
@@ -138,7 +162,8 @@ class DiscoveryEngineV9:
             }
 
     async def _fetch_related(self, term: str) -> Set[str]:
-        related = await self.client.discover_related_terms(term)
+        async with self.semaphore:
+            related = await self.client.discover_related_terms(term)
         return {t for t in related if t not in self.generic_exclusions}
 
     def get_level_summary(self) -> Dict:
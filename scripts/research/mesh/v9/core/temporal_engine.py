@@ -8,6 +8,7 @@ import json
 import os
 from datetime import datetime
 from typing import List, Dict, Any, Tuple, Optional
+from scripts.research.mesh.range_counter import CountUnavailable, RangeCounter
 from .client import PubMedClientV9
 
 logger = logging.getLogger(__name__)
@@ -31,6 +32,15 @@ class TemporalEngineV9:
             "datasets": []
         }
         self.semaphore = asyncio.Semaphore(5)
+        self.range_counter = RangeCounter(self.count_range)
+
+    async def count_range(self, term: str, start: int, end: int) -> int:
+        async with self.semaphore:
+            count = await self.client.get_publication_count(term, year_range=(start, end), default=None)
+        if count is None:
+            # A failed request must not read as "no publications in this range"
+            raise CountUnavailable(f"PubMed request failed for {start}-{end}")
+        return count
 
     def generate_intervals(self) -> List[Tuple[int, int]]:
         """
@@ -66,18 +76,13 @@ class TemporalEngineV9:
         """
         Collects counts for a single condition across all intervals.
         """
-        counts = []
+        counts = await self.range_counter.counts(term, intervals)
         normalized_counts = []
-
-        for i, (start, end) in enumerate(intervals):
-            async with self.semaphore:
-                count = await self.client.get_publication_count(term, year_range=(start, end))
-                counts.append(count)
-
-                if self.normalize and baselines and baselines[i] > 0:
+        if self.normalize and baselines:
+            for count, baseline in zip(counts, baselines):
+                if baseline > 0:
                     # Normalized to count per 10k articles
-                    norm = (count / baselines[i]) * 10000
-                    normalized_counts.append(round(norm, 4))
+                    normalized_counts.append(round((count / baseline) * 10000, 4))
 
         result = {
             "label": term,
@@ -106,5 +111,10 @@ class TemporalEngineV9:
             tasks.append(self.process_condition(condition, intervals, baselines))
 
         self.results["datasets"] = await asyncio.gather(*tasks)
+        logger.info(f"Counted {len(conditions)} series of {len(intervals)} intervals "
+                    f"with {self.range_counter.calls} range queries.")
+        if self.range_counter.failed:
+            logger.warning(f"{len(self.range_counter.failed)} intervals could not be counted and were left at 0: "
+                           f"{self.range_counter.failed}")
 
         return self.results
@@ -10,8 +10,12 @@ import time
 import logging
 import argparse
 from datetime import datetime
+import sys
 from typing import List, Dict, Any
 
+# Ensure the repository root is in the path for the shared mesh modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../..")))
+
 from core.client import PubMedClientV9
 from core.ct_client import ClinicalTrialsClientV9
 from core.engine import DiscoveryEngineV9
@@ -39,10 +43,10 @@ class PipelineV9:
 
         self.pubmed_client = PubMedClientV9(
             api_key=os.getenv("PUBMED_API_KEY"),
-            cache_db=self.config.get("cache", {}).get("db_path", "scripts/research/mesh/v9/cache.db")
+            cache_db=self.config.get("cache", {}).get("db_path")
         )
         self.ct_client = ClinicalTrialsClientV9(
-            cache_db=self.config.get("cache", {}).get("db_path", "scripts/research/mesh/v9/cache.db")
+            cache_db=self.config.get("cache", {}).get("db_path")
         )
         self.discovery_engine = DiscoveryEngineV9(self.pubmed_client, self.config)
         self.temporal_engine = TemporalEngineV9(self.pubmed_client, self.config)
@@ -2,7 +2,7 @@ import unittest
 import json
 from unittest.mock import patch, MagicMock
 from flask import Flask
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from flask_jwt_extended import JWTManager
 
 from application.interface.backend.handlers.analytics_handler import analytics_bp
@@ -39,10 +39,17 @@ class TestAnalyticsHandler(unittest.TestCase):
         mock_get_db.return_value = mock_db
         mock_db.cursor.return_value = mock_cursor
 
-        mock_cursor.fetchone.side_effect = [
-            [10], [2], [5], [3], [4, 60.0], [10, 8], [72.0, 100], [50]
-        ]
-        mock_cursor.fetchall.return_value = []
+        mock_cursor.fetchone.return_value = ({
+            'total_patients': 10, 'new_patients': 2, 'active_patients': 5,
+            'appointment_status': [['scheduled', 3], ['completed', 1]],
+            'upcoming_appointments': 3,
+            'assessments': [],
+            'therapy_sessions': {'total': 4, 'avg_duration': 60.0},
+            'homework': {'total': 10, 'completed': 8},
+            'vitals': {'avg_heart_rate': 72.0, 'total_readings': 100},
+            'messages_sent': 50,
+            'active_clinicians': None, 'clinician_workload': [], 'access_activity': [], 'active_users': None
+        },)
 
         with self.app.test_request_context():
             from flask_jwt_extended import create_access_token
@@ -50,7 +57,17 @@ class TestAnalyticsHandler(unittest.TestCase):
 
         response = self.client.get('/api/analytics/dashboard', headers={'Authorization': f'Bearer {access_token}'})
         self.assertEqual(response.status_code, 200)
-        self.assertIn('metrics', json.loads(response.data))
+        metrics = json.loads(response.data)['metrics']
+        self.assertEqual(metrics['appointments'], {'total': 4, 'by_status': {'scheduled': 3, 'completed': 1}})
+        self.assertEqual(metrics['homework_completion_rate'], 80.0)
+        self.assertNotIn('clinician_workload', metrics)
+
+        # Whole payload in one round trip, scoped to the clinician
+        mock_cursor.execute.assert_called_once()
+        params = mock_cursor.execute.call_args[0][1]
+        self.assertTrue(params['scoped'])
+        self.assertFalse(params['is_admin'])
+        self.assertEqual(params['clinician_id'], 5)
 
     @patch('application.interface.backend.handlers.analytics_handler.get_jwt_identity')
     @patch('application.interface.backend.handlers.auth_handler.get_jwt')
@@ -65,7 +82,8 @@ class TestAnalyticsHandler(unittest.TestCase):
         mock_cursor = MagicMock()
         mock_get_db.return_value = mock_db
         mock_db.cursor.return_value = mock_cursor
-        mock_cursor.fetchall.return_value = []
+        mock_cursor.fetchall.return_value = [(datetime(2026, 1, 5), 4, 'completed'), (datetime(2026, 1, 5), 1, 'cancelled')]
+        mock_cursor.fetchone.return_value = (datetime.now(), date(2020, 1, 1), 0)
 
         with self.app.test_request_context():
             from flask_jwt_extended import create_access_token
@@ -73,7 +91,13 @@ class TestAnalyticsHandler(unittest.TestCase):
 
         response = self.client.get('/api/analytics/trends', headers={'Authorization': f'Bearer {access_token}'})
         self.assertEqual(response.status_code, 200)
-        self.assertIn('data', json.loads(response.data))
+        body = json.loads(response.data)
+        self.assertEqual(body['data'], [{'period': '2026-01-05T00:00:00', 'total': 5, 'by_status': {'completed': 4, 'cancelled': 1}}])
+        self.assertFalse(body['rollup_status']['stale'])
+
+        # Served from the daily rollup table, not the appointments table
+        query = mock_cursor.execute.call_args_list[0][0][0]
+        self.assertIn('analytics_daily_clinician_rollup', query)
 
     @patch('application.interface.backend.handlers.analytics_handler.get_jwt_identity')
     @patch('application.interface.backend.handlers.auth_handler.get_jwt')
@@ -89,6 +113,7 @@ class TestAnalyticsHandler(unittest.TestCase):
         mock_get_db.return_value = mock_db
         mock_db.cursor.return_value = mock_cursor
         mock_cursor.fetchall.return_value = []
+        mock_cursor.fetchone.return_value = (datetime.now(), date(2020, 1, 1), 0)
 
         with self.app.test_request_context():
             from flask_jwt_extended import create_access_token
@@ -98,9 +123,9 @@ class TestAnalyticsHandler(unittest.TestCase):
         response = self.client.get('/api/analytics/trends?days=1000', headers={'Authorization': f'Bearer {access_token}'})
         self.assertEqual(response.status_code, 200)
         # Clamped to 365 days ago
-        call_args = mock_cursor.execute.call_args[0]
-        start_date = call_args[1][0]
-        self.assertTrue((datetime.now() - start_date).days >= 364)
+        call_args = mock_cursor.execute.call_args_list[0][0]
+        start_day = call_args[1]['start_day']
+        self.assertTrue((date.today() - start_day).days >= 364)
 
     @patch('application.interface.backend.handlers.analytics_handler.get_jwt_identity')
     @patch('application.interface.backend.handlers.auth_handler.get_jwt')
@@ -116,6 +141,7 @@ class TestAnalyticsHandler(unittest.TestCase):
         mock_get_db.return_value = mock_db
         mock_db.cursor.return_value = mock_cursor
         mock_cursor.fetchall.return_value = []
+        mock_cursor.fetchone.return_value = (datetime.now(), None, 0)
 
         with self.app.test_request_context():
             from flask_jwt_extended import create_access_token
@@ -124,7 +150,10 @@ class TestAnalyticsHandler(unittest.TestCase):
         data = {'report_type': 'patient_summary'}
         response = self.client.post('/api/analytics/reports/generate', data=json.dumps(data), content_type='application/json', headers={'Authorization': f'Bearer {access_token}'})
         self.assertEqual(response.status_code, 200)
-        self.assertIn('data', json.loads(response.data))
+        body = json.loads(response.data)
+        self.assertIn('data', body)
+        # Never backfilled, so the report is flagged stale
+        self.assertTrue(body['rollup_status']['stale'])
 
     @patch('application.interface.backend.handlers.analytics_handler.get_jwt_identity')
     @patch('application.interface.backend.handlers.auth_handler.get_jwt')
@@ -151,6 +180,75 @@ class TestAnalyticsHandler(unittest.TestCase):
         response = self.client.post('/api/analytics/reports/generate', data=json.dumps(data), content_type='application/json', headers={'Authorization': f'Bearer {access_token}'})
         self.assertEqual(response.status_code, 400)
 
+    @patch('application.interface.backend.handlers.analytics_handler.get_jwt_identity')
+    @patch('application.interface.backend.handlers.auth_handler.get_jwt')
+    @patch('application.interface.backend.handlers.analytics_handler.get_jwt')
+    @patch('application.interface.backend.handlers.analytics_handler.get_clinician_id')
+    @patch('application.interface.backend.handlers.analytics_handler.get_report_jobs')
+    def test_create_report_job(self, mock_get_report_jobs, mock_get_clinician_id, mock_get_jwt_analytics, mock_get_jwt_auth, mock_get_jwt_identity):
+        mock_get_jwt_identity.return_value = 'clinician_user'
+        mock_get_jwt_auth.return_value = {'role': 'clinician', 'mfa_verified': True}
+        mock_get_jwt_analytics.return_value = {'role': 'clinician', 'mfa_verified': True}
+        mock_get_clinician_id.return_value = 5
+        job = MagicMock(id='a' * 32)
+        job.to_dict.return_value = {'job_id': 'a' * 32, 'status': 'queued'}
+        mock_get_report_jobs.return_value.submit.return_value = (job, False)
+
+        with self.app.test_request_context():
+            from flask_jwt_extended import create_access_token
+            access_token = create_access_token(identity='clinician_user')
+
+        data = {'report_type': 'clinician_workload', 'start_date': '2026-01-01', 'end_date': '2026-03-31', 'format': 'ndjson'}
+        response = self.client.post('/api/analytics/reports/jobs', data=json.dumps(data), content_type='application/json', headers={'Authorization': f'Bearer {access_token}'})
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(response.headers['Location'].endswith('/api/analytics/reports/jobs/' + 'a' * 32))
+        self.assertTrue(json.loads(response.data)['deduplicated'])
+
+        args, kwargs = mock_get_report_jobs.return_value.submit.call_args
+        self.assertEqual(args, ('clinician_workload', date(2026, 1, 1), date(2026, 3, 31)))
+        self.assertEqual(kwargs['clinician_id'], 5)
+        self.assertTrue(kwargs['scoped'])
+        self.assertEqual(kwargs['export_format'], 'ndjson')
+
+        # Only the rollup-backed reports can be exported
+        data = {'report_type': 'system_usage'}
+        response = self.client.post('/api/analytics/reports/jobs', data=json.dumps(data), content_type='application/json', headers={'Authorization': f'Bearer {access_token}'})
+        self.assertEqual(response.status_code, 400)
+
+    @patch('application.interface.backend.handlers.analytics_handler.get_jwt_identity')
+    @patch('application.interface.backend.handlers.auth_handler.get_jwt')
+    @patch('application.interface.backend.handlers.analytics_handler.get_jwt')
+    @patch('application.interface.backend.handlers.analytics_handler.get_clinician_id')
+    @patch('application.interface.backend.handlers.analytics_handler.get_report_jobs')
+    def test_report_job_scope_and_download(self, mock_get_report_jobs, mock_get_clinician_id, mock_get_jwt_analytics, mock_get_jwt_auth, mock_get_jwt_identity):
+        mock_get_jwt_identity.return_value = 'clinician_user'
+        mock_get_jwt_auth.return_value = {'role': 'clinician', 'mfa_verified': True}
+        mock_get_jwt_analytics.return_value = {'role': 'clinician', 'mfa_verified': True}
+        mock_get_clinician_id.return_value = 5
+        job = MagicMock(id='b' * 32, scope='clinician:7', status='running')
+        job.to_dict.return_value = {'job_id': 'b' * 32, 'status': 'running'}
+        mock_get_report_jobs.return_value.get.return_value = job
+
+        with self.app.test_request_context():
+            from flask_jwt_extended import create_access_token
+            access_token = create_access_token(identity='clinician_user')
+        headers = {'Authorization': f'Bearer {access_token}'}
+
+        # Another clinician's job is invisible
+        response = self.client.get('/api/analytics/reports/jobs/' + 'b' * 32, headers=headers)
+        self.assertEqual(response.status_code, 404)
+
+        job.scope = 'clinician:5'
+        response = self.client.get('/api/analytics/reports/jobs/' + 'b' * 32, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['status'], 'running')
+
+        response = self.client.get('/api/analytics/reports/jobs/' + 'b' * 32 + '/download', headers=headers)
+        self.assertEqual(response.status_code, 409)
+
+        response = self.client.get('/api/analytics/reports/jobs/../etc', headers=headers)
+        self.assertEqual(response.status_code, 404)
+
     @patch('application.interface.backend.handlers.analytics_handler.get_jwt_identity')
     @patch('application.interface.backend.handlers.auth_handler.get_jwt')
     @patch('application.interface.backend.handlers.analytics_handler.get_jwt')
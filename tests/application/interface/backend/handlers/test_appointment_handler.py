@@ -0,0 +1,130 @@
+import unittest
+import json
+from unittest.mock import patch
+from flask import Flask
+from datetime import datetime
+from flask_jwt_extended import JWTManager, create_access_token
+
+from application.interface.backend.handlers.appointment_handler import appointment_bp
+from application.interface.backend.models.appointment import Appointment
+
+class TestAppointmentHandler(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['JWT_SECRET_KEY'] = 'test-secret'
+        self.app.config['JWT_TOKEN_LOCATION'] = ['headers']
+        self.app.register_blueprint(appointment_bp, url_prefix='/api')
+        self.jwt = JWTManager(self.app)
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            self.clinician_token = create_access_token(
+                identity='1',
+                additional_claims={'mfa_verified': True, 'role': 'clinician'}
+            )
+            self.admin_token = create_access_token(
+                identity='3',
+                additional_claims={'mfa_verified': True, 'role': 'admin'}
+            )
+            self.patient_token = create_access_token(
+                identity='2',
+                additional_claims={'mfa_verified': True, 'role': 'patient'}
+            )
+
+    def post(self, body, token):
+        return self.client.post('/api/appointments/batch', data=json.dumps(body), content_type='application/json',
+                                headers={'Authorization': f'Bearer {token}'})
+
+    @patch('application.interface.backend.models.appointment.Appointment.schedule_batch')
+    @patch('application.interface.backend.handlers.appointment_handler.get_assigned_patient_ids')
+    @patch('application.interface.backend.handlers.appointment_handler.get_clinician_id')
+    def test_schedule_batch(self, mock_get_clinician_id, mock_assigned, mock_schedule_batch):
+        mock_get_clinician_id.return_value = 7
+        mock_assigned.return_value = frozenset({10, 11})
+        mock_schedule_batch.return_value = (
+            [Appointment(1, 10, 7, datetime(2026, 3, 2, 9, 0), 'scheduled')],
+            [(1, {}, 'Conflicts with an earlier appointment in this batch')]
+        )
+
+        body = {'clinician_id': 99, 'appointments': [
+            {'patient_id': 10, 'appointment_time': '2026-03-02T09:00:00'},
+            {'patient_id': 12, 'appointment_time': '2026-03-02T11:00:00'},  # not assigned
+            {'patient_id': 11, 'appointment_time': '2026-03-02T09:30:00'},
+            {'patient_id': 10, 'appointment_time': 'tomorrow'},
+        ]}
+        response = self.post(body, self.clinician_token)
+
+        self.assertEqual(response.status_code, 201)
+        result = json.loads(response.data)
+        self.assertEqual([a['id'] for a in result['created']], [1])
+        self.assertEqual([r['index'] for r in result['rejected']], [1, 2, 3])
+        self.assertEqual(result['rejected'][0]['error'], 'Clinician is not assigned to this patient')
+
+        # Clinicians always schedule for themselves
+        clinician_id, proposals = mock_schedule_batch.call_args[0]
+        self.assertEqual(clinician_id, 7)
+        self.assertEqual([p['patient_id'] for p in proposals], [10, 11])
+        self.assertEqual(proposals[0]['appointment_time'], datetime(2026, 3, 2, 9, 0))
+
+    @patch('application.interface.backend.models.appointment.Appointment.schedule_batch')
+    @patch('application.interface.backend.handlers.appointment_handler.get_assigned_patient_ids')
+    @patch('application.interface.backend.handlers.appointment_handler.get_clinician_id')
+    def test_offset_times_are_normalized_to_utc(self, mock_get_clinician_id, mock_assigned, mock_schedule_batch):
+        mock_get_clinician_id.return_value = 7
+        mock_assigned.return_value = frozenset({10})
+        mock_schedule_batch.return_value = ([], [])
+
+        body = {'appointments': [
+            {'patient_id': 10, 'appointment_time': '2026-03-02T09:00:00Z'},
+            {'patient_id': 10, 'appointment_time': '2026-03-02T12:00:00+02:00'},
+            {'patient_id': 10, 'appointment_time': '2026-03-02T15:00:00'},
+        ]}
+        response = self.post(body, self.clinician_token)
+
+        self.assertEqual(response.status_code, 200)
+        times = [p['appointment_time'] for p in mock_schedule_batch.call_args[0][1]]
+        self.assertEqual(times, [datetime(2026, 3, 2, 9, 0), datetime(2026, 3, 2, 10, 0), datetime(2026, 3, 2, 15, 0)])
+        self.assertTrue(all(t.tzinfo is None for t in times))
+
+    @patch('application.interface.backend.models.appointment.Appointment.schedule_batch')
+    @patch('application.interface.backend.models.appointment.Appointment.find_references')
+    def test_admin_unknown_patient_is_rejected(self, mock_find_references, mock_schedule_batch):
+        mock_find_references.return_value = (True, frozenset({10}))
+        mock_schedule_batch.return_value = ([Appointment(1, 10, 7, datetime(2026, 3, 2, 9, 0), 'scheduled')], [])
+
+        body = {'clinician_id': 7, 'appointments': [
+            {'patient_id': 999, 'appointment_time': '2026-03-02T11:00:00'},
+            {'patient_id': 10, 'appointment_time': '2026-03-02T09:00:00'},
+        ]}
+        response = self.post(body, self.admin_token)
+
+        self.assertEqual(response.status_code, 201)
+        result = json.loads(response.data)
+        self.assertEqual(result['rejected'], [{'index': 0, 'error': 'Patient not found'}])
+        clinician_id, proposals = mock_schedule_batch.call_args[0]
+        self.assertEqual(clinician_id, 7)
+        self.assertEqual([p['patient_id'] for p in proposals], [10])
+
+    @patch('application.interface.backend.models.appointment.Appointment.schedule_batch')
+    @patch('application.interface.backend.models.appointment.Appointment.find_references')
+    def test_admin_unknown_clinician(self, mock_find_references, mock_schedule_batch):
+        mock_find_references.return_value = (False, frozenset({10}))
+
+        body = {'clinician_id': 404, 'appointments': [{'patient_id': 10, 'appointment_time': '2026-03-02T09:00:00'}]}
+        response = self.post(body, self.admin_token)
+
+        self.assertEqual(response.status_code, 404)
+        mock_schedule_batch.assert_not_called()
+
+    def test_requires_clinician_or_admin(self):
+        response = self.post({'appointments': []}, self.patient_token)
+        self.assertEqual(response.status_code, 403)
+
+    def test_requires_appointment_list(self):
+        response = self.post({'appointments': 'none'}, self.clinician_token)
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
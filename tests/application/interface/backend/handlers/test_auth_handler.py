@@ -7,6 +7,7 @@ from flask_jwt_extended import JWTManager
 
 from application.interface.backend.handlers.auth_handler import auth_bp
 from application.interface.backend.utils.validators import Validators, ValidationError
+from application.interface.backend.utils.password_hasher import HasherBusyError
 
 class TestAuthHandler(unittest.TestCase):
 
@@ -24,15 +25,15 @@ class TestAuthHandler(unittest.TestCase):
         self.app_context.pop()
 
     @patch('application.interface.backend.handlers.auth_handler.get_db')
-    @patch('application.interface.backend.handlers.auth_handler.bcrypt')
+    @patch('application.interface.backend.handlers.auth_handler.get_password_hasher')
     @patch('application.interface.backend.handlers.auth_handler.datetime')
     @patch('application.interface.backend.handlers.auth_handler.field_encryption')
-    def test_register(self, mock_encryption, mock_datetime, mock_bcrypt, mock_get_db):
+    def test_register(self, mock_encryption, mock_datetime, mock_hasher, mock_get_db):
         mock_db = MagicMock()
         mock_cursor = MagicMock()
         mock_get_db.return_value = mock_db
         mock_db.cursor.return_value = mock_cursor
-        mock_bcrypt.generate_password_hash.return_value = b'hashed_password'
+        mock_hasher.return_value.generate_password_hash.return_value = 'hashed_password'
         mock_datetime.utcnow.return_value = datetime.utcnow()
         mock_encryption.encrypt.return_value = 'encrypted_secret'
 
@@ -61,8 +62,8 @@ class TestAuthHandler(unittest.TestCase):
         self.assertEqual(json.loads(response.data)['error'], 'User already exists')
 
     @patch('application.interface.backend.handlers.auth_handler.get_db')
-    @patch('application.interface.backend.handlers.auth_handler.bcrypt')
-    def test_login(self, mock_bcrypt, mock_get_db):
+    @patch('application.interface.backend.handlers.auth_handler.get_password_hasher')
+    def test_login(self, mock_hasher, mock_get_db):
         mock_db = MagicMock()
         mock_cursor = MagicMock()
         mock_get_db.return_value = mock_db
@@ -72,7 +73,7 @@ class TestAuthHandler(unittest.TestCase):
             (1, 'test@example.com', 'Test User', 1, 'patient'), # User info
             ('hashed_password',) # Stored hash
         ]
-        mock_bcrypt.check_password_hash.return_value = True
+        mock_hasher.return_value.check_password_hash.return_value = True
 
         data = {'email': 'test@example.com', 'password': 'Password123!'}
         response = self.client.post('/api/auth/login', data=json.dumps(data), content_type='application/json')
@@ -93,8 +94,8 @@ class TestAuthHandler(unittest.TestCase):
         self.assertEqual(json.loads(response.data)['error'], 'Invalid credentials')
 
     @patch('application.interface.backend.handlers.auth_handler.get_db')
-    @patch('application.interface.backend.handlers.auth_handler.bcrypt')
-    def test_login_wrong_password(self, mock_bcrypt, mock_get_db):
+    @patch('application.interface.backend.handlers.auth_handler.get_password_hasher')
+    def test_login_wrong_password(self, mock_hasher, mock_get_db):
         mock_db = MagicMock()
         mock_cursor = MagicMock()
         mock_get_db.return_value = mock_db
@@ -104,13 +105,32 @@ class TestAuthHandler(unittest.TestCase):
             (1, 'test@example.com', 'Test User', 1, 'patient'),
             ('hashed_password',)
         ]
-        mock_bcrypt.check_password_hash.return_value = False # Wrong password
+        mock_hasher.return_value.check_password_hash.return_value = False # Wrong password
 
         data = {'email': 'test@example.com', 'password': 'WrongPassword123!'}
         response = self.client.post('/api/auth/login', data=json.dumps(data), content_type='application/json')
         self.assertEqual(response.status_code, 401)
         self.assertEqual(json.loads(response.data)['error'], 'Invalid credentials')
 
+    @patch('application.interface.backend.handlers.auth_handler.get_db')
+    @patch('application.interface.backend.handlers.auth_handler.get_password_hasher')
+    def test_login_hasher_busy(self, mock_hasher, mock_get_db):
+        mock_db = MagicMock()
+        mock_cursor = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.cursor.return_value = mock_cursor
+
+        mock_cursor.fetchone.side_effect = [
+            (1, 'test@example.com', 'Test User', 1, 'patient'),
+            ('hashed_password',)
+        ]
+        mock_hasher.return_value.check_password_hash.side_effect = HasherBusyError(3)
+
+        data = {'email': 'test@example.com', 'password': 'Password123!'}
+        response = self.client.post('/api/auth/login', data=json.dumps(data), content_type='application/json')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '3')
+
     @patch('application.interface.backend.handlers.auth_handler.get_db')
     @patch('application.interface.backend.handlers.auth_handler.pyotp.TOTP')
     @patch('application.interface.backend.handlers.auth_handler.field_encryption')
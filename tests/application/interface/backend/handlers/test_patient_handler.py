@@ -24,31 +24,67 @@ class TestPatientHandler(unittest.TestCase):
                 additional_claims={'mfa_verified': True, 'role': 'clinician'}
             )
 
-    @patch('application.interface.backend.models.patient.Patient.get_all')
+    @patch('application.interface.backend.models.patient.Patient.get_page')
     @patch('application.interface.backend.handlers.patient_handler.get_clinician_id')
-    def test_get_all_patients(self, mock_get_clinician_id, mock_get_all):
+    def test_get_all_patients(self, mock_get_clinician_id, mock_get_page):
         mock_get_clinician_id.return_value = 1
         mock_patient = Patient(1, 1, datetime.now(), 'Male', datetime.now(), 'Caucasian', '123 Main St', None, 'CA', '12345', 'Anytown')
-        mock_get_all.return_value = [mock_patient]
+        mock_get_page.return_value = [mock_patient]
 
         response = self.client.get('/api/patients', headers={'Authorization': f'Bearer {self.clinician_token}'})
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(json.loads(response.data)), 1)
+        self.assertNotIn('X-Next-Cursor', response.headers)
+        mock_get_page.assert_called_once_with(clinician_id=1, after=None, limit=101)
+
+    @patch('application.interface.backend.models.patient.Patient.get_page')
+    @patch('application.interface.backend.handlers.patient_handler.get_clinician_id')
+    def test_get_patients_next_page(self, mock_get_clinician_id, mock_get_page):
+        mock_get_clinician_id.return_value = 1
+        mock_get_page.return_value = [
+            Patient(i, i, None, 'other', None, None, None, None, None, None, None) for i in (11, 12, 13)
+        ]
+
+        response = self.client.get('/api/patients?after=10&limit=2', headers={'Authorization': f'Bearer {self.clinician_token}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['id'] for p in json.loads(response.data)], [11, 12])
+        self.assertEqual(response.headers['X-Next-Cursor'], '12')
+        self.assertIn('after=12&limit=2', response.headers['Link'])
+        mock_get_page.assert_called_once_with(clinician_id=1, after=10, limit=3)
+
+    @patch('application.interface.backend.handlers.patient_handler.get_clinician_id')
+    def test_get_patients_invalid_cursor(self, mock_get_clinician_id):
+        response = self.client.get('/api/patients?after=abc', headers={'Authorization': f'Bearer {self.clinician_token}'})
+        self.assertEqual(response.status_code, 400)
+
+    @patch('application.interface.backend.models.patient.Patient.iter_all')
+    @patch('application.interface.backend.handlers.patient_handler.get_clinician_id')
+    def test_get_patients_stream(self, mock_get_clinician_id, mock_iter_all):
+        mock_get_clinician_id.return_value = 1
+        mock_iter_all.return_value = iter([
+            Patient(i, i, None, 'other', None, None, '1 Main St', None, None, None, None) for i in (1, 2)
+        ])
+
+        response = self.client.get('/api/patients?stream=true', headers={'Authorization': f'Bearer {self.clinician_token}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        body = json.loads(response.data)
+        self.assertEqual([p['id'] for p in body], [1, 2])
+        self.assertEqual(body[0]['address_line_1'], '1 Main St')
 
     @patch('application.interface.backend.models.patient.Patient.get_by_id')
     @patch('application.interface.backend.handlers.patient_handler.get_clinician_id')
-    @patch('application.interface.backend.handlers.patient_handler.get_db')
-    def test_get_patient_by_id(self, mock_get_db, mock_get_clinician_id, mock_get_by_id):
+    @patch('application.interface.backend.handlers.patient_handler.is_patient_assigned')
+    def test_get_patient_by_id(self, mock_is_assigned, mock_get_clinician_id, mock_get_by_id):
         mock_get_clinician_id.return_value = 1
-        mock_cursor = MagicMock()
-        mock_get_db.return_value.cursor.return_value = mock_cursor
-        mock_cursor.fetchone.return_value = (1,) # Assignment link exists
+        mock_is_assigned.return_value = True # Assignment link exists
         mock_patient = Patient(1, 1, datetime.now(), 'Male', datetime.now(), 'Caucasian', '123 Main St', None, 'CA', '12345', 'Anytown')
         mock_get_by_id.return_value = mock_patient
 
         response = self.client.get('/api/patients/1', headers={'Authorization': f'Bearer {self.clinician_token}'})
         self.assertEqual(response.status_code, 200)
         self.assertEqual(json.loads(response.data)['user_id'], 1)
+        mock_is_assigned.assert_called_once_with(1, 1)
 
     @patch('application.interface.backend.models.patient.Patient.create')
     def test_create_patient(self, mock_create):
@@ -69,12 +105,10 @@ class TestPatientHandler(unittest.TestCase):
 
     @patch('application.interface.backend.models.patient.Patient.get_by_id')
     @patch('application.interface.backend.handlers.patient_handler.get_clinician_id')
-    @patch('application.interface.backend.handlers.patient_handler.get_db')
-    def test_get_patient_unauthorized(self, mock_get_db, mock_get_clinician_id, mock_get_by_id):
+    @patch('application.interface.backend.handlers.patient_handler.is_patient_assigned')
+    def test_get_patient_unauthorized(self, mock_is_assigned, mock_get_clinician_id, mock_get_by_id):
         mock_get_clinician_id.return_value = 1
-        mock_cursor = MagicMock()
-        mock_get_db.return_value.cursor.return_value = mock_cursor
-        mock_cursor.fetchone.return_value = None # Assignment link DOES NOT exist
+        mock_is_assigned.return_value = False # Assignment link DOES NOT exist
 
         mock_patient = Patient(2, 2, datetime.now(), 'Female', datetime.now(), 'Hispanic', '456 Oak Ave', None, 'NY', '54321', 'Somecity')
         mock_get_by_id.return_value = mock_patient
@@ -82,6 +116,61 @@ class TestPatientHandler(unittest.TestCase):
         response = self.client.get('/api/patients/2', headers={'Authorization': f'Bearer {self.clinician_token}'})
         self.assertEqual(response.status_code, 403)
 
+    @patch('application.interface.backend.models.vital.Vital.get_series')
+    @patch('application.interface.backend.models.patient.Patient.get_by_id')
+    @patch('application.interface.backend.handlers.patient_handler.get_clinician_id')
+    @patch('application.interface.backend.handlers.patient_handler.is_patient_assigned')
+    def test_get_vitals_series(self, mock_is_assigned, mock_get_clinician_id, mock_get_by_id, mock_get_series):
+        mock_get_clinician_id.return_value = 1
+        mock_is_assigned.return_value = True
+        mock_get_by_id.return_value = Patient(2, 2, datetime.now(), 'female', datetime.now(), None, None, None, None, None, None)
+        mock_get_series.return_value = {'tier': 'hour', 'bucket_seconds': 3600, 'stale': False,
+                                        'series': {'heart_rate': [], 'systolic': [], 'diastolic': []}}
+
+        response = self.client.get(
+            '/api/patients/2/vitals/series?start=2026-01-01T00:00:00&end=2026-02-01T00:00:00&max_points=100000',
+            headers={'Authorization': f'Bearer {self.clinician_token}'}
+        )
+        self.assertEqual(response.status_code, 200)
+        body = json.loads(response.data)
+        self.assertEqual(body['tier'], 'hour')
+        self.assertEqual(body['max_points'], 5000)
+        mock_get_series.assert_called_once_with(2, datetime(2026, 1, 1), datetime(2026, 2, 1), 5000)
+
+    @patch('application.interface.backend.models.vital.Vital.get_series')
+    @patch('application.interface.backend.models.patient.Patient.get_by_id')
+    def test_get_vitals_series_offset_bounds(self, mock_get_by_id, mock_get_series):
+        with self.app.app_context():
+            admin_token = create_access_token(identity='9', additional_claims={'mfa_verified': True, 'role': 'admin'})
+        mock_get_by_id.return_value = Patient(2, 2, datetime.now(), 'female', datetime.now(), None, None, None, None, None, None)
+        mock_get_series.return_value = {'tier': 'day', 'bucket_seconds': 86400, 'stale': False,
+                                        'series': {'heart_rate': [], 'systolic': [], 'diastolic': []}}
+        headers = {'Authorization': f'Bearer {admin_token}'}
+
+        # Only start given: compared against the default end without a TypeError
+        response = self.client.get('/api/patients/2/vitals/series?start=2026-01-01T00:00:00Z', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        start, end = mock_get_series.call_args[0][1:3]
+        self.assertEqual(start, datetime(2026, 1, 1))
+        self.assertIsNone(end.tzinfo)
+
+        response = self.client.get('/api/patients/2/vitals/series'
+                                   '?start=2026-01-01T02:00:00%2B02:00&end=2026-02-01T00:00:00Z', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_get_series.call_args[0][1:3], (datetime(2026, 1, 1), datetime(2026, 2, 1)))
+
+    @patch('application.interface.backend.models.patient.Patient.get_by_id')
+    def test_get_vitals_series_invalid_range(self, mock_get_by_id):
+        with self.app.app_context():
+            admin_token = create_access_token(identity='9', additional_claims={'mfa_verified': True, 'role': 'admin'})
+        mock_get_by_id.return_value = Patient(2, 2, datetime.now(), 'female', datetime.now(), None, None, None, None, None, None)
+        headers = {'Authorization': f'Bearer {admin_token}'}
+
+        response = self.client.get('/api/patients/2/vitals/series?start=yesterday', headers=headers)
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/patients/2/vitals/series?start=2026-02-01&end=2026-01-01', headers=headers)
+        self.assertEqual(response.status_code, 400)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import patch, MagicMock
 from datetime import datetime
 from application.interface.backend.models.appointment import Appointment
+from application.interface.backend.utils.scheduling import CONFLICT_SLOT
 
 class TestAppointment(unittest.TestCase):
     def setUp(self):
@@ -54,5 +55,78 @@ class TestAppointment(unittest.TestCase):
         self.assertEqual(new_appointment.patient_id, 101)
         mock_db.commit.assert_called_once()
 
+    @patch('application.interface.backend.models.appointment.invalidate_analytics')
+    @patch('application.interface.backend.models.appointment.execute_values')
+    @patch('application.interface.backend.models.appointment.get_db')
+    def test_schedule_batch(self, mock_get_db, mock_execute_values, mock_invalidate):
+        mock_db = MagicMock()
+        mock_cursor = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [(datetime(2023, 10, 27, 10, 0), False)]
+        mock_execute_values.return_value = [(5, 102, 201, datetime(2023, 10, 27, 14, 0), 'scheduled')]
+
+        proposals = [
+            {'patient_id': 101, 'appointment_time': datetime(2023, 10, 27, 10, 30)},
+            {'patient_id': 102, 'appointment_time': datetime(2023, 10, 27, 14, 0)},
+        ]
+        created, rejected = Appointment.schedule_batch(201, proposals)
+
+        self.assertEqual([a.id for a in created], [5])
+        self.assertEqual([i for i, _, _ in rejected], [0])
+        # Lock, then one window load for the whole batch
+        self.assertEqual(mock_cursor.execute.call_count, 2)
+        self.assertIn('pg_advisory_xact_lock', mock_cursor.execute.call_args_list[0][0][0])
+        self.assertEqual(mock_cursor.execute.call_args_list[1][0][1],
+                         (201, datetime(2023, 10, 27, 9, 30), datetime(2023, 10, 27, 15, 0)))
+        self.assertEqual(mock_execute_values.call_args[0][2],
+                         [(102, 201, datetime(2023, 10, 27, 14, 0), 'scheduled')])
+        mock_db.commit.assert_called_once()
+        mock_invalidate.assert_called_once_with(201)
+
+    @patch('application.interface.backend.models.appointment.invalidate_analytics')
+    @patch('application.interface.backend.models.appointment.execute_values')
+    @patch('application.interface.backend.models.appointment.get_db')
+    def test_schedule_batch_reports_taken_slots(self, mock_get_db, mock_execute_values, mock_invalidate):
+        mock_db = MagicMock()
+        mock_cursor = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.cursor.return_value = mock_cursor
+        # A cancelled appointment still holds 10:00
+        mock_cursor.fetchall.return_value = [(datetime(2023, 10, 27, 10, 0), True)]
+        # 16:00 was booked by a write outside the advisory lock: ON CONFLICT skips it
+        mock_execute_values.return_value = [(5, 102, 201, datetime(2023, 10, 27, 14, 0), 'scheduled')]
+
+        proposals = [
+            {'patient_id': 101, 'appointment_time': datetime(2023, 10, 27, 10, 0)},
+            {'patient_id': 102, 'appointment_time': datetime(2023, 10, 27, 14, 0)},
+            {'patient_id': 103, 'appointment_time': datetime(2023, 10, 27, 16, 0)},
+        ]
+        created, rejected = Appointment.schedule_batch(201, proposals)
+
+        self.assertEqual([a.id for a in created], [5])
+        self.assertEqual([(i, reason) for i, _, reason in rejected], [(0, CONFLICT_SLOT), (2, CONFLICT_SLOT)])
+        self.assertIn('ON CONFLICT (clinician_id, appointment_time) DO NOTHING', mock_execute_values.call_args[0][1])
+        self.assertEqual([row[0] for row in mock_execute_values.call_args[0][2]], [102, 103])
+        mock_db.commit.assert_called_once()
+
+    @patch('application.interface.backend.models.appointment.get_db')
+    def test_find_references(self, mock_get_db):
+        mock_cursor = mock_get_db.return_value.cursor.return_value
+        mock_cursor.fetchone.return_value = (True, [101])
+
+        self.assertEqual(Appointment.find_references(201, [101, 999, 101]), (True, frozenset({101})))
+        self.assertEqual(sorted(mock_cursor.execute.call_args[0][1][1]), [101, 999])
+
+    @patch('application.interface.backend.models.appointment.get_db')
+    def test_schedule_batch_rolls_back_on_error(self, mock_get_db):
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.cursor.return_value.execute.side_effect = Exception('db down')
+
+        with self.assertRaises(Exception):
+            Appointment.schedule_batch(201, [{'patient_id': 1, 'appointment_time': datetime(2023, 10, 27, 10, 0)}])
+        mock_db.rollback.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
@@ -39,6 +39,41 @@ class TestPatientModel(unittest.TestCase):
         self.assertIn('pc.clinician_id = %s', mock_cursor.execute.call_args[0][0])
         self.assertEqual(mock_cursor.execute.call_args[0][1], (5,))
 
+    @patch('application.interface.backend.models.patient.get_db')
+    def test_get_page(self, mock_get_db):
+        mock_db = MagicMock()
+        mock_cursor = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [
+            (7, 1, datetime.now(), 'Male', datetime.now(), 'Caucasian', '123 Main St', None, 'CA', '12345', 'Anytown')
+        ]
+
+        patients = Patient.get_page(clinician_id=5, after=6, limit=50)
+        self.assertEqual(patients[0].id, 7)
+        query, params = mock_cursor.execute.call_args[0]
+        self.assertNotIn('*', query)
+        self.assertIn('pc.clinician_id = %s AND p.id > %s ORDER BY p.id LIMIT %s', query)
+        self.assertEqual(params, (5, 6, 50))
+
+    @patch('application.interface.backend.models.patient.get_db')
+    def test_iter_all_uses_named_cursor(self, mock_get_db):
+        mock_db = MagicMock()
+        mock_cursor = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_db.cursor.return_value = mock_cursor
+        mock_cursor.__iter__.return_value = iter([
+            (1, 1, None, 'Male', None, None, None, None, None, None, None),
+            (2, 2, None, 'Female', None, None, None, None, None, None, None)
+        ])
+
+        patients = list(Patient.iter_all(batch_size=500))
+        self.assertEqual([p.id for p in patients], [1, 2])
+        mock_db.cursor.assert_called_once_with(name='patient_export')
+        self.assertEqual(mock_cursor.itersize, 500)
+        self.assertEqual(mock_cursor.execute.call_args[0][1], [])
+        mock_cursor.close.assert_called_once()
+
     @patch('application.interface.backend.models.patient.get_db')
     def test_get_patient_by_id(self, mock_get_db):
         mock_db = MagicMock()
@@ -54,5 +54,35 @@ class TestVital(unittest.TestCase):
         self.assertEqual(new_vital.patient_id, 101)
         mock_db.commit.assert_called_once()
 
+    @patch('application.interface.backend.utils.bulk_write.audit_logger')
+    @patch('application.interface.backend.utils.bulk_write.execute_values')
+    @patch('application.interface.backend.utils.bulk_write.get_db')
+    def test_bulk_create(self, mock_get_db, mock_execute_values, mock_audit_logger):
+        mock_db = MagicMock()
+        mock_get_db.return_value = mock_db
+        mock_execute_values.side_effect = [[(1,), (2,)], [(3,)]]
+        rows = [{'patient_id': 101, 'heart_rate': 70 + i, 'recorded_at': datetime(2023, 10, 27, 10, i)}
+                for i in range(3)]
+
+        ids = Vital.bulk_create(rows, batch_size=2)
+
+        self.assertEqual(ids, [1, 2, 3])
+        self.assertEqual(mock_db.commit.call_count, 2)
+        self.assertEqual(mock_audit_logger.log_bulk_write.call_count, 2)
+        query = mock_execute_values.call_args_list[0][0][1]
+        # blood_pressure is in no row and keeps its default
+        self.assertIn('INSERT INTO vitals (patient_id, heart_rate, recorded_at)', query)
+
+    @patch('application.interface.backend.models.vital.fetch_vitals_series')
+    @patch('application.interface.backend.models.vital.get_db')
+    def test_get_series(self, mock_get_db, mock_fetch):
+        mock_fetch.return_value = {'tier': 'raw', 'bucket_seconds': None, 'stale': False,
+                                   'series': {'heart_rate': [[datetime(2023, 10, 27, 10, 0), 72]]}}
+
+        result = Vital.get_series(101, datetime(2023, 10, 27), datetime(2023, 10, 28), 500)
+
+        self.assertEqual(result['series']['heart_rate'], [['2023-10-27T10:00:00', 72]])
+        mock_get_db.return_value.cursor.return_value.close.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
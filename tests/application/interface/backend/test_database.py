@@ -1,8 +1,21 @@
+import threading
 import unittest
 from unittest.mock import patch, MagicMock
 from flask import Flask
+import psycopg2.extensions
+
+from application.interface.backend.database import (
+    get_db, close_db, init_app, get_pool, ConnectionPool, PoolTimeoutError
+)
+from application.interface.backend.utils.query_profiler import ProfilingCursor, RequestProfile
+
+
+def make_conn():
+    conn = MagicMock()
+    conn.closed = 0
+    conn.get_transaction_status.return_value = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    return conn
 
-from application.interface.backend.database import get_db, close_db, init_app
 
 class TestDatabase(unittest.TestCase):
 
@@ -13,7 +26,7 @@ class TestDatabase(unittest.TestCase):
     @patch('application.interface.backend.database.psycopg2.connect')
     def test_get_db(self, mock_connect):
         with self.app.app_context():
-            mock_conn = MagicMock()
+            mock_conn = make_conn()
             mock_connect.return_value = mock_conn
 
             db = get_db()
@@ -28,14 +41,150 @@ class TestDatabase(unittest.TestCase):
     def test_close_db(self):
         with self.app.app_context():
             with patch('application.interface.backend.database.psycopg2.connect') as mock_connect:
-                mock_conn = MagicMock()
+                mock_conn = make_conn()
                 mock_connect.return_value = mock_conn
 
                 # Get a database connection
                 db = get_db()
 
-        # The app context is now closed, which should trigger close_db
-        mock_conn.close.assert_called_once()
+        # The app context is now closed, which should return the connection to the pool
+        mock_conn.close.assert_not_called()
+        stats = get_pool(self.app).stats()
+        self.assertEqual(stats['in_use'], 0)
+        self.assertEqual(stats['idle'], 1)
+
+    @patch('application.interface.backend.database.psycopg2.connect')
+    def test_connection_reused_across_requests(self, mock_connect):
+        mock_connect.side_effect = [make_conn(), make_conn()]
+
+        with self.app.app_context():
+            first = get_db()
+        with self.app.app_context():
+            second = get_db()
+
+        self.assertIs(first, second)
+        mock_connect.assert_called_once()
+
+    @patch('application.interface.backend.database.psycopg2.connect')
+    def test_profiled_request_uses_profiling_cursor(self, mock_connect):
+        mock_connect.side_effect = [make_conn()]
+
+        with self.app.test_request_context():
+            from flask import g
+            g.query_profile = RequestProfile()
+            self.assertIs(get_db().cursor_factory, ProfilingCursor)
+        with self.app.app_context():
+            self.assertIs(get_db().cursor_factory, psycopg2.extensions.cursor)
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    @patch('application.interface.backend.database.psycopg2.connect')
+    def test_checkout_timeout_when_exhausted(self, mock_connect):
+        mock_connect.side_effect = lambda **kwargs: make_conn()
+        pool = ConnectionPool({}, min_size=0, max_size=1, checkout_timeout=0.01)
+
+        pool.getconn()
+        with self.assertRaises(PoolTimeoutError):
+            pool.getconn()
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    @patch('application.interface.backend.database.psycopg2.connect')
+    def test_open_transaction_rolled_back_on_return(self, mock_connect):
+        conn = make_conn()
+        conn.get_transaction_status.return_value = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        mock_connect.return_value = conn
+        pool = ConnectionPool({}, min_size=0, max_size=2)
+
+        pool.putconn(pool.getconn())
+        conn.rollback.assert_called_once()
+        self.assertEqual(pool.stats()['idle'], 1)
+
+    @patch('application.interface.backend.database.psycopg2.connect')
+    def test_unhealthy_connection_replaced_on_checkout(self, mock_connect):
+        stale, fresh = make_conn(), make_conn()
+        stale.cursor.return_value.execute.side_effect = psycopg2.OperationalError('gone')
+        mock_connect.side_effect = [stale, fresh]
+        pool = ConnectionPool({}, min_size=0, max_size=2, health_check_interval=0)
+
+        pool.putconn(pool.getconn())
+        self.assertIs(pool.getconn(), fresh)
+        stats = pool.stats()
+        self.assertEqual(stats['health_check_failures'], 1)
+        self.assertEqual(stats['connections_discarded'], 1)
+
+    @patch('application.interface.backend.database.psycopg2.connect')
+    def test_idle_connections_reaped_down_to_min_size(self, mock_connect):
+        mock_connect.side_effect = lambda **kwargs: make_conn()
+        pool = ConnectionPool({}, min_size=1, max_size=3, idle_timeout=-1)
+
+        conns = [pool.getconn() for _ in range(3)]
+        for conn in conns:
+            pool.putconn(conn)
+
+        stats = pool.stats()
+        self.assertEqual(stats['size'], 1)
+        self.assertEqual(stats['connections_reaped'], 2)
+
+    @patch('application.interface.backend.database.psycopg2.connect')
+    def test_health_ping_runs_outside_lock(self, mock_connect):
+        stalled, fresh = make_conn(), make_conn()
+        pinging, release = threading.Event(), threading.Event()
+
+        def stall(sql):
+            pinging.set()
+            release.wait(5)
+        stalled.cursor.return_value.execute.side_effect = stall
+        mock_connect.side_effect = [stalled, fresh]
+        pool = ConnectionPool({}, min_size=0, max_size=2, health_check_interval=0)
+        pool.putconn(pool.getconn())
+
+        checked_out = []
+        thread = threading.Thread(target=lambda: checked_out.append(pool.getconn()))
+        thread.start()
+        self.assertTrue(pinging.wait(5))
+
+        # The ping holds a slot, not the lock: another checkout proceeds
+        self.assertIs(pool.getconn(), fresh)
+        self.assertEqual(pool.stats()['in_use'], 1)
+        release.set()
+        thread.join(5)
+        self.assertEqual(checked_out, [stalled])
+        self.assertEqual(pool.stats()['in_use'], 2)
+
+    @patch('application.interface.backend.database.psycopg2.connect')
+    def test_rollback_on_return_runs_outside_lock(self, mock_connect):
+        stalled, fresh = make_conn(), make_conn()
+        stalled.get_transaction_status.return_value = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        rolling_back, release = threading.Event(), threading.Event()
+        stalled.rollback.side_effect = lambda: (rolling_back.set(), release.wait(5))
+        mock_connect.side_effect = [stalled, fresh]
+        pool = ConnectionPool({}, min_size=0, max_size=2)
+
+        conn = pool.getconn()
+        thread = threading.Thread(target=pool.putconn, args=(conn,))
+        thread.start()
+        self.assertTrue(rolling_back.wait(5))
+
+        self.assertIs(pool.getconn(), fresh)
+        release.set()
+        thread.join(5)
+        stats = pool.stats()
+        self.assertEqual((stats['idle'], stats['in_use']), (1, 1))
+
+    @patch('application.interface.backend.database.psycopg2.connect')
+    def test_warm_opens_min_size(self, mock_connect):
+        mock_connect.side_effect = lambda **kwargs: make_conn()
+        pool = ConnectionPool({}, min_size=2, max_size=3)
+
+        pool.warm()
+        pool.warm()
+        stats = pool.stats()
+        self.assertEqual((stats['idle'], stats['connections_created']), (2, 2))
+
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            ConnectionPool({}, min_size=5, max_size=2)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import MagicMock
+from datetime import date, datetime
+
+from application.interface.backend.utils.analytics_rollups import (
+    recompute_days, refresh_rollups, backfill_rollups, rollup_status, fetch_rollup_rows,
+    INSERT_CLINICIAN_ROLLUP, APPOINTMENT_TREND_QUERY
+)
+
+
+class TestAnalyticsRollups(unittest.TestCase):
+
+    def setUp(self):
+        self.db = MagicMock()
+        self.cur = MagicMock()
+        self.db.cursor.return_value = self.cur
+
+    def test_recompute_days_deletes_then_inserts(self):
+        days = [date(2026, 1, 1), date(2026, 1, 2)]
+        recompute_days(self.cur, days)
+
+        queries = [c[0][0] for c in self.cur.execute.call_args_list]
+        self.assertEqual(len(queries), 6)
+        self.assertTrue(all(q.startswith('DELETE') for q in queries[:3]))
+        self.assertIs(queries[3], INSERT_CLINICIAN_ROLLUP)
+        self.assertEqual(self.cur.execute.call_args_list[3][0][1], {'days': days})
+
+    def test_recompute_no_days_is_noop(self):
+        recompute_days(self.cur, [])
+        self.cur.execute.assert_not_called()
+
+    def test_refresh_claims_dirty_days(self):
+        self.cur.fetchall.return_value = [(date(2026, 1, 1),), (date(2026, 1, 3),)]
+
+        self.assertEqual(refresh_rollups(self.db, max_days=10), 2)
+        first_query, first_params = self.cur.execute.call_args_list[0][0]
+        self.assertIn('analytics_rollup_dirty_days', first_query)
+        self.assertEqual(first_params, (10,))
+        self.db.commit.assert_called_once()
+        self.cur.close.assert_called_once()
+
+    def test_refresh_rolls_back_on_error(self):
+        self.cur.execute.side_effect = Exception('boom')
+        with self.assertRaises(Exception):
+            refresh_rollups(self.db)
+        self.db.rollback.assert_called_once()
+        self.db.commit.assert_not_called()
+
+    def test_backfill_commits_per_chunk(self):
+        count = backfill_rollups(self.db, date(2026, 1, 1), date(2026, 1, 10), chunk_days=4)
+        self.assertEqual(count, 10)
+        self.assertEqual(self.db.commit.call_count, 3)
+
+        state_updates = [c[0][1] for c in self.cur.execute.call_args_list if 'analytics_rollup_state' in c[0][0]]
+        self.assertEqual(state_updates[-1]['start'], date(2026, 1, 9))
+        self.assertEqual(state_updates[-1]['end'], date(2026, 1, 10))
+
+    def test_status_fresh(self):
+        self.cur.fetchone.return_value = (datetime(2026, 1, 31, 12, 0), date(2025, 1, 1), 0)
+        status = rollup_status(self.cur, date(2026, 1, 1), date(2026, 1, 31))
+        self.assertEqual(status, {'refreshed_at': '2026-01-31T12:00:00', 'pending_days': 0, 'stale': False})
+
+    def test_status_stale_with_pending_days(self):
+        self.cur.fetchone.return_value = (datetime(2026, 1, 31, 12, 0), date(2025, 1, 1), 2)
+        self.assertTrue(rollup_status(self.cur, date(2026, 1, 1), date(2026, 1, 31))['stale'])
+
+    def test_status_stale_before_backfill(self):
+        self.cur.fetchone.return_value = (datetime(2026, 1, 31, 12, 0), date(2026, 1, 15), 0)
+        self.assertTrue(rollup_status(self.cur, date(2026, 1, 1), date(2026, 1, 31))['stale'])
+
+    def test_status_missing_state_row(self):
+        self.cur.fetchone.return_value = None
+        self.assertTrue(rollup_status(self.cur, date(2026, 1, 1), date(2026, 1, 31))['stale'])
+
+    def test_fetch_rows_passes_scope(self):
+        self.cur.fetchall.return_value = [('row',)]
+        rows = fetch_rollup_rows(self.cur, APPOINTMENT_TREND_QUERY, date(2026, 1, 1), date(2026, 1, 31),
+                                 clinician_id=5, scoped=True, unit='week')
+        self.assertEqual(rows, [('row',)])
+        params = self.cur.execute.call_args[0][1]
+        self.assertTrue(params['scoped'])
+        self.assertEqual(params['clinician_id'], 5)
+        self.assertEqual(params['unit'], 'week')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -66,6 +66,20 @@ class TestAuditLogger(unittest.TestCase):
         )
         self.logger.logger.info.assert_called_once()
 
+    def test_log_bulk_write(self):
+        writer = MagicMock()
+        self.logger.attach_writer(writer)
+        self.logger.log_bulk_write(
+            user_id='test_user',
+            action='BULK_CREATE',
+            resource_type='vital',
+            record_ids=[12, 10, 11],
+            ip_address='127.0.0.1'
+        )
+        self.logger.logger.info.assert_called_once()
+        writer.enqueue.assert_called_once()
+        self.assertEqual(writer.enqueue.call_args[0][1], 'BULK_CREATE_vital_10-12')
+
     def test_log_consent_change(self):
         self.logger.log_consent_change(
             patient_id='patient_123',
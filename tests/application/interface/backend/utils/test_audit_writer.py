@@ -0,0 +1,213 @@
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from datetime import datetime
+
+from application.interface.backend.utils.audit_writer import AuditWriter, create_writer, INSERT_ACCESS_LOG
+from application.interface.backend.utils import audit_logger as audit_logger_module
+from application.interface.backend.utils.audit_logger import AuditLogger
+
+
+def redirect_audit_log(test, directory):
+    """Send the 'audit' logger to directory/audit.log instead of the repo's logs/ for one test"""
+    handler = logging.FileHandler(os.path.join(directory, 'audit.log'))
+    patcher = patch.object(logging.getLogger('audit'), 'handlers', [handler])
+    patcher.start()
+    test.addCleanup(patcher.stop)
+    test.addCleanup(handler.close)
+    # AuditLogger() adds its own file handler; keep that one in directory too
+    file_handler_class = logging.FileHandler
+    file_handler = patch.object(audit_logger_module.logging, 'FileHandler',
+                                lambda path: file_handler_class(os.path.join(directory, os.path.basename(path))))
+    file_handler.start()
+    test.addCleanup(file_handler.stop)
+
+
+def hold_spool_lock(spool_path, locked, release):
+    writer = AuditWriter(MagicMock(), spool_path=spool_path)
+    with writer._spool_locked():
+        locked.set()
+        release.wait(5)
+
+
+class TestAuditWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.spool_path = os.path.join(self.tmpdir.name, 'spool.jsonl')
+        redirect_audit_log(self, self.tmpdir.name)
+        self.pool = MagicMock()
+        self.conn = MagicMock()
+        self.pool.getconn.return_value = self.conn
+        self.execute_values = patch('application.interface.backend.utils.audit_writer.execute_values').start()
+        self.writer = AuditWriter(self.pool, spool_path=self.spool_path, batch_size=3, flush_interval=0.05)
+
+    def tearDown(self):
+        self.writer.shutdown()
+        patch.stopall()
+        self.tmpdir.cleanup()
+
+    def enqueue(self, n, start=0):
+        for i in range(start, start + n):
+            self.writer.enqueue(i, f'VIEW_patient_{i}', '127.0.0.1', 'agent', datetime(2026, 1, 1, 12, 0, i))
+
+    def inserted_rows(self):
+        return [row for call in self.execute_values.call_args_list for row in call[0][2]]
+
+    def test_batches_by_size(self):
+        self.enqueue(7)
+        self.assertTrue(self.writer.flush(timeout=5))
+
+        self.assertEqual([r[0] for r in self.inserted_rows()], list(range(7)))
+        self.assertEqual(self.execute_values.call_args[0][1], INSERT_ACCESS_LOG)
+        self.assertTrue(all(len(call[0][2]) <= 3 for call in self.execute_values.call_args_list))
+        stats = self.writer.stats()
+        self.assertEqual(stats['written'], 7)
+        self.assertEqual(stats['batches'], self.execute_values.call_count)
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertEqual(self.pool.putconn.call_count, self.pool.getconn.call_count)
+
+    def test_failed_batch_spools_then_replays(self):
+        self.execute_values.side_effect = Exception('db down')
+        self.enqueue(2)
+        self.assertTrue(self.writer.flush(timeout=5))
+
+        self.assertTrue(os.path.exists(self.spool_path))
+        self.assertEqual(self.writer.stats()['spooled'], 2)
+        self.conn.rollback.assert_called()
+
+        self.execute_values.side_effect = None
+        self.execute_values.reset_mock()
+        self.enqueue(1, start=10)
+        self.assertTrue(self.writer.flush(timeout=5))
+
+        self.assertEqual(sorted(r[0] for r in self.inserted_rows()), [0, 1, 10])
+        replayed = [r for r in self.inserted_rows() if r[0] == 0][0]
+        self.assertEqual(replayed[4], datetime(2026, 1, 1, 12, 0, 0))
+        self.assertFalse(os.path.exists(self.spool_path))
+        self.assertEqual(self.writer.stats()['replayed'], 2)
+
+    def write_spool(self, lines):
+        with open(self.spool_path, 'w') as f:
+            f.writelines(line + '\n' for line in lines)
+
+    def spool_line(self, user_id, action='VIEW'):
+        return json.dumps([user_id, action, '127.0.0.1', 'agent', datetime(2026, 1, 1).isoformat()])
+
+    def test_corrupt_spool_line_is_quarantined(self):
+        self.write_spool([self.spool_line(0), '[1, "VIEW_pat', self.spool_line(2)])
+        self.enqueue(1, start=10)
+        self.assertTrue(self.writer.flush(timeout=5))
+
+        self.assertEqual(sorted(r[0] for r in self.inserted_rows()), [0, 2, 10])
+        self.assertFalse(os.path.exists(self.spool_path))
+        with open(self.spool_path + '.bad') as f:
+            self.assertEqual(f.read(), '[1, "VIEW_pat\n')
+        self.assertEqual(self.writer.stats()['quarantined'], 1)
+
+        # The writer thread is still running
+        self.enqueue(1, start=11)
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertIn(11, [r[0] for r in self.inserted_rows()])
+
+    def test_failing_spool_chunk_is_quarantined_without_duplicates(self):
+        def insert(cur, sql, rows, page_size):
+            if any(row[1] == 'POISON' for row in rows):
+                raise Exception('value too long')
+        self.execute_values.side_effect = insert
+        self.write_spool([self.spool_line(i) for i in range(3)] + [self.spool_line(3, 'POISON')])
+
+        for i in range(4):
+            self.enqueue(1, start=10 + i)
+            self.assertTrue(self.writer.flush(timeout=5))
+
+        inserted = [r[0] for call in self.execute_values.call_args_list
+                    if not any(row[1] == 'POISON' for row in call[0][2]) for r in call[0][2]]
+        self.assertEqual(sorted(inserted), [0, 1, 2, 10, 11, 12, 13])
+        self.assertFalse(os.path.exists(self.spool_path))
+        with open(self.spool_path + '.bad') as f:
+            self.assertIn('POISON', f.read())
+        # Retried until the third failed replay, then set aside
+        self.assertEqual(sum(1 for call in self.execute_values.call_args_list
+                             if any(row[1] == 'POISON' for row in call[0][2])), 3)
+        self.assertEqual(self.writer.stats()['replayed'], 3)
+
+    def test_writer_thread_survives_errors(self):
+        self.execute_values.side_effect = Exception('db down')
+        with patch.object(self.writer, '_spool', side_effect=OSError('disk full')):
+            self.enqueue(1)
+            self.assertTrue(self.writer.flush(timeout=5))
+
+        self.execute_values.side_effect = None
+        self.enqueue(1, start=10)
+        self.assertTrue(self.writer.flush(timeout=5))
+        self.assertEqual(self.writer.stats()['written'], 1)
+
+    def test_spool_is_locked_across_processes(self):
+        context = multiprocessing.get_context('fork')
+        locked, release = context.Event(), context.Event()
+        other_worker = context.Process(target=hold_spool_lock, args=(self.spool_path, locked, release))
+        other_worker.start()
+        self.addCleanup(other_worker.join, 5)
+        self.assertTrue(locked.wait(5))
+
+        threading.Timer(0.2, release.set).start()
+        started = time.monotonic()
+        self.writer._spool([(1, 'VIEW_patient_1', '127.0.0.1', 'agent', datetime(2026, 1, 1))])
+        # The append waited for the other worker's lock
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+        with open(self.spool_path) as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    def test_full_queue_spools_instead_of_dropping(self):
+        writer = AuditWriter(self.pool, spool_path=self.spool_path, max_queue=1)
+        # Keep the writer thread from draining the queue
+        writer._ensure_started = lambda: None
+        writer.enqueue(1, 'VIEW_patient_1', '127.0.0.1', 'agent', datetime(2026, 1, 1))
+        writer.enqueue(2, 'VIEW_patient_2', '127.0.0.1', 'agent', datetime(2026, 1, 1))
+
+        self.assertEqual(writer.stats()['overflow_spooled'], 1)
+        with open(self.spool_path) as f:
+            self.assertIn('VIEW_patient_2', f.read())
+
+    def test_shutdown_flushes(self):
+        writer = AuditWriter(self.pool, spool_path=self.spool_path, batch_size=100, flush_interval=60)
+        writer.enqueue(1, 'VIEW_patient_1', '127.0.0.1', 'agent', datetime(2026, 1, 1))
+        writer.shutdown()
+        self.assertEqual(writer.stats()['written'], 1)
+
+    def test_create_writer(self):
+        writer = create_writer(self.pool, {'AUDIT_BATCH_SIZE': 50, 'AUDIT_SPOOL_PATH': self.spool_path})
+        self.assertEqual(writer.batch_size, 50)
+        self.assertEqual(writer.spool_path, self.spool_path)
+
+
+class TestAuditLoggerWithWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        redirect_audit_log(self, self.tmpdir.name)
+
+    @patch('application.interface.backend.utils.audit_logger.get_db')
+    def test_log_access_enqueues(self, mock_get_db):
+        logger = AuditLogger()
+        logger.logger = MagicMock()
+        writer = MagicMock()
+        logger.attach_writer(writer)
+
+        logger.log_access('7', 'VIEW', 'patient', '123', '127.0.0.1', 'agent')
+
+        mock_get_db.assert_not_called()
+        args = writer.enqueue.call_args[0]
+        self.assertEqual(args[:4], ('7', 'VIEW_patient_123', '127.0.0.1', 'agent'))
+
+
+if __name__ == '__main__':
+    unittest.main()
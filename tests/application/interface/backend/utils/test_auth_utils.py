@@ -1,6 +1,11 @@
 import unittest
 from unittest.mock import patch, MagicMock
-from application.interface.backend.utils.auth_utils import get_clinician_id
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from application.interface.backend.utils.auth_utils import (
+    get_clinician_id, get_assigned_patient_ids, is_patient_assigned, invalidate_clinician_cache
+)
+from application.interface.backend.utils.validators import BusinessRules, ValidationError
 
 class TestAuthUtils(unittest.TestCase):
 
@@ -27,5 +32,64 @@ class TestAuthUtils(unittest.TestCase):
         result = get_clinician_id(99)
         self.assertIsNone(result)
 
+    @patch('application.interface.backend.utils.auth_utils.get_db')
+    def test_get_clinician_id_cached(self, mock_get_db):
+        mock_cursor = mock_get_db.return_value.cursor.return_value
+        mock_cursor.fetchone.return_value = (10,)
+
+        with Flask(__name__).app_context():
+            self.assertEqual(get_clinician_id(1), 10)
+            self.assertEqual(get_clinician_id(1), 10)
+        mock_cursor.execute.assert_called_once()
+
+    @patch('application.interface.backend.utils.auth_utils.get_db')
+    def test_get_clinician_id_from_token_claim(self, mock_get_db):
+        app = Flask(__name__)
+        app.config['JWT_SECRET_KEY'] = 'test-secret'
+        JWTManager(app)
+        with app.app_context():
+            token = create_access_token(identity='1', additional_claims={'clinician_id': 10})
+        with app.test_request_context(headers={'Authorization': f'Bearer {token}'}):
+            from flask_jwt_extended import verify_jwt_in_request
+            verify_jwt_in_request()
+            self.assertEqual(get_clinician_id('1'), 10)
+            # The claim only answers for the token's own user
+            mock_get_db.return_value.cursor.return_value.fetchone.return_value = (20,)
+            self.assertEqual(get_clinician_id('2'), 20)
+        mock_get_db.return_value.cursor.return_value.execute.assert_called_once()
+
+
+class TestPatientAssignment(unittest.TestCase):
+
+    def setUp(self):
+        self.app_context = Flask(__name__).app_context()
+        self.app_context.push()
+        self.db = MagicMock()
+        self.cur = self.db.cursor.return_value
+        self.cur.fetchall.return_value = [(1,), (2,), (3,)]
+
+    def tearDown(self):
+        self.app_context.pop()
+
+    def test_assignment_is_set_membership(self):
+        self.assertEqual(get_assigned_patient_ids(5, db=self.db), frozenset({1, 2, 3}))
+        self.assertTrue(is_patient_assigned(5, 2, db=self.db))
+        self.assertFalse(is_patient_assigned(5, 4, db=self.db))
+        self.cur.execute.assert_called_once()
+        self.assertFalse(is_patient_assigned(None, 2, db=self.db))
+
+    def test_invalidate_reloads(self):
+        is_patient_assigned(5, 4, db=self.db)
+        self.cur.fetchall.return_value = [(4,)]
+        invalidate_clinician_cache(5)
+        self.assertTrue(is_patient_assigned(5, 4, db=self.db))
+        self.assertEqual(self.cur.execute.call_count, 2)
+
+    def test_business_rule_uses_cache(self):
+        self.assertTrue(BusinessRules.check_clinician_patient_assignment(5, 1, self.db))
+        with self.assertRaises(ValidationError):
+            BusinessRules.check_clinician_patient_assignment(5, 9, self.db)
+        self.cur.execute.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,163 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from flask import Flask
+
+from application.interface.backend.utils.bulk_write import bulk_insert, bulk_upsert, resolve_batch_size
+from application.interface.backend.utils.validators import BulkValidationError, Validators
+
+SCHEMA = {
+    'email': {'required': True, 'validator': Validators.validate_email},
+    'full_name': {'required': True},
+}
+
+
+class TestBulkWrite(unittest.TestCase):
+
+    def setUp(self):
+        self.db = MagicMock()
+        self.cursor = MagicMock()
+        self.db.cursor.return_value = self.cursor
+        patcher = patch('application.interface.backend.utils.bulk_write.audit_logger')
+        self.audit_logger = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('application.interface.backend.utils.bulk_write.execute_values')
+    def test_insert_batches(self, mock_execute_values):
+        mock_execute_values.side_effect = [[(10,), (11,)], [(12,), (13,)], [(14,)]]
+        rows = [{'email': f'user{i}@example.com', 'full_name': f'User {i}'} for i in range(5)]
+
+        ids = bulk_insert('users', ('email', 'full_name', 'role_id'), rows, 'user', SCHEMA,
+                          batch_size=2, db=self.db)
+
+        self.assertEqual(ids, [10, 11, 12, 13, 14])
+        self.assertEqual(self.db.commit.call_count, 3)
+        query = mock_execute_values.call_args[0][1]
+        self.assertEqual(query, 'INSERT INTO users (email, full_name) VALUES %s RETURNING id')
+        self.assertEqual(mock_execute_values.call_args_list[2][0][2], [('user4@example.com', 'User 4')])
+
+        # One audit event per batch
+        self.assertEqual(self.audit_logger.log_bulk_write.call_count, 3)
+        args = self.audit_logger.log_bulk_write.call_args_list[0][0]
+        self.assertEqual(args[1:4], ('BULK_CREATE', 'user', [10, 11]))
+
+    @patch('application.interface.backend.utils.bulk_write.execute_values')
+    def test_invalid_rows_write_nothing(self, mock_execute_values):
+        rows = [
+            {'email': 'ok@example.com', 'full_name': 'Ok'},
+            {'email': 'not-an-email', 'full_name': 'Bad'},
+            {'email': 'missing@example.com'},
+        ]
+        with self.assertRaises(BulkValidationError) as context:
+            bulk_insert('users', ('email', 'full_name'), rows, 'user', SCHEMA, db=self.db)
+
+        self.assertEqual([(index, field) for index, field, _ in context.exception.errors],
+                         [(1, 'email'), (2, 'full_name')])
+        mock_execute_values.assert_not_called()
+        self.db.commit.assert_not_called()
+
+    @patch('application.interface.backend.utils.bulk_write.execute_values')
+    def test_failed_batch_rolls_back(self, mock_execute_values):
+        mock_execute_values.side_effect = [[(1,)], Exception('constraint violation')]
+        rows = [{'email': f'user{i}@example.com', 'full_name': 'User'} for i in range(2)]
+
+        with self.assertRaises(Exception):
+            bulk_insert('users', ('email', 'full_name'), rows, 'user', SCHEMA, batch_size=1, db=self.db)
+
+        self.db.commit.assert_called_once()
+        self.db.rollback.assert_called_once()
+        self.assertEqual(self.audit_logger.log_bulk_write.call_count, 1)
+
+    @patch('application.interface.backend.utils.bulk_write.execute_values')
+    def test_upsert(self, mock_execute_values):
+        mock_execute_values.return_value = [(7,), (8,)]
+        rows = [
+            {'email': 'a@example.com', 'full_name': 'A'},
+            {'email': 'b@example.com', 'full_name': 'B'},
+            {'email': 'a@example.com', 'full_name': 'A2'},
+        ]
+
+        ids = bulk_upsert('users', ('full_name', 'email'), rows, 'user', ('email',), SCHEMA, db=self.db)
+
+        self.assertEqual(ids, [7, 8])
+        query = mock_execute_values.call_args[0][1]
+        self.assertEqual(query, 'INSERT INTO users (email, full_name) VALUES %s '
+                                'ON CONFLICT (email) DO UPDATE SET full_name = EXCLUDED.full_name RETURNING id')
+        # A key repeated within a batch is written once, last row wins
+        self.assertEqual(mock_execute_values.call_args[0][2],
+                         [('a@example.com', 'A2'), ('b@example.com', 'B')])
+        self.assertEqual(self.audit_logger.log_bulk_write.call_args[0][1], 'BULK_UPSERT')
+
+    @patch('application.interface.backend.utils.bulk_write.execute_values')
+    def test_mixed_columns_are_written_separately(self, mock_execute_values):
+        columns = ('user_id', 'gender', 'city')
+        mock_execute_values.side_effect = [[(1,), (3,)], [(2,)]]
+        rows = [
+            {'id': 1, 'user_id': 5, 'gender': 'male'},
+            {'id': 2, 'user_id': 6, 'city': 'X'},
+            {'id': 3, 'user_id': 7, 'gender': 'female'},
+        ]
+
+        ids = bulk_upsert('patients', columns, rows, 'patient', ('id',), db=self.db)
+
+        self.assertEqual(ids, [1, 3, 2])
+        calls = [(call[0][1], call[0][2]) for call in mock_execute_values.call_args_list]
+        self.assertEqual(calls, [
+            ('INSERT INTO patients (id, user_id, gender) VALUES %s ON CONFLICT (id) DO UPDATE SET '
+             'user_id = EXCLUDED.user_id, gender = EXCLUDED.gender RETURNING id',
+             [(1, 5, 'male'), (3, 7, 'female')]),
+            ('INSERT INTO patients (id, user_id, city) VALUES %s ON CONFLICT (id) DO UPDATE SET '
+             'user_id = EXCLUDED.user_id, city = EXCLUDED.city RETURNING id',
+             [(2, 6, 'X')]),
+        ])
+        # Still one transaction and one audit event for the batch
+        self.db.commit.assert_called_once()
+        self.assertEqual(self.audit_logger.log_bulk_write.call_args[0][3], [1, 3, 2])
+
+    @patch('application.interface.backend.utils.bulk_write.execute_values')
+    def test_insert_leaves_missing_columns_to_defaults(self, mock_execute_values):
+        mock_execute_values.side_effect = [[(10,), (12,)], [(11,)]]
+        rows = [
+            {'sender_id': 1, 'content': 'a'},
+            {'sender_id': 1, 'content': 'b', 'sent_at': '2026-01-01T00:00:00'},
+            {'sender_id': 2, 'content': 'c'},
+        ]
+
+        ids = bulk_insert('messages', ('sender_id', 'content', 'sent_at'), rows, 'message', db=self.db)
+
+        # IDs come back in row order across statements
+        self.assertEqual(ids, [10, 11, 12])
+        queries = [call[0][1] for call in mock_execute_values.call_args_list]
+        self.assertEqual(queries, ['INSERT INTO messages (sender_id, content) VALUES %s RETURNING id',
+                                   'INSERT INTO messages (sender_id, content, sent_at) VALUES %s RETURNING id'])
+
+    @patch('application.interface.backend.utils.bulk_write.execute_values')
+    def test_failed_group_rolls_back_batch(self, mock_execute_values):
+        mock_execute_values.side_effect = [[(10,)], Exception('constraint violation')]
+        rows = [{'sender_id': 1, 'content': 'a'}, {'sender_id': 1, 'sent_at': '2026-01-01T00:00:00'}]
+
+        with self.assertRaises(Exception):
+            bulk_insert('messages', ('sender_id', 'content', 'sent_at'), rows, 'message', db=self.db)
+
+        self.db.commit.assert_not_called()
+        self.db.rollback.assert_called_once()
+        self.audit_logger.log_bulk_write.assert_not_called()
+
+    def test_upsert_requires_key(self):
+        with self.assertRaises(BulkValidationError):
+            bulk_upsert('vitals', ('patient_id',), [{'patient_id': 1}], 'vital', ('id',), db=self.db)
+
+    def test_empty(self):
+        self.assertEqual(bulk_insert('users', ('email',), [], 'user', db=self.db), [])
+        self.db.cursor.assert_not_called()
+
+    def test_resolve_batch_size(self):
+        self.assertEqual(resolve_batch_size(), 1000)
+        self.assertEqual(resolve_batch_size(50), 50)
+        app = Flask(__name__)
+        app.config['BULK_WRITE_BATCH_SIZE'] = 250
+        with app.app_context():
+            self.assertEqual(resolve_batch_size(), 250)
+
+
+if __name__ == '__main__':
+    unittest.main()
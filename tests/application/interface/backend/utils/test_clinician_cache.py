@@ -0,0 +1,63 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+from application.interface.backend.utils.clinician_cache import ClinicianCache, create_clinician_cache
+
+
+class TestClinicianCache(unittest.TestCase):
+
+    def test_hits_skip_loader(self):
+        cache = ClinicianCache()
+        loader = MagicMock(return_value=10)
+        self.assertEqual(cache.clinician_id(1, loader), 10)
+        self.assertEqual(cache.clinician_id('1', loader), 10)
+        loader.assert_called_once()
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_none_is_cached(self):
+        cache = ClinicianCache()
+        loader = MagicMock(return_value=None)
+        cache.clinician_id(1, loader)
+        cache.clinician_id(1, loader)
+        loader.assert_called_once()
+
+    def test_ttl_expiry(self):
+        cache = ClinicianCache(ttl=60)
+        loader = MagicMock(return_value=[1, 2])
+        with patch('application.interface.backend.utils.clinician_cache.time.monotonic', return_value=100.0):
+            self.assertEqual(cache.assigned_patients(5, loader), frozenset({1, 2}))
+        with patch('application.interface.backend.utils.clinician_cache.time.monotonic', return_value=159.0):
+            cache.assigned_patients(5, loader)
+        self.assertEqual(loader.call_count, 1)
+        with patch('application.interface.backend.utils.clinician_cache.time.monotonic', return_value=161.0):
+            cache.assigned_patients(5, loader)
+        self.assertEqual(loader.call_count, 2)
+
+    def test_lru_eviction(self):
+        cache = ClinicianCache(max_entries=2)
+        cache.clinician_id(1, lambda: 1)
+        cache.clinician_id(2, lambda: 2)
+        cache.clinician_id(1, lambda: 1)
+        cache.clinician_id(3, lambda: 3)
+        loader = MagicMock(return_value=2)
+        cache.clinician_id(2, loader)
+        loader.assert_called_once()
+        self.assertEqual(cache.stats()['evictions'], 2)
+
+    def test_invalidate(self):
+        cache = ClinicianCache()
+        cache.clinician_id(1, lambda: 10)
+        cache.assigned_patients(10, lambda: [1])
+        cache.invalidate(10)
+        self.assertEqual(cache.stats()['entries'], 1)
+        cache.invalidate()
+        self.assertEqual(cache.stats()['entries'], 0)
+
+    def test_create_clinician_cache(self):
+        cache = create_clinician_cache({'CLINICIAN_CACHE_TTL': '30', 'CLINICIAN_CACHE_MAX_ENTRIES': 50})
+        self.assertEqual(cache.ttl, 30.0)
+        self.assertEqual(cache.max_entries, 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import MagicMock
+from datetime import datetime, timedelta
+
+from application.interface.backend.utils.dashboard_metrics import (
+    fetch_dashboard_metrics, STAFF_DASHBOARD_QUERY, PATIENT_DASHBOARD_QUERY
+)
+
+
+def staff_payload(**overrides):
+    payload = {
+        'total_patients': 120, 'new_patients': 7, 'active_patients': 40,
+        'appointment_status': [['scheduled', 12], ['cancelled', 3]],
+        'upcoming_appointments': 9,
+        'assessments': [
+            {'instrument_code': 'PHQ9', 'name': 'PHQ-9', 'total': 4, 'completion_rate': 1},
+            {'instrument_code': 'GAD7', 'name': 'GAD-7', 'total': 0, 'completion_rate': None}
+        ],
+        'therapy_sessions': {'total': 0, 'avg_duration': None},
+        'homework': {'total': 0, 'completed': None},
+        'vitals': {'avg_heart_rate': None, 'total_readings': 0},
+        'messages_sent': 31,
+        'active_clinicians': 6,
+        'clinician_workload': [{'clinician_id': 1, 'name': 'Dr. A', 'patient_count': 20, 'appointment_count': 8}],
+        'access_activity': [{'action': 'VIEW_patient_1', 'count': 3}],
+        'active_users': 11
+    }
+    payload.update(overrides)
+    return payload
+
+
+class TestDashboardMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.cur = MagicMock()
+        self.now = datetime(2026, 1, 31, 12, 0)
+        self.start = self.now - timedelta(days=30)
+
+    def test_admin_metrics_single_query(self):
+        self.cur.fetchone.return_value = (staff_payload(),)
+
+        metrics = fetch_dashboard_metrics(self.cur, 'admin', '1', None, self.start, self.now)
+
+        self.cur.execute.assert_called_once()
+        query, params = self.cur.execute.call_args[0]
+        self.assertIs(query, STAFF_DASHBOARD_QUERY)
+        self.assertFalse(params['scoped'])
+        self.assertTrue(params['is_admin'])
+
+        self.assertEqual(metrics['appointments'], {'total': 15, 'by_status': {'scheduled': 12, 'cancelled': 3}})
+        self.assertEqual(metrics['assessments'][0]['completion_rate'], 1.0)
+        self.assertEqual(metrics['assessments'][1]['completion_rate'], 0)
+        self.assertEqual(metrics['therapy_sessions'], {'total': 0, 'avg_duration': 0})
+        self.assertEqual(metrics['homework_completion_rate'], 0)
+        self.assertEqual(metrics['vitals'], {'avg_heart_rate': 0, 'total_readings': 0})
+        self.assertEqual(metrics['active_clinicians'], 6)
+        self.assertEqual(metrics['active_users'], 11)
+        self.assertEqual(len(metrics['clinician_workload']), 1)
+
+    def test_clinician_metrics_omit_admin_sections(self):
+        self.cur.fetchone.return_value = (staff_payload(),)
+
+        metrics = fetch_dashboard_metrics(self.cur, 'clinician', '2', 5, self.start, self.now)
+
+        params = self.cur.execute.call_args[0][1]
+        self.assertTrue(params['scoped'])
+        self.assertEqual(params['clinician_id'], 5)
+        for key in ['active_clinicians', 'clinician_workload', 'access_activity', 'active_users']:
+            self.assertNotIn(key, metrics)
+
+    def test_unlinked_clinician_stays_scoped(self):
+        # A clinician without a clinicians row must never fall back to admin-wide data
+        self.cur.fetchone.return_value = (staff_payload(),)
+
+        fetch_dashboard_metrics(self.cur, 'clinician', '2', None, self.start, self.now)
+
+        params = self.cur.execute.call_args[0][1]
+        self.assertTrue(params['scoped'])
+        self.assertIsNone(params['clinician_id'])
+
+    def test_patient_metrics(self):
+        self.cur.fetchone.return_value = ({
+            'patient_id': 3,
+            'appointment_status': [['completed', 2]],
+            'assessments': 4,
+            'homework': {'total': 4, 'completed': 1}
+        },)
+
+        metrics = fetch_dashboard_metrics(self.cur, 'patient', '9', None, self.start, self.now)
+
+        self.assertIs(self.cur.execute.call_args[0][0], PATIENT_DASHBOARD_QUERY)
+        self.assertEqual(metrics['my_appointments'], {'total': 2, 'by_status': {'completed': 2}})
+        self.assertEqual(metrics['my_assessments'], 4)
+        self.assertEqual(metrics['my_homework'], {'total': 4, 'completed': 1, 'completion_rate': 25.0})
+
+    def test_patient_without_record(self):
+        self.cur.fetchone.return_value = ({
+            'patient_id': None, 'appointment_status': [], 'assessments': 0,
+            'homework': {'total': 0, 'completed': None}
+        },)
+
+        self.assertEqual(fetch_dashboard_metrics(self.cur, 'patient', '9', None, self.start, self.now), {})
+
+    def test_unknown_role_runs_no_queries(self):
+        self.assertEqual(fetch_dashboard_metrics(self.cur, 'guest', '9', None, self.start, self.now), {})
+        self.cur.execute.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
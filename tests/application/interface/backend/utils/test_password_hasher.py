@@ -0,0 +1,89 @@
+import threading
+import unittest
+
+from application.interface.backend.utils.password_hasher import (
+    PasswordHasher, HasherBusyError, create_password_hasher
+)
+
+
+class TestPasswordHasherInline(unittest.TestCase):
+
+    def setUp(self):
+        self.hasher = PasswordHasher(workers=0, bcrypt_rounds=4)
+
+    def test_bcrypt_round_trip(self):
+        pw_hash = self.hasher.generate_password_hash('Password123!')
+        self.assertTrue(pw_hash.startswith('$2b$04$'))
+        self.assertTrue(self.hasher.check_password_hash(pw_hash, 'Password123!'))
+        self.assertFalse(self.hasher.check_password_hash(pw_hash, 'wrong'))
+
+    def test_checks_flask_bcrypt_hashes(self):
+        from flask_bcrypt import Bcrypt
+        pw_hash = Bcrypt().generate_password_hash('Password123!', 4).decode('utf-8')
+        self.assertTrue(self.hasher.check_password_hash(pw_hash, 'Password123!'))
+
+    def test_stats(self):
+        self.hasher.check_password_hash(self.hasher.generate_password_hash('secret'), 'secret')
+        stats = self.hasher.stats()
+        self.assertEqual(stats['submitted'], 2)
+        self.assertEqual(stats['completed'], 2)
+        self.assertEqual(stats['pending'], 0)
+        self.assertGreater(stats['hash_ms_avg'], 0)
+
+    def test_rejects_when_saturated(self):
+        hasher = PasswordHasher(workers=0, max_pending=1, retry_after=5)
+        release = threading.Event()
+        entered = threading.Event()
+
+        def slow_check(pw_hash, password):
+            entered.set()
+            release.wait(5)
+            return True
+
+        from application.interface.backend.utils import password_hasher
+        original = password_hasher.OPERATIONS['bcrypt_check']
+        password_hasher.OPERATIONS['bcrypt_check'] = slow_check
+        try:
+            thread = threading.Thread(target=hasher.check_password_hash, args=('h', 'p'))
+            thread.start()
+            entered.wait(5)
+            with self.assertRaises(HasherBusyError) as ctx:
+                hasher.check_password_hash('h', 'p')
+            self.assertEqual(ctx.exception.retry_after, 5)
+            release.set()
+            thread.join()
+        finally:
+            password_hasher.OPERATIONS['bcrypt_check'] = original
+
+        self.assertEqual(hasher.stats()['rejected'], 1)
+        self.assertEqual(hasher.stats()['pending'], 0)
+
+    def test_failure_releases_slot(self):
+        hasher = PasswordHasher(workers=0, max_pending=1)
+        with self.assertRaises(ValueError):
+            hasher.check_password_hash('not-a-bcrypt-hash', 'p')
+        self.assertEqual(hasher.stats()['pending'], 0)
+        self.assertEqual(hasher.stats()['failed'], 1)
+
+
+class TestPasswordHasherPool(unittest.TestCase):
+
+    def test_process_pool(self):
+        hasher = PasswordHasher(workers=1, bcrypt_rounds=4)
+        try:
+            pw_hash = hasher.generate_password_hash('Password123!')
+            self.assertTrue(hasher.check_password_hash(pw_hash, 'Password123!'))
+        finally:
+            hasher.shutdown()
+        self.assertEqual(hasher.stats()['completed'], 2)
+
+    def test_create_password_hasher(self):
+        hasher = create_password_hasher({'PASSWORD_HASH_WORKERS': 0, 'PASSWORD_HASH_MAX_PENDING': 8,
+                                         'BCRYPT_LOG_ROUNDS': 4})
+        self.assertEqual(hasher.workers, 0)
+        self.assertEqual(hasher.max_pending, 8)
+        self.assertEqual(hasher.bcrypt_rounds, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
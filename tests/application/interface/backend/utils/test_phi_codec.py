@@ -0,0 +1,75 @@
+import unittest
+from datetime import date
+
+from application.interface.backend.utils.encryption import FieldEncryption, DataMasking
+from application.interface.backend.utils.phi_codec import PHICodec, compile_mask_rules, mask_records
+from application.interface.backend.models.patient import Patient
+
+
+class TestMaskRules(unittest.TestCase):
+
+    def test_rules_follow_is_phi_field(self):
+        rules = compile_mask_rules(['id', 'email', 'phone_number', 'date_of_birth', 'full_name', 'diagnosis', 'created_at'])
+        self.assertEqual(set(rules), {'email', 'phone_number', 'date_of_birth', 'full_name', 'diagnosis'})
+        self.assertIs(rules['email'], DataMasking.mask_email)
+        self.assertIs(rules['phone_number'], DataMasking.mask_phone)
+        self.assertIs(rules['date_of_birth'], DataMasking.mask_dob)
+        self.assertIs(rules['full_name'], DataMasking.mask_name)
+        self.assertIs(rules['diagnosis'], DataMasking.mask_generic)
+
+    def test_overrides(self):
+        rules = compile_mask_rules(['city', 'id'], overrides={'city': DataMasking.mask_generic})
+        self.assertEqual(rules, {'city': DataMasking.mask_generic})
+
+    def test_mask_records_keeps_empty_values(self):
+        records = [{'email': 'jane@example.com', 'id': 1}, {'email': None, 'id': 2}]
+        mask_records(records, compile_mask_rules(['email', 'id']))
+        self.assertEqual(records, [{'email': 'j**e@example.com', 'id': 1}, {'email': None, 'id': 2}])
+
+    def test_patient_batch_matches_per_row(self):
+        patients = [
+            Patient(i, i, date(1980, 1, i), 'female', None, 'Hispanic', f'{i} Main St', None, 'CA', '90210', 'Springfield')
+            for i in range(1, 4)
+        ]
+        batch = Patient.to_dicts(patients, mask=True)
+        self.assertEqual(batch, [p.to_dict(mask=True) for p in patients])
+        self.assertEqual(batch[0]['date_of_birth'], '****-**-**')
+        self.assertEqual(batch[0]['address_line_1'], '*' * len('1 Main St'))
+        self.assertEqual(batch[0]['city'], '****')
+        self.assertEqual(batch[0]['id'], 1)
+        self.assertEqual(Patient.to_dicts(patients)[0]['city'], 'Springfield')
+
+
+class TestPHICodec(unittest.TestCase):
+
+    def setUp(self):
+        self.encryption = FieldEncryption(FieldEncryption.generate_key())
+
+    def test_column_roundtrip_inline(self):
+        codec = PHICodec(self.encryption)
+        values = ['a', None, 'ç']
+        encrypted = codec.encrypt_column(values)
+        self.assertIsNone(encrypted[1])
+        self.assertEqual(codec.decrypt_column(encrypted), values)
+        self.assertIsNone(codec._executor)
+
+    def test_column_roundtrip_parallel_preserves_order(self):
+        codec = PHICodec(self.encryption, max_workers=4, chunk_size=7, parallel_threshold=10)
+        values = [f'value-{i}' for i in range(100)]
+        encrypted = codec.encrypt_column(values)
+        self.assertIsNotNone(codec._executor)
+        self.assertEqual([self.encryption.decrypt(v) for v in encrypted], values)
+        self.assertEqual(codec.decrypt_column(encrypted), values)
+        codec.shutdown()
+
+    def test_records(self):
+        codec = PHICodec(self.encryption)
+        records = [{'id': 1, 'notes': 'x'}, {'id': 2, 'notes': 'y'}]
+        codec.encrypt_records(records, ['notes'])
+        self.assertNotEqual(records[0]['notes'], 'x')
+        codec.decrypt_records(records, ['notes'])
+        self.assertEqual(records, [{'id': 1, 'notes': 'x'}, {'id': 2, 'notes': 'y'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
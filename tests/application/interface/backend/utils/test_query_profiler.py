@@ -0,0 +1,100 @@
+import unittest
+from flask import Flask, jsonify
+
+from application.interface.backend.utils.query_profiler import (
+    QueryProfiler, RequestProfile, normalize_statement, create_profiler, init_app, get_profiler
+)
+
+
+class TestNormalizeStatement(unittest.TestCase):
+
+    def test_literals_and_whitespace(self):
+        self.assertEqual(
+            normalize_statement("SELECT *\n  FROM users WHERE id = 42 AND email = 'a@b.c'"),
+            'SELECT * FROM users WHERE id = ? AND email = ?'
+        )
+
+    def test_in_lists_collapse(self):
+        self.assertEqual(normalize_statement('SELECT 1 FROM t WHERE id IN (%s, %s, %s)'),
+                         'SELECT ? FROM t WHERE id IN (...)')
+        self.assertEqual(normalize_statement('SELECT 1 FROM t WHERE id IN (1, 2)'),
+                         'SELECT ? FROM t WHERE id IN (...)')
+
+    def test_identifiers_with_digits_kept(self):
+        self.assertEqual(normalize_statement('SELECT col1 FROM table2'), 'SELECT col1 FROM table2')
+
+
+class TestRequestProfile(unittest.TestCase):
+
+    def test_repeated_and_duplicate_statements(self):
+        profile = RequestProfile()
+        lookup = 'SELECT id FROM clinicians WHERE user_id = %s'
+        for _ in range(3):
+            statement = profile.record_query(lookup, ('7',), 0.001)
+            profile.record_rows(statement, 1)
+        for patient_id in range(5):
+            profile.record_query('SELECT * FROM vitals WHERE patient_id = %s', (patient_id,), 0.002)
+
+        self.assertEqual(profile.query_count, 8)
+        self.assertEqual(profile.rows, 3)
+        self.assertEqual(profile.duplicate_statements(), {lookup: 2})
+        self.assertEqual(profile.repeated_statements(5), {'SELECT * FROM vitals WHERE patient_id = %s': 5})
+
+
+class TestQueryProfiler(unittest.TestCase):
+
+    def test_route_aggregates(self):
+        profiler = QueryProfiler(sample_rate=1, repeat_threshold=3, max_statements=2)
+        for _ in range(2):
+            profile = RequestProfile()
+            profile.record_query('SELECT a FROM t1', None, 0.010)
+            profile.record_query('SELECT b FROM t2', None, 0.001)
+            for _ in range(3):
+                profile.record_query('SELECT c FROM t3 WHERE id = %s', (1,), 0.002)
+            profiler.record('GET /api/things', 'thing_bp', profile)
+
+        report = profiler.snapshot(limit=5)
+        route = report['routes']['GET /api/things']
+        self.assertEqual(report['sampled_requests'], 2)
+        self.assertEqual(route['requests'], 2)
+        self.assertEqual(route['avg_queries'], 5)
+        self.assertAlmostEqual(route['avg_db_ms'], 17.0, places=3)
+        # Only the two statements with the most DB time are kept
+        self.assertEqual([s['statement'] for s in route['slowest_statements']],
+                         ['SELECT a FROM t1', 'SELECT c FROM t3 WHERE id = %s'])
+        self.assertEqual(route['n_plus_one'], {'SELECT c FROM t3 WHERE id = %s': 2})
+        self.assertEqual(route['duplicate_queries'], {'SELECT c FROM t3 WHERE id = %s': 4})
+        self.assertEqual(report['slowest_statements'][0]['route'], 'GET /api/things')
+
+        profiler.reset()
+        self.assertEqual(profiler.snapshot()['routes'], {})
+
+    def test_sampling_disabled(self):
+        self.assertFalse(QueryProfiler(sample_rate=0).should_sample())
+        self.assertTrue(QueryProfiler(sample_rate=1).should_sample())
+
+    def test_request_hooks_and_server_timing(self):
+        app = Flask(__name__)
+        app.config.update(QUERY_PROFILE_SAMPLE_RATE=1, QUERY_PROFILE_SERVER_TIMING=True)
+        init_app(app)
+
+        @app.route('/things/<int:thing_id>')
+        def thing(thing_id):
+            from flask import g
+            g.query_profile.record_query('SELECT * FROM things WHERE id = %s', (thing_id,), 0.004)
+            return jsonify({})
+
+        response = app.test_client().get('/things/3')
+        self.assertEqual(response.headers['Server-Timing'], 'db;dur=4.00;desc="1 queries"')
+        route = get_profiler(app).snapshot()['routes']['GET /things/<int:thing_id>']
+        self.assertEqual(route['requests'], 1)
+
+    def test_create_profiler(self):
+        profiler = create_profiler({'QUERY_PROFILE_SAMPLE_RATE': '0.5', 'QUERY_PROFILE_REPEAT_THRESHOLD': 10})
+        self.assertEqual(profiler.sample_rate, 0.5)
+        self.assertEqual(profiler.repeat_threshold, 10)
+        self.assertFalse(profiler.server_timing)
+
+
+if __name__ == '__main__':
+    unittest.main()
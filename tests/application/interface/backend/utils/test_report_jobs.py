@@ -0,0 +1,118 @@
+import csv
+import json
+import os
+import tempfile
+import threading
+import unittest
+from datetime import date
+from unittest.mock import patch, MagicMock
+from flask import Flask
+
+from application.interface.backend.utils.report_jobs import (
+    ReportJobQueue, create_report_jobs, COMPLETED, FAILED
+)
+from application.interface.backend.utils.analytics_rollups import PATIENT_SUMMARY_QUERY
+
+
+def patient_rows(n, start=0):
+    return [(i, f'Patient {i}', date(1980, 1, 1), 'other', 3, 2, 1) for i in range(start, start + n)]
+
+
+class TestReportJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.app = Flask(__name__)
+        self.cur = MagicMock()
+        self.db = MagicMock()
+        self.db.cursor.return_value = self.cur
+        patch('application.interface.backend.utils.report_jobs.get_db', return_value=self.db).start()
+        self.audit = patch('application.interface.backend.utils.report_jobs.audit_logger').start()
+        self.queue = ReportJobQueue(self.app, directory=self.tmpdir.name, chunk_size=2)
+
+    def tearDown(self):
+        self.queue.shutdown()
+        patch.stopall()
+        self.tmpdir.cleanup()
+
+    def run_job(self, export_format='csv', **kwargs):
+        job, created = self.queue.submit('patient_summary', date(2026, 1, 1), date(2026, 1, 31),
+                                         export_format=export_format, user_id='7', ip_address='127.0.0.1', **kwargs)
+        self.queue.shutdown()
+        return job, created
+
+    def test_csv_export_in_chunks(self):
+        self.cur.fetchmany.side_effect = [patient_rows(2), patient_rows(1, start=2), []]
+        job, created = self.run_job()
+
+        self.assertTrue(created)
+        self.assertEqual(job.status, COMPLETED)
+        self.assertEqual(job.rows_written, 3)
+        self.cur.fetchmany.assert_called_with(2)
+        self.assertIs(self.cur.execute.call_args[0][0], PATIENT_SUMMARY_QUERY)
+        self.db.cursor.assert_called_with(name=f'report_job_{job.id}')
+
+        with open(self.queue.path_for(job), newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([row['patient_id'] for row in rows], ['0', '1', '2'])
+        self.assertEqual(rows[0]['date_of_birth'], '1980-01-01')
+
+        kwargs = self.audit.log_data_export.call_args[1]
+        self.assertEqual(kwargs['record_count'], 3)
+        self.assertEqual(kwargs['export_type'], 'report_patient_summary')
+        self.assertEqual(self.queue.stats()['rows_exported'], 3)
+
+    def test_ndjson_export(self):
+        self.cur.fetchmany.side_effect = [patient_rows(1), []]
+        job, _ = self.run_job(export_format='ndjson')
+        with open(self.queue.path_for(job)) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records[0]['name'], 'Patient 0')
+
+    def test_identical_requests_deduplicated_while_in_flight(self):
+        release = threading.Event()
+
+        def fetchmany(size):
+            release.wait(5)
+            return []
+        self.cur.fetchmany.side_effect = fetchmany
+
+        first, created = self.queue.submit('patient_summary', date(2026, 1, 1), date(2026, 1, 31))
+        second, created_again = self.queue.submit('patient_summary', date(2026, 1, 1), date(2026, 1, 31))
+        other, _ = self.queue.submit('patient_summary', date(2026, 1, 1), date(2026, 1, 31),
+                                     clinician_id=5, scoped=True)
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(other.scope, 'clinician:5')
+
+        release.set()
+        self.queue.shutdown()
+        third, created = self.queue.submit('patient_summary', date(2026, 1, 1), date(2026, 1, 31))
+        self.assertTrue(created)
+        self.assertEqual(self.queue.stats()['deduplicated'], 1)
+
+    def test_failed_job_leaves_no_file(self):
+        self.cur.fetchmany.side_effect = Exception('db down')
+        job, _ = self.run_job()
+
+        self.assertEqual(job.status, FAILED)
+        self.assertEqual(os.listdir(self.tmpdir.name), [])
+        self.audit.log_data_export.assert_not_called()
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.queue.submit('system_usage', date(2026, 1, 1), date(2026, 1, 31))
+        with self.assertRaises(ValueError):
+            self.queue.submit('patient_summary', date(2026, 1, 1), date(2026, 1, 31), export_format='xlsx')
+
+    def test_create_report_jobs(self):
+        self.app.config.update(REPORT_JOBS_DIR=self.tmpdir.name, REPORT_JOBS_CHUNK_SIZE=50)
+        queue = create_report_jobs(self.app)
+        self.assertEqual(queue.directory, self.tmpdir.name)
+        self.assertEqual(queue.chunk_size, 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from flask import Flask, jsonify
+
+from application.interface.backend.utils.response_cache import (
+    MemoryCacheBackend, RedisCacheBackend, ResponseCache, NullResponseCache,
+    create_cache, cached_response, invalidate_analytics, SCOPE_ADMIN
+)
+
+
+class TestMemoryCacheBackend(unittest.TestCase):
+
+    def test_get_set_roundtrip(self):
+        backend = MemoryCacheBackend()
+        backend.set('k', {'a': [1, 2]}, ttl=60)
+        self.assertEqual(backend.get('k'), {'a': [1, 2]})
+        self.assertIsNone(backend.get('missing'))
+        stats = backend.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+    def test_ttl_expiry(self):
+        backend = MemoryCacheBackend()
+        with patch('application.interface.backend.utils.response_cache.time.monotonic', return_value=100.0):
+            backend.set('k', 1, ttl=10)
+        with patch('application.interface.backend.utils.response_cache.time.monotonic', return_value=111.0):
+            self.assertIsNone(backend.get('k'))
+        self.assertEqual(backend.stats()['expired'], 1)
+        self.assertEqual(backend.stats()['bytes'], 0)
+
+    def test_lru_eviction_by_entries(self):
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.set('a', 1, ttl=60)
+        backend.set('b', 2, ttl=60)
+        backend.get('a')
+        backend.set('c', 3, ttl=60)
+        self.assertEqual(backend.get('a'), 1)
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(backend.stats()['evictions'], 1)
+
+    def test_byte_budget(self):
+        backend = MemoryCacheBackend(max_bytes=20)
+        backend.set('a', 'x' * 10, ttl=60)
+        backend.set('b', 'y' * 10, ttl=60)
+        self.assertIsNone(backend.get('a'))
+        self.assertLessEqual(backend.stats()['bytes'], 20)
+
+        backend.set('huge', 'z' * 100, ttl=60)
+        self.assertIsNone(backend.get('huge'))
+        self.assertEqual(backend.stats()['rejected'], 1)
+
+    def test_values_are_copies(self):
+        backend = MemoryCacheBackend()
+        value = {'a': 1}
+        backend.set('k', value, ttl=60)
+        backend.get('k')['a'] = 2
+        self.assertEqual(backend.get('k'), {'a': 1})
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ResponseCache(MemoryCacheBackend(), default_ttl=60)
+
+    def test_invalidate_clinician_scope(self):
+        self.cache.set('clinician:1', 'k1', 'one')
+        self.cache.set('clinician:2', 'k2', 'two')
+        self.cache.set(SCOPE_ADMIN, 'ka', 'admin')
+
+        self.cache.invalidate(clinician_id=1)
+
+        self.assertIsNone(self.cache.get('clinician:1', 'k1'))
+        self.assertEqual(self.cache.get('clinician:2', 'k2'), 'two')
+        self.assertIsNone(self.cache.get(SCOPE_ADMIN, 'ka'))
+
+    def test_invalidate_all(self):
+        self.cache.set('clinician:2', 'k2', 'two')
+        self.cache.invalidate()
+        self.assertIsNone(self.cache.get('clinician:2', 'k2'))
+
+    def test_redis_backend_versions(self):
+        client = MagicMock()
+        client.get.side_effect = lambda key: {'p:version:all': b'3'}.get(key)
+        backend = RedisCacheBackend(client, prefix='p:')
+        cache = ResponseCache(backend)
+
+        cache.set('admin', 'k', {'x': 1}, ttl=5)
+        client.set.assert_called_once_with('p:3.0:k', '{"x":1}', ex=5)
+
+        cache.invalidate(clinician_id=7)
+        client.incr.assert_any_call('p:version:clinician:7')
+
+    def test_redis_outage_is_a_miss(self):
+        client = MagicMock()
+        client.get.side_effect = ConnectionError('down')
+        cache = ResponseCache(RedisCacheBackend(client))
+        self.assertIsNone(cache.get('admin', 'k'))
+        cache.set('admin', 'k', 1)
+        client.set.assert_not_called()
+
+    def test_create_cache(self):
+        self.assertIsInstance(create_cache({'ANALYTICS_CACHE_BACKEND': 'none'}), NullResponseCache)
+        cache = create_cache({'ANALYTICS_CACHE_MAX_BYTES': 1024, 'ANALYTICS_CACHE_TTL': 5})
+        self.assertEqual(cache.backend.max_bytes, 1024)
+        self.assertEqual(cache.default_ttl, 5)
+        with self.assertRaises(ValueError):
+            create_cache({'ANALYTICS_CACHE_BACKEND': 'bogus'})
+
+
+@patch('application.interface.backend.utils.response_cache.get_clinician_id')
+@patch('application.interface.backend.utils.response_cache.get_jwt_identity')
+@patch('application.interface.backend.utils.response_cache.get_jwt')
+class TestCachedResponse(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.calls = []
+
+        @self.app.route('/metrics')
+        @cached_response('metrics', params=('time_range',))
+        def metrics():
+            self.calls.append(1)
+            return jsonify({'n': len(self.calls)}), 200
+
+        self.client = self.app.test_client()
+
+    def login(self, mock_get_jwt, mock_identity, mock_clinician_id, role, user_id, clinician_id=None):
+        mock_get_jwt.return_value = {'role': role}
+        mock_identity.return_value = user_id
+        mock_clinician_id.return_value = clinician_id
+
+    def test_hit_and_param_keying(self, mock_get_jwt, mock_identity, mock_clinician_id):
+        self.login(mock_get_jwt, mock_identity, mock_clinician_id, 'admin', '1')
+        self.assertEqual(self.client.get('/metrics').get_json(), {'n': 1})
+        self.assertEqual(self.client.get('/metrics').get_json(), {'n': 1})
+        self.assertEqual(self.client.get('/metrics?time_range=year').get_json(), {'n': 2})
+
+    def test_clinicians_never_share_entries(self, mock_get_jwt, mock_identity, mock_clinician_id):
+        self.login(mock_get_jwt, mock_identity, mock_clinician_id, 'clinician', '10', clinician_id=1)
+        self.assertEqual(self.client.get('/metrics').get_json(), {'n': 1})
+
+        self.login(mock_get_jwt, mock_identity, mock_clinician_id, 'clinician', '20', clinician_id=2)
+        self.assertEqual(self.client.get('/metrics').get_json(), {'n': 2})
+
+        # Same clinician_id (e.g. None for an unlinked account) but another user
+        self.login(mock_get_jwt, mock_identity, mock_clinician_id, 'clinician', '30', clinician_id=2)
+        self.assertEqual(self.client.get('/metrics').get_json(), {'n': 3})
+
+    def test_invalidation_hook(self, mock_get_jwt, mock_identity, mock_clinician_id):
+        self.login(mock_get_jwt, mock_identity, mock_clinician_id, 'clinician', '10', clinician_id=1)
+        self.client.get('/metrics')
+        with self.app.app_context():
+            invalidate_analytics(1)
+        self.assertEqual(self.client.get('/metrics').get_json(), {'n': 2})
+
+    def test_errors_not_cached(self, mock_get_jwt, mock_identity, mock_clinician_id):
+        @self.app.route('/failing')
+        @cached_response('failing')
+        def failing():
+            self.calls.append(1)
+            return jsonify({'error': 'x'}), 500
+
+        self.login(mock_get_jwt, mock_identity, mock_clinician_id, 'admin', '1')
+        self.client.get('/failing')
+        self.client.get('/failing')
+        self.assertEqual(len(self.calls), 2)
+
+    def test_invalidate_outside_app_context(self, mock_get_jwt, mock_identity, mock_clinician_id):
+        invalidate_analytics(1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from datetime import datetime
+
+from application.interface.backend.utils.revocation_cache import (
+    BloomFilter, RevocationCache, create_revocation_cache, LOAD_ACTIVE_QUERY, LOAD_SINCE_QUERY
+)
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        jtis = [f'jti-{i}' for i in range(1000)]
+        for jti in jtis:
+            bloom.add(jti)
+        self.assertTrue(all(jti in bloom for jti in jtis))
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add(f'jti-{i}')
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+@patch('application.interface.backend.utils.revocation_cache.get_db')
+class TestRevocationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cur = MagicMock()
+        self.db = MagicMock()
+        self.db.cursor.return_value = self.cur
+        self.revoked = {'revoked-1': datetime(2026, 1, 1, 10, 0)}
+
+        def execute(query, params=None):
+            if query is LOAD_ACTIVE_QUERY or query is LOAD_SINCE_QUERY:
+                self.cur.fetchall.return_value = list(self.revoked.items())
+            else:
+                self.cur.fetchone.return_value = (1,) if params[0] in self.revoked else None
+        self.cur.execute.side_effect = execute
+
+    def queries(self):
+        return [c[0][0] for c in self.cur.execute.call_args_list]
+
+    def test_negative_skips_db(self, mock_get_db):
+        mock_get_db.return_value = self.db
+        cache = RevocationCache(max_staleness=60)
+
+        self.assertFalse(cache.is_revoked('valid'))  # builds the filter
+        self.cur.execute.reset_mock()
+        mock_get_db.reset_mock()
+
+        self.assertFalse(cache.is_revoked('valid-2'))
+        mock_get_db.assert_not_called()
+        self.assertEqual(cache.stats()['filter_negatives'], 2)
+
+    def test_positive_confirmed_with_db(self, mock_get_db):
+        mock_get_db.return_value = self.db
+        cache = RevocationCache(max_staleness=60)
+        self.assertTrue(cache.is_revoked('revoked-1'))
+        self.assertEqual(self.queries(), [LOAD_ACTIVE_QUERY, "SELECT 1 FROM token_blacklist WHERE jti = %s"])
+
+    def test_local_add_is_immediate(self, mock_get_db):
+        mock_get_db.return_value = self.db
+        cache = RevocationCache(max_staleness=60)
+        cache.is_revoked('warmup')
+
+        self.revoked['logged-out'] = datetime(2026, 1, 1, 11, 0)
+        cache.add('logged-out')
+        self.assertTrue(cache.is_revoked('logged-out'))
+
+    def test_incremental_refresh_after_staleness(self, mock_get_db):
+        mock_get_db.return_value = self.db
+        cache = RevocationCache(max_staleness=5)
+        with patch('application.interface.backend.utils.revocation_cache.time.monotonic', return_value=1000.0):
+            cache.is_revoked('warmup')
+
+        # Revoked by another worker
+        self.revoked['elsewhere'] = datetime(2026, 1, 1, 12, 0)
+        with patch('application.interface.backend.utils.revocation_cache.time.monotonic', return_value=1003.0):
+            self.assertFalse(cache.is_revoked('elsewhere'))
+        with patch('application.interface.backend.utils.revocation_cache.time.monotonic', return_value=1006.0):
+            self.assertTrue(cache.is_revoked('elsewhere'))
+
+        since = [c for c in self.cur.execute.call_args_list if c[0][0] is LOAD_SINCE_QUERY]
+        self.assertEqual(len(since), 1)
+        self.assertLess(since[0][0][1][0], datetime(2026, 1, 1, 10, 0))
+        self.assertEqual(cache._watermark, datetime(2026, 1, 1, 12, 0))
+
+    def test_refresh_failure_falls_back_to_db(self, mock_get_db):
+        mock_get_db.return_value = self.db
+        cache = RevocationCache()
+
+        def execute(query, params=None):
+            if query is LOAD_ACTIVE_QUERY:
+                raise Exception('db hiccup')
+            self.cur.fetchone.return_value = None
+        self.cur.execute.side_effect = execute
+
+        self.assertFalse(cache.is_revoked('valid'))
+        self.assertEqual(cache.stats()['refresh_failures'], 1)
+        self.assertEqual(cache.stats()['db_lookups'], 1)
+
+    def test_db_mode(self, mock_get_db):
+        mock_get_db.return_value = self.db
+        cache = create_revocation_cache({'JWT_REVOCATION_CACHE_MODE': 'db'})
+        self.assertTrue(cache.is_revoked('revoked-1'))
+        self.assertFalse(cache.is_revoked('valid'))
+        self.assertNotIn(LOAD_ACTIVE_QUERY, self.queries())
+
+    def test_invalid_mode(self, mock_get_db):
+        with self.assertRaises(ValueError):
+            RevocationCache(mode='redis')
+
+
+if __name__ == '__main__':
+    unittest.main()
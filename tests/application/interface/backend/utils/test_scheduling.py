@@ -0,0 +1,78 @@
+import unittest
+from datetime import datetime, timedelta
+
+from application.interface.backend.utils.scheduling import (
+    AppointmentSlotIndex, conflict_window, plan_appointment_batch, CONFLICT_EXISTING, CONFLICT_BATCH,
+    CONFLICT_SLOT
+)
+
+
+def at(hour, minute=0):
+    return datetime(2026, 3, 2, hour, minute)
+
+
+class TestAppointmentSlotIndex(unittest.TestCase):
+
+    def test_window_is_inclusive(self):
+        index = AppointmentSlotIndex([at(10)])
+        self.assertTrue(index.conflicts(at(11)))
+        self.assertTrue(index.conflicts(at(9)))
+        self.assertTrue(index.conflicts(at(10, 30)))
+        self.assertFalse(index.conflicts(at(11, 1)))
+        self.assertFalse(index.conflicts(at(8, 59)))
+
+    def test_add_keeps_order(self):
+        index = AppointmentSlotIndex([at(14), at(8)])
+        index.add(at(11))
+        self.assertEqual(len(index), 3)
+        self.assertTrue(index.conflicts(at(12)))
+        self.assertFalse(index.conflicts(at(16)))
+
+
+class TestPlanAppointmentBatch(unittest.TestCase):
+
+    def test_conflicts_with_existing_and_batch(self):
+        proposals = [
+            {'patient_id': 1, 'appointment_time': at(9)},
+            {'patient_id': 2, 'appointment_time': at(12, 30)},  # existing at 12:00
+            {'patient_id': 3, 'appointment_time': at(9, 45)},   # accepted 9:00
+            {'patient_id': 4, 'appointment_time': at(14)},
+        ]
+        accepted, rejected = plan_appointment_batch([at(12)], proposals)
+
+        self.assertEqual([p['patient_id'] for p in accepted], [1, 4])
+        self.assertEqual([(i, reason) for i, _, reason in rejected],
+                         [(1, CONFLICT_EXISTING), (2, CONFLICT_BATCH)])
+
+    def test_rejected_proposal_does_not_block_later_ones(self):
+        proposals = [
+            {'patient_id': 1, 'appointment_time': at(10, 30)},
+            {'patient_id': 2, 'appointment_time': at(11, 45)},
+        ]
+        accepted, rejected = plan_appointment_batch([at(10)], proposals)
+        self.assertEqual([p['patient_id'] for p in accepted], [2])
+
+    def test_taken_times_block_exact_match_only(self):
+        proposals = [
+            {'patient_id': 1, 'appointment_time': at(10)},      # cancelled at 10:00
+            {'patient_id': 2, 'appointment_time': at(12, 30)},
+        ]
+        accepted, rejected = plan_appointment_batch([], proposals, taken_times=[at(10), at(12)])
+        self.assertEqual([p['patient_id'] for p in accepted], [2])
+        self.assertEqual([(i, reason) for i, _, reason in rejected], [(0, CONFLICT_SLOT)])
+
+    def test_conflict_window(self):
+        proposals = [{'appointment_time': at(12)}, {'appointment_time': at(9)}]
+        self.assertEqual(conflict_window(proposals), (at(8), at(13)))
+
+    def test_weekly_schedule(self):
+        start = datetime(2026, 1, 5, 9, 0)
+        proposals = [{'appointment_time': start + timedelta(days=7 * week, hours=slot)}
+                     for week in range(52) for slot in (0, 2, 4)]
+        accepted, rejected = plan_appointment_batch([], proposals)
+        self.assertEqual(len(accepted), 156)
+        self.assertEqual(rejected, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,11 @@
 import unittest
 from datetime import date, datetime, timedelta
 
-from application.interface.backend.utils.validators import Validators, ValidationError
+from types import SimpleNamespace
+from flask import Flask, jsonify
+from application.interface.backend.utils.validators import (
+    Validators, ValidationError, validate_rows, compile_schema, password_validator, validate_request
+)
 
 class TestValidators(unittest.TestCase):
 
@@ -135,5 +139,85 @@ class TestValidators(unittest.TestCase):
         with self.assertRaises(ValidationError):
             Validators.validate_iso_date('not-a-date')
 
+    def test_validate_rows(self):
+        schema = {
+            'patient_id': {'required': True},
+            'heart_rate': {'validator': Validators.validate_heart_rate},
+        }
+        rows = [
+            {'patient_id': 1, 'heart_rate': 72},
+            {'heart_rate': 300},
+            {'patient_id': 2, 'heart_rate': 72},
+            {'patient_id': 3},
+        ]
+        errors = validate_rows(rows, schema)
+        self.assertEqual([(index, field) for index, field, _ in errors],
+                         [(1, 'patient_id'), (1, 'heart_rate')])
+        self.assertEqual(validate_rows(rows[:1], schema), [])
+
+    def test_validate_rows_checks_each_value_once(self):
+        calls = []
+        schema = {'gender': {'validator': lambda value: calls.append(value)}}
+        validate_rows([{'gender': 'female'}] * 50 + [{'gender': 'male'}], schema)
+        self.assertEqual(calls, ['female', 'male'])
+
+    def test_validate_rows_mixed_numeric_types(self):
+        schema = {'heart_rate': {'validator': Validators.validate_heart_rate}}
+        rows = [{'heart_rate': 72}, {'heart_rate': 72.0}, {'heart_rate': True}]
+        # 72 == 72.0 == True as dict keys; each type still gets its own result
+        for ordered in (rows, rows[::-1]):
+            errors = {ordered[index]['heart_rate'].__class__: message
+                      for index, _, message in validate_rows(ordered, schema)}
+            self.assertEqual(set(errors), {float, bool})
+            self.assertIn('integer', errors[float])
+            self.assertIn('between', errors[bool])
+
+    def test_compile_schema(self):
+        validate = compile_schema({
+            'email': {'required': True, 'validator': Validators.validate_email},
+            'full_name': {'required': True},
+            'phone': {'validator': Validators.validate_phone},
+        })
+        self.assertEqual(validate({'email': 'a@example.com', 'full_name': 'A'}), {})
+        self.assertEqual(validate({'email': 'bad', 'phone': '12'}), {
+            'email': 'Invalid email format',
+            'full_name': 'full_name is required',
+            'phone': 'Invalid phone number',
+        })
+
+    def test_password_validator_reads_config_once(self):
+        config = SimpleNamespace(PASSWORD_MIN_LENGTH=8, PASSWORD_REQUIRE_SPECIAL=False,
+                                 PASSWORD_REQUIRE_NUMBER=True, PASSWORD_REQUIRE_UPPERCASE=True)
+        validate = password_validator(config)
+        config.PASSWORD_MIN_LENGTH = 100
+        self.assertTrue(validate('Password1'))
+        with self.assertRaises(ValidationError):
+            validate('password1')
+        with self.assertRaises(ValidationError):
+            password_validator()('Password1')
+
+    def test_validate_request_many(self):
+        app = Flask(__name__)
+
+        @app.route('/vitals', methods=['POST'])
+        @validate_request({
+            'patient_id': {'required': True},
+            'heart_rate': {'validator': Validators.validate_heart_rate},
+        }, many='vitals')
+        def create_vitals():
+            return jsonify({'ok': True})
+
+        client = app.test_client()
+        response = client.post('/vitals', json={'vitals': [{'patient_id': 1, 'heart_rate': 70}]})
+        self.assertEqual(response.status_code, 200)
+
+        response = client.post('/vitals', json={'vitals': [{'patient_id': 1}, {'heart_rate': 20}]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([(e['index'], e['field']) for e in response.get_json()['errors']],
+                         [(1, 'patient_id'), (1, 'heart_rate')])
+
+        response = client.post('/vitals', json={'vitals': 'none'})
+        self.assertEqual(response.status_code, 400)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,131 @@
+import math
+import unittest
+from unittest.mock import MagicMock
+from datetime import date, datetime, timedelta
+
+from application.interface.backend.utils.vitals_timeseries import (
+    lttb_indices, downsample, choose_tier, recompute_patient_days, refresh_vitals_tiers,
+    backfill_vitals_tiers, fetch_vitals_series, INSERT_TIER_QUERIES
+)
+
+
+class TestLttb(unittest.TestCase):
+
+    def test_keeps_endpoints_and_budget(self):
+        xs = list(range(1000))
+        ys = [math.sin(x / 20) for x in xs]
+        kept = lttb_indices(xs, ys, 100)
+        self.assertEqual(len(kept), 100)
+        self.assertEqual(kept[0], 0)
+        self.assertEqual(kept[-1], 999)
+        self.assertEqual(kept, sorted(set(kept)))
+
+    def test_keeps_spike(self):
+        xs = list(range(500))
+        ys = [70] * 500
+        ys[250] = 180
+        self.assertIn(250, lttb_indices(xs, ys, 20))
+
+    def test_small_inputs(self):
+        self.assertEqual(lttb_indices([0, 1, 2], [1, 2, 3], 10), [0, 1, 2])
+        self.assertEqual(lttb_indices(list(range(10)), [0] * 10, 2), [0, 9])
+
+    def test_downsample_points(self):
+        start = datetime(2026, 1, 1)
+        points = [[start + timedelta(minutes=i), 60 + i % 7] for i in range(300)]
+        result = downsample(points, 50)
+        self.assertEqual(len(result), 50)
+        self.assertIs(result[0], points[0])
+        self.assertIs(downsample(points[:10], 50)[0], points[0])
+
+
+class TestVitalsTiers(unittest.TestCase):
+
+    def setUp(self):
+        self.db = MagicMock()
+        self.cur = MagicMock()
+        self.db.cursor.return_value = self.cur
+
+    def test_choose_tier(self):
+        start = datetime(2026, 1, 1)
+        self.assertEqual(choose_tier(start, start + timedelta(hours=12), 1000)[0], 'minute')
+        self.assertEqual(choose_tier(start, start + timedelta(days=30), 1000)[0], 'hour')
+        self.assertEqual(choose_tier(start, start + timedelta(days=365), 1000)[0], 'day')
+        self.assertEqual(choose_tier(start, start + timedelta(days=3650), 1000)[0], 'day')
+
+    def test_recompute_patient_days(self):
+        recompute_patient_days(self.cur, [(7, date(2026, 1, 1)), (8, date(2026, 1, 2))])
+        queries = [c[0][0] for c in self.cur.execute.call_args_list]
+        self.assertEqual(len(queries), 6)
+        self.assertTrue(all(q.strip().startswith('DELETE') for q in queries[:3]))
+        self.assertIs(queries[3], INSERT_TIER_QUERIES[0])
+        self.assertEqual(self.cur.execute.call_args_list[3][0][1],
+                         {'patient_ids': [7, 8], 'days': [date(2026, 1, 1), date(2026, 1, 2)]})
+
+        self.cur.reset_mock()
+        recompute_patient_days(self.cur, [])
+        self.cur.execute.assert_not_called()
+
+    def test_refresh_claims_dirty_pairs(self):
+        self.cur.fetchall.return_value = [(7, date(2026, 1, 1))]
+        self.assertEqual(refresh_vitals_tiers(self.db, max_pairs=5), 1)
+        first_query, first_params = self.cur.execute.call_args_list[0][0]
+        self.assertIn('vitals_rollup_dirty', first_query)
+        self.assertEqual(first_params, (5,))
+        self.db.commit.assert_called_once()
+
+    def test_refresh_rolls_back_on_error(self):
+        self.cur.execute.side_effect = Exception('boom')
+        with self.assertRaises(Exception):
+            refresh_vitals_tiers(self.db)
+        self.db.rollback.assert_called_once()
+
+    def test_backfill_commits_per_chunk(self):
+        self.cur.fetchall.return_value = [(7, date(2026, 1, 1))]
+        self.assertEqual(backfill_vitals_tiers(self.db, date(2026, 1, 1), date(2026, 1, 10), chunk_days=4), 3)
+        self.assertEqual(self.db.commit.call_count, 3)
+
+
+class TestFetchVitalsSeries(unittest.TestCase):
+
+    def setUp(self):
+        self.cur = MagicMock()
+        self.start = datetime(2026, 1, 1)
+
+    def test_raw_when_within_budget(self):
+        self.cur.fetchall.return_value = [
+            (self.start, 72, '120/80'),
+            (self.start + timedelta(minutes=5), None, 'bad'),
+        ]
+        result = fetch_vitals_series(self.cur, 7, self.start, self.start + timedelta(days=1), 10)
+
+        self.assertEqual(result['tier'], 'raw')
+        self.assertEqual(result['series']['heart_rate'], [[self.start, 72]])
+        self.assertEqual(result['series']['systolic'], [[self.start, 120]])
+        self.assertEqual(result['series']['diastolic'], [[self.start, 80]])
+        # Raw probe asks for one row past the budget
+        self.assertEqual(self.cur.execute.call_args[0][1][-1], 11)
+        self.assertEqual(self.cur.execute.call_count, 1)
+
+    def test_tier_when_over_budget(self):
+        raw = [(self.start + timedelta(seconds=i), 70, '120/80') for i in range(51)]
+        buckets = [
+            (self.start + timedelta(hours=i), 60, 90, 72.5, 110, 130, 120.0, None, None, None)
+            for i in range(60)
+        ]
+        self.cur.fetchall.side_effect = [raw, buckets]
+        self.cur.fetchone.return_value = (True,)
+
+        result = fetch_vitals_series(self.cur, 7, self.start, self.start + timedelta(days=2), 50)
+
+        self.assertEqual(result['tier'], 'hour')
+        self.assertEqual(result['bucket_seconds'], 3600)
+        self.assertTrue(result['stale'])
+        self.assertEqual(len(result['series']['heart_rate']), 50)
+        self.assertEqual(result['series']['heart_rate'][0], [self.start, 72.5, 60, 90])
+        self.assertEqual(result['series']['diastolic'], [])
+        self.assertIn('FROM vitals_hourly', self.cur.execute.call_args_list[1][0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
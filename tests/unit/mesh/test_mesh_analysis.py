@@ -0,0 +1,89 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
+
+from scripts.research.mesh import analysis
+from scripts.research.mesh.analysis import Analyzer, fit_series, ols_slopes
+
+
+def series_df():
+    rows = []
+    years = np.arange(1990, 2025)
+    for ui, L, k, x0 in [("D1", 1000, 0.3, 2005), ("D2", 400, 0.2, 2015)]:
+        rows += [(ui, int(y), int(round(L / (1 + np.exp(-k * (y - x0)))))) for y in years]
+    rows += [("D3", 2020, 5), ("D3", 2022, 9), ("D3", 2024, 10)]  # sparse, too short to fit
+    rows += [("D4", 2000, 7)]
+    return pd.DataFrame(rows, columns=['ui', 'year', 'count'])
+
+
+class TestAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        self.df = series_df()
+        self.analyzer = Analyzer(self.df, {"D1": "Anxiety"}, MagicMock())
+
+    def test_ols_slopes_match_polyfit(self):
+        rng = np.random.default_rng(0)
+        x = np.arange(2010, 2025, dtype=float)
+        y = rng.integers(0, 500, size=(4, len(x))).astype(float)
+        mask = rng.random((4, len(x))) < 0.7
+        mask[3] = False
+        mask[3, 2] = True  # a single point has no slope
+
+        slopes = ols_slopes(x, y, mask)
+        for row in range(3):
+            expected, _ = np.polyfit(x[mask[row]], y[row, mask[row]], 1)
+            self.assertAlmostEqual(slopes[row], expected, places=6)
+        self.assertEqual(slopes[3], 0.0)
+
+    def test_calculate_tss(self):
+        stats = self.analyzer.calculate_tss().set_index('ui')
+        self.assertEqual(list(stats.index), ["D1", "D2", "D3", "D4"])
+        self.assertEqual(stats.loc["D1", "name"], "Anxiety")
+        self.assertEqual(stats.loc["D3", "total_count"], 24)
+        self.assertEqual(stats.loc["D3", "years_active"], 3)
+        # Slope over the observed years only, not zero-filled gaps
+        self.assertAlmostEqual(stats.loc["D3", "recent_slope"], np.polyfit([2020, 2022, 2024], [5, 9, 10], 1)[0])
+        self.assertEqual(stats.loc["D4", "recent_slope"], 0.0)
+
+    def test_fit_series_logistic(self):
+        x = np.arange(1990, 2025, dtype=float)
+        y = 1000 / (1 + np.exp(-0.3 * (x - 2005)))
+        fit = fit_series(x, y)
+        self.assertEqual(fit['model'], 'logistic')
+        self.assertAlmostEqual(fit['params']['L'], 1000, delta=1)
+        self.assertAlmostEqual(fit['params']['k'], 0.3, places=3)
+        self.assertAlmostEqual(fit['params']['x0'], 2005, places=2)
+
+    def test_fit_series_linear_fallback(self):
+        x = np.arange(2000, 2010, dtype=float)
+        with patch.object(analysis, 'curve_fit', side_effect=RuntimeError("maxfev")) as curve_fit:
+            fit = fit_series(x, 2 * x + 1)
+        self.assertEqual(curve_fit.call_count, 2)  # warm start, then the default guess
+        self.assertEqual(fit['model'], 'linear')
+        self.assertAlmostEqual(fit['params']['slope'], 2.0)
+        self.assertIsNone(fit_series(x[:4], x[:4]))
+
+    def test_fit_growth_models(self):
+        self.assertEqual(self.analyzer.fit_growth_models("D1")['model'], 'logistic')
+        self.assertIsNone(self.analyzer.fit_growth_models("D3"))
+        self.assertIsNone(self.analyzer.fit_growth_models("D9"))
+
+    def test_fit_growth_models_batch(self):
+        fits = self.analyzer.fit_growth_models_batch()
+        self.assertEqual(set(fits), {"D1", "D2"})
+        self.assertEqual(fits["D1"], self.analyzer.fit_growth_models("D1"))
+        self.assertEqual(set(self.analyzer.fit_growth_models_batch(["D2", "D9", "D3"])), {"D2"})
+
+        with patch.object(analysis, 'FIT_CHUNK_SIZE', 1):
+            self.assertEqual(self.analyzer.fit_growth_models_batch(workers=2), fits)
+
+
+if __name__ == '__main__':
+    unittest.main()
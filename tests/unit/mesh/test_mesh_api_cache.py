@@ -0,0 +1,107 @@
+import unittest
+from unittest.mock import MagicMock, patch, AsyncMock
+import sys
+import os
+import shutil
+import sqlite3
+import tempfile
+import aiohttp
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
+
+from scripts.research.mesh import api_cache
+from scripts.research.mesh.api_cache import ResponseCache, get_cache, request_key
+from scripts.research.mesh.v8.data_sources.pubmed_client import PubMedClient
+
+ESEARCH = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+
+
+class TestResponseCache(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "cache", "api_cache.db")
+
+    def tearDown(self):
+        api_cache.close_all()
+        shutil.rmtree(self.tmp)
+
+    def test_request_key_is_canonical(self):
+        params = {"db": "pubmed", "term": "Anxiety", "retmax": 0}
+        key = request_key(ESEARCH, params)
+        self.assertEqual(request_key(ESEARCH, dict(reversed(params.items()))), key)
+        self.assertEqual(request_key(ESEARCH, {**params, "api_key": "k", "email": "e", "tool": "V9"}), key)
+        self.assertEqual(request_key(f"{ESEARCH}?db=pubmed&term=Anxiety&retmax=0"), key)
+        self.assertNotEqual(request_key(ESEARCH, params, kind="text"), key)
+
+    def test_round_trip_and_stats(self):
+        cache = ResponseCache(self.path)
+        self.assertIsNone(cache.get(ESEARCH, {"term": "Anxiety"}))
+        cache.set(ESEARCH, {"term": "Anxiety"}, {"esearchresult": {"count": "42"}})
+        self.assertEqual(cache.get(ESEARCH, {"term": "Anxiety"}), {"esearchresult": {"count": "42"}})
+
+        summary = cache.summary()
+        self.assertEqual((summary["hits"], summary["misses"], summary["entries"]), (1, 1, 1))
+        self.assertEqual(summary["hit_rate"], 0.5)
+        cache.close()
+
+        # Persisted, in WAL mode, as compressed blobs
+        cache = ResponseCache(self.path)
+        self.assertEqual(cache.get(ESEARCH, {"term": "Anxiety"}), {"esearchresult": {"count": "42"}})
+        cache.close()
+        conn = sqlite3.connect(self.path)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertIsInstance(conn.execute("SELECT value FROM responses").fetchone()[0], bytes)
+        conn.close()
+
+    def test_entries_expire_by_endpoint(self):
+        cache = ResponseCache(self.path)
+        trials = "https://clinicaltrials.gov/api/v2/studies"
+        cache.set(ESEARCH, {"term": "Anxiety"}, 1)
+        cache.set(trials, {"query.term": "Anxiety"}, 2)
+
+        with patch.object(api_cache.time, 'time', return_value=api_cache.time.time() + 2 * api_cache.DAY):
+            self.assertEqual(cache.get(ESEARCH, {"term": "Anxiety"}), 1)
+            self.assertIsNone(cache.get(trials, {"query.term": "Anxiety"}))
+        self.assertEqual(cache.summary()["expired"], 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = ResponseCache(self.path, max_bytes=1000)
+        with patch.object(api_cache, 'TOUCH_BATCH', 1):
+            for i in range(20):
+                cache.set(ESEARCH, {"term": i}, os.urandom(64).hex())
+                cache.get(ESEARCH, {"term": 0})  # keep the first entry in use
+        self.assertLessEqual(cache.summary()["bytes"], 1000)
+        self.assertGreater(cache.stats["evictions"], 0)
+        self.assertIsNotNone(cache.get(ESEARCH, {"term": 0}))
+        self.assertIsNone(cache.get(ESEARCH, {"term": 1}))
+
+    async def test_async_access(self):
+        cache = get_cache(self.path)
+        self.assertIs(get_cache(self.path), cache)
+        await cache.aset(ESEARCH, {"term": "Sleep"}, "<xml/>", kind="text")
+        self.assertEqual(await cache.aget(ESEARCH, {"term": "Sleep"}, kind="text"), "<xml/>")
+        self.assertIsNone(await cache.aget(ESEARCH, {"term": "Sleep"}))
+
+    @patch('aiohttp.ClientSession.get')
+    async def test_shared_between_clients(self, mock_get):
+        mock_response = MagicMock()
+        mock_response.status = 200
+        mock_response.json = AsyncMock(return_value={"esearchresult": {"idlist": ["12345"]}})
+        mock_get.return_value.__aenter__.return_value = mock_response
+
+        client = PubMedClient(api_key="key", cache_db=self.path)
+        async with aiohttp.ClientSession() as session:
+            self.assertEqual(await client.search_articles(session, "test"), ["12345"])
+            self.assertEqual(await PubMedClient(cache_db=self.path).search_articles(session, "test"), ["12345"])
+        mock_get.assert_called_once()
+
+        # A plain URL request for the same search, as v10 makes it, is a hit too
+        params = mock_get.call_args.kwargs["params"]
+        url = ESEARCH + "?" + "&".join(f"{k}={v}" for k, v in params.items() if k != "api_key")
+        self.assertEqual(get_cache(self.path).get(url), {"esearchresult": {"idlist": ["12345"]}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import gzip
+import shutil
+import tempfile
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
+
+from scripts.research.mesh import ingest_index
+from scripts.research.mesh.ingest_index import IngestIndex, counts_to_columns
+
+
+def article(year, uis):
+    headings = "".join(f'<MeshHeading><DescriptorName UI="{ui}">x</DescriptorName></MeshHeading>' for ui in uis)
+    return (f"<PubmedArticle><Article><Journal><JournalIssue><PubDate><Year>{year}</Year></PubDate>"
+            f"</JournalIssue></Journal></Article><MeshHeadingList>{headings}</MeshHeadingList></PubmedArticle>")
+
+
+class TestIngestIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.index_dir = os.path.join(self.tmp, "index")
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write_baseline(self, name, articles):
+        path = os.path.join(self.tmp, name)
+        with gzip.open(path, 'wt') as f:
+            f.write("<PubmedArticleSet>" + "".join(articles) + "</PubmedArticleSet>")
+        return path
+
+    def build(self, files, allowed_uis=None):
+        index = IngestIndex(self.index_dir, self.logger)
+        failed = index.update(files, num_workers=1)
+        return index, failed, index.load(files, allowed_uis=allowed_uis)
+
+    def as_dict(self, df):
+        return {(row.ui, row.year): row.count for row in df.itertuples()}
+
+    def test_counts_to_columns(self):
+        columns = counts_to_columns({('D2', 2000): 3, ('D1', 2001): 4, ('D2', 2001): 1})
+        self.assertEqual(list(columns['terms']), ['D1', 'D2'])
+        self.assertEqual(columns['term'].dtype.name, 'uint32')
+        self.assertEqual(columns['year'].dtype.name, 'uint16')
+        self.assertEqual(columns['count'].dtype.name, 'uint32')
+        triples = {(columns['terms'][t], int(y), int(c))
+                   for t, y, c in zip(columns['term'], columns['year'], columns['count'])}
+        self.assertEqual(triples, {('D2', 2000, 3), ('D1', 2001, 4), ('D2', 2001, 1)})
+
+    def test_merges_shards_and_filters_at_load(self):
+        a = self.write_baseline("pubmed24n0001.xml.gz", [article(2000, ["D1", "D2"]), article(2000, ["D1"])])
+        b = self.write_baseline("pubmed24n0002.xml.gz", [article(2000, ["D1"]), article(2001, ["D3"])])
+
+        _, failed, df = self.build([a, b])
+        self.assertEqual(failed, [])
+        self.assertEqual(list(df.columns), ['ui', 'year', 'count'])
+        self.assertEqual(self.as_dict(df), {('D1', 2000): 3, ('D2', 2000): 1, ('D3', 2001): 1})
+
+        # Shards hold every term, so a different filter needs no reparse
+        with patch.object(ingest_index, 'build_shard') as build_shard:
+            _, _, df = self.build([a, b], allowed_uis={'D1', 'D3'})
+            build_shard.assert_not_called()
+        self.assertEqual(self.as_dict(df), {('D1', 2000): 3, ('D3', 2001): 1})
+
+    def test_merge_spans_year_ranges_of_all_shards(self):
+        a = self.write_baseline("pubmed24n0001.xml.gz", [article(1965, ["D1"]), article(1966, ["D2"])])
+        b = self.write_baseline("pubmed24n0002.xml.gz", [article(2024, ["D1", "D2"]), article(2024, ["D1"])])
+
+        _, _, df = self.build([a, b])
+        self.assertEqual(self.as_dict(df), {('D1', 1965): 1, ('D2', 1966): 1, ('D1', 2024): 2, ('D2', 2024): 1})
+        self.assertEqual(list(df['ui']), sorted(df['ui']))
+
+        _, _, df = self.build([a, b], allowed_uis={'D9'})
+        self.assertTrue(df.empty)
+
+    def test_update_schedules_largest_files_first(self):
+        small = self.write_baseline("pubmed24n0001.xml.gz", [article(2000, ["D1"])])
+        large = self.write_baseline("pubmed24n0002.xml.gz", [article(2000 + i, ["D1", "D2"]) for i in range(50)])
+        executor = MagicMock()
+        executor.__enter__.return_value = executor
+        executor.submit.side_effect = lambda fn, *args: MagicMock(result=MagicMock(return_value=fn(*args)))
+
+        with patch.object(ingest_index, 'ProcessPoolExecutor', return_value=executor), \
+                patch.object(ingest_index, 'as_completed', side_effect=lambda futures: futures):
+            index = IngestIndex(self.index_dir, self.logger)
+            self.assertEqual(index.update([small, large], num_workers=2), [])
+
+        self.assertEqual([call.args[1] for call in executor.submit.call_args_list], [large, small])
+        self.assertEqual(set(index.manifest['files']), {"pubmed24n0001.xml.gz", "pubmed24n0002.xml.gz"})
+        self.assertIn("GB", self.logger.info.call_args_list[-1].args[0])
+
+    def test_reparses_only_changed_files(self):
+        a = self.write_baseline("pubmed24n0001.xml.gz", [article(2000, ["D1"])])
+        b = self.write_baseline("pubmed24n0002.xml.gz", [article(2001, ["D2"])])
+        self.build([a, b])
+
+        # Touched but unchanged: hash matches, shard kept
+        os.utime(a, ns=(0, 0))
+        self.write_baseline("pubmed24n0002.xml.gz", [article(2001, ["D2"]), article(2002, ["D2"])])
+        index = IngestIndex(self.index_dir, self.logger)
+        self.assertTrue(index.is_fresh(a))
+        self.assertFalse(index.is_fresh(b))
+
+        _, _, df = self.build([a, b])
+        self.assertEqual(self.as_dict(df), {('D1', 2000): 1, ('D2', 2001): 1, ('D2', 2002): 1})
+
+    def test_failed_file_is_not_cached(self):
+        bad = os.path.join(self.tmp, "pubmed24n0003.xml.gz")
+        with open(bad, 'wb') as f:
+            f.write(b"not gzip")
+
+        index, failed, df = self.build([bad])
+        self.assertEqual(failed, [bad])
+        self.assertNotIn("pubmed24n0003.xml.gz", index.manifest['files'])
+        self.assertTrue(df.empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import json
+import time
+import shutil
+import tempfile
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
+
+from scripts.research.mesh import pubmed_client, discover_terms
+from scripts.research.mesh.pubmed_client import PubMedClient, TokenBucket
+
+
+def json_response(result, status_code=200):
+    response = MagicMock(status_code=status_code)
+    response.json.return_value = {"esearchresult": result}
+    return response
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_spaces_requests_at_rate(self):
+        bucket = TokenBucket(rate=50)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        # First token is immediate, the next five wait 1/50 s each
+        self.assertGreaterEqual(time.monotonic() - start, 5 / 50 - 0.01)
+
+
+class TestPubMedClient(unittest.TestCase):
+
+    def setUp(self):
+        self.session = MagicMock()
+        self.client = PubMedClient(api_key=None, session=self.session)
+        self.client.limiter = MagicMock()
+
+    def test_rate_follows_api_key(self):
+        self.assertEqual(self.client.rate, 3)
+        self.assertEqual(self.client.max_workers, 3)
+        self.assertEqual(PubMedClient(api_key="key", session=self.session).rate, 10)
+
+    def test_count(self):
+        self.session.get.return_value = json_response({"count": "42"})
+        self.assertEqual(self.client.count("Anxiety", year=2020), 42)
+        params = self.session.get.call_args.kwargs["params"]
+        self.assertEqual(params["term"], "(Anxiety[MeSH Major Topic]) AND (2020[PDAT])")
+        self.assertNotIn("api_key", params)
+        self.client.limiter.acquire.assert_called_once()
+
+    def test_counts_in_parallel(self):
+        def get(url, params, timeout):
+            return json_response({"count": str(len(params["term"]))})
+        self.session.get.side_effect = get
+
+        counts = self.client.counts(["Anxiety", "Sleep", "Anxiety"])
+        self.assertEqual(list(counts), ["Anxiety", "Sleep"])
+        self.assertEqual(counts["Sleep"], len("(Sleep[MeSH Major Topic])"))
+        self.assertEqual(self.client.limiter.acquire.call_count, 2)
+
+    @patch.object(pubmed_client.time, 'sleep')
+    def test_retries_rate_limited_requests(self, sleep):
+        self.session.get.side_effect = [json_response({}, 429), json_response({"count": "7"})]
+        self.assertEqual(self.client.count("Anxiety"), 7)
+        sleep.assert_called_once_with(1)
+
+    def test_error_counts_as_zero(self):
+        response = json_response({}, 400)
+        response.raise_for_status.side_effect = pubmed_client.requests.exceptions.HTTPError("bad request")
+        self.session.get.return_value = response
+        self.assertEqual(self.client.count("Anxiety"), 0)
+
+    def test_yearly_counts_use_history_server(self):
+        def get(url, params, timeout):
+            if params.get("usehistory") == "y":
+                return json_response({"count": "100", "webenv": "ENV", "querykey": "1"})
+            self.assertEqual(params["WebEnv"], "ENV")
+            return json_response({"count": params["term"][-11:-7]})
+        self.session.get.side_effect = get
+
+        counts = self.client.yearly_counts("Anxiety", [2019, 2020])
+        self.assertEqual(counts, {2019: 2019, 2020: 2020})
+        terms = [c.kwargs["params"]["term"] for c in self.session.get.call_args_list[1:]]
+        self.assertEqual(sorted(terms), ["#1 AND (2019[PDAT])", "#1 AND (2020[PDAT])"])
+
+    def test_related_terms(self):
+        self.session.get.return_value = json_response({"idlist": ["1", "2"]})
+        fetch = MagicMock(status_code=200)
+        fetch.content = (b"<PubmedArticleSet><MeshHeading><DescriptorName>Anxiety</DescriptorName></MeshHeading>"
+                         b"<MeshHeading><DescriptorName>Sleep</DescriptorName></MeshHeading></PubmedArticleSet>")
+        self.session.post.return_value = fetch
+
+        self.assertEqual(self.client.related_terms("Anxiety"), ["Sleep"])
+        self.assertEqual(self.session.post.call_args.kwargs["data"]["id"], "1,2")
+
+
+class TestDiscoveryPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_frontier_counted_in_batches(self):
+        counts = {"Mental Health": 9000, "A": 6000, "B": 10, "C": 7000}
+        related = {"Mental Health": ["A", "B", "C"], "A": ["C"], "C": []}
+        client = MagicMock(max_workers=3)
+        client.counts.side_effect = lambda terms: {t: counts[t] for t in terms}
+        output = os.path.join(self.tmp, "terms.json")
+
+        with patch.object(discover_terms, 'get_client', return_value=client), \
+                patch.object(discover_terms, 'discover_related_terms', side_effect=related.get), \
+                patch.object(discover_terms, 'OUTPUT_JSON_PATH', output), \
+                patch('builtins.print'):
+            discover_terms.run_discovery_pipeline()
+
+        self.assertEqual([c.args[0] for c in client.counts.call_args_list], [["Mental Health"], ["A", "B", "C"]])
+        with open(output) as f:
+            results = json.load(f)
+        self.assertEqual([r["primary_term"] for r in results], ["Mental Health", "C", "A"])
+
+
+if __name__ == '__main__':
+    unittest.main()
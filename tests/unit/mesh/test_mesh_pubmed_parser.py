@@ -0,0 +1,116 @@
+import unittest
+import sys
+import os
+import gzip
+import shutil
+import tempfile
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
+
+from scripts.research.mesh.pubmed_parser import PubMedExtractor, PubMedParser
+
+ARTICLES = """<?xml version="1.0"?>
+<!DOCTYPE PubmedArticleSet PUBLIC "-//NLM//DTD PubMedArticle, 1st January 2024//EN" "pubmed_240101.dtd">
+<PubmedArticleSet>
+<PubmedArticle><MedlineCitation><PMID>1</PMID>
+  <DateCompleted><Year>2003</Year></DateCompleted>
+  <Article><Journal><JournalIssue><PubDate><Year>2001</Year><Month>Jan</Month></PubDate></JournalIssue></Journal>
+  <ArticleTitle>Depression &lt;PubDate&gt; in text</ArticleTitle>
+  <ArticleDate DateType="Electronic"><Year>2002</Year></ArticleDate></Article>
+  <MeshHeadingList>
+    <MeshHeading><DescriptorName UI="D003863" MajorTopicYN="Y">Depression</DescriptorName>
+      <QualifierName UI="Q000188" MajorTopicYN="N">drug therapy</QualifierName></MeshHeading>
+    <MeshHeading><DescriptorName MajorTopicYN="N" UI="D006801">Humans</DescriptorName></MeshHeading>
+  </MeshHeadingList></MedlineCitation>
+  <PubmedData><History><PubMedPubDate PubStatus="pubmed"><Year>1999</Year></PubMedPubDate></History></PubmedData>
+</PubmedArticle>
+<PubmedArticle><MedlineCitation><PMID>2</PMID>
+  <Article><Journal><JournalIssue><PubDate><MedlineDate>1998 Spring</MedlineDate></PubDate></JournalIssue></Journal>
+  <ArticleDate DateType="Electronic"><Year>1998</Year></ArticleDate></Article>
+  <MeshHeadingList><MeshHeading><DescriptorName UI="D006801" MajorTopicYN="N">Humans</DescriptorName></MeshHeading></MeshHeadingList>
+</MedlineCitation></PubmedArticle>
+<PubmedArticle><MedlineCitation><PMID>3</PMID>
+  <DateCompleted><Year>2005</Year></DateCompleted>
+  <Article><Journal><JournalIssue><PubDate><Season>Winter</Season></PubDate></JournalIssue></Journal></Article>
+  <MeshHeadingList><MeshHeading><DescriptorName UI="D003863" MajorTopicYN="N">Depression</DescriptorName></MeshHeading></MeshHeadingList>
+</MedlineCitation></PubmedArticle>
+<PubmedArticle><MedlineCitation><PMID>4</PMID>
+  <Article><Journal><JournalIssue><PubDate><Month>Mar</Month></PubDate></JournalIssue></Journal></Article>
+  <MeshHeadingList><MeshHeading><DescriptorName UI="D003863" MajorTopicYN="N">Depression</DescriptorName></MeshHeading></MeshHeadingList>
+</MedlineCitation></PubmedArticle>
+<PubmedArticle><MedlineCitation><PMID>5</PMID>
+  <Article><Journal><JournalIssue><PubDate><Year>2010</Year></PubDate></JournalIssue></Journal></Article>
+</MedlineCitation></PubmedArticle>
+</PubmedArticleSet>
+"""
+
+
+class TestPubMedExtractor(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "pubmed24n0001.xml.gz")
+        with gzip.open(self.path, 'wt') as f:
+            f.write(ARTICLES)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_reads_year_and_descriptors(self):
+        extractor = PubMedExtractor()
+        articles = list(extractor.iter_articles(self.path))
+        named = [(year, [(extractor.terms[t], major) for t, major in headings]) for year, headings in articles]
+        self.assertEqual(named, [
+            (2001, [('D003863', True), ('D006801', False)]),  # PubDate wins over ArticleDate/DateCompleted
+            (1998, [('D006801', False)]),                      # MedlineDate only: ArticleDate
+            (2005, [('D003863', False)]),                      # no Year in PubDate, no ArticleDate
+            (2010, []),
+        ])  # article 4 has no year and is skipped
+        self.assertEqual(extractor.terms, ['D003863', 'D006801'])
+
+    def test_small_chunks_match_single_read(self):
+        whole = list(PubMedExtractor().iter_articles(self.path))
+        chunked = list(PubMedExtractor().iter_articles(self.path, chunk_size=7))
+        self.assertEqual(chunked, whole)
+
+    def test_count_file(self):
+        extractor = PubMedExtractor()
+        counts = extractor.count_file(self.path)
+        depression, humans = extractor.term_ids[b'D003863'], extractor.term_ids[b'D006801']
+        self.assertEqual(dict(counts), {(depression, 2001): 1, (humans, 2001): 1, (humans, 1998): 1,
+                                        (depression, 2005): 1})
+
+    def test_parse_file_filters_uis(self):
+        counts = PubMedParser(allowed_mesh_uis={'D003863'}).parse_file(self.path)
+        self.assertEqual(dict(counts), {('D003863', 2001): 1, ('D003863', 2005): 1})
+
+    def test_book_article_before_article(self):
+        with gzip.open(self.path, 'wt') as f:
+            f.write("""<PubmedArticleSet>
+<PubmedBookArticle><BookDocument><PMID>6</PMID>
+  <Book><PubDate><Year>1999</Year></PubDate></Book>
+</BookDocument></PubmedBookArticle>
+<PubmedArticle><MedlineCitation><PMID>7</PMID>
+  <Article><Journal><JournalIssue><PubDate><MedlineDate>2010 Jan-Feb</MedlineDate></PubDate></JournalIssue></Journal>
+  <ArticleDate DateType="Electronic"><Year>2010</Year></ArticleDate></Article>
+  <MeshHeadingList><MeshHeading><DescriptorName UI="D000001" MajorTopicYN="N">A</DescriptorName></MeshHeading></MeshHeadingList>
+</MedlineCitation></PubmedArticle>
+</PubmedArticleSet>
+""")
+        # The book's PubDate is not read as the article's
+        self.assertEqual(dict(PubMedParser().parse_file(self.path)), {('D000001', 2010): 1})
+
+    def test_truncated_file(self):
+        with gzip.open(self.path, 'wt') as f:
+            f.write(ARTICLES[:ARTICLES.index("<PMID>3</PMID>")])
+
+        with self.assertRaises(ValueError):
+            PubMedParser().parse_file(self.path, raise_errors=True)
+        # Without raise_errors the complete articles are still counted
+        counts = PubMedParser().parse_file(self.path)
+        self.assertEqual(counts[('D006801', 1998)], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
+
+from scripts.research.mesh import api_cache
+from scripts.research.mesh.range_counter import CountUnavailable, RangeCounter
+from scripts.research.mesh.v9.core.client import PubMedClientV9
+from scripts.research.mesh.v9.core.temporal_engine import TemporalEngineV9
+
+YEARS = range(1950, 2026)
+SERIES = {
+    "Zero": {},
+    "Late": {year: 100 + year - 2005 for year in range(2005, 2026)},
+    "Sparse": {1961: 1, 1990: 2, 2020: 1},
+    "Dense": {year: 500 for year in YEARS},
+}
+
+
+def intervals(step):
+    return [(year, min(year + step - 1, YEARS[-1])) for year in range(YEARS[0], YEARS[-1] + 1, step)]
+
+
+def expected(term, spans):
+    return [sum(SERIES[term].get(year, 0) for year in range(start, end + 1)) for start, end in spans]
+
+
+class TestRangeCounter(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.queries = []
+
+        async def count_range(term, start, end):
+            self.queries.append((term, start, end))
+            return sum(SERIES[term].get(year, 0) for year in range(start, end + 1))
+        self.counter = RangeCounter(count_range)
+
+    async def test_counts_match_one_query_per_interval(self):
+        for term in SERIES:
+            for step in (1, 5, 10):
+                spans = intervals(step)
+                self.assertEqual(await self.counter.counts(term, spans), expected(term, spans), (term, step))
+
+    async def test_calls_per_series_shape(self):
+        spans = intervals(1)
+        for term, max_calls in [("Zero", 1), ("Late", 35), ("Sparse", 40), ("Dense", len(spans) + 1)]:
+            before = self.counter.calls
+            await self.counter.counts(term, spans)
+            self.assertLessEqual(self.counter.calls - before, max_calls, term)
+
+    async def test_results_are_cached(self):
+        spans = intervals(5)
+        await self.counter.counts("Late", spans)
+        calls = self.counter.calls
+        self.assertEqual(await self.counter.counts("Late", spans), expected("Late", spans))
+        self.assertEqual(self.counter.calls, calls)
+        self.assertEqual(len(self.queries), len(set(self.queries)))
+
+    async def test_failed_full_span_is_split_not_zeroed(self):
+        spans = intervals(1)
+        failing = {("Late", YEARS[0], YEARS[-1])}
+        count_range = self.counter.count_range
+
+        async def flaky(term, start, end):
+            if (term, start, end) in failing:
+                failing.discard((term, start, end))
+                raise CountUnavailable("HTTP 503")
+            return await count_range(term, start, end)
+        self.counter.count_range = flaky
+
+        self.assertEqual(await self.counter.counts("Late", spans), expected("Late", spans))
+        self.assertEqual(self.counter.failed, [])
+        # The failure was not cached: the span is fetched again when asked
+        self.assertEqual(await self.counter.count("Late", YEARS[0], YEARS[-1]), sum(SERIES["Late"].values()))
+
+    async def test_persistent_failure_costs_one_interval(self):
+        spans = intervals(1)
+        count_range = self.counter.count_range
+
+        async def broken(term, start, end):
+            if start <= 2010 <= end:
+                raise CountUnavailable("HTTP 500")
+            return await count_range(term, start, end)
+        self.counter.count_range = broken
+
+        for term in ("Late", "Dense"):
+            want = expected(term, spans)
+            want[spans.index((2010, 2010))] = 0
+            self.assertEqual(await self.counter.counts(term, spans), want, term)
+            self.assertIn((term, 2010, 2010), self.counter.failed)
+
+    async def test_empty_intervals(self):
+        self.assertEqual(await self.counter.counts("Dense", []), [])
+        self.assertEqual(self.counter.calls, 0)
+
+
+class TestTemporalEngineV9(unittest.IsolatedAsyncioTestCase):
+
+    async def test_process_condition_normalizes_range_counts(self):
+        client = MagicMock()
+
+        async def get_publication_count(term, year=None, year_range=None, default=0):
+            return sum(SERIES[term].get(year, 0) for year in range(year_range[0], year_range[1] + 1))
+        client.get_publication_count = AsyncMock(side_effect=get_publication_count)
+        engine = TemporalEngineV9(client, {"temporal": {"start_year": 1995, "end_year": 2014}})
+
+        spans = engine.generate_intervals()
+        result = await engine.process_condition("Late", spans, baselines=[1000, 1000, 0, 2000])
+        self.assertEqual(result["counts"], [0, 0, 510, 535])
+        self.assertEqual(result["normalized_counts"], [0.0, 0.0, 2675.0])
+
+    async def test_failed_request_is_not_a_zero_count(self):
+        calls = []
+
+        async def esearch(query, retmax=0):
+            calls.append(query)
+            if len(calls) == 1:
+                return {"error": "Maximum retries exceeded"}
+            start, end = map(int, query.split("(")[-1].split("[")[0].split(":"))
+            return {"esearchresult": {"count": str(sum(SERIES["Late"].get(y, 0) for y in range(start, end + 1)))}}
+
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        self.addCleanup(api_cache.close_all)
+        client = PubMedClientV9(cache_db=os.path.join(tmp, "api_cache.db"))
+        client.esearch = AsyncMock(side_effect=esearch)
+        engine = TemporalEngineV9(client, {"temporal": {"start_year": 2000, "end_year": 2009,
+                                                        "interval_strategy": "annual", "normalize": False}})
+
+        result = await engine.process_condition("Late", engine.generate_intervals())
+        self.assertEqual(result["counts"], [0, 0, 0, 0, 0, 100, 101, 102, 103, 104])
+        self.assertEqual(engine.range_counter.failed, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import shutil
+import tempfile
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
+
+from scripts.research.mesh import mesh_store
+from scripts.research.mesh.mesh_loader import MeshLoader
+from scripts.research.mesh.mesh_store import MeshStore, TreeNumberTrie
+
+
+def record(ui, name, tree_numbers, entry_terms=()):
+    trees = "".join(f"<TreeNumber>{tn}</TreeNumber>" for tn in tree_numbers)
+    terms = "".join(f"<Term><String>{t}</String></Term>" for t in (name,) + tuple(entry_terms))
+    return (f"<DescriptorRecord><DescriptorUI>{ui}</DescriptorUI><DescriptorName><String>{name}</String>"
+            f"</DescriptorName><TreeNumberList>{trees}</TreeNumberList>"
+            f"<ConceptList><Concept><TermList>{terms}</TermList></Concept></ConceptList></DescriptorRecord>")
+
+
+DESCRIPTORS = [
+    record("D001007", "Anxiety", ["F01.470.361"], ["Angst", "Nervousness"]),
+    record("D001008", "Anxiety Disorders", ["F03.080"]),
+    record("D003863", "Depression", ["F01.145.126.350"], ["Depressive Symptoms"]),
+    record("D003866", "Depressive Disorder", ["F03.600.300"]),
+    record("D012559", "Schizophrenia", ["F03.700.750"]),
+    record("D006801", "Humans", ["B01.050.150.900.649.313.988.400.112.400.400"]),
+    record("D011581", "Psychiatry", ["F04.096.544", "H02.403.720"]),
+]
+
+
+class TestMeshStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.xml_path = os.path.join(self.tmp, "desc2024.xml")
+        self.snapshot_path = os.path.join(self.tmp, "cache", "mesh_descriptors.json.gz")
+        self.write_xml(DESCRIPTORS)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def write_xml(self, records):
+        with open(self.xml_path, 'w') as f:
+            f.write('<?xml version="1.0"?>\n<DescriptorRecordSet LanguageCode="eng">'
+                    + "".join(records) + "</DescriptorRecordSet>")
+
+    def store(self):
+        return MeshStore(self.xml_path, self.snapshot_path).load()
+
+    def test_trie_matches_startswith(self):
+        store = self.store()
+        for prefix in ["F03", "F01", "F0", "F03.600", "F03.6", "F01.470.361", "H", "Z99", "B01.050"]:
+            expected = {ui for ui, tns in store.tree_numbers.items() if any(tn.startswith(prefix) for tn in tns)}
+            self.assertEqual(store.trie.subtree(prefix), expected, prefix)
+
+    def test_descendants(self):
+        store = self.store()
+        self.assertEqual(store.descendants(["F03", "G11"]), {
+            "D001008": "Anxiety Disorders", "D003866": "Depressive Disorder", "D012559": "Schizophrenia"})
+        self.assertEqual(list(store.descendants("F0")), sorted(store.descendants("F0")))
+
+    def test_lookup(self):
+        store = self.store()
+        self.assertEqual(store.lookup("depression"), "D003863")
+        self.assertEqual(store.lookup(" Nervousness "), "D001007")
+        self.assertIsNone(store.lookup("Unknown term"))
+        self.assertEqual(store.tree_numbers["D011581"], ["F04.096.544", "H02.403.720"])
+
+    def test_snapshot_reused_until_xml_changes(self):
+        self.store()
+        with patch.object(mesh_store, 'parse_descriptor_xml') as parse:
+            self.assertEqual(len(self.store()), len(DESCRIPTORS))
+            parse.assert_not_called()
+
+            # Touched but unchanged: the hash still matches
+            os.utime(self.xml_path, ns=(0, 0))
+            self.store()
+            parse.assert_not_called()
+
+        self.write_xml(DESCRIPTORS[:2])
+        self.assertEqual(len(self.store()), 2)
+
+    def test_mesh_loader_candidates(self):
+        loader = MeshLoader(self.xml_path, MagicMock(), snapshot_path=self.snapshot_path)
+        with patch.object(mesh_store.config, 'TARGET_TREE_PREFIXES', ["F03", "F01"]):
+            term_map = loader.load_descriptors()
+        self.assertEqual(set(term_map), {"D001007", "D001008", "D003863", "D003866", "D012559"})
+        self.assertEqual(loader.tree_map["D003866"], ["F03.600.300"])
+
+
+class TestTreeNumberTrie(unittest.TestCase):
+
+    def test_descriptor_filed_at_several_places(self):
+        trie = TreeNumberTrie()
+        trie.insert("F03.600", "D1")
+        trie.insert("F01.100", "D1")
+        trie.insert("F03.600.100", "D2")
+        self.assertEqual(trie.subtree("F03.600"), {"D1", "D2"})
+        self.assertEqual(trie.subtree("F03.600.100"), {"D2"})
+        self.assertEqual(trie.subtree("F01"), {"D1"})
+        self.assertEqual(trie.subtree("F03.600.100.5"), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,10 +6,14 @@ import unittest
 import numpy as np
 import os
 import sys
+import shutil
+import tempfile
+from unittest.mock import patch
 
 # Add work dir to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
+from scripts.research.mesh import api_cache, config as mesh_config
 from scripts.research.mesh.v10.core.schemas import PEICOTSchema, ScaleHarmonizer
 from scripts.research.mesh.v10.meta_analysis.pooling import MetaAnalysisEngine, EffectSizeConverter
 from scripts.research.mesh.v10.meta_analysis.diagnostics import MetaDiagnostics
@@ -19,6 +23,14 @@ from scripts.research.mesh.v10.neuro_modeling.systems import NeuroSystemsModeler
 
 class TestMeshV10(unittest.TestCase):
     def setUp(self):
+        # Keep API responses out of the shared ./data cache
+        self.tmp = tempfile.mkdtemp()
+        cache_patch = patch.object(mesh_config, "API_CACHE_DB", os.path.join(self.tmp, "api_cache.db"))
+        cache_patch.start()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.addCleanup(cache_patch.stop)
+        self.addCleanup(api_cache.close_all)
+
         self.config = {
             "systematic_review": {
                 "peicot_schema": {
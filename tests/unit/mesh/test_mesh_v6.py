@@ -11,6 +11,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.
 
 from scripts.research.mesh.v6.core.api_clients import DiscoveryClientV6
 from scripts.research.mesh.v6.core.engine import DiscoveryEngineV6
+from scripts.research.mesh.api_cache import close_all
 
 class TestMeshV6Async(unittest.IsolatedAsyncioTestCase):
 
@@ -19,6 +20,7 @@ class TestMeshV6Async(unittest.IsolatedAsyncioTestCase):
         self.config = {"max_concurrency": 2, "cache_db": self.cache_db}
 
     def tearDown(self):
+        close_all()
         if os.path.exists(self.cache_db):
             os.remove(self.cache_db)
 
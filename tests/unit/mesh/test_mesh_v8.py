@@ -13,6 +13,7 @@ from scripts.research.mesh.v8.data_sources.pubmed_client import PubMedClient
 from scripts.research.mesh.v8.data_sources.clinicaltrials_client import ClinicalTrialsClient
 from scripts.research.mesh.v8.data_sources.opentargets_client import OpenTargetsClient
 from scripts.research.mesh.v8.graph_builder import GraphBuilder
+from scripts.research.mesh.api_cache import close_all
 
 class TestMeshV8(unittest.IsolatedAsyncioTestCase):
 
@@ -20,6 +21,7 @@ class TestMeshV8(unittest.IsolatedAsyncioTestCase):
         self.cache_db = "test_cache_v8.db"
 
     def tearDown(self):
+        close_all()
         if os.path.exists(self.cache_db):
             os.remove(self.cache_db)
 
@@ -0,0 +1,103 @@
+import unittest
+from unittest.mock import MagicMock, AsyncMock
+import sys
+import os
+import asyncio
+import shutil
+import tempfile
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
+
+from scripts.research.mesh.v9.core.engine import DiscoveryEngineV9
+
+COUNTS = {"Seed": 20000, "A": 6000, "B": 10, "C": 7000, "D": 2000, "E": 50, "F": 1500}
+RELATED = {"Seed": ["A", "B", "C"], "A": ["C", "D", "Humans"], "C": ["A", "E", "F"], "D": [], "F": []}
+
+
+class TestDiscoveryEngineV9(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.delays = {}
+
+        async def request(kind, term):
+            self.requests.append((kind, term))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(self.delays.get((kind, term), 0.01))
+            self.in_flight -= 1
+
+        async def get_publication_count(term):
+            await request("count", term)
+            return COUNTS[term]
+
+        async def discover_related_terms(term):
+            await request("related", term)
+            return RELATED[term]
+
+        self.client = MagicMock()
+        self.client.get_publication_count = AsyncMock(side_effect=get_publication_count)
+        self.client.discover_related_terms = AsyncMock(side_effect=discover_related_terms)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def engine(self, **discovery):
+        return DiscoveryEngineV9(self.client, {
+            "discovery": discovery,
+            "cache": {"db_path": os.path.join(self.tmp, "cache.db")},
+        })
+
+    async def run_engine(self, engine):
+        return [res async for res in engine.run("Seed")]
+
+    async def test_levels_and_dedup(self):
+        engine = self.engine()
+        results = await self.run_engine(engine)
+
+        by_term = {r["term"]: (r["level"], r["status"]) for r in results}
+        self.assertEqual(by_term, {
+            "Seed": (1, "accepted"), "A": (2, "accepted"), "B": (2, "pruned"), "C": (2, "accepted"),
+            "D": (3, "accepted"), "E": (3, "pruned"), "F": (3, "accepted"),
+        })
+        self.assertEqual([r["level"] for r in results], sorted(r["level"] for r in results))
+
+        # Every term is counted once even though A and C list each other
+        counts = [term for kind, term in self.requests if kind == "count"]
+        self.assertEqual(sorted(counts), sorted(COUNTS))
+        self.assertEqual(engine.telemetry["levels"][3]["skipped"], 2)
+        self.assertEqual([r["term"] for r in engine.load_checkpoint(1)], ["Seed"])
+        self.assertEqual(len(engine.load_checkpoint(3)), 3)
+
+    async def test_expansions_overlap_next_level_counts(self):
+        self.delays = {("related", "A"): 0.2}
+        await self.run_engine(self.engine())
+
+        # C's children are counted while A's slow expansion is still running
+        self.assertLess(self.requests.index(("count", "F")), self.requests.index(("count", "D")))
+        self.assertGreaterEqual(self.max_in_flight, 3)
+
+    async def test_respects_semaphore(self):
+        engine = self.engine()
+        engine.semaphore = asyncio.Semaphore(1)
+        await self.run_engine(engine)
+        self.assertEqual(self.max_in_flight, 1)
+
+    async def test_total_max_terms(self):
+        engine = self.engine(total_max_terms=3)
+        results = await self.run_engine(engine)
+
+        accepted = {r["term"] for r in results if r["status"] == "accepted"}
+        self.assertEqual(accepted, {"Seed", "A", "C"})
+        self.assertEqual(engine.total_terms, 3)
+        # No level 3 term is counted once the budget is spent
+        counts = {term for kind, term in self.requests if kind == "count"}
+        self.assertEqual(counts, {"Seed", "A", "B", "C"})
+
+
+if __name__ == '__main__':
+    unittest.main()